@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from accounts.teardown import requeue_stuck_business_teardowns, run_pending_business_teardowns
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete businesses queued for background teardown (large tenants removed "
+        "through the delete business / delete account flows)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=5,
+            help='Max number of pending teardowns to run.',
+        )
+        parser.add_argument(
+            '--stuck-minutes',
+            type=int,
+            default=60,
+            help='Requeue teardowns left running for longer than this (dead thread or worker).',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Queue failed teardowns again before running.',
+        )
+
+    def handle(self, *args, **options):
+        from accounts.models import BusinessTeardownJob
+
+        requeued = requeue_stuck_business_teardowns(older_than_minutes=int(options.get('stuck_minutes') or 60))
+        if options.get('retry_failed'):
+            requeued += BusinessTeardownJob.objects.filter(status=BusinessTeardownJob.STATUS_FAILED).update(
+                status=BusinessTeardownJob.STATUS_PENDING, error='',
+            )
+        processed = run_pending_business_teardowns(limit=int(options.get('limit') or 5))
+        self.stdout.write(self.style.SUCCESS(f"Processed={processed}, requeued={requeued}."))
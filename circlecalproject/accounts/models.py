@@ -250,3 +250,39 @@ class MobileSSOToken(models.Model):
         if self.used_at is not None:
             return False
         return timezone.now() <= self.expires_at
+
+
+class BusinessTeardownJob(models.Model):
+    """Deletion of one business through accounts.teardown.
+
+    Outlives the business it deletes and doubles as the summarized audit
+    record of what was removed (`progress` holds per-table row counts).
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'pending'),
+        (STATUS_RUNNING, 'running'),
+        (STATUS_DONE, 'done'),
+        (STATUS_FAILED, 'failed'),
+    ]
+
+    business = models.ForeignKey(Business, null=True, blank=True, on_delete=models.SET_NULL, related_name='teardown_jobs')
+    business_ref = models.PositiveIntegerField(db_index=True)
+    business_name = models.CharField(max_length=255, blank=True, default='')
+    business_slug = models.CharField(max_length=255, blank=True, default='')
+    requested_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    reason = models.CharField(max_length=50, blank=True, default='')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    progress = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"BusinessTeardownJob {self.id} ({self.business_slug}) {self.status}"
@@ -3,9 +3,10 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import requests
 from django.conf import settings
 
+from calendar_app import http_client
+
 from .models import PushDevice
 
 logger = logging.getLogger(__name__)
@@ -38,7 +39,7 @@ def send_expo_push(messages: list[dict[str, Any]]) -> dict[str, Any] | None:
         return None
 
     try:
-        resp = requests.post(expo_push_url(), json=messages, timeout=6)
+        resp = http_client.request("expo", "POST", expo_push_url(), json=messages)
     except Exception as exc:
         logger.info("Expo push send failed (network): %s", exc)
         return None
@@ -0,0 +1,232 @@
+"""Set-based teardown for deleting a business.
+
+`Business.delete()` lets the ORM collect every booking and audit row of the
+tenant and fires the Booking post_delete receivers per row (cancellation
+notifications, freeze cleanup, audit writes), all inside one transaction that
+holds its locks until the very end. For a mature tenant that takes minutes.
+
+Here the high-volume tables (`BULK_MODELS`, none of which is referenced by
+another model) are removed first with raw, id-ordered batch deletes, each in
+its own short transaction. What is left (services, availability, memberships,
+billing rows) is small and goes through the ORM cascade as before, with the
+per-row booking receivers suppressed. The `BusinessTeardownJob` row records
+progress and, once done, the per-table counts as the single summary of the
+deletion.
+
+Businesses with more than `BUSINESS_TEARDOWN_SYNC_MAX_ROWS` bulk rows are
+hidden right away (archived, memberships deactivated) and torn down in a
+daemon thread after commit; `manage.py run_business_teardowns` (also a
+`run_scheduler` job) picks up anything left behind.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+BULK_MODELS = (
+    'bookings.Booking',
+    'bookings.PublicBookingIntent',
+    'bookings.AuditBooking',
+    'bookings.ArchivedBooking',
+    'bookings.ArchivedAuditBooking',
+)
+
+_suppressed: contextvars.ContextVar = contextvars.ContextVar('cc_business_teardown', default=False)
+
+
+def teardown_in_progress() -> bool:
+    """True while a teardown runs; per-row delete receivers should return early."""
+    return bool(_suppressed.get())
+
+
+@contextmanager
+def suppress_row_signals():
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+@contextmanager
+def _rls_bypass():
+    """Background runs have no request user; bypass tenant RLS like signed public links do."""
+    if getattr(connection, 'vendor', '') != 'postgresql':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT set_config(%s, %s, false)", ['circlecal.rls_bypass', '1'])
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT set_config(%s, %s, false)", ['circlecal.rls_bypass', '0'])
+
+
+def sync_max_rows() -> int:
+    try:
+        return max(0, int(getattr(settings, 'BUSINESS_TEARDOWN_SYNC_MAX_ROWS', 2000) or 0))
+    except Exception:
+        return 2000
+
+
+def _batch_size() -> int:
+    try:
+        return max(1, int(getattr(settings, 'BUSINESS_TEARDOWN_BATCH_SIZE', 1000) or 1000))
+    except Exception:
+        return 1000
+
+
+def _bulk_models():
+    for label in BULK_MODELS:
+        model = apps.get_model(label)
+        # Raw deletes skip the ORM cascade, so only use them for tables nothing points at.
+        if model._meta.related_objects or model._meta.many_to_many:
+            continue
+        yield label, model
+
+
+def count_bulk_rows(org_id: int) -> dict:
+    return {label: model.objects.filter(organization_id=org_id).count() for label, model in _bulk_models()}
+
+
+def request_business_teardown(org, *, requested_by=None, reason: str = ''):
+    """Delete `org` now when it is small, otherwise hide it and delete it in the background."""
+    from accounts.models import BusinessTeardownJob, Membership
+
+    counts = count_bulk_rows(org.id)
+    job = BusinessTeardownJob.objects.create(
+        business=org,
+        business_ref=org.id,
+        business_name=org.name or '',
+        business_slug=org.slug or '',
+        requested_by=requested_by if getattr(requested_by, 'pk', None) else None,
+        reason=reason,
+        total=sum(counts.values()),
+    )
+    if job.total <= sync_max_rows():
+        run_business_teardown(job.id)
+        job.refresh_from_db()
+        return job
+
+    type(org).objects.filter(id=org.id).update(is_archived=True)
+    Membership.objects.filter(organization_id=org.id).update(is_active=False)
+    if getattr(settings, 'BUSINESS_TEARDOWN_BACKGROUND_THREAD', True):
+        transaction.on_commit(lambda: _start_teardown_thread(job.id))
+    return job
+
+
+def _start_teardown_thread(job_id):
+    def _work():
+        close_old_connections()
+        try:
+            with _rls_bypass():
+                run_business_teardown(job_id)
+        except Exception:
+            logger.exception('business teardown job %s failed', job_id)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=_work, name='business-teardown', daemon=True).start()
+
+
+def _delete_in_batches(qs, *, batch_size: int, on_batch) -> int:
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(qs.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            doomed = qs.model.objects.filter(id__in=ids)
+            doomed._raw_delete(doomed.db)
+        deleted += len(ids)
+        on_batch(len(ids))
+    return deleted
+
+
+def run_business_teardown(job_id) -> bool:
+    """Claim and run one pending teardown job. Returns True if it finished."""
+    from accounts.models import Business, BusinessTeardownJob
+
+    claimed = BusinessTeardownJob.objects.filter(
+        id=job_id, status=BusinessTeardownJob.STATUS_PENDING,
+    ).update(status=BusinessTeardownJob.STATUS_RUNNING, started_at=timezone.now())
+    if not claimed:
+        return False
+    job = BusinessTeardownJob.objects.get(id=job_id)
+    org_id = job.business_ref
+    progress = dict(job.progress or {})
+    processed = [job.processed]
+
+    def _bump(label):
+        def _on_batch(n):
+            progress[label] = int(progress.get(label, 0)) + n
+            processed[0] += n
+            BusinessTeardownJob.objects.filter(id=job_id).update(progress=progress, processed=processed[0])
+        return _on_batch
+
+    try:
+        with suppress_row_signals():
+            for label, model in _bulk_models():
+                _delete_in_batches(
+                    model.objects.filter(organization_id=org_id), batch_size=_batch_size(), on_batch=_bump(label),
+                )
+            with transaction.atomic():
+                _, per_model = Business.objects.filter(id=org_id).delete()
+        for label, n in per_model.items():
+            if n:
+                progress[label] = int(progress.get(label, 0)) + int(n)
+    except Exception as exc:
+        logger.exception('business teardown for %s (%s) failed', job.business_slug, org_id)
+        BusinessTeardownJob.objects.filter(id=job_id).update(
+            status=BusinessTeardownJob.STATUS_FAILED, error=str(exc)[:2000], progress=progress,
+            processed=processed[0], finished_at=timezone.now(),
+        )
+        return False
+
+    BusinessTeardownJob.objects.filter(id=job_id).update(
+        status=BusinessTeardownJob.STATUS_DONE, progress=progress, processed=processed[0], finished_at=timezone.now(),
+    )
+    logger.info(
+        'Deleted business %s (%s, %s): %s',
+        job.business_slug, org_id, job.reason or 'unspecified',
+        ', '.join(f'{label}={n}' for label, n in sorted(progress.items())),
+    )
+    return True
+
+
+def requeue_stuck_business_teardowns(*, older_than_minutes: int = 60) -> int:
+    """Return teardowns left running by a dead thread or worker to the queue.
+
+    The business is already hidden, so an abandoned job would leave it
+    half-deleted. Batches delete whatever rows remain and `progress` carries
+    over, so the rerun resumes where the old one stopped.
+    """
+    from accounts.models import BusinessTeardownJob
+
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    return BusinessTeardownJob.objects.filter(
+        status=BusinessTeardownJob.STATUS_RUNNING, started_at__lt=cutoff,
+    ).update(status=BusinessTeardownJob.STATUS_PENDING)
+
+
+def run_pending_business_teardowns(*, limit: int = 5) -> int:
+    from accounts.models import BusinessTeardownJob
+
+    pending = list(
+        BusinessTeardownJob.objects.filter(status=BusinessTeardownJob.STATUS_PENDING)
+        .order_by('created_at')
+        .values_list('id', flat=True)[:limit]
+    )
+    return sum(1 for job_id in pending if run_business_teardown(job_id))
@@ -877,9 +877,11 @@ def delete_account_view(request):
 		except Exception:
 			pass
 
+		from .teardown import request_business_teardown
 		for b in owned:
 			try:
-				b.delete()
+				# Large businesses finish deleting in the background (see accounts.teardown).
+				request_business_teardown(b, requested_by=u, reason='delete_account')
 			except Exception:
 				# Continue deleting others even if one fails
 				pass
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from billing.mirror import backfill_billing_mirrors
+
+
+class Command(BaseCommand):
+    help = (
+        'Sync the billing mirror for organizations that have a Stripe customer but have never been synced, '
+        'so their first billing page view does not render empty.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=0,
+            help='Max organizations to sync (0 = all).',
+        )
+
+    def handle(self, *args, **options):
+        counts = backfill_billing_mirrors(
+            limit=max(0, int(options.get('limit') or 0)) or None,
+            log=lambda message: self.stdout.write(f'  {message}'),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Synced={counts['synced']}, failed={counts['failed']}."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from billing.webhooks import (
+    process_pending_stripe_events,
+    purge_processed_stripe_events,
+    requeue_stuck_stripe_events,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply queued Stripe webhook events (in order per customer, retrying "
+        "failures with backoff) and purge processed events older than --max-age-days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=500,
+            help='Max number of events to apply in one run.',
+        )
+        parser.add_argument(
+            '--stuck-minutes',
+            type=int,
+            default=15,
+            help='Requeue events left running for longer than this (crashed worker).',
+        )
+        parser.add_argument(
+            '--max-age-days',
+            type=int,
+            default=30,
+            help='Delete processed events older than this many days.',
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stuck_stripe_events(older_than_minutes=int(options.get('stuck_minutes') or 15))
+        processed = process_pending_stripe_events(limit=int(options.get('limit') or 500))
+        purged = purge_processed_stripe_events(max_age_days=int(options.get('max_age_days') or 30))
+        self.stdout.write(self.style.SUCCESS(f"Processed={processed}, requeued={requeued}, purged={purged}."))
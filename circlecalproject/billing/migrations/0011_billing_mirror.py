@@ -0,0 +1,88 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_merge_0023_accounts_rls_updates'),
+        ('billing', '0010_subscription_custom_domain_addon_enabled'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingMirrorState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('default_payment_method_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('subscription_data', models.JSONField(blank=True, default=dict)),
+                ('upcoming_invoice', models.JSONField(blank=True, default=dict)),
+                ('addon_subscription_data', models.JSONField(blank=True, default=dict)),
+                ('addon_upcoming_invoice', models.JSONField(blank=True, default=dict)),
+                ('stale', models.BooleanField(default=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='amount_due_cents',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='amount_paid_cents',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='card_brand',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='card_last4',
+            field=models.CharField(blank=True, max_length=8, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='currency',
+            field=models.CharField(blank=True, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='hosted_invoice_url',
+            field=models.URLField(blank=True, max_length=1000, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='invoice_created_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='stripe_status',
+            field=models.CharField(blank=True, max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='stripe_subscription_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='invoicemeta',
+            index=models.Index(fields=['organization', 'stripe_subscription_id', 'invoice_created_at'], name='billing_inv_org_sub_cr_idx'),
+        ),
+        migrations.AddField(
+            model_name='billingmirrorstate',
+            name='organization',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='billing_mirror', to='accounts.business'),
+        ),
+    ]
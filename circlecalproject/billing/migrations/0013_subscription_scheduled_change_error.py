@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0012_stripewebhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscription',
+            name='scheduled_change_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0013_subscription_scheduled_change_error'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoicemeta',
+            name='card_resolved',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,477 @@
+"""Local mirror of the Stripe billing data shown on the billing page.
+
+`manage_billing` used to list invoices, payment methods, subscriptions and
+upcoming invoices from Stripe on every load (plus one PaymentIntent/Charge
+lookup per invoice for card details). The page now renders from:
+
+- `PaymentMethod` rows (card metadata, default flag),
+- `InvoiceMeta` rows with the mirrored invoice fields,
+- one `BillingMirrorState` per organization for the subscription snapshots,
+  upcoming invoices and default payment method.
+
+Webhooks keep rows current and flag the state as stale. Reads follow
+stale-while-revalidate: a missing, stale or expired snapshot is served as-is
+(empty on an organization's first load) while a refresh runs after the
+response (daemon thread, same as audit exports). `backfill_billing_mirror`
+(also a scheduler job) syncs organizations that have never been synced, so
+the first load after a deploy does not wait on Stripe.
+
+Card details cost one or two Stripe lookups per invoice, so they are only
+resolved for the invoices the page shows (`INVOICE_CARD_LIMIT` per
+subscription), once each (`InvoiceMeta.card_resolved`).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import stripe
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from billing.models import BillingMirrorState, InvoiceMeta, PaymentMethod
+
+
+logger = logging.getLogger(__name__)
+
+INVOICE_SYNC_LIMIT = 100
+# Matches `mirrored_invoices`' default page size.
+INVOICE_CARD_LIMIT = 10
+
+
+def _get(obj, key, default=None):
+    try:
+        if obj is None:
+            return default
+        if isinstance(obj, dict):
+            return obj.get(key, default)
+        return getattr(obj, key, default)
+    except Exception:
+        return default
+
+
+def _plain(obj) -> dict:
+    """Convert a Stripe object to plain JSON-serializable data."""
+    if not obj:
+        return {}
+    to_dict = getattr(obj, 'to_dict_recursive', None) or getattr(obj, 'to_dict', None)
+    if callable(to_dict):
+        try:
+            return to_dict()
+        except Exception:
+            pass
+    try:
+        return dict(obj)
+    except Exception:
+        return {}
+
+
+def _from_ts(ts):
+    try:
+        return datetime.fromtimestamp(int(ts), tz=dt_timezone.utc) if ts else None
+    except Exception:
+        return None
+
+
+def mirror_ttl_seconds() -> int:
+    return max(0, int(getattr(settings, 'BILLING_MIRROR_TTL_SECONDS', 300) or 0))
+
+
+# ---------------------------------------------------------------------------
+# Writes (sync + webhooks)
+# ---------------------------------------------------------------------------
+
+def _invoice_card(inv):
+    """Resolve (brand, last4, complete) for a paid invoice from its PaymentIntent or Charge.
+
+    `complete` is False when a Stripe lookup failed, so the card is tried
+    again on the next sync.
+    """
+    brand = last4 = None
+    complete = True
+    pi = _get(inv, 'payment_intent')
+    if pi:
+        try:
+            pi_obj = stripe.PaymentIntent.retrieve(pi) if isinstance(pi, str) else pi
+            charges = (_get(pi_obj, 'charges', {}) or {}).get('data', [])
+            if charges:
+                card = (charges[0].get('payment_method_details', {}) or {}).get('card', {}) or {}
+                brand, last4 = card.get('brand'), card.get('last4')
+        except Exception:
+            complete = False
+    if not last4:
+        charge = _get(inv, 'charge')
+        if charge:
+            try:
+                ch = stripe.Charge.retrieve(charge) if isinstance(charge, str) else charge
+                card = (ch.get('payment_method_details', {}) or {}).get('card', {}) or {}
+                brand, last4 = card.get('brand'), card.get('last4')
+            except Exception:
+                complete = False
+    return brand, last4, complete
+
+
+def upsert_invoice(org, inv, *, resolve_card=True):
+    """Create or update the mirrored `InvoiceMeta` row for a Stripe invoice."""
+    inv_id = _get(inv, 'id')
+    if not inv_id:
+        return None
+    meta = InvoiceMeta.objects.filter(organization=org, stripe_invoice_id=inv_id).order_by('id').first()
+    if meta is None:
+        meta = InvoiceMeta(organization=org, stripe_invoice_id=inv_id)
+
+    sub = _get(inv, 'subscription')
+    if not isinstance(sub, str):
+        sub = _get(sub, 'id')
+    if not sub:
+        # Newer API versions nest the subscription under `parent`.
+        details = _get(_get(inv, 'parent'), 'subscription_details')
+        sub = _get(details, 'subscription')
+
+    meta.stripe_subscription_id = sub or meta.stripe_subscription_id
+    meta.stripe_status = _get(inv, 'status')
+    meta.amount_due_cents = _get(inv, 'amount_due')
+    meta.amount_paid_cents = _get(inv, 'amount_paid')
+    meta.currency = _get(inv, 'currency')
+    meta.hosted_invoice_url = _get(inv, 'hosted_invoice_url')
+    meta.invoice_created_at = _from_ts(_get(inv, 'created')) or meta.invoice_created_at
+    # Non-card payments never get a last4; `card_resolved` stops the lookups.
+    if resolve_card and meta.stripe_status == 'paid' and not (meta.card_last4 or meta.card_resolved):
+        meta.card_brand, meta.card_last4, meta.card_resolved = _invoice_card(inv)
+    meta.synced_at = timezone.now()
+    meta.save()
+    return meta
+
+
+def _upcoming_snapshot(ui) -> dict:
+    if not ui:
+        return {}
+    return {
+        'amount_due': _get(ui, 'amount_due'),
+        'period_end': _get(ui, 'period_end'),
+        'created': _get(ui, 'created'),
+        'subscription': _get(ui, 'subscription'),
+    }
+
+
+def _upcoming(org, subscription_id):
+    from billing.views import stripe_invoice_upcoming
+
+    try:
+        return stripe_invoice_upcoming(customer=org.stripe_customer_id, subscription=subscription_id)
+    except Exception:
+        try:
+            ui = stripe_invoice_upcoming(customer=org.stripe_customer_id)
+        except Exception:
+            return None
+        if ui and _get(ui, 'subscription') and _get(ui, 'subscription') != subscription_id:
+            return None
+        return ui
+
+
+def _is_addon_subscription(row, addon_price_id) -> bool:
+    meta = _get(row, 'metadata', {}) or {}
+    if (meta.get('purchase_type') or '').strip().lower() == 'custom_domain_addon':
+        return True
+    if not addon_price_id:
+        return False
+    for item in (_get(_get(row, 'items', {}), 'data', []) or []):
+        if (_get(_get(item, 'price', {}), 'id', '') or '').strip() == addon_price_id:
+            return True
+    return False
+
+
+def _sync_payment_methods(org, state):
+    cust = stripe.Customer.retrieve(org.stripe_customer_id)
+    default_pm = (_get(cust, 'invoice_settings', {}) or {}).get('default_payment_method')
+    if not isinstance(default_pm, str):
+        default_pm = _get(default_pm, 'id')
+    state.default_payment_method_id = default_pm
+
+    pms = stripe.PaymentMethod.list(customer=org.stripe_customer_id, type='card')
+    seen = []
+    for pm in (_get(pms, 'data', []) or []):
+        card = _get(pm, 'card', {}) or {}
+        PaymentMethod.objects.update_or_create(
+            stripe_pm_id=_get(pm, 'id'),
+            defaults={
+                'organization': org,
+                'brand': _get(card, 'brand'),
+                'last4': _get(card, 'last4'),
+                'exp_month': _get(card, 'exp_month'),
+                'exp_year': _get(card, 'exp_year'),
+                'is_default': bool(default_pm and _get(pm, 'id') == default_pm),
+            },
+        )
+        seen.append(_get(pm, 'id'))
+    PaymentMethod.objects.filter(organization=org).exclude(stripe_pm_id__in=seen).delete()
+
+
+def reconcile_subscription(subscription, stripe_sub) -> None:
+    """Copy status and period fields from a fresh Stripe subscription onto the local row.
+
+    This prevents stale UI (e.g., still showing "cancels at period end") after
+    a user resumes billing/changes plan and a webhook or client-side sync was missed.
+    """
+    stripe_status = stripe_sub.get('status') or getattr(subscription, 'status', 'active')
+    stripe_cancel = bool(stripe_sub.get('cancel_at_period_end', False))
+
+    update_fields = []
+    if getattr(subscription, 'status', None) != stripe_status:
+        subscription.status = stripe_status
+        update_fields.append('status')
+
+    stripe_active = (stripe_status in ('active', 'trialing'))
+    if getattr(subscription, 'active', None) != stripe_active:
+        subscription.active = stripe_active
+        update_fields.append('active')
+
+    if getattr(subscription, 'cancel_at_period_end', None) != stripe_cancel:
+        subscription.cancel_at_period_end = stripe_cancel
+        update_fields.append('cancel_at_period_end')
+
+    # Keep key timestamps in sync for display.
+    try:
+        cpe = stripe_sub.get('current_period_end')
+        if cpe:
+            cpe_dt = timezone.make_aware(datetime.fromtimestamp(int(cpe)))
+            if getattr(subscription, 'current_period_end', None) != cpe_dt:
+                subscription.current_period_end = cpe_dt
+                update_fields.append('current_period_end')
+        te = stripe_sub.get('trial_end')
+        if te:
+            te_dt = timezone.make_aware(datetime.fromtimestamp(int(te)))
+            if getattr(subscription, 'trial_end', None) != te_dt:
+                subscription.trial_end = te_dt
+                update_fields.append('trial_end')
+    except Exception:
+        pass
+
+    if update_fields:
+        try:
+            subscription.save(update_fields=list(dict.fromkeys(update_fields)))
+        except Exception:
+            subscription.save()
+
+
+def _sync_subscriptions(org, state):
+    subscription = getattr(org, 'subscription', None)
+    sid = getattr(subscription, 'stripe_subscription_id', None) if subscription else None
+    if sid:
+        state.subscription_data = _plain(stripe.Subscription.retrieve(sid))
+        try:
+            reconcile_subscription(subscription, state.subscription_data)
+        except Exception:
+            logger.exception('billing mirror: failed to reconcile subscription %s', sid)
+        state.upcoming_invoice = _upcoming_snapshot(_upcoming(org, sid))
+    else:
+        state.subscription_data = {}
+        state.upcoming_invoice = {}
+
+    # Custom-domain add-on: prefer an active/trialing subscription, else the newest match.
+    addon_price_id = (os.getenv('STRIPE_PRICE_ID_CUSTOM_DOMAIN_ADDON') or '').strip()
+    rows = stripe.Subscription.list(customer=org.stripe_customer_id, status='all', limit=100)
+    candidate = None
+    addon = None
+    for row in (_get(rows, 'data', []) or []):
+        if not _is_addon_subscription(row, addon_price_id):
+            continue
+        if candidate is None:
+            candidate = row
+        if (_get(row, 'status', '') or '').strip().lower() in {'active', 'trialing'}:
+            addon = row
+            break
+    addon = addon or candidate
+    addon_sid = _get(addon, 'id') if addon else None
+    if addon_sid:
+        try:
+            # Store discounts expanded so the page never has to resolve IDs.
+            addon = stripe.Subscription.retrieve(addon_sid, expand=['discounts', 'discount'])
+        except Exception:
+            pass
+        state.addon_subscription_data = _plain(addon)
+        state.addon_upcoming_invoice = _upcoming_snapshot(_upcoming(org, addon_sid))
+    else:
+        state.addon_subscription_data = {}
+        state.addon_upcoming_invoice = {}
+
+
+def _sync_invoices(org):
+    invs = stripe.Invoice.list(customer=org.stripe_customer_id, limit=INVOICE_SYNC_LIMIT)
+    shown = {}
+    # Stripe lists newest first, the same order the page shows.
+    for inv in (_get(invs, 'data', []) or []):
+        sub = _get(inv, 'subscription')
+        sub = sub if isinstance(sub, str) else _get(sub, 'id')
+        shown[sub] = shown.get(sub, 0) + 1
+        try:
+            upsert_invoice(org, inv, resolve_card=shown[sub] <= INVOICE_CARD_LIMIT)
+        except Exception:
+            logger.exception('billing mirror: failed to store invoice %s', _get(inv, 'id'))
+
+
+def refresh_billing_mirror(org, *, state=None):
+    """Pull the organization's billing data from Stripe into the mirror.
+
+    Each part is synced independently so one failing Stripe call only leaves
+    that part of the snapshot as it was.
+    """
+    if state is None:
+        state, _ = BillingMirrorState.objects.get_or_create(organization=org)
+    if getattr(org, 'stripe_customer_id', None):
+        for step in (
+            lambda: _sync_payment_methods(org, state),
+            lambda: _sync_subscriptions(org, state),
+            lambda: _sync_invoices(org),
+        ):
+            try:
+                step()
+            except Exception:
+                logger.exception('billing mirror: sync step failed for org %s', getattr(org, 'id', None))
+    state.stale = False
+    state.synced_at = timezone.now()
+    state.save()
+    return state
+
+
+def backfill_billing_mirrors(*, limit=None, log=None) -> dict:
+    """Sync organizations with a Stripe customer whose mirror has never been synced."""
+    from accounts.models import Business
+
+    orgs = (
+        Business.objects.exclude(stripe_customer_id__isnull=True)
+        .exclude(stripe_customer_id='')
+        .filter(Q(billing_mirror__isnull=True) | Q(billing_mirror__synced_at__isnull=True))
+        .order_by('id')
+    )
+    if limit:
+        orgs = orgs[:limit]
+    counts = {'synced': 0, 'failed': 0}
+    for org in orgs:
+        try:
+            refresh_billing_mirror(org)
+            counts['synced'] += 1
+        except Exception:
+            logger.exception('billing mirror: backfill failed for org %s', org.id)
+            counts['failed'] += 1
+            if log:
+                log(f'{org.slug}: failed')
+    return counts
+
+
+def mark_billing_mirror_stale(org) -> None:
+    if org is None:
+        return
+    BillingMirrorState.objects.filter(organization=org).update(stale=True)
+
+
+def _start_refresh_thread(org_id):
+    def _work():
+        close_old_connections()
+        try:
+            from accounts.models import Business
+
+            org = Business.objects.filter(id=org_id).first()
+            if org is not None:
+                refresh_billing_mirror(org)
+        except Exception:
+            logger.exception('billing mirror: background refresh failed for org %s', org_id)
+        finally:
+            cache.delete(_refresh_lock_key(org_id))
+            close_old_connections()
+
+    threading.Thread(target=_work, name=f'billing-mirror-{org_id}', daemon=True).start()
+
+
+def _refresh_lock_key(org_id) -> str:
+    return f'billing_mirror_refresh:{org_id}'
+
+
+def get_billing_mirror(org):
+    """Return the organization's mirror state, syncing or scheduling a refresh as needed."""
+    state, _ = BillingMirrorState.objects.get_or_create(organization=org)
+    if not getattr(org, 'stripe_customer_id', None):
+        return state
+
+    # A never-synced state renders empty until the refresh (or the backfill)
+    # fills it; syncing up to INVOICE_SYNC_LIMIT invoices inline is too slow.
+    expired = state.synced_at is None or state.synced_at < timezone.now() - timedelta(seconds=mirror_ttl_seconds())
+    if not (state.stale or expired):
+        return state
+
+    if not getattr(settings, 'BILLING_MIRROR_BACKGROUND_THREAD', True):
+        return refresh_billing_mirror(org, state=state)
+    # One refresh per organization at a time, across workers.
+    if cache.add(_refresh_lock_key(org.id), 1, timeout=120):
+        transaction.on_commit(lambda: _start_refresh_thread(org.id))
+    return state
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def mirrored_invoices(org, subscription_id, *, limit=10):
+    """Invoice entries for one subscription in the shape `manage_billing` renders."""
+    if not subscription_id:
+        return []
+    rows = (
+        InvoiceMeta.objects.filter(
+            organization=org,
+            stripe_subscription_id=subscription_id,
+            synced_at__isnull=False,
+        )
+        .order_by('-invoice_created_at', '-id')[:limit]
+    )
+    out = []
+    for row in rows:
+        amount = row.amount_paid_cents if row.amount_paid_cents else (row.amount_due_cents or 0)
+        out.append({
+            'created': timezone.localtime(row.invoice_created_at) if row.invoice_created_at else None,
+            'amount_display_dollars': amount / 100.0,
+            'status': row.stripe_status,
+            'hosted_invoice_url': row.hosted_invoice_url,
+            'card_brand': row.card_brand,
+            'card_last4': row.card_last4,
+            'raw': {
+                'id': row.stripe_invoice_id,
+                'status': row.stripe_status,
+                'subscription': row.stripe_subscription_id,
+                'amount_due': row.amount_due_cents,
+                'amount_paid': row.amount_paid_cents,
+                'hosted_invoice_url': row.hosted_invoice_url,
+            },
+        })
+    return out
+
+
+def mirrored_subscription(org, subscription_id):
+    """The mirrored Stripe subscription snapshot, if it is for `subscription_id`."""
+    state = BillingMirrorState.objects.filter(organization=org).only('subscription_data').first()
+    data = (state.subscription_data if state else None) or {}
+    return data if subscription_id and data.get('id') == subscription_id else None
+
+
+def mirrored_payment_methods(org):
+    """Return (payment_methods, default_payment_method_id, default_card_last4) from the cache."""
+    cached = list(PaymentMethod.objects.filter(organization=org).order_by('-is_default', '-updated_at'))
+    payment_methods = [
+        {
+            'id': pm.stripe_pm_id,
+            'card': {
+                'last4': pm.last4,
+                'brand': pm.brand,
+                'exp_month': pm.exp_month,
+                'exp_year': pm.exp_year,
+            },
+        }
+        for pm in cached
+    ]
+    default = next((p for p in cached if p.is_default), None)
+    return payment_methods, (default.stripe_pm_id if default else None), (default.last4 if default else None)
@@ -11,8 +11,11 @@ from django.contrib.auth import get_user_model
 class InvoiceMeta(models.Model):
     """Local metadata for invoices and pseudo-invoices to allow hiding/voiding and audits.
 
-    This does not duplicate Stripe data; it simply stores flags tied to either a
-    `stripe_invoice_id` or a `subscription_change` (pseudo-invoice) for UI purposes.
+    Stores flags tied to either a `stripe_invoice_id` or a `subscription_change`
+    (pseudo-invoice) for UI purposes. Rows for Stripe invoices also carry the
+    mirrored display fields below (see `billing.mirror`) so the billing page
+    can list invoices without calling Stripe; `synced_at` is null until the
+    invoice has been mirrored.
     """
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='invoice_meta')
     stripe_invoice_id = models.CharField(max_length=255, blank=True, null=True, db_index=True)
@@ -24,8 +27,25 @@ class InvoiceMeta(models.Model):
     void_reason = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Mirrored Stripe invoice fields
+    stripe_subscription_id = models.CharField(max_length=255, blank=True, null=True)
+    stripe_status = models.CharField(max_length=32, blank=True, null=True)
+    amount_due_cents = models.IntegerField(null=True, blank=True)
+    amount_paid_cents = models.IntegerField(null=True, blank=True)
+    currency = models.CharField(max_length=10, blank=True, null=True)
+    hosted_invoice_url = models.URLField(max_length=1000, blank=True, null=True)
+    invoice_created_at = models.DateTimeField(null=True, blank=True)
+    card_brand = models.CharField(max_length=50, blank=True, null=True)
+    card_last4 = models.CharField(max_length=8, blank=True, null=True)
+    # Set once the card lookup ran, so non-card payments are not looked up again.
+    card_resolved = models.BooleanField(default=False)
+    synced_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
-        indexes = [models.Index(fields=['organization', 'stripe_invoice_id'])]
+        indexes = [
+            models.Index(fields=['organization', 'stripe_invoice_id']),
+            models.Index(fields=['organization', 'stripe_subscription_id', 'invoice_created_at'], name='billing_inv_org_sub_cr_idx'),
+        ]
 
     def __str__(self):
         if self.stripe_invoice_id:
@@ -102,6 +122,9 @@ class Subscription(models.Model):
     # downgrades at period end" policy.
     scheduled_plan = models.ForeignKey(Plan, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     scheduled_change_at = models.DateTimeField(null=True, blank=True)
+    # Set when Stripe permanently rejected the scheduled change; the change is
+    # no longer retried by `apply_scheduled_changes` until it is rescheduled.
+    scheduled_change_error = models.TextField(blank=True, default='')
     # Added fields referenced by webhook logic
     active = models.BooleanField(default=True)
     current_period_end = models.DateTimeField(null=True, blank=True)
@@ -300,6 +323,29 @@ class PaymentMethod(models.Model):
         return f"PM {self.stripe_pm_id} @ {self.organization}" 
 
 
+class BillingMirrorState(models.Model):
+    """Per-organization Stripe snapshots backing the billing page.
+
+    Invoices and payment methods are mirrored as rows (`InvoiceMeta`,
+    `PaymentMethod`); the remaining Stripe objects the page needs (the primary
+    and add-on subscriptions, their upcoming invoices and the customer's
+    default card) are kept here as JSON. Webhooks set `stale` and
+    `billing.mirror` refreshes stale snapshots after serving the old ones.
+    """
+    organization = models.OneToOneField(Organization, on_delete=models.CASCADE, related_name='billing_mirror')
+    default_payment_method_id = models.CharField(max_length=255, blank=True, null=True)
+    subscription_data = models.JSONField(default=dict, blank=True)
+    upcoming_invoice = models.JSONField(default=dict, blank=True)
+    addon_subscription_data = models.JSONField(default=dict, blank=True)
+    addon_upcoming_invoice = models.JSONField(default=dict, blank=True)
+    stale = models.BooleanField(default=True)
+    synced_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Billing mirror @ {self.organization}"
+
+
 class SubscriptionChange(models.Model):
     """Represents a scheduled or processed subscription change (upgrade/downgrade).
 
@@ -536,3 +582,45 @@ class AppliedDiscount(models.Model):
         if removed_by:
             self.removed_by = removed_by
         self.save()
+
+
+class StripeWebhookEvent(models.Model):
+    """A verified Stripe webhook event, stored before it is processed.
+
+    `stripe_webhook` only persists the event (unique on Stripe's event id, so
+    redeliveries are dropped) and acknowledges; `billing.webhooks` applies
+    events in Stripe order per customer and retries failures with backoff.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'pending'),
+        (STATUS_RUNNING, 'running'),
+        (STATUS_DONE, 'done'),
+        (STATUS_FAILED, 'failed'),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    # Ordering key: Stripe customer id (or connected account id) the event is about.
+    customer_key = models.CharField(max_length=255, blank=True, default='')
+    stripe_created = models.DateTimeField(null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    received_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='billing_whk_status_next_idx'),
+            models.Index(fields=['customer_key', 'stripe_created', 'id'], name='billing_whk_cust_order_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id} ({self.status})"
@@ -0,0 +1,178 @@
+"""Apply due scheduled plan changes (period-end downgrades) to Stripe.
+
+Due subscriptions are claimed in batches with `SELECT ... FOR UPDATE SKIP
+LOCKED`, so overlapping runs (cron, `run_scheduler` on two instances) never
+pick the same row. The batch's Stripe calls run in a bounded thread pool while
+the rows stay locked; worker threads only see plain values, never the ORM.
+Every call has an HTTP timeout and an idempotency key derived from the
+scheduled change, so a retry cannot apply the same change twice.
+
+Failures are classified: network errors, rate limits, timeouts and 5xx
+responses are retried a few times with backoff and otherwise left due for the
+next run; anything else (e.g. an archived price) is recorded on
+`Subscription.scheduled_change_error` and not retried. Results are written back
+before the locks are released: applied rows are saved one by one, so the
+subscription signals still send the owner's "Billing update" push (after
+commit), and failures with one `bulk_update` per batch.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from billing.models import Subscription, SubscriptionChange
+
+
+logger = logging.getLogger(__name__)
+
+APPLIED = 'applied'
+RETRY = 'retry'
+FAILED = 'failed'
+
+
+@dataclass
+class _Call:
+    subscription_id: int
+    stripe_subscription_id: str
+    price_id: str
+    idempotency_key: str
+    outcome: str = ''
+    stripe_sub: dict | None = None
+    error: str = ''
+
+
+def is_transient_stripe_error(exc: Exception) -> bool:
+    if isinstance(exc, (stripe.APIConnectionError, stripe.RateLimitError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, stripe.StripeError):
+        status = getattr(exc, 'http_status', None)
+        # 409: idempotency key reused while the first request is in flight.
+        return status is None or status >= 500 or status == 409
+    return False
+
+
+def stripe_client(*, timeout: float | None = None):
+    timeout = timeout or float(getattr(settings, 'SCHEDULED_CHANGE_STRIPE_TIMEOUT_SECONDS', 20) or 20)
+    return stripe.StripeClient(
+        settings.STRIPE_SECRET_KEY or '',
+        http_client=stripe.new_default_http_client(timeout=timeout),
+        max_network_retries=0,
+    )
+
+
+def _modify(client, call: _Call, *, retries: int) -> _Call:
+    attempt = 0
+    while True:
+        try:
+            result = client.v1.subscriptions.update(
+                call.stripe_subscription_id,
+                params={'items': [{'price': call.price_id}], 'proration_behavior': 'none'},
+                options={'idempotency_key': call.idempotency_key},
+            )
+            call.outcome, call.stripe_sub = APPLIED, result
+            return call
+        except Exception as exc:
+            transient = is_transient_stripe_error(exc)
+            if transient and attempt < retries:
+                time.sleep(min(0.5 * (2 ** attempt), 5))
+                attempt += 1
+                continue
+            call.outcome = RETRY if transient else FAILED
+            call.error = f'{type(exc).__name__}: {exc}'[:2000]
+            return call
+
+
+def _apply_result(sub: Subscription, stripe_sub) -> None:
+    sub.plan = sub.scheduled_plan
+    sub.status = stripe_sub.get('status', sub.status) or sub.status
+    sub.active = sub.status in ('active', 'trialing')
+    period_end = stripe_sub.get('current_period_end')
+    if period_end:
+        sub.current_period_end = timezone.make_aware(datetime.fromtimestamp(period_end))
+    sub.scheduled_plan = None
+    sub.scheduled_change_at = None
+    sub.scheduled_change_error = ''
+
+
+def apply_due_scheduled_changes(*, batch_size: int = 50, workers: int = 8, client=None, now=None, log=None) -> dict:
+    """Apply every due scheduled change. Returns counts per outcome."""
+    now = now or timezone.now()
+    client = client or stripe_client()
+    retries = max(0, int(getattr(settings, 'SCHEDULED_CHANGE_STRIPE_RETRIES', 2) or 0))
+    log = log or (lambda message: None)
+    counts = {APPLIED: 0, RETRY: 0, FAILED: 0, 'skipped': 0}
+    seen: set[int] = set()
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Subscription.objects.select_for_update(skip_locked=True, of=('self',))
+                .select_related('organization', 'scheduled_plan')
+                .filter(scheduled_plan__isnull=False, scheduled_change_at__lte=now, scheduled_change_error='')
+                .exclude(id__in=seen)
+                .order_by('scheduled_change_at', 'id')[:batch_size]
+            )
+            if not rows:
+                break
+            seen.update(sub.id for sub in rows)
+
+            calls = []
+            for sub in rows:
+                org = sub.organization
+                if not org.stripe_customer_id or not sub.stripe_subscription_id:
+                    log(f'Skipping {org.slug}: missing stripe customer or subscription id')
+                    counts['skipped'] += 1
+                    continue
+                calls.append(_Call(
+                    subscription_id=sub.id,
+                    stripe_subscription_id=sub.stripe_subscription_id,
+                    price_id=sub.scheduled_plan.stripe_price_id,
+                    idempotency_key=(
+                        f'scheduled-change-{sub.id}-{sub.scheduled_plan_id}-{int(sub.scheduled_change_at.timestamp())}'
+                    ),
+                ))
+            if not calls:
+                continue
+
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(calls))), thread_name_prefix='sched-change') as pool:
+                results = list(pool.map(lambda c: _modify(client, c, retries=retries), calls))
+
+            by_id = {sub.id: sub for sub in rows}
+            applied, failed = [], []
+            for call in results:
+                sub = by_id[call.subscription_id]
+                counts[call.outcome] += 1
+                if call.outcome == APPLIED:
+                    target = sub.scheduled_plan
+                    _apply_result(sub, call.stripe_sub)
+                    applied.append(sub)
+                    log(f'Applied scheduled change for {sub.organization.slug} to {target.slug}')
+                else:
+                    if call.outcome == FAILED:
+                        sub.scheduled_change_error = call.error
+                        failed.append(sub)
+                    logger.warning('scheduled change for subscription %s %s: %s', sub.id, call.outcome, call.error)
+                    log(f'Failed to apply scheduled change for {sub.organization.slug} ({call.outcome}): {call.error}')
+
+            if applied:
+                for sub in applied:
+                    sub.save(update_fields=[
+                        'plan', 'status', 'active', 'current_period_end',
+                        'scheduled_plan', 'scheduled_change_at', 'scheduled_change_error',
+                    ])
+                SubscriptionChange.objects.filter(
+                    subscription_id__in=[sub.id for sub in applied], status='scheduled',
+                ).update(status='processed', updated_at=timezone.now())
+            if failed:
+                Subscription.objects.bulk_update(failed, ['scheduled_change_error'])
+
+    return counts
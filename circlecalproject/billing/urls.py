@@ -1,5 +1,8 @@
 from django.urls import path
-from . import views
+from calendar_app.lazy_views import lazy_views
+
+# Imported on first use; see calendar_app.lazy_views.
+views = lazy_views('billing.views')
 
 app_name = 'billing'
 
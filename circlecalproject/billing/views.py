@@ -14,9 +14,19 @@ from accounts.models import Business as Organization
 from billing.models import Plan, Subscription, PaymentMethod
 from calendar_app.utils import user_has_role
 from billing.models import InvoiceMeta, InvoiceActionLog
+from billing.mirror import (
+    get_billing_mirror,
+    mark_billing_mirror_stale,
+    mirrored_invoices,
+    mirrored_payment_methods,
+    mirrored_subscription,
+    upsert_invoice,
+)
+from billing.webhooks import record_stripe_event, schedule_stripe_event_processing
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.utils import timezone as dj_timezone
+from django.db import DatabaseError
 from django.db.models import Q
 import logging
 import traceback
@@ -1019,6 +1029,23 @@ def stripe_webhook(request):
     except Exception:
         return HttpResponse(status=400)
 
+    # Acknowledge first: persist the event (deduplicated on its Stripe id) and
+    # process it after the response, in order per customer (billing.webhooks).
+    record, created = record_stripe_event(event)
+    if created:
+        schedule_stripe_event_processing(record)
+    return HttpResponse(status=200)
+
+
+def handle_stripe_event(event):
+    """Apply one verified Stripe event to local state.
+
+    Called by the webhook queue worker (`billing.webhooks`), inside a
+    transaction; raising marks the event for retry. Optional steps swallow
+    their errors, but never database errors: on Postgres those leave the
+    transaction unusable, so every later write would fail silently and roll
+    back. They propagate instead and the event is retried.
+    """
     event_type = event["type"]
     data = event["data"]["object"]
 
@@ -1038,6 +1065,8 @@ def stripe_webhook(request):
                         "stripe_connect_charges_enabled",
                         "stripe_connect_payouts_enabled",
                     ])
+        except DatabaseError:
+            raise
         except Exception:
             # Webhooks should never crash the endpoint.
             pass
@@ -1062,6 +1091,8 @@ def stripe_webhook(request):
                 )
                 sub.custom_domain_addon_enabled = True
                 sub.save(update_fields=['custom_domain_addon_enabled'])
+            except DatabaseError:
+                raise
             except Exception:
                 pass
 
@@ -1122,6 +1153,8 @@ def stripe_webhook(request):
                     )
                     sub.custom_domain_addon_enabled = True
                     sub.save(update_fields=['custom_domain_addon_enabled'])
+            except DatabaseError:
+                raise
             except Exception:
                 pass
         else:
@@ -1132,12 +1165,16 @@ def stripe_webhook(request):
                     org = Organization.objects.filter(id=org_id).first()
                 if not org and customer_id:
                     org = Organization.objects.filter(stripe_customer_id=customer_id).first()
+            except DatabaseError:
+                raise
             except Exception:
                 org = None
 
             try:
                 if plan_id:
                     plan = Plan.objects.filter(id=plan_id).first()
+            except DatabaseError:
+                raise
             except Exception:
                 plan = None
 
@@ -1152,6 +1189,8 @@ def stripe_webhook(request):
                             price_id = price.get("id")
                     if price_id:
                         plan = Plan.objects.filter(stripe_price_id=price_id).first()
+                except DatabaseError:
+                    raise
                 except Exception:
                     plan = None
 
@@ -1237,7 +1276,9 @@ def stripe_webhook(request):
                     sub.custom_domain_addon_enabled = bool(status in ('active', 'trialing'))
                     sub.save(update_fields=['custom_domain_addon_enabled'])
                 # Do not continue into main-plan subscription status handling.
-                return HttpResponse(status=200)
+                return
+        except DatabaseError:
+            raise
         except Exception:
             pass
 
@@ -1272,6 +1313,8 @@ def stripe_webhook(request):
                             scheduled_account_deletion_at=None,
                             scheduled_account_deletion_reason=None,
                         )
+            except DatabaseError:
+                raise
             except Exception:
                 pass
         except Subscription.DoesNotExist:
@@ -1296,6 +1339,8 @@ def stripe_webhook(request):
                             'exp_year': card.get('exp_year'),
                         }
                     )
+            except DatabaseError:
+                raise
             except Exception:
                 pass
 
@@ -1304,6 +1349,8 @@ def stripe_webhook(request):
         pm_id = pm.get('id')
         try:
             PaymentMethod.objects.filter(stripe_pm_id=pm_id).delete()
+        except DatabaseError:
+            raise
         except Exception:
             pass
 
@@ -1319,6 +1366,8 @@ def stripe_webhook(request):
                 PaymentMethod.objects.filter(organization=org).update(is_default=False)
                 if default_pm:
                     PaymentMethod.objects.filter(stripe_pm_id=default_pm).update(is_default=True)
+        except DatabaseError:
+            raise
         except Exception:
             pass
 
@@ -1338,7 +1387,20 @@ def stripe_webhook(request):
                 stripe_subscription_id=subscription_id
             ).update(active=False, status="past_due")
 
-    return HttpResponse(status=200)
+    # 7) Billing mirror: store invoice rows as they change and flag the org's
+    # subscription/upcoming-invoice snapshots for a refresh on next view.
+    if event_type.startswith(('invoice.', 'customer.subscription.')) or event_type in ('customer.updated', 'payment_method.attached'):
+        try:
+            cust_id = data.get('id') if event_type == 'customer.updated' else data.get('customer')
+            org = Organization.objects.filter(stripe_customer_id=cust_id).first() if cust_id else None
+            if org:
+                if event_type.startswith('invoice.') and event_type != 'invoice.upcoming' and data.get('id'):
+                    upsert_invoice(org, data)
+                mark_billing_mirror_stale(org)
+        except DatabaseError:
+            raise
+        except Exception:
+            pass
 
 
 @require_http_methods(["GET"])
@@ -1560,6 +1622,12 @@ def preview_embedded_initial_invoice(request, org_slug, subscription_id):
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=400)
 
+    # Seed the billing mirror so the new invoice shows up without a refresh.
+    try:
+        upsert_invoice(org, inv, resolve_card=False)
+    except Exception:
+        pass
+
     amount_due_cents = int(inv.get('amount_due') or 0)
     currency = (inv.get('currency') or 'usd')
     period_end_ts = inv.get('period_end') or inv.get('created')
@@ -1898,55 +1966,15 @@ def manage_billing(request, org_slug):
     except Exception:
         pass
 
-    # Best-effort: reconcile local subscription state from Stripe.
-    # This prevents stale UI (e.g., still showing "cancels at period end") after
-    # a user resumes billing/changes plan and a webhook or client-side sync was missed.
-    if subscription and getattr(subscription, 'stripe_subscription_id', None) and org.stripe_customer_id:
+    # Stripe data comes from the local mirror (billing.mirror), which also
+    # reconciles the local subscription row whenever it refreshes. Stale
+    # snapshots are served while a refresh runs after the response.
+    billing_mirror = None
+    if org.stripe_customer_id:
         try:
-            stripe_sub = stripe.Subscription.retrieve(subscription.stripe_subscription_id)
-            stripe_status = stripe_sub.get('status') or getattr(subscription, 'status', 'active')
-            stripe_cancel = bool(stripe_sub.get('cancel_at_period_end', False))
-
-            update_fields = []
-            if getattr(subscription, 'status', None) != stripe_status:
-                subscription.status = stripe_status
-                update_fields.append('status')
-
-            stripe_active = (stripe_status in ('active', 'trialing'))
-            if getattr(subscription, 'active', None) != stripe_active:
-                subscription.active = stripe_active
-                update_fields.append('active')
-
-            if getattr(subscription, 'cancel_at_period_end', None) != stripe_cancel:
-                subscription.cancel_at_period_end = stripe_cancel
-                update_fields.append('cancel_at_period_end')
-
-            # Keep key timestamps in sync for display.
-            try:
-                from datetime import datetime
-                from django.utils import timezone as django_tz
-                cpe = stripe_sub.get('current_period_end')
-                if cpe:
-                    cpe_dt = django_tz.make_aware(datetime.fromtimestamp(int(cpe)))
-                    if getattr(subscription, 'current_period_end', None) != cpe_dt:
-                        subscription.current_period_end = cpe_dt
-                        update_fields.append('current_period_end')
-                te = stripe_sub.get('trial_end')
-                if te:
-                    te_dt = django_tz.make_aware(datetime.fromtimestamp(int(te)))
-                    if getattr(subscription, 'trial_end', None) != te_dt:
-                        subscription.trial_end = te_dt
-                        update_fields.append('trial_end')
-            except Exception:
-                pass
-
-            if update_fields:
-                try:
-                    subscription.save(update_fields=list(dict.fromkeys(update_fields)))
-                except Exception:
-                    subscription.save()
+            billing_mirror = get_billing_mirror(org)
         except Exception:
-            pass
+            billing_mirror = None
 
     # Determine trial countdown regardless of Stripe subscription presence
     if subscription and subscription.status == "trialing" and subscription.trial_end and subscription.trial_end > now:
@@ -1964,152 +1992,23 @@ def manage_billing(request, org_slug):
         show_invoices = False
         show_upcoming_invoice = False
 
-    # Prefer reading cached payment methods from DB to avoid extra Stripe calls
+    # Payment methods come from the PaymentMethod cache kept in sync by the mirror.
     try:
-        cached = list(PaymentMethod.objects.filter(organization=org).order_by('-is_default', '-updated_at'))
-        if cached:
-            payment_methods = []
-            for pm in cached:
-                payment_methods.append({
-                    'id': pm.stripe_pm_id,
-                    'card': {
-                        'last4': pm.last4,
-                        'brand': pm.brand,
-                        'exp_month': pm.exp_month,
-                        'exp_year': pm.exp_year,
-                    }
-                })
-            default = next((p for p in cached if p.is_default), None)
-            default_payment_method_id = default.stripe_pm_id if default else None
-            # Capture the default card last4 for UI convenience when available
-            default_card_last4 = default.last4 if default else None
-        else:
-            # Fallback to Stripe live API
-            if org.stripe_customer_id:
-                try:
-                    pms = stripe.PaymentMethod.list(customer=org.stripe_customer_id, type="card")
-                    payment_methods = pms.get("data", [])
-                    cust = stripe.Customer.retrieve(org.stripe_customer_id)
-                    default_payment_method_id = cust.get("invoice_settings", {}).get("default_payment_method")
-                    # try to resolve default last4 from the retrieved payment methods
-                    default_card_last4 = None
-                    if default_payment_method_id and isinstance(payment_methods, list):
-                        for pm in payment_methods:
-                            pm_id = pm.get('id') if isinstance(pm, dict) else getattr(pm, 'id', None)
-                            if pm_id == default_payment_method_id:
-                                # pm may be a dict-like stripe object
-                                card = pm.get('card') if isinstance(pm, dict) else getattr(pm, 'card', None) or {}
-                                default_card_last4 = (card.get('last4') if isinstance(card, dict) else getattr(card, 'last4', None))
-                                break
-                except Exception:
-                    payment_methods = []
-                    default_card_last4 = None
+        payment_methods, default_payment_method_id, default_card_last4 = mirrored_payment_methods(org)
     except Exception:
-        # If cache lookup fails for any reason, fall back to Stripe
-        try:
-            if org.stripe_customer_id:
-                pms = stripe.PaymentMethod.list(customer=org.stripe_customer_id, type="card")
-                payment_methods = pms.get("data", [])
-                cust = stripe.Customer.retrieve(org.stripe_customer_id)
-                default_payment_method_id = cust.get("invoice_settings", {}).get("default_payment_method")
-                # try to resolve default last4
-                default_card_last4 = None
-                if default_payment_method_id and isinstance(payment_methods, list):
-                    for pm in payment_methods:
-                        pm_id = pm.get('id') if isinstance(pm, dict) else getattr(pm, 'id', None)
-                        if pm_id == default_payment_method_id:
-                            card = pm.get('card') if isinstance(pm, dict) else getattr(pm, 'card', None) or {}
-                            default_card_last4 = (card.get('last4') if isinstance(card, dict) else getattr(card, 'last4', None))
-                            break
-        except Exception:
-            payment_methods = []
-            default_card_last4 = None
+        payment_methods = []
+        default_card_last4 = None
 
     # Respect optional query param to show archived (hidden) invoices
     show_archived = str(request.GET.get('show_archived', '')).lower() in ('1', 'true', 'yes')
 
-    # Only pull invoices if a real Stripe subscription exists
+    # Only list invoices if a real Stripe subscription exists. Rows are scoped
+    # to that subscription so invoices from other subscriptions on the same
+    # customer (e.g. the custom-domain add-on) are not mixed in.
     if subscription and subscription.stripe_subscription_id and org.stripe_customer_id:
         try:
             if show_invoices:
-                # Scope invoice listing to the specific subscription so the UI
-                # shows invoices relevant to this subscription (avoids mixing
-                # invoices from other subscriptions on the same customer).
-                try:
-                    invs = stripe.Invoice.list(subscription=subscription.stripe_subscription_id, limit=10)
-                except Exception:
-                    # Fallback to customer-wide listing if subscription-scoped list fails
-                    invs = stripe.Invoice.list(customer=org.stripe_customer_id, limit=10)
-
-                raw_invoices = invs.get("data", [])
-                invoices = []
-                from datetime import datetime
-                for i in raw_invoices:
-                    # Prefer showing the amount actually paid for paid invoices,
-                    # otherwise fall back to amount_due for open/draft invoices.
-                    amount_display = i.get('amount_paid') if i.get('amount_paid', 0) else i.get('amount_due', 0)
-                    # Convert Stripe unix timestamp to aware datetime for template rendering
-                    created_ts = i.get('created')
-                    created_dt = None
-                    try:
-                        if created_ts:
-                            # Stripe timestamps are UTC seconds. Create a UTC-aware
-                            # datetime then convert to the current Django timezone
-                            from datetime import datetime, timezone as dt_tz
-                            created_utc = datetime.fromtimestamp(int(created_ts), tz=dt_tz.utc)
-                            created_dt = timezone.localtime(created_utc)
-                    except Exception:
-                        created_dt = None
-
-                    invoices.append({
-                        'created': created_dt,
-                        'amount_display_dollars': (amount_display / 100.0),
-                        'status': i.get('status'),
-                        'hosted_invoice_url': i.get('hosted_invoice_url'),
-                        'card_brand': None,
-                        'card_last4': None,
-                        'raw': i,
-                    })
-
-                # Try to enrich invoices with card details where available
-                for idx, entry in enumerate(invoices):
-                    raw = entry.get('raw')
-                    try:
-                        card_brand = None
-                        card_last4 = None
-                        # Prefer payment_intent -> charges
-                        pi = raw.get('payment_intent')
-                        if pi:
-                            try:
-                                pi_obj = stripe.PaymentIntent.retrieve(pi) if isinstance(pi, str) else pi
-                                charges = pi_obj.get('charges', {}).get('data', [])
-                                if charges:
-                                    ch = charges[0]
-                                    pm_card = ch.get('payment_method_details', {}).get('card', {})
-                                    card_brand = pm_card.get('brand')
-                                    card_last4 = pm_card.get('last4')
-                            except Exception:
-                                pass
-
-                        # Fallback: invoice.charge (older API) -> Charge.retrieve
-                        if not card_last4:
-                            charge_id = raw.get('charge')
-                            if charge_id:
-                                try:
-                                    ch = stripe.Charge.retrieve(charge_id)
-                                    pm_card = ch.get('payment_method_details', {}).get('card', {})
-                                    card_brand = pm_card.get('brand')
-                                    card_last4 = pm_card.get('last4')
-                                except Exception:
-                                    pass
-
-                        if card_brand:
-                            invoices[idx]['card_brand'] = card_brand
-                        if card_last4:
-                            invoices[idx]['card_last4'] = card_last4
-                    except Exception:
-                        # never fail invoice listing because of enrichment
-                        continue
+                invoices = mirrored_invoices(org, subscription.stripe_subscription_id)
         except Exception:
             invoices = []
 
@@ -2336,15 +2235,9 @@ def manage_billing(request, org_slug):
     # return a usable upcoming invoice.
     try:
         if subscription and subscription.stripe_subscription_id and org.stripe_customer_id and show_upcoming_invoice:
-            try:
-                ui = stripe_invoice_upcoming(customer=org.stripe_customer_id, subscription=subscription.stripe_subscription_id)
-            except Exception:
-                try:
-                    ui = stripe_invoice_upcoming(customer=org.stripe_customer_id)
-                    if ui and ui.get('subscription') and ui.get('subscription') != subscription.stripe_subscription_id:
-                        ui = None
-                except Exception:
-                    ui = None
+            ui = (billing_mirror.upcoming_invoice if billing_mirror else None) or None
+            if ui and ui.get('subscription') and ui.get('subscription') != subscription.stripe_subscription_id:
+                ui = None
 
             billing_date = None
             amount_due = None
@@ -2445,46 +2338,9 @@ def manage_billing(request, org_slug):
         # Keep add-on history visible even if currently disabled.
         # We still gate cancellation controls separately via show_custom_domain_addon_cancel.
         if org.stripe_customer_id:
-            addon_price_id = (os.getenv('STRIPE_PRICE_ID_CUSTOM_DOMAIN_ADDON') or '').strip()
-
-            try:
-                rows = stripe.Subscription.list(customer=org.stripe_customer_id, status='all', limit=100)
-                data = _stripe_obj_get(rows, 'data', []) or []
-                # Prefer an active/trialing add-on subscription; otherwise fall back to the newest match.
-                candidate = None
-                for row in data:
-                    meta = _stripe_obj_get(row, 'metadata', {}) or {}
-                    purchase_type = (meta.get('purchase_type') or '').strip().lower()
-                    status = (_stripe_obj_get(row, 'status', '') or '').strip().lower()
-
-                    is_addon = purchase_type == 'custom_domain_addon'
-                    if not is_addon and addon_price_id:
-                        try:
-                            items_obj = _stripe_obj_get(row, 'items', {}) or {}
-                            items = _stripe_obj_get(items_obj, 'data', []) or []
-                            for item in items:
-                                price = _stripe_obj_get(item, 'price', {}) or {}
-                                pid = (_stripe_obj_get(price, 'id', '') or '').strip()
-                                if pid and pid == addon_price_id:
-                                    is_addon = True
-                                    break
-                        except Exception:
-                            pass
-
-                    if not is_addon:
-                        continue
-
-                    # Keep first match as fallback; prefer active/trialing.
-                    if candidate is None:
-                        candidate = row
-                    if status in {'active', 'trialing'}:
-                        addon_stripe_sub = row
-                        break
-
-                if addon_stripe_sub is None:
-                    addon_stripe_sub = candidate
-            except Exception:
-                addon_stripe_sub = None
+            # The mirror picks the active/trialing add-on subscription (or the
+            # newest match) and stores it with discounts expanded.
+            addon_stripe_sub = (billing_mirror.addon_subscription_data if billing_mirror else None) or None
 
             addon_sid = (_stripe_obj_get(addon_stripe_sub, 'id', '') or '').strip() if addon_stripe_sub else None
 
@@ -2609,10 +2465,7 @@ def manage_billing(request, org_slug):
             try:
                 billing_date = None
                 if addon_sid:
-                    try:
-                        ui = stripe_invoice_upcoming(customer=org.stripe_customer_id, subscription=addon_sid)
-                    except Exception:
-                        ui = None
+                    ui = (billing_mirror.addon_upcoming_invoice if billing_mirror else None) or None
                     if ui:
                         billing_timestamp = ui.get('period_end') or ui.get('created')
                         if billing_timestamp:
@@ -2638,67 +2491,9 @@ def manage_billing(request, org_slug):
             # Invoices for the add-on subscription.
             try:
                 if addon_sid:
-                    invs = stripe.Invoice.list(subscription=addon_sid, limit=10)
-                    raw_invoices = invs.get('data', [])
-                    from datetime import datetime, timezone as dt_tz
-                    for i in raw_invoices:
-                        amount_display = i.get('amount_paid') if i.get('amount_paid', 0) else i.get('amount_due', 0)
-                        created_ts = i.get('created')
-                        created_dt = None
-                        try:
-                            if created_ts:
-                                created_utc = datetime.fromtimestamp(int(created_ts), tz=dt_tz.utc)
-                                created_dt = timezone.localtime(created_utc)
-                        except Exception:
-                            created_dt = None
-                        custom_domain_addon_invoices.append({
-                            'created': created_dt,
-                            'amount_display_dollars': (amount_display / 100.0),
-                            'status': i.get('status'),
-                            'hosted_invoice_url': i.get('hosted_invoice_url'),
-                            'card_brand': None,
-                            'card_last4': None,
-                            'raw': i,
-                            'hidden': False,
-                        })
-
-                    # Enrich add-on invoices with card details where available.
-                    for idx, entry in enumerate(custom_domain_addon_invoices):
-                        raw = entry.get('raw')
-                        try:
-                            card_brand = None
-                            card_last4 = None
-
-                            pi = raw.get('payment_intent') if isinstance(raw, dict) else None
-                            if pi:
-                                try:
-                                    pi_obj = stripe.PaymentIntent.retrieve(pi) if isinstance(pi, str) else pi
-                                    charges = pi_obj.get('charges', {}).get('data', [])
-                                    if charges:
-                                        ch = charges[0]
-                                        pm_card = ch.get('payment_method_details', {}).get('card', {})
-                                        card_brand = pm_card.get('brand')
-                                        card_last4 = pm_card.get('last4')
-                                except Exception:
-                                    pass
-
-                            if not card_last4:
-                                charge_id = raw.get('charge') if isinstance(raw, dict) else None
-                                if charge_id:
-                                    try:
-                                        ch = stripe.Charge.retrieve(charge_id)
-                                        pm_card = ch.get('payment_method_details', {}).get('card', {})
-                                        card_brand = pm_card.get('brand')
-                                        card_last4 = pm_card.get('last4')
-                                    except Exception:
-                                        pass
-
-                            if card_brand:
-                                custom_domain_addon_invoices[idx]['card_brand'] = card_brand
-                            if card_last4:
-                                custom_domain_addon_invoices[idx]['card_last4'] = card_last4
-                        except Exception:
-                            continue
+                    custom_domain_addon_invoices = [
+                        dict(inv, hidden=False) for inv in mirrored_invoices(org, addon_sid)
+                    ]
 
                     # Annotate hidden flag from local invoice metadata so
                     # View/Hide/Void/Unhide behavior matches the primary table.
@@ -3105,25 +2900,18 @@ def list_payment_methods(request, org_slug):
         return JsonResponse({"data": [], "default_payment_method_id": None})
 
     try:
-        default_pm_id = None
-        try:
-            cust = stripe.Customer.retrieve(org.stripe_customer_id)
-            default_pm_id = (cust.get('invoice_settings') or {}).get('default_payment_method')
-        except Exception:
-            default_pm_id = None
-
-        pms = stripe.PaymentMethod.list(customer=org.stripe_customer_id, type="card")
+        get_billing_mirror(org)
+        payment_methods, default_pm_id, _last4 = mirrored_payment_methods(org)
         data = []
-        for pm in pms.get('data', []):
-            card = pm.card if hasattr(pm, 'card') else pm.get('card', {})
-            pm_id = pm.id
+        for pm in payment_methods:
+            card = pm.get('card') or {}
             data.append({
-                'id': pm_id,
-                'brand': (card.brand if card else pm.get('card', {}).get('brand')),
-                'last4': (card.last4 if card else pm.get('card', {}).get('last4')),
-                'exp_month': (card.exp_month if card else pm.get('card', {}).get('exp_month')),
-                'exp_year': (card.exp_year if card else pm.get('card', {}).get('exp_year')),
-                'is_default': bool(default_pm_id and str(pm_id) == str(default_pm_id)),
+                'id': pm['id'],
+                'brand': card.get('brand'),
+                'last4': card.get('last4'),
+                'exp_month': card.get('exp_month'),
+                'exp_year': card.get('exp_year'),
+                'is_default': bool(default_pm_id and str(pm['id']) == str(default_pm_id)),
             })
         return JsonResponse({"data": data, "default_payment_method_id": default_pm_id})
     except Exception:
@@ -3545,7 +3333,7 @@ def preview_plan_change(request, org_slug, plan_id):
         if sub and sub.stripe_subscription_id and org.stripe_customer_id:
             # Retrieve the Stripe subscription to get the subscription item id
             try:
-                stripe_sub = stripe.Subscription.retrieve(sub.stripe_subscription_id)
+                stripe_sub = mirrored_subscription(org, sub.stripe_subscription_id) or stripe.Subscription.retrieve(sub.stripe_subscription_id)
                 # Choose the first subscription item to replace
                 items = stripe_sub.get('items', {}).get('data', [])
                 if items:
@@ -3897,6 +3685,7 @@ def change_subscription_plan(request, org_slug, plan_id):
     if is_upgrade is False:
         sub.scheduled_plan = new_plan
         sub.scheduled_change_at = sub.current_period_end or None
+        sub.scheduled_change_error = ''
         sub.save()
         # Record a local SubscriptionChange so the user can see the scheduled change
         try:
@@ -0,0 +1,210 @@
+"""Queue for Stripe webhook events.
+
+`stripe_webhook` verifies the signature, stores the event as a
+`StripeWebhookEvent` (unique on Stripe's event id, so redeliveries are no-ops)
+and returns 200 straight away. Processing happens after the response:
+
+- Events are applied in Stripe `created` order per customer. An event waits
+  while an earlier event for the same customer is still pending or running,
+  so a retrying `customer.subscription.updated` cannot be overtaken by the
+  `deleted` that followed it.
+- Each event runs in its own transaction. Failures roll back and are retried
+  with exponential backoff up to `STRIPE_WEBHOOK_MAX_ATTEMPTS`, after which the
+  event is marked failed and stops blocking its customer.
+
+By default a daemon thread drains the customer's queue after commit (same
+pattern as audit exports); `manage.py process_stripe_events` picks up anything
+left behind, e.g. retries or events received while the thread was disabled.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from billing.models import StripeWebhookEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(event) -> dict:
+    to_dict = getattr(event, 'to_dict_recursive', None) or getattr(event, 'to_dict', None)
+    if callable(to_dict):
+        try:
+            return to_dict()
+        except Exception:
+            pass
+    return dict(event)
+
+
+def _customer_key(event: dict) -> str:
+    obj = ((event.get('data') or {}).get('object')) or {}
+    if obj.get('object') == 'customer':
+        return str(obj.get('id') or '')
+    if obj.get('customer'):
+        cust = obj.get('customer')
+        return str(cust if isinstance(cust, str) else (cust or {}).get('id') or '')
+    if obj.get('object') == 'account' and obj.get('id'):
+        return str(obj.get('id'))
+    return str(event.get('account') or '')
+
+
+def max_attempts() -> int:
+    return max(1, int(getattr(settings, 'STRIPE_WEBHOOK_MAX_ATTEMPTS', 8) or 1))
+
+
+def record_stripe_event(event):
+    """Persist a verified event. Returns (record, created); duplicates return created=False."""
+    data = _plain(event)
+    event_id = str(data.get('id') or '') or f'local_{uuid.uuid4().hex}'
+    created_ts = data.get('created')
+    try:
+        stripe_created = datetime.fromtimestamp(int(created_ts), tz=dt_timezone.utc) if created_ts else None
+    except Exception:
+        stripe_created = None
+
+    existing = StripeWebhookEvent.objects.filter(event_id=event_id).first()
+    if existing is not None:
+        return existing, False
+    try:
+        with transaction.atomic():
+            record = StripeWebhookEvent.objects.create(
+                event_id=event_id,
+                event_type=str(data.get('type') or ''),
+                customer_key=_customer_key(data),
+                stripe_created=stripe_created or timezone.now(),
+                payload=data,
+            )
+    except IntegrityError:
+        # Concurrent redelivery of the same event.
+        return StripeWebhookEvent.objects.get(event_id=event_id), False
+    return record, True
+
+
+def schedule_stripe_event_processing(record) -> None:
+    customer_key = record.customer_key
+    if getattr(settings, 'STRIPE_WEBHOOK_BACKGROUND_THREAD', True):
+        transaction.on_commit(lambda: _start_queue_thread(customer_key))
+    else:
+        process_customer_queue(customer_key)
+
+
+def _start_queue_thread(customer_key):
+    def _work():
+        close_old_connections()
+        try:
+            process_customer_queue(customer_key)
+        except Exception:
+            logger.exception('stripe webhook queue failed for %s', customer_key or '(no customer)')
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=_work, name='stripe-webhooks', daemon=True).start()
+
+
+def _blocked(record) -> bool:
+    """True when an earlier event for the same customer has not finished yet."""
+    if not record.customer_key:
+        return False
+    earlier = Q(stripe_created__lt=record.stripe_created) | Q(stripe_created=record.stripe_created, id__lt=record.id)
+    return StripeWebhookEvent.objects.filter(
+        earlier,
+        customer_key=record.customer_key,
+        status__in=[StripeWebhookEvent.STATUS_PENDING, StripeWebhookEvent.STATUS_RUNNING],
+    ).exists()
+
+
+def process_stripe_event(record_id) -> bool:
+    """Claim and apply one due event. Returns True if it was applied successfully."""
+    from billing.views import handle_stripe_event
+
+    now = timezone.now()
+    record = StripeWebhookEvent.objects.filter(id=record_id).first()
+    if record is None or record.status != StripeWebhookEvent.STATUS_PENDING or record.next_attempt_at > now:
+        return False
+    if _blocked(record):
+        return False
+    claimed = StripeWebhookEvent.objects.filter(
+        id=record_id, status=StripeWebhookEvent.STATUS_PENDING,
+    ).update(status=StripeWebhookEvent.STATUS_RUNNING, started_at=now, attempts=record.attempts + 1)
+    if not claimed:
+        return False
+
+    try:
+        with transaction.atomic():
+            handle_stripe_event(record.payload)
+    except Exception as exc:
+        attempts = record.attempts + 1
+        logger.exception('stripe webhook %s (%s) failed, attempt %s', record.event_id, record.event_type, attempts)
+        if attempts >= max_attempts():
+            status, next_at = StripeWebhookEvent.STATUS_FAILED, timezone.now()
+        else:
+            status = StripeWebhookEvent.STATUS_PENDING
+            next_at = timezone.now() + timedelta(minutes=min(2 ** (attempts - 1), 60))
+        StripeWebhookEvent.objects.filter(id=record_id).update(
+            status=status, next_attempt_at=next_at, last_error=str(exc)[:2000],
+        )
+        return False
+
+    StripeWebhookEvent.objects.filter(id=record_id).update(
+        status=StripeWebhookEvent.STATUS_DONE, processed_at=timezone.now(), last_error='',
+    )
+    return True
+
+
+def process_customer_queue(customer_key, *, limit: int = 100) -> int:
+    """Apply due events for one customer in order, stopping at the first one that cannot run."""
+    processed = 0
+    while processed < limit:
+        record = (
+            StripeWebhookEvent.objects.filter(customer_key=customer_key, status=StripeWebhookEvent.STATUS_PENDING)
+            .order_by('stripe_created', 'id')
+            .first()
+        )
+        if record is None or not process_stripe_event(record.id):
+            break
+        processed += 1
+    return processed
+
+
+def process_pending_stripe_events(*, limit: int = 500) -> int:
+    """Drain due events across all customers. Returns the number applied."""
+    keys = (
+        StripeWebhookEvent.objects.filter(
+            status=StripeWebhookEvent.STATUS_PENDING,
+            next_attempt_at__lte=timezone.now(),
+        )
+        .order_by('customer_key')
+        .values_list('customer_key', flat=True)
+        .distinct()
+    )
+    processed = 0
+    for key in list(keys):
+        if processed >= limit:
+            break
+        processed += process_customer_queue(key, limit=limit - processed)
+    return processed
+
+
+def requeue_stuck_stripe_events(*, older_than_minutes: int = 15) -> int:
+    """Return events left running by a crashed worker to the queue."""
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    return StripeWebhookEvent.objects.filter(
+        status=StripeWebhookEvent.STATUS_RUNNING, started_at__lt=cutoff,
+    ).update(status=StripeWebhookEvent.STATUS_PENDING, next_attempt_at=timezone.now())
+
+
+def purge_processed_stripe_events(*, max_age_days: int = 30) -> int:
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    deleted, _ = StripeWebhookEvent.objects.filter(
+        status=StripeWebhookEvent.STATUS_DONE, processed_at__lt=cutoff,
+    ).delete()
+    return deleted
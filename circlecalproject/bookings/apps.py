@@ -7,3 +7,7 @@ class BookingsConfig(AppConfig):
 
     def ready(self):
         import bookings.signals  # noqa
+
+        # Invalidate cached calendar feeds on booking changes.
+        from .ics_feeds import connect_signals
+        connect_signals()
@@ -0,0 +1,209 @@
+"""Cold-history archival for bookings and booking audit entries.
+
+`Booking` and `AuditBooking` only need the recent past and the future for
+the hot paths (overlap checks, availability, the calendar feed). Rows older
+than `BOOKING_ARCHIVE_MONTHS` are moved in id-ordered batches into
+`ArchivedBooking` / `ArchivedAuditBooking` by the `archive_old_bookings`
+command, so the hot tables and their indexes stop growing with tenant age.
+
+Archived rows keep their original primary keys. History views read both
+tables through `merged_keyset_page` (bookings, ordered by start) and
+`ArchiveChain` (audit entries, newest first).
+
+Rows are removed from the hot tables with a raw delete: the Booking
+post_delete signal would otherwise send cancellation emails and write audit
+entries for what is only a storage move.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.search import decode_cursor, encode_cursor, keyset_page
+
+
+logger = logging.getLogger(__name__)
+
+
+def booking_archive_months() -> int:
+    try:
+        return max(1, int(getattr(settings, 'BOOKING_ARCHIVE_MONTHS', 18) or 18))
+    except Exception:
+        return 18
+
+
+def archive_cutoff(months: int | None = None, *, now: datetime | None = None) -> datetime:
+    """First instant of the month `months` months before `now`.
+
+    Bookings that ended, and audit entries created, before this instant are
+    archived. Aligning to month starts keeps each run moving whole months.
+    """
+    months = booking_archive_months() if months is None else max(1, int(months))
+    now = now or timezone.now()
+    y, m = divmod(now.year * 12 + (now.month - 1) - months, 12)
+    return now.replace(year=y, month=m + 1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class ArchiveResult:
+    cutoff: datetime
+    bookings: int = 0
+    audits: int = 0
+    dry_run: bool = False
+
+
+def _move_rows(source_qs, archive_model, *, batch_size: int, archived_at: datetime) -> int:
+    """Copy `source_qs` rows into `archive_model` and raw-delete the originals."""
+    source_model = source_qs.model
+    names = [f.attname for f in source_model._meta.concrete_fields]
+    moved = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(source_qs.filter(id__gt=last_id).order_by('id')[:batch_size])
+            if not rows:
+                break
+            archive_model.objects.bulk_create(
+                [archive_model(archived_at=archived_at, **{n: getattr(r, n) for n in names}) for r in rows],
+                ignore_conflicts=True,
+            )
+            doomed = source_model.objects.filter(id__in=[r.id for r in rows])
+            doomed._raw_delete(doomed.db)
+        moved += len(rows)
+        last_id = rows[-1].id
+    return moved
+
+
+def archive_old_bookings(
+    *,
+    months: int | None = None,
+    organization=None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    now: datetime | None = None,
+) -> ArchiveResult:
+    """Move bookings and audit entries older than the cutoff to the archive."""
+    from bookings.models import ArchivedAuditBooking, ArchivedBooking, AuditBooking, Booking
+
+    cutoff = archive_cutoff(months, now=now)
+    bookings_qs = Booking.objects.filter(end__lt=cutoff)
+    audits_qs = AuditBooking.objects.filter(created_at__lt=cutoff)
+    if organization is not None:
+        bookings_qs = bookings_qs.filter(organization=organization)
+        audits_qs = audits_qs.filter(organization=organization)
+
+    if dry_run:
+        return ArchiveResult(cutoff=cutoff, bookings=bookings_qs.count(), audits=audits_qs.count(), dry_run=True)
+
+    batch_size = max(1, int(batch_size or 1000))
+    archived_at = timezone.now()
+    result = ArchiveResult(cutoff=cutoff)
+    result.bookings = _move_rows(bookings_qs, ArchivedBooking, batch_size=batch_size, archived_at=archived_at)
+    result.audits = _move_rows(audits_qs, ArchivedAuditBooking, batch_size=batch_size, archived_at=archived_at)
+    if result.bookings or result.audits:
+        logger.info(
+            'Archived %s bookings and %s audit entries older than %s',
+            result.bookings, result.audits, cutoff.isoformat(),
+        )
+    return result
+
+
+def merged_keyset_page(querysets, *, cursor=None, limit=200, descending=False):
+    """`keyset_page` across several booking querysets (hot + archive).
+
+    Each source is paged with the same cursor and the results are merged on
+    (start, id), so the cursor format is the one `keyset_page` uses.
+    """
+    if cursor:
+        decode_cursor(cursor)  # raise InvalidCursor before touching the DB
+
+    pages = []
+    more = False
+    for qs in querysets:
+        rows, next_cursor = keyset_page(qs, cursor=cursor, limit=limit, descending=descending)
+        pages.append(rows)
+        more = more or next_cursor is not None
+
+    merged = list(heapq.merge(*pages, key=lambda b: (b.start, b.id), reverse=descending))
+    next_cursor = None
+    if more or len(merged) > limit:
+        merged = merged[:limit]
+        if merged:
+            next_cursor = encode_cursor(merged[-1].start, merged[-1].id)
+    return merged, next_cursor
+
+
+class ArchiveChain:
+    """Read-only view over a hot queryset followed by its archive queryset.
+
+    Audit entries are archived by `created_at`, so every archived entry is
+    older than every hot one and a newest-first listing is simply the hot
+    rows followed by the archived rows. Supports the queryset operations the
+    audit views and exports use: `count`, slicing, iteration and `iterator`.
+    """
+
+    def __init__(self, *querysets):
+        self.querysets = querysets
+
+    def filter(self, *args, **kwargs):
+        return ArchiveChain(*(qs.filter(*args, **kwargs) for qs in self.querysets))
+
+    def none(self):
+        return ArchiveChain(*(qs.none() for qs in self.querysets))
+
+    def count(self) -> int:
+        return sum(qs.count() for qs in self.querysets)
+
+    def exists(self) -> bool:
+        return any(qs.exists() for qs in self.querysets)
+
+    def iterator(self, chunk_size=None):
+        return itertools.chain.from_iterable(qs.iterator(chunk_size=chunk_size) for qs in self.querysets)
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.querysets)
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None:
+            raise TypeError('ArchiveChain only supports simple slices.')
+        start = max(0, item.start or 0)
+        stop = item.stop
+        rows = []
+        for qs in self.querysets:
+            if stop is not None and stop <= 0:
+                break
+            size = qs.count()
+            if start < size:
+                rows.extend(qs[start:size if stop is None else min(stop, size)])
+            start = max(0, start - size)
+            if stop is not None:
+                stop -= size
+        return rows
+
+
+def booking_history(organization):
+    """(hot, archived) Booking querysets for an organization's history views."""
+    from bookings.models import ArchivedBooking, Booking
+
+    return (
+        Booking.objects.filter(organization=organization),
+        ArchivedBooking.objects.filter(organization=organization),
+    )
+
+
+def audit_history(organization) -> ArchiveChain:
+    """Newest-first audit entries for an organization, hot then archived."""
+    from bookings.models import ArchivedAuditBooking, AuditBooking
+
+    return ArchiveChain(*(
+        model.objects.filter(organization=organization).select_related('service').order_by('-created_at', '-id')
+        for model in (AuditBooking, ArchivedAuditBooking)
+    ))
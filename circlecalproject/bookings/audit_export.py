@@ -0,0 +1,456 @@
+"""Booking audit exports (streaming CSV/NDJSON + background PDF jobs).
+
+Rows are produced by iterating `AuditBooking` (then its archive) with
+`.iterator()` and a
+per-org service map loaded once up front, so memory stays flat regardless
+of how many entries are exported. Small PDF selections are still rendered
+inline; larger ones become an `AuditExportJob` processed off the request
+path (see `run_audit_export_job` and the `run_audit_export_jobs` command),
+which streams the rows into the PDF writer instead of collecting them.
+Jobs left running by a recycled worker are requeued by the command.
+"""
+
+import csv
+import io
+import json
+import logging
+import threading
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+ITERATOR_CHUNK_SIZE = 500
+
+CSV_COLUMNS = [
+    'id',
+    'booking_id',
+    'booking_ref',
+    'event_type',
+    'display_event',
+    'service',
+    'service_price',
+    'business',
+    'start',
+    'end',
+    'client_name',
+    'client_email',
+    'non_refunded',
+    'created_at',
+]
+
+
+def audit_sync_pdf_max() -> int:
+    """Largest selection rendered as a PDF inside the request."""
+    try:
+        return int(getattr(settings, 'AUDIT_EXPORT_SYNC_PDF_MAX', 250) or 250)
+    except Exception:
+        return 250
+
+
+def _org_tz(org):
+    try:
+        return ZoneInfo(getattr(org, 'timezone', None) or 'UTC')
+    except Exception:
+        return ZoneInfo('UTC')
+
+
+def _fmt_local(dt, org_tz):
+    if not dt:
+        return None
+    try:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=ZoneInfo('UTC'))
+        return dt.astimezone(org_tz).strftime('%b %d, %Y %I:%M %p')
+    except Exception:
+        try:
+            return dt.isoformat()
+        except Exception:
+            return str(dt)
+
+
+def audit_export_queryset(org, *, ids=None, start_from=None, start_to=None):
+    """Org-scoped audit entries (hot and archived) for an export selection.
+
+    `ids` selects explicit entries; otherwise the optional [start_from,
+    start_to) range on the appointment start is used. Returns an
+    `ArchiveChain`, which supports `count()` and `iterator()`.
+    """
+    from bookings.archive import audit_history
+
+    qs = audit_history(org)
+    if ids is not None:
+        qs = qs.filter(id__in=list(ids))
+    if start_from is not None:
+        qs = qs.filter(start__gte=start_from)
+    if start_to is not None:
+        qs = qs.filter(start__lt=start_to)
+    return qs
+
+
+def _non_refunded(a, service) -> bool:
+    """True when a cancellation fell inside the service's no-refund window."""
+    from bookings.models import AuditBooking
+
+    try:
+        if a.event_type == AuditBooking.EVENT_CANCELLED and service and a.start and a.created_at:
+            hrs = (a.start - a.created_at).total_seconds() / 3600.0
+            if getattr(service, 'refunds_allowed', False):
+                cutoff = float(getattr(service, 'refund_cutoff_hours', 0) or 0)
+                refundable = hrs >= cutoff
+            else:
+                refundable = False
+            return not refundable
+    except Exception:
+        pass
+    return False
+
+
+def iter_audit_export_rows(org, qs, *, include_snapshot=True):
+    """Yield export dicts for `qs` without materializing the queryset."""
+    from bookings.models import AuditBooking, Service
+
+    org_tz = _org_tz(org)
+    now = timezone.now()
+    services = {
+        s.id: s
+        for s in Service.objects.filter(organization=org).only(
+            'id', 'name', 'price', 'refunds_allowed', 'refund_cutoff_hours'
+        )
+    }
+
+    for a in qs.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        svc = services.get(a.service_id) if a.service_id else None
+        snap = a.booking_snapshot if isinstance(a.booking_snapshot, dict) else {}
+        booking_ref = snap.get('public_ref') or a.booking_id
+
+        display_event = a.event_type or ''
+        try:
+            if a.event_type == AuditBooking.EVENT_DELETED and a.start and a.start < now:
+                display_event = 'successful'
+        except Exception:
+            pass
+
+        row = {
+            'id': a.id,
+            'booking_id': a.booking_id,
+            'booking_ref': booking_ref,
+            'event_type': a.event_type,
+            'display_event': display_event,
+            'service': svc.name if svc else None,
+            'service_price': float(svc.price) if (svc and getattr(svc, 'price', None) is not None) else None,
+            'business': org.name,
+            'start': a.start.isoformat() if a.start else None,
+            'start_display': _fmt_local(a.start, org_tz),
+            'end': a.end.isoformat() if a.end else None,
+            'end_display': _fmt_local(a.end, org_tz),
+            'client_name': a.client_name,
+            'client_email': a.client_email,
+            'non_refunded': _non_refunded(a, svc),
+            'created_at': a.created_at.isoformat() if a.created_at else None,
+        }
+        if include_snapshot:
+            row['snapshot'] = a.booking_snapshot
+        yield row
+
+
+class AuditExportSummary:
+    """Running earnings summary (successful + non-refunded cancellations)."""
+
+    def __init__(self):
+        self.count = 0
+        self.successful_count = 0
+        self.cancelled_count = 0
+        self.deleted_count = 0
+        self.total_gross = 0.0
+        self.potential_gross = 0.0
+        self.per_service = {}
+
+    def add(self, it):
+        from bookings.models import AuditBooking
+
+        self.count += 1
+        ev = (it.get('display_event') or it.get('event_type') or '').lower()
+        raw = (it.get('event_type') or '').lower()
+        is_successful = ev == 'successful'
+        if is_successful:
+            self.successful_count += 1
+        elif raw == AuditBooking.EVENT_CANCELLED:
+            self.cancelled_count += 1
+        else:
+            self.deleted_count += 1
+
+        try:
+            p = float(it.get('service_price')) if it.get('service_price') is not None else 0.0
+        except Exception:
+            p = 0.0
+        self.potential_gross += p
+
+        contributes = is_successful or (raw == AuditBooking.EVENT_CANCELLED and bool(it.get('non_refunded')))
+        if contributes:
+            self.total_gross += p
+            svc = it.get('service') or 'Unspecified'
+            entry = self.per_service.setdefault(svc, {'count': 0, 'subtotal': 0.0})
+            entry['count'] += 1
+            entry['subtotal'] += p
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'successful_count': self.successful_count,
+            'cancelled_count': self.cancelled_count,
+            'deleted_count': self.deleted_count,
+            'total_gross': round(self.total_gross, 2),
+            'potential_gross': round(self.potential_gross, 2),
+            'per_service': {
+                k: {'count': v['count'], 'subtotal': round(v['subtotal'], 2)}
+                for k, v in self.per_service.items()
+            },
+        }
+
+
+def summarize_audit_rows(rows) -> dict:
+    summary = AuditExportSummary()
+    for it in rows:
+        summary.add(it)
+    return summary.as_dict()
+
+
+class _Echo:
+    """File-like object whose write() returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_audit_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for it in rows:
+        yield writer.writerow(['' if it.get(col) is None else it.get(col) for col in CSV_COLUMNS])
+
+
+def stream_audit_ndjson(rows):
+    for it in rows:
+        yield json.dumps(it, default=str) + '\n'
+
+
+def render_audit_pdf(org, items, *, summary=None, include_business=True, count=None) -> bytes:
+    """Render audit export rows into a PDF (requires reportlab).
+
+    `items` may be any iterable; it is consumed once, row by row. Pass
+    `count` when it has no len() and no summary is drawn.
+    """
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+
+    from bookings.models import AuditBooking
+
+    packet = io.BytesIO()
+    c = canvas.Canvas(packet, pagesize=letter)
+    width, height = letter
+    y = height - 40
+    line_h = 14
+
+    c.setFont('Helvetica-Bold', 14)
+    c.drawCentredString(width / 2.0, y, f'Audit export for {org.name}')
+    y -= line_h * 2
+
+    if summary is not None:
+        c.setFont('Helvetica-Bold', 12)
+        c.drawString(
+            40,
+            y,
+            f"Selected: {summary.get('count', 0)}  "
+            f"Successful: {summary.get('successful_count', 0)}  "
+            f"Cancelled: {summary.get('cancelled_count', 0)}  "
+            f"Deleted: {summary.get('deleted_count', 0)}",
+        )
+        y -= line_h * 1.2
+        c.setFont('Helvetica', 11)
+        c.drawString(40, y, f"Total Earned (successful + non-refunded cancellations): ${summary.get('total_gross', 0.0):.2f}")
+        y -= line_h * 1.2
+        c.drawString(40, y, f"Potential Total (all appointments): ${summary.get('potential_gross', 0.0):.2f}")
+        y -= line_h * 1.2
+        if summary.get('per_service'):
+            c.setFont('Helvetica', 10)
+            for svc_name, data in summary.get('per_service').items():
+                if y < 60:
+                    c.showPage()
+                    c.setFont('Helvetica', 11)
+                    y = height - 40
+                c.drawString(40, y, f"{svc_name}: {data.get('count', 0)} — ${data.get('subtotal', 0.0):.2f}")
+                y -= line_h
+        y -= line_h * 0.5
+    else:
+        c.setFont('Helvetica', 11)
+        c.drawString(40, y, f'Selected entries: {len(items) if count is None else count}')
+        y -= line_h * 1.5
+
+    c.setFont('Helvetica', 11)
+    for item in items:
+        if y < 60:
+            c.showPage()
+            c.setFont('Helvetica', 11)
+            y = height - 40
+        ev = item.get('display_event') or item.get('event_type') or ''
+        bid = item.get('booking_ref') or item.get('booking_id') or '-'
+        c.drawString(40, y, f"Event: {str(ev).capitalize()}  ID: {bid}")
+        y -= line_h
+        c.drawString(60, y, f"Service: {item.get('service') or '-'}")
+        y -= line_h
+        if include_business:
+            c.drawString(60, y, f"Business: {item.get('business') or org.name}")
+            y -= line_h
+        c.drawString(60, y, f"Client: {item.get('client_name') or '-'} <{item.get('client_email') or '-'}>")
+        y -= line_h
+        price = item.get('service_price')
+        if price is not None:
+            try:
+                c.drawString(60, y, f"Charge: ${float(price):.2f}")
+            except Exception:
+                c.drawString(60, y, f"Charge: {price}")
+            y -= line_h
+        if (item.get('event_type') or '').lower() == AuditBooking.EVENT_CANCELLED and item.get('non_refunded'):
+            c.drawString(60, y, 'Note: Cancellation charge retained (no refund)')
+            y -= line_h
+        start_disp = item.get('start_display') or item.get('start') or '-'
+        end_disp = item.get('end_display') or item.get('end') or None
+        if end_disp:
+            c.drawString(60, y, f"Start: {start_disp}  —  End: {end_disp}")
+        else:
+            c.drawString(60, y, f"Start: {start_disp}")
+        y -= line_h * 2.5 if include_business else line_h * 2
+
+    c.save()
+    return packet.getvalue()
+
+
+# --- Background PDF jobs ---
+
+
+def create_audit_export_job(org, *, user=None, ids=None, start_from=None, start_to=None, include_summary=True):
+    """Persist a pending PDF export job and schedule it after commit."""
+    from bookings.models import AuditExportJob
+
+    job = AuditExportJob.objects.create(
+        organization=org,
+        created_by=user if getattr(user, 'is_authenticated', False) else None,
+        params={
+            'ids': list(ids) if ids is not None else None,
+            'start_from': start_from.isoformat() if start_from else None,
+            'start_to': start_to.isoformat() if start_to else None,
+            'include_summary': bool(include_summary),
+        },
+    )
+    if getattr(settings, 'AUDIT_EXPORT_BACKGROUND_THREAD', True):
+        transaction.on_commit(lambda: _start_job_thread(job.id))
+    return job
+
+
+def _start_job_thread(job_id):
+    def _work():
+        close_old_connections()
+        try:
+            run_audit_export_job(job_id)
+        finally:
+            close_old_connections()
+
+    threading.Thread(target=_work, name=f'audit-export-{job_id}', daemon=True).start()
+
+
+def run_audit_export_job(job_id) -> bool:
+    """Claim and run one pending job. Returns True if this call processed it."""
+    from django.utils.dateparse import parse_datetime
+
+    from bookings.models import AuditExportJob
+
+    claimed = AuditExportJob.objects.filter(id=job_id, status=AuditExportJob.STATUS_PENDING).update(
+        status=AuditExportJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+    )
+    if not claimed:
+        return False
+
+    job = AuditExportJob.objects.select_related('organization').get(id=job_id)
+    org = job.organization
+    params = job.params or {}
+    try:
+        qs = audit_export_queryset(
+            org,
+            ids=params.get('ids'),
+            start_from=parse_datetime(params['start_from']) if params.get('start_from') else None,
+            start_to=parse_datetime(params['start_to']) if params.get('start_to') else None,
+        )
+        total = qs.count()
+        AuditExportJob.objects.filter(id=job.id).update(total=total)
+
+        include_summary = bool(params.get('include_summary', True))
+        # The summary is drawn above the rows, so it takes its own pass.
+        summary = summarize_audit_rows(iter_audit_export_rows(org, qs, include_snapshot=False)) if include_summary else None
+
+        processed = 0
+
+        def rows():
+            nonlocal processed
+            for processed, row in enumerate(iter_audit_export_rows(org, qs, include_snapshot=False), start=1):
+                if processed % ITERATOR_CHUNK_SIZE == 0:
+                    AuditExportJob.objects.filter(id=job.id).update(processed=processed)
+                yield row
+
+        pdf = render_audit_pdf(org, rows(), summary=summary, include_business=include_summary, count=total)
+        AuditExportJob.objects.filter(id=job.id).update(
+            status=AuditExportJob.STATUS_DONE,
+            processed=processed,
+            artifact=pdf,
+            finished_at=timezone.now(),
+        )
+    except Exception as exc:
+        logger.exception('Audit export job %s failed', job_id)
+        AuditExportJob.objects.filter(id=job.id).update(
+            status=AuditExportJob.STATUS_FAILED,
+            error=str(exc)[:500],
+            finished_at=timezone.now(),
+        )
+    return True
+
+
+def requeue_stuck_audit_export_jobs(*, older_than_minutes: int = 60) -> int:
+    """Return jobs left running by a recycled or crashed worker to the queue."""
+    from bookings.models import AuditExportJob
+
+    cutoff = timezone.now() - timedelta(minutes=older_than_minutes)
+    return AuditExportJob.objects.filter(
+        status=AuditExportJob.STATUS_RUNNING, started_at__lt=cutoff,
+    ).update(status=AuditExportJob.STATUS_PENDING, started_at=None, processed=0)
+
+
+def purge_expired_audit_export_jobs(max_age_hours=24) -> int:
+    from bookings.models import AuditExportJob
+
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    deleted, _ = AuditExportJob.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def audit_export_job_payload(job, *, status_url=None, download_url=None) -> dict:
+    from bookings.models import AuditExportJob
+
+    total = int(job.total or 0)
+    processed = int(job.processed or 0)
+    progress = 1.0 if job.status == AuditExportJob.STATUS_DONE else (round(processed / total, 3) if total else 0.0)
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'total': total,
+        'processed': processed,
+        'progress': progress,
+        'error': job.error or None,
+        'status_url': status_url,
+        'download_url': download_url if job.status == AuditExportJob.STATUS_DONE else None,
+    }
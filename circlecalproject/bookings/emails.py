@@ -1,8 +1,12 @@
+import contextvars
 import logging
+from contextlib import contextmanager
 from urllib.parse import quote, urlencode
 import datetime
 import re
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
@@ -115,6 +119,150 @@ def _user_avatar_url(user) -> str:
         return ''
 
 
+# A booking usually triggers several emails at once (client and internal
+# copies, confirmation and owner notification). The org, staff and profile
+# rows they read are loaded once per booking instance by
+# `_booking_email_data`; `queue_booking_email` and `booking_email_connection`
+# deliver them over one backend connection.
+_connection = contextvars.ContextVar('booking_email_connection', default=None)
+
+
+def _booking_email_data(booking) -> dict:
+    """Load the org, staff and profile rows booking emails read, once per instance."""
+    data = getattr(booking, '_email_data', None)
+    if data is not None:
+        return data
+
+    try:
+        # Skips whatever the caller already select_related.
+        prefetch_related_objects(
+            [booking],
+            'organization__owner__profile',
+            'organization__subscription__plan',
+            'assigned_user__profile',
+        )
+    except Exception:
+        pass
+
+    try:
+        org = getattr(booking, 'organization', None)
+    except Exception:
+        org = None
+    try:
+        service_id = getattr(booking, 'service_id', None)
+    except Exception:
+        service_id = None
+
+    # (user, membership active) for every member assigned to the service.
+    assignments = []
+    if service_id is not None:
+        try:
+            from bookings.models import ServiceAssignment
+            qs = (
+                ServiceAssignment.objects
+                .filter(service_id=service_id)
+                .select_related('membership__user__profile')
+            )
+            assignments = [(row.membership.user, row.membership.is_active) for row in qs]
+        except Exception:
+            # Table might not exist if migrations haven't been applied.
+            assignments = []
+
+    manager_emails = []
+    if org is not None:
+        try:
+            from accounts.models import Membership
+            manager_emails = list(
+                Membership.objects
+                .filter(organization=org, is_active=True, role='manager')
+                .values_list('user__email', flat=True)
+            )
+        except Exception:
+            manager_emails = []
+
+    try:
+        from billing.utils import can_add_staff
+        is_team_plan = bool(org and can_add_staff(org))
+    except Exception:
+        is_team_plan = False
+
+    data = {
+        'org': org,
+        'assignments': assignments,
+        'manager_emails': manager_emails,
+        'is_team_plan': is_team_plan,
+        'rendered': {},
+    }
+    try:
+        booking._email_data = data
+    except Exception:
+        pass
+    return data
+
+
+def _render_once(booking, key, build):
+    """Return `build()`'s (subject, html), shared by the client and internal copies."""
+    rendered = _booking_email_data(booking)['rendered']
+    if key not in rendered:
+        rendered[key] = build()
+    return rendered[key]
+
+
+@contextmanager
+def booking_email_connection():
+    """Send every booking email in the block over one backend connection."""
+    current = _connection.get()
+    if current is not None:
+        yield current
+        return
+    connection = None
+    try:
+        connection = get_connection()
+        connection.open()
+    except Exception:
+        # Each message retries on its own and handles the failure as before.
+        logging.getLogger(__name__).warning('Could not open shared email connection', exc_info=True)
+    if connection is None:
+        yield None
+        return
+    token = _connection.set(connection)
+    try:
+        yield connection
+    finally:
+        _connection.reset(token)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def _flush_email_queue(booking):
+    queue = booking.__dict__.pop('_email_queue', None) or []
+    with booking_email_connection():
+        for send, args, kwargs in queue:
+            try:
+                send(*args, **kwargs)
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    'Queued %s failed for booking=%s', getattr(send, '__name__', send), getattr(booking, 'id', None)
+                )
+
+
+def queue_booking_email(booking, send, *args, **kwargs):
+    """Call `send(*args, **kwargs)` after commit, with the booking's other emails.
+
+    Everything queued for the same booking instance in one transaction is sent
+    in order over a single connection. Outside a transaction it runs at once,
+    like `transaction.on_commit`.
+    """
+    queue = getattr(booking, '_email_queue', None)
+    if queue is not None:
+        queue.append((send, args, kwargs))
+        return
+    booking._email_queue = [(send, args, kwargs)]
+    transaction.on_commit(lambda: _flush_email_queue(booking))
+
+
 def _build_booking_people_context(booking) -> dict:
     """Build context for owner/staff profile pictures for client-facing emails.
 
@@ -123,10 +271,8 @@ def _build_booking_people_context(booking) -> dict:
     - Staff cards only when org is on Team plan and staff has avatar
     - Staff derived from service assignments + booking.assigned_user
     """
-    try:
-        org = getattr(booking, 'organization', None)
-    except Exception:
-        org = None
+    data = _booking_email_data(booking)
+    org = data['org']
 
     owner_card = None
     try:
@@ -142,39 +288,11 @@ def _build_booking_people_context(booking) -> dict:
         owner_card = None
 
     staff_cards: list[dict] = []
-    try:
-        from billing.utils import can_add_staff
-        is_team_plan = bool(org and can_add_staff(org))
-    except Exception:
-        is_team_plan = False
-
-    if not is_team_plan:
+    if not data['is_team_plan']:
         return {'owner_card': owner_card, 'staff_cards': staff_cards}
 
-    staff_users = []
-    try:
-        service_id = getattr(booking, 'service_id', None)
-    except Exception:
-        service_id = None
-
     # Staff assigned to the service (Team plan)
-    if service_id is not None:
-        try:
-            from bookings.models import ServiceAssignment
-            qs = (
-                ServiceAssignment.objects
-                .filter(service_id=service_id, membership__is_active=True)
-                .select_related('membership__user', 'membership__user__profile')
-            )
-            for row in qs:
-                try:
-                    u = row.membership.user
-                except Exception:
-                    u = None
-                if u:
-                    staff_users.append(u)
-        except Exception:
-            pass
+    staff_users = [u for u, is_active in data['assignments'] if u and is_active]
 
     # Booking assignment (when present)
     try:
@@ -330,21 +448,12 @@ def _booking_internal_recipients(booking):
     For unassigned services, only owner+managers receive internal notifications.
     """
     # During cascaded deletes (e.g., org deletion), the related Business row may
-    # already be gone by the time on_commit hooks run. Accessing the FK relation
-    # can then raise Business.DoesNotExist; treat that as "no org" and just
-    # return an empty/partial recipient list instead of crashing.
-    try:
-        org = getattr(booking, 'organization', None)
-    except Exception:
-        org = None
-    # Important: don't dereference booking.service here.
-    # During cascaded deletes/cleanup, the Service row can be missing while the
-    # Booking instance still has a service_id value; accessing the FK relation
-    # raises Service.DoesNotExist and can crash on_commit hooks.
-    try:
-        service_id = getattr(booking, 'service_id', None)
-    except Exception:
-        service_id = None
+    # already be gone by the time on_commit hooks run; `_booking_email_data`
+    # treats that as "no org", so this returns an empty/partial recipient list
+    # instead of crashing. It also reads only booking.service_id: the Service row
+    # can be missing while the Booking instance still has a service_id value.
+    data = _booking_email_data(booking)
+    org = data['org']
 
     base = []
     try:
@@ -355,17 +464,7 @@ def _booking_internal_recipients(booking):
         pass
 
     # Managers in this organization
-    try:
-        from accounts.models import Membership
-        mgrs = (
-            Membership.objects
-            .filter(organization=org, is_active=True, role='manager')
-            .select_related('user')
-            .values_list('user__email', flat=True)
-        )
-        base.extend(list(mgrs))
-    except Exception:
-        pass
+    base.extend(data['manager_emails'])
 
     assigned = []
     try:
@@ -376,23 +475,9 @@ def _booking_internal_recipients(booking):
         pass
 
     # Service assignments (team members assigned to the service)
-    has_assignments = False
-    try:
-        if service_id is not None:
-            from bookings.models import ServiceAssignment
-            rows = (
-                ServiceAssignment.objects
-                .filter(service_id=service_id)
-                .select_related('membership__user')
-                .values_list('membership__user__email', flat=True)
-            )
-            rows_list = [e for e in list(rows) if e]
-            if rows_list:
-                has_assignments = True
-                assigned.extend(rows_list)
-    except Exception:
-        # Table might not exist if migrations haven't been applied.
-        has_assignments = False
+    rows_list = [u.email for u, _is_active in data['assignments'] if u and u.email]
+    has_assignments = bool(rows_list)
+    assigned.extend(rows_list)
 
     recipients = list(base)
     if has_assignments:
@@ -409,16 +494,17 @@ def _booking_internal_recipients(booking):
     return recipients
 
 
-def _send_html_email(subject: str, html_content: str, to_emails, booking_id=None, fail_silently=False):
+def _send_html_email(subject: str, html_content: str, to_emails, booking_id=None, fail_silently=False, connection=None):
     """Send a single HTML email using Django EmailMessage.
 
-    Uses BCC to avoid leaking recipient lists to each other.
+    Uses BCC to avoid leaking recipient lists to each other. Reuses the
+    `booking_email_connection()` connection when one is open.
     """
     to_emails = _dedupe_emails(to_emails)
     if not to_emails:
         return 0
     from_email = settings.DEFAULT_FROM_EMAIL
-    msg = EmailMessage(subject, html_content, from_email, [from_email], bcc=to_emails)
+    msg = EmailMessage(subject, html_content, from_email, [from_email], bcc=to_emails, connection=connection or _connection.get())
     msg.content_subtype = 'html'
     try:
         if booking_id is not None:
@@ -646,7 +732,7 @@ def send_booking_confirmation(booking):
     html_content = render_to_string('bookings/emails/booking_confirmation.html', context)
     from_email = settings.DEFAULT_FROM_EMAIL
     recipient_list = [booking.client_email]
-    msg = EmailMessage(subject, html_content, from_email, recipient_list)
+    msg = EmailMessage(subject, html_content, from_email, recipient_list, connection=_connection.get())
     msg.content_subtype = "html"  # Send HTML-only (no plain text fallback)
     # Add a helpful X-header so provider logs can be correlated with our booking id
     try:
@@ -664,6 +750,49 @@ def send_booking_confirmation(booking):
         return False
 
 
+def _booking_cancellation_email(booking, refund_info=None):
+    """Subject and HTML shared by the client and internal cancellation emails."""
+    def build():
+        booking_id = getattr(booking, 'id', None)
+        reschedule_url = None
+        try:
+            if booking_id:
+                signer = TimestampSigner()
+                token = signer.sign(str(booking_id))
+                base_url = getattr(settings, 'SITE_URL', 'https://circlecal.app')
+                reschedule_url = _build_signed_booking_url('bookings:reschedule_booking', booking_id, token=token, base_url=base_url)
+        except Exception:
+            reschedule_url = None
+
+        context = {
+            'booking': booking,
+            'public_ref': getattr(booking, 'public_ref', None),
+            'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
+            'refund_info': refund_info,
+            'reschedule_url': reschedule_url,
+        }
+
+        try:
+            context.update(_build_booking_people_context(booking))
+        except Exception:
+            pass
+
+        try:
+            context.update(_build_group_booking_context(booking))
+        except Exception:
+            pass
+
+        try:
+            context.update(_build_calendar_quick_links(booking))
+        except Exception:
+            pass
+
+        subject = f"Booking Cancelled - {booking.organization.name}"
+        return subject, render_to_string('bookings/emails/booking_cancellation.html', context)
+
+    return _render_once(booking, ('cancellation', refund_info), build)
+
+
 def send_booking_cancellation(booking, refund_info=None):
     """Send booking cancellation email to client. Accept optional refund_info string."""
     if not booking.client_email:
@@ -682,40 +811,11 @@ def send_booking_cancellation(booking, refund_info=None):
         # Fail open: if we can't determine time, preserve existing behavior.
         pass
     
-    signer = TimestampSigner()
-    token = signer.sign(str(booking.id))
-    base_url = getattr(settings, 'SITE_URL', 'https://circlecal.app')
-    reschedule_url = _build_signed_booking_url('bookings:reschedule_booking', booking.id, token=token, base_url=base_url)
-
-    context = {
-        'booking': booking,
-        'public_ref': getattr(booking, 'public_ref', None),
-            'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
-        'refund_info': refund_info,
-        'reschedule_url': reschedule_url,
-    }
-
-    try:
-        context.update(_build_booking_people_context(booking))
-    except Exception:
-        pass
-
-    try:
-        context.update(_build_group_booking_context(booking))
-    except Exception:
-        pass
-
-    try:
-        context.update(_build_calendar_quick_links(booking))
-    except Exception:
-        pass
-    
     logger = logging.getLogger(__name__)
-    subject = f"Booking Cancelled - {booking.organization.name}"
-    html_content = render_to_string('bookings/emails/booking_cancellation.html', context)
+    subject, html_content = _booking_cancellation_email(booking, refund_info)
     from_email = settings.DEFAULT_FROM_EMAIL
     recipient_list = [booking.client_email]
-    msg = EmailMessage(subject, html_content, from_email, recipient_list)
+    msg = EmailMessage(subject, html_content, from_email, recipient_list, connection=_connection.get())
     msg.content_subtype = "html"
     try:
         msg.extra_headers = {**getattr(msg, 'extra_headers', {}), 'X-CircleCal-Booking-ID': str(booking.id)}
@@ -742,43 +842,8 @@ def send_internal_booking_cancellation_notification(booking, refund_info=None):
     if not recipients:
         return False
 
-    booking_id = getattr(booking, 'id', None)
-    reschedule_url = None
-    try:
-        if booking_id:
-            signer = TimestampSigner()
-            token = signer.sign(str(booking_id))
-            base_url = getattr(settings, 'SITE_URL', 'https://circlecal.app')
-            reschedule_url = _build_signed_booking_url('bookings:reschedule_booking', booking_id, token=token, base_url=base_url)
-    except Exception:
-        reschedule_url = None
-
-    context = {
-        'booking': booking,
-        'public_ref': getattr(booking, 'public_ref', None),
-        'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
-        'refund_info': refund_info,
-        'reschedule_url': reschedule_url,
-    }
-
-    try:
-        context.update(_build_booking_people_context(booking))
-    except Exception:
-        pass
-
-    try:
-        context.update(_build_group_booking_context(booking))
-    except Exception:
-        pass
-
-    try:
-        context.update(_build_calendar_quick_links(booking))
-    except Exception:
-        pass
-
     logger = logging.getLogger(__name__)
-    subject = f"Booking Cancelled - {booking.organization.name}"
-    html_content = render_to_string('bookings/emails/booking_cancellation.html', context)
+    subject, html_content = _booking_cancellation_email(booking, refund_info)
     try:
         logger.info('Sending INTERNAL booking cancellation for booking=%s to=%s', getattr(booking, 'id', None), recipients)
         _send_html_email(subject, html_content, recipients, booking_id=getattr(booking, 'id', None), fail_silently=True)
@@ -788,27 +853,35 @@ def send_internal_booking_cancellation_notification(booking, refund_info=None):
         return False
 
 
+def _booking_reminder_email(booking):
+    """Subject and HTML shared by the client and internal reminder emails."""
+    def build():
+        context = {
+            'booking': booking,
+            'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
+        }
+
+        try:
+            context.update(_build_booking_people_context(booking))
+        except Exception:
+            pass
+
+        subject = f"Reminder: Upcoming Booking - {booking.organization.name}"
+        return subject, render_to_string('bookings/emails/booking_reminder.html', context)
+
+    return _render_once(booking, ('reminder',), build)
+
+
 def send_booking_reminder(booking):
     """Send booking reminder email to client (typically 24h before)."""
     if not booking.client_email:
         return False
-    
-    context = {
-        'booking': booking,
-        'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
-    }
 
-    try:
-        context.update(_build_booking_people_context(booking))
-    except Exception:
-        pass
-    
     logger = logging.getLogger(__name__)
-    subject = f"Reminder: Upcoming Booking - {booking.organization.name}"
-    html_content = render_to_string('bookings/emails/booking_reminder.html', context)
+    subject, html_content = _booking_reminder_email(booking)
     from_email = settings.DEFAULT_FROM_EMAIL
     recipient_list = [booking.client_email]
-    msg = EmailMessage(subject, html_content, from_email, recipient_list)
+    msg = EmailMessage(subject, html_content, from_email, recipient_list, connection=_connection.get())
     msg.content_subtype = "html"
     try:
         msg.extra_headers = {**getattr(msg, 'extra_headers', {}), 'X-CircleCal-Booking-ID': str(booking.id)}
@@ -833,18 +906,8 @@ def send_internal_booking_reminder_notification(booking):
     recipients = _booking_internal_recipients(booking)
     if not recipients:
         return False
-    context = {
-        'booking': booking,
-        'site_url': getattr(settings, 'SITE_URL', 'https://circlecal.app'),
-    }
-
-    try:
-        context.update(_build_booking_people_context(booking))
-    except Exception:
-        pass
     logger = logging.getLogger(__name__)
-    subject = f"Reminder: Upcoming Booking - {booking.organization.name}"
-    html_content = render_to_string('bookings/emails/booking_reminder.html', context)
+    subject, html_content = _booking_reminder_email(booking)
     try:
         logger.info('Sending INTERNAL booking reminder for booking=%s to=%s', getattr(booking, 'id', None), recipients)
         _send_html_email(subject, html_content, recipients, booking_id=getattr(booking, 'id', None), fail_silently=True)
@@ -1050,20 +1113,23 @@ def send_booking_rescheduled(new_booking, old_booking_id=None):
     except Exception:
         pass
 
-    try:
-        logger.info('Sending booking rescheduled for booking=%s to=%s', booking.id, booking.client_email)
-        sent = msg.send()
-        logger.info('booking rescheduled send result for booking=%s sent=%s', booking.id, sent)
-        # Internal notification copy (same styling/template)
+    # The internal copy goes out on the same connection.
+    with booking_email_connection() as connection:
+        msg.connection = connection
         try:
-            recipients = _booking_internal_recipients(booking)
-            if recipients:
-                logger.info('Sending INTERNAL booking rescheduled for booking=%s to=%s', booking.id, recipients)
-                _send_html_email(subject, html_content, recipients, booking_id=booking.id, fail_silently=True)
-        except Exception:
-            logger.exception('Failed to send INTERNAL booking rescheduled for booking=%s', getattr(booking, 'id', None))
+            logger.info('Sending booking rescheduled for booking=%s to=%s', booking.id, booking.client_email)
+            sent = msg.send()
+            logger.info('booking rescheduled send result for booking=%s sent=%s', booking.id, sent)
+            # Internal notification copy (same styling/template)
+            try:
+                recipients = _booking_internal_recipients(booking)
+                if recipients:
+                    logger.info('Sending INTERNAL booking rescheduled for booking=%s to=%s', booking.id, recipients)
+                    _send_html_email(subject, html_content, recipients, booking_id=booking.id, fail_silently=True)
+            except Exception:
+                logger.exception('Failed to send INTERNAL booking rescheduled for booking=%s', getattr(booking, 'id', None))
 
-        return True
-    except Exception:
-        logger.exception('Failed to send booking rescheduled for booking=%s to=%s', booking.id, booking.client_email)
-        return False
+            return True
+        except Exception:
+            logger.exception('Failed to send booking rescheduled for booking=%s to=%s', booking.id, booking.client_email)
+            return False
@@ -46,3 +46,79 @@ def booking_to_ics_string(booking):
         'END:VCALENDAR',
     ]
     return "\r\n".join(ics)
+
+
+def _escape_text(value):
+    """Escape a TEXT property value (RFC 5545 3.3.11)."""
+    text = str(value or '')
+    for raw, escaped in (('\\', '\\\\'), (';', '\\;'), (',', '\\,'), ('\r\n', '\\n'), ('\n', '\\n')):
+        text = text.replace(raw, escaped)
+    return text
+
+
+def _fold(line):
+    """Fold a content line at 75 octets (RFC 5545 3.1)."""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line
+    parts = []
+    while data:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(data))
+        # Never split a multi-byte character.
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode('utf-8'))
+        data = data[cut:]
+    return '\r\n '.join(parts)
+
+
+def _feed_event_lines(booking, dtstamp):
+    service = getattr(booking, 'service', None)
+    summary = service.name if service else (getattr(booking, 'title', '') or 'Booking')
+    org = getattr(booking, 'organization', None)
+    description_lines = []
+    if getattr(booking, 'client_name', None):
+        description_lines.append(f"Client: {booking.client_name}")
+    if getattr(booking, 'public_ref', None):
+        description_lines.append(f"Ref: {booking.public_ref}")
+    return [
+        'BEGIN:VEVENT',
+        f"UID:circlecal-booking-{booking.id}@circlecal",
+        f'DTSTAMP:{dtstamp}',
+        f'DTSTART:{_format_dt_as_utc(booking.start)}',
+        f'DTEND:{_format_dt_as_utc(booking.end)}',
+        f'SUMMARY:{_escape_text(summary)}',
+        f"DESCRIPTION:{_escape_text(chr(10).join(description_lines))}",
+        f"LOCATION:{_escape_text(getattr(org, 'name', '') if org else '')}",
+        'END:VEVENT',
+    ]
+
+
+def iter_feed_chunks(bookings, name, chunk_size=200):
+    """Yield a subscription calendar for `bookings` in string chunks.
+
+    Rows are read with `QuerySet.iterator(chunk_size)`, so a large feed never
+    holds every booking (or the whole body as a list of lines) at once.
+    Select the booking's `service` and `organization` to avoid per-row queries.
+    """
+    dtstamp = _format_dt_as_utc(timezone.now())
+    yield '\r\n'.join([
+        'BEGIN:VCALENDAR',
+        'PRODID:-//CircleCal//EN',
+        'VERSION:2.0',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        _fold(f'X-WR-CALNAME:{_escape_text(name)}'),
+    ]) + '\r\n'
+
+    lines = []
+    rows = bookings.iterator(chunk_size=chunk_size) if hasattr(bookings, 'iterator') else iter(bookings)
+    for count, booking in enumerate(rows, 1):
+        lines.extend(_fold(line) for line in _feed_event_lines(booking, dtstamp))
+        if count % chunk_size == 0:
+            yield '\r\n'.join(lines) + '\r\n'
+            lines = []
+    if lines:
+        yield '\r\n'.join(lines) + '\r\n'
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,298 @@
+"""Subscribable iCalendar feeds for an organization, a team member or a service.
+
+Feed URLs carry a signed token naming the scope (`org`, `member` or
+`service`), the organization, the member's user id or the service id, the
+member who was issued the URL and the org's feed key
+(`OrgSettings.ics_feed_key`); `feed_links` hands them out to members of the
+organization. They do not expire, as calendar clients keep the URL forever,
+but every poll re-checks the issuer: the membership must still be active,
+with a manager role for the org feed and a manager role or an assignment for
+a service feed. `reset_feed_links` rotates the key, which revokes every feed
+URL of the organization.
+
+Calendar clients poll every few minutes, so a poll is made nearly free:
+
+- each organization has a feed version in the cache, bumped (to the current
+  time) whenever one of its bookings, services, service assignments,
+  memberships or settings changes. The version is the feed's ETag and
+  Last-Modified, and the issuer check is cached under it, so an unchanged
+  feed answers 304 after one signature check and two cache reads;
+- the rendered body is cached under the version for
+  `ICS_FEED_CACHE_SECONDS`. On a miss the bookings are streamed through
+  `bookings.ics.iter_feed_chunks` (from the replica when one is configured).
+
+Feeds cover `ICS_FEED_PAST_DAYS` back and `ICS_FEED_FUTURE_DAYS` ahead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.signing import BadSignature, Signer
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import condition, require_http_methods, require_safe
+
+from accounts.models import Business, Membership
+from calendar_app.db_routing import read_replica
+
+from .ics import iter_feed_chunks
+from .models import Booking, OrgSettings, Service, ServiceAssignment
+
+
+SCOPES = ('org', 'member', 'service')
+MANAGER_ROLES = ('owner', 'admin', 'manager')
+
+_SALT = 'bookings.ics_feed'
+_VERSION_KEY = 'ics_feed_ver:{org_id}'
+
+
+def feed_token(scope: str, org_id, obj_id=0, *, issuer_id, key: str) -> str:
+    return Signer(salt=_SALT).sign(f'{scope}.{int(org_id)}.{int(obj_id or 0)}.{int(issuer_id)}.{key}')
+
+
+def feed_url(scope: str, org_id, obj_id=0, *, issuer_id, key: str) -> str:
+    base = (getattr(settings, 'SITE_URL', '') or 'https://circlecal.app').rstrip('/')
+    token = feed_token(scope, org_id, obj_id, issuer_id=issuer_id, key=key)
+    return base + reverse('bookings:ics_feed', args=[token])
+
+
+def feed_key(org) -> str:
+    """The org's current feed key, created on first use."""
+    org_settings, _ = OrgSettings.objects.get_or_create(organization=org)
+    if not org_settings.ics_feed_key:
+        org_settings.ics_feed_key = secrets.token_hex(16)
+        org_settings.save(update_fields=['ics_feed_key'])
+    return org_settings.ics_feed_key
+
+
+def reset_feed_key(org) -> str:
+    """Rotate the org's feed key; every previously issued feed URL stops working."""
+    org_settings, _ = OrgSettings.objects.get_or_create(organization=org)
+    org_settings.ics_feed_key = secrets.token_hex(16)
+    org_settings.save(update_fields=['ics_feed_key'])
+    return org_settings.ics_feed_key
+
+
+def _unsign(token: str) -> tuple[str, int, int, int, str]:
+    try:
+        scope, org_id, obj_id, issuer_id, key = Signer(salt=_SALT).unsign(token).split('.')
+        parsed = (scope, int(org_id), int(obj_id), int(issuer_id), key)
+    except (BadSignature, ValueError):
+        raise Http404('Unknown calendar feed.')
+    if scope not in SCOPES or not key:
+        raise Http404('Unknown calendar feed.')
+    return parsed
+
+
+def feed_version(org_id) -> int:
+    """Time (ns) of the organization's last feed-relevant change."""
+    key = _VERSION_KEY.format(org_id=org_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return int(version or 0)
+
+
+def _bump(org_id) -> None:
+    cache.set(_VERSION_KEY.format(org_id=org_id), time.time_ns(), timeout=None)
+
+
+def invalidate_feeds(org_id) -> None:
+    """Drop every cached feed of the organization (again on commit)."""
+    if not org_id:
+        return
+    _bump(org_id)
+    transaction.on_commit(lambda: _bump(org_id))
+
+
+def _issuer_allowed(scope: str, org_id: int, obj_id: int, issuer_id: int, key: str) -> bool:
+    """Whether the URL's key is current and its issuer may still see the feed."""
+    current = OrgSettings.objects.filter(organization_id=org_id).values_list('ics_feed_key', flat=True).first()
+    if not current or not secrets.compare_digest(current, key):
+        return False
+    membership = Membership.objects.filter(user_id=issuer_id, organization_id=org_id, is_active=True).first()
+    if membership is None:
+        return False
+    is_manager = membership.role in MANAGER_ROLES
+    if scope == 'org':
+        return is_manager
+    if scope == 'member':
+        return obj_id == issuer_id
+    return is_manager or ServiceAssignment.objects.filter(service_id=obj_id, membership=membership).exists()
+
+
+def _check_issuer(token: str, scope: str, org_id: int, obj_id: int, issuer_id: int, key: str, version: int) -> None:
+    # Memberships, assignments and the key all bump the feed version, so the
+    # answer holds for as long as the version does.
+    cache_key = f'ics_feed_ok:{hashlib.sha256(token.encode()).hexdigest()}:{version}'
+    allowed = cache.get(cache_key)
+    if allowed is None:
+        allowed = _issuer_allowed(scope, org_id, obj_id, issuer_id, key)
+        ttl = max(60, int(getattr(settings, 'ICS_FEED_CACHE_SECONDS', 3600) or 0))
+        cache.set(cache_key, allowed, timeout=ttl)
+    if not allowed:
+        raise Http404('Unknown calendar feed.')
+
+
+def _feed_bookings(scope: str, org_id: int, obj_id: int):
+    """Return (calendar name, bookings) for a feed, or None when it is gone."""
+    org = Business.objects.filter(id=org_id, is_archived=False).first()
+    if org is None:
+        return None
+    now = timezone.now()
+    qs = Booking.objects.filter(
+        organization_id=org_id,
+        is_blocking=False,
+        start__gte=now - timedelta(days=int(getattr(settings, 'ICS_FEED_PAST_DAYS', 30))),
+        start__lt=now + timedelta(days=int(getattr(settings, 'ICS_FEED_FUTURE_DAYS', 365))),
+    )
+    name = org.name
+    if scope == 'service':
+        service = Service.objects.filter(id=obj_id, organization_id=org_id).first()
+        if service is None:
+            return None
+        qs = qs.filter(service_id=service.id)
+        name = f'{org.name} - {service.name}'
+    elif scope == 'member':
+        membership = (
+            Membership.objects
+            .filter(user_id=obj_id, organization_id=org_id, is_active=True)
+            .select_related('user')
+            .first()
+        )
+        if membership is None:
+            return None
+        assigned_services = ServiceAssignment.objects.filter(membership=membership).values('service_id')
+        qs = qs.filter(assigned_user_id=obj_id) | qs.filter(service_id__in=assigned_services)
+        user = membership.user
+        name = f"{org.name} - {user.get_full_name() or user.get_username()}"
+    return name, qs.select_related('service', 'organization').order_by('start', 'id')
+
+
+def _render_feed(scope: str, org_id: int, obj_id: int) -> str:
+    found = _feed_bookings(scope, org_id, obj_id)
+    if found is None:
+        return ''
+    name, bookings = found
+    return ''.join(iter_feed_chunks(bookings, name))
+
+
+def _feed_meta(request, token):
+    meta = getattr(request, '_ics_feed', None)
+    if meta is None:
+        scope, org_id, obj_id, issuer_id, key = _unsign(token)
+        version = feed_version(org_id)
+        _check_issuer(token, scope, org_id, obj_id, issuer_id, key, version)
+        meta = request._ics_feed = (scope, org_id, obj_id, version)
+    return meta
+
+
+def _feed_etag(request, token):
+    scope, org_id, obj_id, version = _feed_meta(request, token)
+    # Weak: a re-render after the cache TTL shifts the date window and DTSTAMP.
+    return f'W/"{scope}-{org_id}-{obj_id}-{version}"'
+
+
+def _feed_last_modified(request, token):
+    version = _feed_meta(request, token)[3]
+    return datetime.fromtimestamp(version / 1e9, tz=dt_timezone.utc).replace(microsecond=0)
+
+
+@require_safe
+@condition(etag_func=_feed_etag, last_modified_func=_feed_last_modified)
+@read_replica
+def ics_feed(request, token):
+    scope, org_id, obj_id, version = _feed_meta(request, token)
+    ttl = max(0, int(getattr(settings, 'ICS_FEED_CACHE_SECONDS', 3600) or 0))
+    key = f'ics_feed:{scope}:{org_id}:{obj_id}:{version}'
+    body = cache.get(key) if ttl else None
+    if body is None:
+        body = _render_feed(scope, org_id, obj_id)
+        if ttl:
+            cache.set(key, body, timeout=ttl)
+    if not body:
+        raise Http404('Unknown calendar feed.')
+    response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['Content-Disposition'] = 'inline; filename="circlecal.ics"'
+    return response
+
+
+@login_required
+def feed_links(request, org_slug):
+    """Feed URLs the signed-in member may subscribe to."""
+    org = get_object_or_404(Business, slug=org_slug, is_archived=False)
+    membership = Membership.objects.filter(user=request.user, organization=org, is_active=True).first()
+    if membership is None:
+        return JsonResponse({'error': 'forbidden'}, status=403)
+
+    return JsonResponse(_links_payload(org, membership, feed_key(org)))
+
+
+@login_required
+@require_http_methods(['POST'])
+def reset_feed_links(request, org_slug):
+    """Revoke every feed URL of the organization and return fresh ones."""
+    org = get_object_or_404(Business, slug=org_slug, is_archived=False)
+    membership = Membership.objects.filter(user=request.user, organization=org, is_active=True).first()
+    if membership is None or membership.role not in MANAGER_ROLES:
+        return JsonResponse({'error': 'forbidden'}, status=403)
+    return JsonResponse(_links_payload(org, membership, reset_feed_key(org)))
+
+
+def _links_payload(org, membership, key: str) -> dict:
+    services = Service.objects.filter(organization=org).order_by('name')
+    is_manager = membership.role in MANAGER_ROLES
+    if not is_manager:
+        services = services.filter(assignments__membership=membership)
+    issuer_id = membership.user_id
+    return {
+        'org': feed_url('org', org.id, issuer_id=issuer_id, key=key) if is_manager else None,
+        'member': feed_url('member', org.id, issuer_id, issuer_id=issuer_id, key=key),
+        'services': [
+            {'id': svc.id, 'name': svc.name, 'url': feed_url('service', org.id, svc.id, issuer_id=issuer_id, key=key)}
+            for svc in services
+        ],
+    }
+
+
+def _org_id_for(instance):
+    if isinstance(instance, Business):
+        return instance.id
+    org_id = getattr(instance, 'organization_id', None)
+    if org_id:
+        return org_id
+    if getattr(instance, 'service_id', None):
+        try:
+            return instance.service.organization_id
+        except Exception:
+            return None
+    return None
+
+
+def _on_feed_row_change(sender, instance, **kwargs):
+    from accounts.teardown import teardown_in_progress
+
+    if teardown_in_progress():
+        return
+    invalidate_feeds(_org_id_for(instance))
+
+
+def connect_signals() -> None:
+    for model in (Booking, Service, ServiceAssignment, Membership, OrgSettings):
+        uid = f'ics_feeds:{model._meta.label_lower}'
+        post_save.connect(_on_feed_row_change, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_on_feed_row_change, sender=model, dispatch_uid=f'{uid}:delete')
+    # The organization name is the calendar name and event location.
+    post_save.connect(_on_feed_row_change, sender=Business, dispatch_uid='ics_feeds:business:save')
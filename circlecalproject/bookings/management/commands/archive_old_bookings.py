@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.archive import archive_old_bookings, booking_archive_months
+
+
+class Command(BaseCommand):
+    help = (
+        "Move bookings that ended, and audit entries created, more than --months "
+        "months ago into the archive tables. History views read both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=None,
+            help='Archive horizon in months (default: BOOKING_ARCHIVE_MONTHS).',
+        )
+        parser.add_argument('--org', default=None, help='Only archive this organization (slug).')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows moved per transaction.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be archived.')
+
+    def handle(self, *args, **options):
+        from accounts.models import Business
+
+        org = None
+        if options.get('org'):
+            org = Business.objects.filter(slug=options['org']).first()
+            if org is None:
+                raise CommandError(f"Organization not found: {options['org']}")
+
+        months = options.get('months')
+        if months is not None and months < 1:
+            raise CommandError('--months must be at least 1.')
+
+        result = archive_old_bookings(
+            months=months if months is not None else booking_archive_months(),
+            organization=org,
+            batch_size=options.get('batch_size') or 1000,
+            dry_run=bool(options.get('dry_run')),
+        )
+        verb = 'Would archive' if result.dry_run else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} bookings={result.bookings}, audits={result.audits} (cutoff {result.cutoff.isoformat()})."
+        ))
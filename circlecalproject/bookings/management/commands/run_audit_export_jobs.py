@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from bookings.audit_export import (
+    purge_expired_audit_export_jobs,
+    requeue_stuck_audit_export_jobs,
+    run_audit_export_job,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render pending background audit PDF exports and purge finished jobs "
+        "older than --max-age-hours."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Max number of pending jobs to process in one run.',
+        )
+        parser.add_argument(
+            '--stuck-minutes',
+            type=int,
+            default=60,
+            help='Requeue jobs left running for longer than this (recycled or crashed worker).',
+        )
+        parser.add_argument(
+            '--max-age-hours',
+            type=int,
+            default=24,
+            help='Delete jobs (and their artifacts) older than this many hours.',
+        )
+
+    def handle(self, *args, **options):
+        from bookings.models import AuditExportJob
+
+        limit = int(options.get('limit') or 20)
+        requeued = requeue_stuck_audit_export_jobs(older_than_minutes=int(options.get('stuck_minutes') or 60))
+        pending_ids = list(
+            AuditExportJob.objects.filter(status=AuditExportJob.STATUS_PENDING)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:limit]
+        )
+        processed = sum(1 for job_id in pending_ids if run_audit_export_job(job_id))
+        purged = purge_expired_audit_export_jobs(max_age_hours=int(options.get('max_age_hours') or 24))
+        self.stdout.write(self.style.SUCCESS(f"Processed={processed}, requeued={requeued}, purged={purged}."))
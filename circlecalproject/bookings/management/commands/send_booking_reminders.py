@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
+from django.db.models import F
 from django.utils import timezone
 from datetime import timedelta
 from bookings.models import Booking
-from bookings.emails import send_booking_reminder, send_internal_booking_reminder_notification
+from bookings.emails import booking_email_connection, send_booking_reminder, send_internal_booking_reminder_notification
 
 
 class Command(BaseCommand):
@@ -29,14 +30,23 @@ class Command(BaseCommand):
         start_time = now
         end_time = now + timedelta(hours=hours)
         
-        # Find bookings in the reminder window that aren't blocking events
+        # Find bookings in the reminder window that aren't blocking events and
+        # were not reminded yet (client and staff) for their current start time.
         upcoming_bookings = Booking.objects.filter(
             start__gte=start_time,
             start__lte=end_time,
             is_blocking=False,
         ).exclude(
             client_email=''
-        ).select_related('organization', 'service')
+        ).exclude(
+            reminder_sent_for=F('start'),
+            internal_reminder_sent_for=F('start'),
+        ).select_related(
+            'organization__owner__profile',
+            'organization__subscription__plan',
+            'service',
+            'assigned_user__profile',
+        )
         
         if dry_run:
             self.stdout.write(
@@ -51,24 +61,36 @@ class Command(BaseCommand):
         
         sent_count = 0
         failed_count = 0
+        upcoming_bookings = list(upcoming_bookings)
         
-        for booking in upcoming_bookings:
-            ok_client = send_booking_reminder(booking)
-            # Internal recipients are best-effort; do not count failures against client sends.
-            try:
-                send_internal_booking_reminder_notification(booking)
-            except Exception:
-                pass
+        # One mail connection for the whole run.
+        with booking_email_connection():
+            for booking in upcoming_bookings:
+                ok_client = send_booking_reminder(booking)
+                sent_for = {}
+                # Internal recipients are best-effort and attempted once per start
+                # time; a failing client send is retried without them.
+                if booking.internal_reminder_sent_for != booking.start:
+                    try:
+                        send_internal_booking_reminder_notification(booking)
+                    except Exception:
+                        pass
+                    sent_for['internal_reminder_sent_for'] = booking.start
+
+                if ok_client:
+                    sent_for['reminder_sent_for'] = booking.start
+                if sent_for:
+                    Booking.objects.filter(pk=booking.pk).update(**sent_for)
 
-            if ok_client:
-                sent_count += 1
-                self.stdout.write(self.style.SUCCESS(f'✓ Sent reminder to {booking.client_email}'))
-            else:
-                failed_count += 1
-                self.stdout.write(self.style.ERROR(f'✗ Failed to send reminder to {booking.client_email}'))
+                if ok_client:
+                    sent_count += 1
+                    self.stdout.write(self.style.SUCCESS(f'✓ Sent reminder to {booking.client_email}'))
+                else:
+                    failed_count += 1
+                    self.stdout.write(self.style.ERROR(f'✗ Failed to send reminder to {booking.client_email}'))
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'\nSummary: {sent_count} sent, {failed_count} failed out of {upcoming_bookings.count()} total'
+                f'\nSummary: {sent_count} sent, {failed_count} failed out of {len(upcoming_bookings)} total'
             )
         )
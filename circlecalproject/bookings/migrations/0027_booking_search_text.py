@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS bookings_booking_search_trgm ON public.bookings_booking USING gin (search_text gin_trgm_ops);",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS public.bookings_booking_search_trgm;",
+]
+
+
+def _apply_sql(schema_editor, statements):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def backfill_search_text(apps, schema_editor):
+    from bookings.search import booking_search_text
+
+    Booking = apps.get_model('bookings', 'Booking')
+    batch = []
+    qs = Booking.objects.only('id', 'title', 'client_name', 'client_email', 'public_ref').order_by('id')
+    for b in qs.iterator(chunk_size=2000):
+        b.search_text = booking_search_text(b)
+        batch.append(b)
+        if len(batch) >= 2000:
+            Booking.objects.bulk_update(batch, ['search_text'])
+            batch = []
+    if batch:
+        Booking.objects.bulk_update(batch, ['search_text'])
+
+
+def apply_trgm_index(apps, schema_editor):
+    _apply_sql(schema_editor, FORWARD_SQL)
+
+
+def unapply_trgm_index(apps, schema_editor):
+    _apply_sql(schema_editor, REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_merge_0023_accounts_rls_updates'),
+        ('bookings', '0026_service_location_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=512),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['organization', 'start', 'id'], name='bookings_bo_org_start_id_idx'),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(apply_trgm_index, unapply_trgm_index),
+    ]
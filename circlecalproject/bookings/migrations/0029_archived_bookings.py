@@ -0,0 +1,70 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_merge_0023_accounts_rls_updates'),
+        ('bookings', '0028_auditexportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAuditBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('booking_id', models.IntegerField(blank=True, null=True)),
+                ('event_type', models.CharField(choices=[('deleted', 'deleted'), ('cancelled', 'cancelled')], max_length=32)),
+                ('booking_snapshot', models.JSONField(default=dict)),
+                ('start', models.DateTimeField(blank=True, null=True)),
+                ('end', models.DateTimeField(blank=True, null=True)),
+                ('client_name', models.CharField(blank=True, max_length=200)),
+                ('client_email', models.EmailField(blank=True, max_length=254)),
+                ('created_at', models.DateTimeField()),
+                ('extra', models.TextField(blank=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_audit_bookings', to='accounts.business')),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='bookings.service')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['organization', 'created_at'], name='bookings_arc_audit_org_cr_idx'), models.Index(fields=['organization', 'booking_id'], name='bookings_arc_audit_bid_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('client_name', models.CharField(blank=True, max_length=200)),
+                ('client_email', models.EmailField(blank=True, max_length=254)),
+                ('is_blocking', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('public_ref', models.CharField(blank=True, db_index=True, max_length=16, null=True)),
+                ('payment_method', models.CharField(blank=True, default='none', max_length=20)),
+                ('offline_payment_method', models.CharField(blank=True, default='', max_length=20)),
+                ('payment_status', models.CharField(blank=True, default='not_required', max_length=20)),
+                ('stripe_checkout_session_id', models.CharField(blank=True, default='', max_length=255)),
+                ('participant_count', models.PositiveIntegerField(default=1)),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=8)),
+                ('rescheduled_from_booking_id', models.IntegerField(blank=True, null=True)),
+                ('search_text', models.CharField(blank=True, default='', editable=False, max_length=512)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assigned_team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.team')),
+                ('assigned_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to='accounts.business')),
+                ('resource', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='bookings.facilityresource')),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='bookings.service')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'start', 'id'], name='bookings_arc_org_start_id_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_local_days(apps, schema_editor):
+    from bookings.models import booking_local_day
+
+    Business = apps.get_model('accounts', 'Business')
+    for model_name in ('Booking', 'ArchivedBooking'):
+        model = apps.get_model('bookings', model_name)
+        for org_id, tz_name in Business.objects.values_list('id', 'timezone').iterator():
+            batch = []
+            qs = model.objects.filter(organization_id=org_id).only('id', 'start').order_by('id')
+            for b in qs.iterator(chunk_size=2000):
+                b.local_date, b.local_weekday = booking_local_day(b.start, tz_name)
+                batch.append(b)
+                if len(batch) >= 2000:
+                    model.objects.bulk_update(batch, ['local_date', 'local_weekday'])
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, ['local_date', 'local_weekday'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0025_businessteardownjob'),
+        ('bookings', '0029_archived_bookings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='local_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='local_weekday',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='local_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='local_weekday',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['organization', 'service', 'local_date'], name='bookings_bo_org_svc_day_idx'),
+        ),
+        migrations.RunPython(backfill_local_days, migrations.RunPython.noop),
+    ]
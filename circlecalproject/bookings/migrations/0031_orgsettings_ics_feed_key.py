@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0030_booking_local_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orgsettings',
+            name='ics_feed_key',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
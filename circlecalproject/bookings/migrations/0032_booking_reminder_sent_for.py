@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def mark_already_reminded(apps, schema_editor):
+    # The daily run before this change reminded everything starting within
+    # 24h of when it ran; record that so those bookings are not reminded twice.
+    PeriodicJobState = apps.get_model('calendar_app', 'PeriodicJobState')
+    Booking = apps.get_model('bookings', 'Booking')
+    state = PeriodicJobState.objects.filter(name='send_booking_reminders').first()
+    if state is None or state.last_started_at is None:
+        return
+    Booking.objects.filter(
+        start__gte=timezone.now(),
+        start__lte=state.last_started_at + timedelta(hours=24),
+        is_blocking=False,
+    ).exclude(client_email='').update(reminder_sent_for=F('start'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0031_orgsettings_ics_feed_key'),
+        ('calendar_app', '0007_periodicjobstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='reminder_sent_for',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='reminder_sent_for',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_already_reminded, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:17
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_client_marker(apps, schema_editor):
+    # Until now the internal reminder went out with every client reminder.
+    Booking = apps.get_model('bookings', 'Booking')
+    Booking.objects.filter(reminder_sent_for__isnull=False).update(internal_reminder_sent_for=F('reminder_sent_for'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0032_booking_reminder_sent_for'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedbooking',
+            name='internal_reminder_sent_for',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='internal_reminder_sent_for',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(copy_client_marker, migrations.RunPython.noop),
+    ]
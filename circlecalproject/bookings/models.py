@@ -14,6 +14,39 @@ _PUBLIC_REF_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 def generate_public_ref(n=8):
     return ''.join(secrets.choice(_PUBLIC_REF_ALPHABET) for _ in range(n))
 
+
+def booking_local_day(start, tz_name):
+    """(date, weekday) of `start` in the organization's timezone."""
+    if start is None:
+        return None, None
+    from zoneinfo import ZoneInfo
+    try:
+        tz = ZoneInfo(tz_name or 'UTC')
+    except Exception:
+        tz = ZoneInfo('UTC')
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start, tz)
+    local = start.astimezone(tz).date()
+    return local, local.weekday()
+
+
+def refresh_booking_local_days(org_id, tz_name, *, batch_size=2000):
+    """Recompute `local_date`/`local_weekday` for every booking of an org (timezone change)."""
+    batch = []
+    updated = 0
+    qs = Booking.objects.filter(organization_id=org_id).only('id', 'start').order_by('id')
+    for booking in qs.iterator(chunk_size=batch_size):
+        booking.local_date, booking.local_weekday = booking_local_day(booking.start, tz_name)
+        batch.append(booking)
+        if len(batch) >= batch_size:
+            Booking.objects.bulk_update(batch, ['local_date', 'local_weekday'])
+            updated += len(batch)
+            batch = []
+    if batch:
+        Booking.objects.bulk_update(batch, ['local_date', 'local_weekday'])
+        updated += len(batch)
+    return updated
+
 class Service(models.Model):
     LOCATION_TYPE_ADDRESS = 'address'
     LOCATION_TYPE_OTHER = 'other'
@@ -277,6 +310,21 @@ class Booking(models.Model):
     # so we can defer reschedule cleanup/emails until payment clears (Stripe).
     rescheduled_from_booking_id = models.IntegerField(null=True, blank=True, db_index=True)
 
+    # Denormalized, normalized search document (title/client/email/ref) kept
+    # in sync on save. See bookings.search for how it is queried.
+    search_text = models.CharField(max_length=512, blank=True, default='', editable=False)
+    # Org-local day of `start`, kept in sync on save and when the org changes
+    # timezone, so per-day lookups (freezes, day grouping) hit an index
+    # instead of converting `start` per row.
+    local_date = models.DateField(null=True, blank=True, editable=False)
+    local_weekday = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    # `start` the reminder email was sent for (send_booking_reminders), so
+    # overlapping runs skip it and a rescheduled booking is reminded again.
+    reminder_sent_for = models.DateTimeField(null=True, blank=True, editable=False)
+    # Same for the internal (staff) reminder, which is sent once per start
+    # time even while the client send keeps failing and is retried.
+    internal_reminder_sent_for = models.DateTimeField(null=True, blank=True, editable=False)
+
     def __str__(self):
         return f"{self.title or 'Booking'} ({self.start.date()})"
 
@@ -284,6 +332,9 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=["organization", "start"]),
             models.Index(fields=["service", "start"]),
+            # Keyset pagination for bookings lists: (org, start, id).
+            models.Index(fields=["organization", "start", "id"], name="bookings_bo_org_start_id_idx"),
+            models.Index(fields=["organization", "service", "local_date"], name="bookings_bo_org_svc_day_idx"),
         ]
 
     def save(self, *args, **kwargs):
@@ -295,6 +346,19 @@ class Booking(models.Model):
                 if not Booking.objects.filter(public_ref=candidate).exists():
                     self.public_ref = candidate
                     break
+
+        from bookings.search import SEARCH_SOURCE_FIELDS, booking_search_text
+        self.search_text = booking_search_text(self)
+        org = self.organization if self.organization_id else None
+        self.local_date, self.local_weekday = booking_local_day(self.start, getattr(org, 'timezone', None))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if update_fields & set(SEARCH_SOURCE_FIELDS):
+                update_fields.add('search_text')
+            if update_fields & {'start', 'organization', 'organization_id'}:
+                update_fields.update({'local_date', 'local_weekday'})
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
 
 
@@ -369,6 +433,10 @@ class OrgSettings(models.Model):
     # Staff and other management users are not affected by this toggle.
     owner_receives_staff_booking_push_notifications_enabled = models.BooleanField(default=True)
 
+    # Signed into every iCalendar feed URL (bookings.ics_feeds); rotating it
+    # revokes all of the org's feed URLs.
+    ics_feed_key = models.CharField(max_length=32, blank=True, default='')
+
     def __str__(self):
         try:
             org_name = self.organization.name
@@ -700,4 +768,126 @@ class AuditBooking(models.Model):
         ]
 
     def __str__(self):
-        return f"Audit {self.event_type} booking {self.booking_id or 'unknown'} @ {self.start or 'unknown'}"
\ No newline at end of file
+        return f"Audit {self.event_type} booking {self.booking_id or 'unknown'} @ {self.start or 'unknown'}"
+
+class AuditExportJob(models.Model):
+    """Background PDF export of booking audit entries.
+
+    Large exports are rendered off the request path (see
+    bookings.audit_export); clients poll the job for progress and download
+    the finished artifact from the job endpoint.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'pending'),
+        (STATUS_RUNNING, 'running'),
+        (STATUS_DONE, 'done'),
+        (STATUS_FAILED, 'failed'),
+    ]
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='audit_export_jobs')
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
+    # Selection: {"ids": [...]} or {"start_from": iso, "start_to": iso}
+    params = models.JSONField(default=dict, blank=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    artifact = models.BinaryField(null=True, blank=True, editable=False)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"AuditExportJob {self.id} ({self.organization_id}) {self.status}"
+
+
+class ArchivedBooking(models.Model):
+    """Cold copy of a Booking that ended before the archive horizon.
+
+    Rows are moved here by `bookings.archive.archive_old_bookings` so the hot
+    `Booking` table (and its indexes) only covers the recent past and the
+    future. The original primary key is kept so audit entries, exports and
+    client references keep resolving. History views read both tables.
+    """
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='archived_bookings')
+    title = models.CharField(max_length=200, blank=True)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    client_name = models.CharField(max_length=200, blank=True)
+    client_email = models.EmailField(blank=True)
+    is_blocking = models.BooleanField(default=False)
+    service = models.ForeignKey(Service, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    public_ref = models.CharField(max_length=16, null=True, blank=True, db_index=True)
+    assigned_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    assigned_team = models.ForeignKey(
+        'accounts.Team', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    resource = models.ForeignKey(
+        'FacilityResource', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    payment_method = models.CharField(max_length=20, blank=True, default='none')
+    offline_payment_method = models.CharField(max_length=20, blank=True, default='')
+    payment_status = models.CharField(max_length=20, blank=True, default='not_required')
+    stripe_checkout_session_id = models.CharField(max_length=255, blank=True, default='')
+    participant_count = models.PositiveIntegerField(default=1)
+    total_price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    rescheduled_from_booking_id = models.IntegerField(null=True, blank=True)
+    search_text = models.CharField(max_length=512, blank=True, default='', editable=False)
+    local_date = models.DateField(null=True, blank=True, editable=False)
+    local_weekday = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    reminder_sent_for = models.DateTimeField(null=True, blank=True, editable=False)
+    internal_reminder_sent_for = models.DateTimeField(null=True, blank=True, editable=False)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organization', 'start', 'id'], name='bookings_arc_org_start_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.title or 'Booking'} ({self.start.date()}) [archived]"
+
+
+class ArchivedAuditBooking(models.Model):
+    """Cold copy of an AuditBooking entry older than the archive horizon."""
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='archived_audit_bookings')
+    booking_id = models.IntegerField(null=True, blank=True)
+    event_type = models.CharField(max_length=32, choices=AuditBooking.EVENT_CHOICES)
+    booking_snapshot = models.JSONField(default=dict)
+    service = models.ForeignKey('Service', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    start = models.DateTimeField(null=True, blank=True)
+    end = models.DateTimeField(null=True, blank=True)
+    client_name = models.CharField(max_length=200, blank=True)
+    client_email = models.EmailField(blank=True)
+    created_at = models.DateTimeField()
+    created_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    extra = models.TextField(blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['organization', 'created_at'], name='bookings_arc_audit_org_cr_idx'),
+            models.Index(fields=['organization', 'booking_id'], name='bookings_arc_audit_bid_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived audit {self.event_type} booking {self.booking_id or 'unknown'}"
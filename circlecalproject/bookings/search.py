@@ -0,0 +1,121 @@
+"""Booking list search + keyset pagination helpers.
+
+Shared by the web bookings page (`calendar_app.views.bookings_list`) and the
+mobile API (`circlecalproject.api_bookings.BookingsListView`).
+
+- Search uses the denormalized `Booking.search_text` column (lowercased
+  title/client/email/ref). On Postgres it is backed by a pg_trgm GIN index
+  so `LIKE '%q%'` stays index-assisted; on SQLite it is a plain column scan
+  over a single field instead of four `icontains` clauses plus a join.
+- Pagination uses an opaque cursor over (start, id) so large orgs can page
+  arbitrarily far without OFFSET scans.
+"""
+
+import base64
+import re
+import unicodedata
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+_WS_RE = re.compile(r'\s+')
+
+# Booking fields that feed `Booking.search_text`.
+SEARCH_SOURCE_FIELDS = ('title', 'client_name', 'client_email', 'public_ref')
+
+
+def normalize_search_text(value) -> str:
+    """Lowercase, strip accents and collapse whitespace."""
+    if value is None:
+        return ''
+    try:
+        text = unicodedata.normalize('NFKD', str(value))
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+        return _WS_RE.sub(' ', text.casefold()).strip()
+    except Exception:
+        return ''
+
+
+def booking_search_text(booking) -> str:
+    """Build the normalized search document for a Booking instance."""
+    parts = []
+    for field in SEARCH_SOURCE_FIELDS:
+        raw = getattr(booking, field, None)
+        if raw:
+            parts.append(normalize_search_text(raw))
+    return ' '.join(p for p in parts if p)[:512]
+
+
+def apply_booking_search(qs, q, *, organization=None):
+    """Filter a Booking queryset by a free-text query.
+
+    Service names are matched through a small subquery on the (org-scoped)
+    services table rather than a join across every booking row.
+    """
+    term = normalize_search_text(q)
+    if not term:
+        return qs
+
+    from bookings.models import Service
+
+    svc_qs = Service.objects.filter(name__icontains=(q or '').strip())
+    if organization is not None:
+        svc_qs = svc_qs.filter(organization=organization)
+
+    return qs.filter(
+        Q(search_text__contains=term)
+        | Q(service_id__in=svc_qs.values('id'))
+    )
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(start: datetime, pk: int) -> str:
+    raw = f"{start.isoformat()}|{int(pk)}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by `encode_cursor`; raise InvalidCursor otherwise."""
+    try:
+        padded = str(cursor).strip()
+        padded += '=' * (-len(padded) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        start_raw, pk_raw = raw.rsplit('|', 1)
+        start = parse_datetime(start_raw)
+        if start is None or start.tzinfo is None:
+            raise ValueError('bad start')
+        return start, int(pk_raw)
+    except Exception as exc:
+        raise InvalidCursor('Invalid cursor.') from exc
+
+
+def keyset_page(qs, *, cursor=None, limit=200, descending=False):
+    """Return (items, next_cursor) for a Booking queryset ordered by (start, id).
+
+    The queryset ordering is replaced so the cursor predicate and ORDER BY
+    always agree (and match the (organization, start, id) index).
+    """
+    if descending:
+        qs = qs.order_by('-start', '-id')
+    else:
+        qs = qs.order_by('start', 'id')
+
+    if cursor:
+        c_start, c_id = decode_cursor(cursor)
+        if descending:
+            qs = qs.filter(Q(start__lt=c_start) | Q(start=c_start, id__lt=c_id))
+        else:
+            qs = qs.filter(Q(start__gt=c_start) | Q(start=c_start, id__gt=c_id))
+
+    rows = list(qs[: limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.start, last.id)
+    return rows, next_cursor
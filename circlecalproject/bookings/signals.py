@@ -9,8 +9,9 @@ from django.conf import settings
 from accounts.models import Business as Organization
 from accounts.models import Membership
 from accounts.push import send_push_to_user
-from .models import OrgSettings, Booking, ServiceSettingFreeze, AuditBooking, Service
-from .emails import send_booking_confirmation, send_booking_cancellation, send_internal_booking_cancellation_notification
+from accounts.teardown import teardown_in_progress
+from .models import OrgSettings, Booking, ServiceSettingFreeze, AuditBooking, Service, refresh_booking_local_days
+from .emails import send_booking_confirmation, send_booking_cancellation, send_internal_booking_cancellation_notification, queue_booking_email
 
 
 _BOOKING_PUSH_MANAGEMENT_ROLES = ('owner', 'admin', 'manager')
@@ -40,6 +41,26 @@ def create_org_settings(sender, instance, created, **kwargs):
         OrgSettings.objects.create(organization=instance)
 
 
+@receiver(pre_save, sender=Organization)
+def org_capture_prev_timezone(sender, instance, update_fields=None, **kwargs):
+    instance._prev_timezone = None
+    if not instance.pk or (update_fields is not None and 'timezone' not in update_fields):
+        return
+    try:
+        instance._prev_timezone = Organization.objects.filter(pk=instance.pk).values_list('timezone', flat=True).first()
+    except Exception:
+        instance._prev_timezone = None
+
+
+@receiver(post_save, sender=Organization)
+def org_timezone_refresh_booking_days(sender, instance, created, **kwargs):
+    """Keep Booking.local_date in the org's timezone when the timezone changes."""
+    prev = getattr(instance, '_prev_timezone', None)
+    if created or prev is None or prev == instance.timezone:
+        return
+    refresh_booking_local_days(instance.pk, instance.timezone)
+
+
 def _service_signature_tuple(svc) -> tuple:
     """Mirror calendar_app.views._service_schedule_signature without importing it."""
     try:
@@ -591,6 +612,9 @@ def push_notify_assigned_users_on_update(sender, instance: Booking, created: boo
 @receiver(post_delete, sender=Booking)
 def send_cancellation_email(sender, instance, **kwargs):
     """Send cancellation email when booking is deleted."""
+    # Business teardown summarizes the deletion once instead of per booking.
+    if teardown_in_progress():
+        return
     # Per-date overrides (service NULL) are internal schedule annotations.
     # They should not generate customer cancellation emails.
     # Use service_id to avoid triggering a Service fetch (which can raise
@@ -665,7 +689,7 @@ def send_cancellation_email(sender, instance, **kwargs):
     # Always notify internal recipients (owner/managers, and assignees when assigned).
     try:
         refund_info = getattr(instance, '_refund_info', None)
-        transaction.on_commit(lambda: send_internal_booking_cancellation_notification(instance, refund_info=refund_info))
+        queue_booking_email(instance, send_internal_booking_cancellation_notification, instance, refund_info=refund_info)
     except Exception:
         try:
             refund_info = getattr(instance, '_refund_info', None)
@@ -676,9 +700,10 @@ def send_cancellation_email(sender, instance, **kwargs):
     # Client-facing cancellation email (only when we have a client email).
     if instance.client_email:
         try:
-            # Schedule sending after transaction commit to ensure deletion persisted
+            # Schedule sending after transaction commit to ensure deletion persisted;
+            # shares one connection with the internal copy above.
             refund_info = getattr(instance, '_refund_info', None)
-            transaction.on_commit(lambda: send_booking_cancellation(instance, refund_info=refund_info))
+            queue_booking_email(instance, send_booking_cancellation, instance, refund_info=refund_info)
         except Exception:
             # Fallback to immediate send if on_commit unavailable
             try:
@@ -706,46 +731,40 @@ def _org_local_date_for(dt, org):
 
 
 def _maybe_remove_freeze(booking_instance):
-    # Use service_id and safe lookup so this cleanup never crashes if the
-    # Service row is already deleted (e.g., cascading org delete).
+    # Work from ids only so this cleanup never crashes if the Service row is
+    # already deleted (e.g., cascading org delete).
     service_id = getattr(booking_instance, 'service_id', None)
-    if not service_id:
-        return
-    try:
-        from .models import Service
-        svc = Service.objects.filter(id=service_id).first()
-    except Exception:
-        return
-    if not svc:
-        return
     org_id = getattr(booking_instance, 'organization_id', None)
-    if not org_id:
-        return
-    try:
-        org = Organization.objects.filter(id=org_id).first()
-    except Exception:
-        return
-    if not org:
-        return
-    try:
-        target_date = _org_local_date_for(booking_instance.start, org)
-    except Exception:
+    if not service_id or not org_id:
         return
+    target_date = getattr(booking_instance, 'local_date', None)
+    if target_date is None:
+        try:
+            org = Organization.objects.filter(id=org_id).first()
+            if not org:
+                return
+            target_date = _org_local_date_for(booking_instance.start, org)
+        except Exception:
+            return
 
     try:
-        exists = Booking.objects.filter(service=svc, organization=org, start__date=target_date).exists()
+        exists = Booking.objects.filter(
+            organization_id=org_id, service_id=service_id, local_date=target_date,
+        ).exists()
     except Exception:
         return
 
     if not exists:
         try:
-            ServiceSettingFreeze.objects.filter(service=svc, date=target_date).delete()
+            ServiceSettingFreeze.objects.filter(service_id=service_id, date=target_date).delete()
         except Exception:
             pass
 
 
 @receiver(post_delete, sender=Booking)
 def booking_post_delete_cleanup(sender, instance, **kwargs):
+    if teardown_in_progress():
+        return
     # Run after transaction commit to ensure deletion persisted
     def work():
         try:
@@ -768,6 +787,9 @@ def booking_post_delete_audit(sender, instance, **kwargs):
     JSON snapshot of the useful booking fields to aid debugging and
     owner-facing history UIs.
     """
+    if teardown_in_progress():
+        return
+
     def _create_audit():
         try:
             # Per-date overrides (service NULL) are internal schedule annotations.
@@ -0,0 +1,330 @@
+"""Deterministic synthetic tenants for benchmarks and capacity testing.
+
+`build_synthetic_org` creates one organization with a configurable number of
+services, members, bookings, per-date overrides and setting freezes. Rows are
+written with `bulk_create` in fixed-size batches (model `save()` and signals
+are skipped), so derived columns such as `public_ref`/`search_text`/`local_date` and the
+member profiles are filled in explicitly here. Bookings are generated lazily,
+batch by batch, so millions of rows never sit in memory at once.
+
+The same `seed` always produces the same tenant, which keeps benchmark runs
+and capacity tests comparable across commits. See the
+`generate_synthetic_tenants` management command for the CLI.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Business, Membership, Profile
+from bookings.models import (
+    Booking,
+    MemberWeeklyAvailability,
+    Service,
+    ServiceAssignment,
+    ServiceSettingFreeze,
+    ServiceWeeklyAvailability,
+    WeeklyAvailability,
+    booking_local_day,
+)
+from bookings.search import booking_search_text
+
+
+DURATION_CHOICES = (30, 45, 60, 90)
+BUFFER_CHOICES = (0, 0, 5, 10, 15)
+INCREMENT_CHOICES = (15, 30)
+DAY_START = time(8, 0)
+DAY_END = time(18, 0)
+# Split days (lunch break) use these two windows instead of DAY_START-DAY_END.
+SPLIT_WINDOWS = ((time(8, 0), time(12, 0)), (time(13, 0), time(18, 0)))
+
+_REF_ALPHABET = 'ABCDEFGHJKLMNPQRSTUVWXYZ23456789'
+
+
+@dataclass(frozen=True)
+class SyntheticOrgSpec:
+    services: int = 5
+    members: int = 3
+    bookings: int = 200
+    overrides: int = 20
+    freezes: int = 0
+    # Bookings/overrides are spread over the `past_days` days ending today
+    # and the `days` days starting tomorrow.
+    days: int = 14
+    past_days: int = 0
+    timezone: str = 'UTC'
+    plan_slug: str = 'team'
+    # Fraction of services that are group services (max_participants > 1)
+    # and fraction that are shared between two members.
+    group_ratio: float = 0.2
+    shared_ratio: float = 0.2
+    # Fraction of overrides that block time (the rest add availability).
+    blocking_ratio: float = 0.7
+    # Fraction of members/services whose weekly rules have a lunch break.
+    split_day_ratio: float = 0.0
+    # Zipf-style popularity skew: 0 spreads bookings evenly across services,
+    # ~1 concentrates most bookings on the first few services.
+    skew: float = 0.0
+    duration_choices: tuple = DURATION_CHOICES
+    batch_size: int = 5000
+
+
+@dataclass
+class SyntheticOrg:
+    org: Business
+    owner: object
+    services: list = field(default_factory=list)
+    memberships: list = field(default_factory=list)
+    first_day: date | None = None
+    counts: dict = field(default_factory=dict)
+
+
+def _aware(day: date, t: time, tz: ZoneInfo) -> datetime:
+    return datetime.combine(day, t).replace(tzinfo=tz)
+
+
+def _public_ref(rng: random.Random) -> str:
+    return ''.join(rng.choices(_REF_ALPHABET, k=12))
+
+
+def _weekly_windows(rng: random.Random, split_day_ratio: float):
+    return SPLIT_WINDOWS if rng.random() < split_day_ratio else ((DAY_START, DAY_END),)
+
+
+def _batched(iterable, size: int):
+    it = iter(iterable)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _ensure_plan_subscription(org: Business, plan_slug: str) -> None:
+    if not plan_slug:
+        return
+    from billing.models import Plan, Subscription
+
+    plan, _ = Plan.objects.get_or_create(
+        slug=plan_slug,
+        defaults={'name': plan_slug.title(), 'billing_period': 'monthly', 'price': 0},
+    )
+    Subscription.objects.update_or_create(
+        organization=org,
+        defaults={'plan': plan, 'status': 'active', 'active': True},
+    )
+
+
+def _iter_bookings(spec, rng, ref_rng, org, services, assignees_by_service, day_range, tz):
+    open_minutes = (DAY_END.hour - DAY_START.hour) * 60
+    if spec.skew > 0:
+        weights = [1.0 / ((i + 1) ** spec.skew) for i in range(len(services))]
+        cum_weights = list(itertools.accumulate(weights))
+    else:
+        cum_weights = None
+
+    for _ in range(spec.bookings):
+        if cum_weights:
+            svc = rng.choices(services, cum_weights=cum_weights)[0]
+        else:
+            svc = rng.choice(services)
+        day = day_range[rng.randrange(len(day_range))]
+        offset = rng.randrange(0, max(1, open_minutes - svc.duration + 1), 15)
+        start = _aware(day, DAY_START, tz) + timedelta(minutes=offset)
+        assignees = assignees_by_service.get(svc.id) or []
+        participants = rng.randint(1, svc.max_participants) if svc.max_participants > 1 else 1
+        bk = Booking(
+            organization=org,
+            service=svc,
+            title=svc.name,
+            start=start,
+            end=start + timedelta(minutes=svc.duration),
+            client_name=f'Client {rng.randrange(10 ** 6)}',
+            client_email=f'client{rng.randrange(10 ** 6)}@example.com',
+            assigned_user=(rng.choice(assignees).user if assignees else None),
+            participant_count=participants,
+            public_ref=_public_ref(ref_rng),
+        )
+        bk.search_text = booking_search_text(bk)
+        bk.local_date, bk.local_weekday = booking_local_day(start, org.timezone)
+        yield bk
+
+
+def _iter_overrides(spec, rng, ref_rng, org, memberships, day_range, tz):
+    open_minutes = (DAY_END.hour - DAY_START.hour) * 60
+    for _ in range(spec.overrides):
+        day = day_range[rng.randrange(len(day_range))]
+        blocking = rng.random() < spec.blocking_ratio
+        if rng.random() < 0.5:
+            start, end = _aware(day, time(0, 0), tz), _aware(day, time(23, 59), tz)
+        else:
+            start_min = rng.randrange(0, open_minutes - 60, 30)
+            start = _aware(day, DAY_START, tz) + timedelta(minutes=start_min)
+            end = start + timedelta(minutes=rng.choice((60, 90, 120)))
+        member = rng.choice(memberships) if (memberships and rng.random() < 0.5) else None
+        bk = Booking(
+            organization=org,
+            service=None,
+            title='Unavailable' if blocking else 'Available',
+            start=start,
+            end=end,
+            is_blocking=blocking,
+            assigned_user=(member.user if member else None),
+            public_ref=_public_ref(ref_rng),
+        )
+        bk.search_text = booking_search_text(bk)
+        bk.local_date, bk.local_weekday = booking_local_day(start, org.timezone)
+        yield bk
+
+
+def build_synthetic_org(spec: SyntheticOrgSpec | None = None, *, seed: int = 0, slug: str | None = None) -> SyntheticOrg:
+    """Create a synthetic organization described by `spec`.
+
+    Returns a `SyntheticOrg` holding the org, its owner, the created services,
+    member memberships (owner excluded) and per-table row counts.
+    """
+    spec = spec or SyntheticOrgSpec()
+    rng = random.Random(seed)
+    slug = slug or f'synthetic-{seed}'
+    # Public refs are globally unique, so derive them from the slug as well:
+    # the same seed under another slug gets the same schedule, new refs.
+    ref_rng = random.Random(f'{seed}:{slug}')
+    tz = ZoneInfo(spec.timezone)
+    batch_size = max(1, int(spec.batch_size))
+    User = get_user_model()
+    counts: dict[str, int] = {}
+
+    with transaction.atomic():
+        owner = User.objects.create_user(
+            username=f'{slug}-owner', email=f'owner@{slug}.example.com', password=None,
+        )
+        org = Business.objects.create(name=f'Synthetic {seed}', slug=slug, owner=owner, timezone=spec.timezone)
+        Membership.objects.update_or_create(
+            user=owner, organization=org, defaults={'role': 'owner', 'is_active': True},
+        )
+        _ensure_plan_subscription(org, spec.plan_slug)
+
+        User.objects.bulk_create(
+            (User(username=f'{slug}-m{i}', email=f'm{i}@{slug}.example.com', password='!') for i in range(spec.members)),
+            batch_size=batch_size,
+        )
+        users = list(User.objects.filter(username__startswith=f'{slug}-m').order_by('id'))
+        Profile.objects.bulk_create((Profile(user=u) for u in users), batch_size=batch_size, ignore_conflicts=True)
+        Membership.objects.bulk_create(
+            (Membership(user=u, organization=org, role='staff', is_active=True) for u in users),
+            batch_size=batch_size,
+        )
+        memberships = list(Membership.objects.filter(organization=org, user__in=users).select_related('user').order_by('id'))
+        counts['members'] = len(memberships)
+
+        WeeklyAvailability.objects.bulk_create([
+            WeeklyAvailability(organization=org, weekday=wd, start_time=DAY_START, end_time=DAY_END)
+            for wd in range(7)
+        ])
+        member_rows = [
+            MemberWeeklyAvailability(membership=m, weekday=wd, start_time=s, end_time=e)
+            for m in memberships
+            for windows in (_weekly_windows(rng, spec.split_day_ratio),)
+            for wd in range(7)
+            for s, e in windows
+        ]
+        MemberWeeklyAvailability.objects.bulk_create(member_rows, batch_size=batch_size)
+        counts['member_weekly'] = len(member_rows)
+
+        now = timezone.now()
+        durations = tuple(spec.duration_choices) or DURATION_CHOICES
+        Service.objects.bulk_create(
+            (
+                Service(
+                    organization=org,
+                    name=f'Service {i}',
+                    slug=f'{slug}-svc-{i}',
+                    duration=rng.choice(durations),
+                    buffer_after=rng.choice(BUFFER_CHOICES),
+                    time_increment_minutes=rng.choice(INCREMENT_CHOICES),
+                    max_participants=(rng.randint(2, 8) if rng.random() < spec.group_ratio else 1),
+                    min_notice_hours=0,
+                    max_booking_days=max(spec.days + 7, 60),
+                    signature_updated_at=now,
+                )
+                for i in range(spec.services)
+            ),
+            batch_size=batch_size,
+        )
+        services = list(Service.objects.filter(organization=org).order_by('id'))
+        counts['services'] = len(services)
+
+        service_rows = [
+            ServiceWeeklyAvailability(service=svc, weekday=wd, start_time=s, end_time=e)
+            for svc in services
+            for windows in (_weekly_windows(rng, spec.split_day_ratio),)
+            for wd in range(7)
+            for s, e in windows
+        ]
+        ServiceWeeklyAvailability.objects.bulk_create(service_rows, batch_size=batch_size)
+        counts['service_weekly'] = len(service_rows)
+
+        assignments = []
+        assignees_by_service = {}
+        if memberships:
+            for i, svc in enumerate(services):
+                picked = [memberships[i % len(memberships)]]
+                if len(memberships) > 1 and rng.random() < spec.shared_ratio:
+                    picked.append(memberships[(i + 1) % len(memberships)])
+                assignees_by_service[svc.id] = picked
+                assignments.extend(ServiceAssignment(service=svc, membership=m) for m in picked)
+        ServiceAssignment.objects.bulk_create(assignments, batch_size=batch_size)
+        counts['assignments'] = len(assignments)
+
+        first_day = (now.astimezone(tz) + timedelta(days=1)).date()
+        day_range = [first_day + timedelta(days=d) for d in range(-max(0, spec.past_days), max(1, spec.days))]
+
+        counts['bookings'] = 0
+        if services:
+            for batch in _batched(_iter_bookings(spec, rng, ref_rng, org, services, assignees_by_service, day_range, tz), batch_size):
+                Booking.objects.bulk_create(batch)
+                counts['bookings'] += len(batch)
+
+        counts['overrides'] = 0
+        for batch in _batched(_iter_overrides(spec, rng, ref_rng, org, memberships, day_range, tz), batch_size):
+            Booking.objects.bulk_create(batch)
+            counts['overrides'] += len(batch)
+
+        freezes = {}
+        for _ in range(spec.freezes):
+            if not services:
+                break
+            svc = rng.choice(services)
+            day = day_range[rng.randrange(len(day_range))]
+            freezes[(svc.id, day)] = ServiceSettingFreeze(
+                service=svc,
+                date=day,
+                frozen_settings={
+                    'duration': svc.duration,
+                    'buffer_after': svc.buffer_after,
+                    'time_increment_minutes': svc.time_increment_minutes,
+                    'use_fixed_increment': False,
+                    'allow_ends_after_availability': False,
+                    'allow_squished_bookings': False,
+                    'weekly_windows': [{'start': DAY_START.strftime('%H:%M'), 'end': DAY_END.strftime('%H:%M')}],
+                },
+            )
+        ServiceSettingFreeze.objects.bulk_create(list(freezes.values()), batch_size=batch_size)
+        counts['freezes'] = len(freezes)
+
+    return SyntheticOrg(
+        org=org,
+        owner=owner,
+        services=services,
+        memberships=memberships,
+        first_day=first_day,
+        counts=counts,
+    )
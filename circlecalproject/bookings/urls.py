@@ -1,5 +1,9 @@
 from django.urls import path
-from . import views
+from calendar_app.lazy_views import lazy_views
+from . import ics_feeds
+
+# Imported on first use; see calendar_app.lazy_views.
+views = lazy_views('bookings.views')
 
 app_name = 'bookings'
 
@@ -48,6 +52,18 @@ urlpatterns = [
         name="batch_availability_summary"
     ),
 
+    # First open slot within the booking horizon, per service and per org
+    path(
+        "bus/<slug:org_slug>/services/<slug:service_slug>/next-available/",
+        views.service_next_available,
+        name="service_next_available"
+    ),
+    path(
+        "bus/<slug:org_slug>/next-available/",
+        views.org_next_available,
+        name="org_next_available"
+    ),
+
     # Public busy intervals for a date range (no auth): used by client to hide booked times
     path(
         "bus/<slug:org_slug>/busy/",
@@ -61,5 +77,9 @@ urlpatterns = [
     path("reschedule/<int:booking_id>/", views.reschedule_booking, name="reschedule_booking"),
     # Public ICS export for a booking (signed token or authenticated staff)
     path("ics/<int:booking_id>/", views.booking_ics, name="booking_ics"),
+    # Subscribable calendar feeds (signed org/member/service tokens)
+    path("ics/feed/<str:token>.ics", ics_feeds.ics_feed, name="ics_feed"),
+    path("bus/<slug:org_slug>/calendar-feeds/", ics_feeds.feed_links, name="ics_feed_links"),
+    path("bus/<slug:org_slug>/calendar-feeds/reset/", ics_feeds.reset_feed_links, name="ics_feed_links_reset"),
 
 ]
\ No newline at end of file
@@ -27,8 +27,11 @@ from bookings.models import Booking
 from bookings.models import WeeklyAvailability, OrgSettings
 from bookings.models import ServiceAssignment
 from bookings.models import PublicBookingIntent
+from bookings.capacity import GroupCapacityLedger, service_max_participants
+from bookings.resource_allocation import ResourceAllocator
 from calendar_app.utils import user_has_role  # <-- single source of truth
 from calendar_app.permissions import require_roles
+from calendar_app.db_routing import read_replica
 from billing.utils import get_subscription
 from billing.utils import get_plan_slug, TEAM_SLUG, PRO_SLUG
 from billing.utils import can_use_offline_payment_methods
@@ -308,11 +311,7 @@ def _active_service_freeze_for_date(org, service, target_date, org_tz):
         return None
 
     try:
-        day_start = datetime(target_date.year, target_date.month, target_date.day, 0, 0, 0)
-        if day_start.tzinfo is None:
-            day_start = make_aware(day_start, org_tz)
-        day_end = day_start + timedelta(days=1)
-        has_bookings = Booking.objects.filter(service=service, organization=org, start__gte=day_start, start__lt=day_end).exists()
+        has_bookings = Booking.objects.filter(organization=org, service=service, local_date=target_date).exists()
         return freeze if has_bookings else None
     except Exception:
         # Be conservative on errors: keep freeze.
@@ -1341,27 +1340,20 @@ def _service_resource_ids(service: Optional[Service]):
         return []
 
 
-def _resource_overlaps_any_booking(org: Organization, start_dt, end_dt, service: Optional[Service], resource_id: int) -> bool:
-    """True if the given resource is busy for the candidate window."""
-    if not resource_id:
-        return True
-    # Reuse the overlap logic but scope the candidates to a specific resource.
-    return _has_overlap(org, start_dt, end_dt, service=service, resource_id=int(resource_id))
-
-
-def _find_available_resource_id(org: Organization, service: Service, start_dt, end_dt) -> Optional[int]:
+def _find_available_resource_id(org: Organization, service: Service, start_dt, end_dt, allocator: Optional[ResourceAllocator] = None) -> Optional[int]:
     """Return an available resource_id for this service/slot, else None.
 
-    If the service has no resource links configured, returns None.
+    If the service has no resource links configured, returns None. Pass an
+    `allocator` covering the slot to answer from memory (availability loops);
+    otherwise one query loads the bookings of every linked resource.
     """
+    if allocator is not None and allocator.covers(start_dt, end_dt):
+        return allocator.free_resource_id(start_dt, end_dt)
+
     resource_ids = _service_resource_ids(service)
     if not resource_ids:
         return None
-
-    for rid in resource_ids:
-        if not _resource_overlaps_any_booking(org, start_dt, end_dt, service=service, resource_id=rid):
-            return int(rid)
-    return None
+    return ResourceAllocator(org, service, resource_ids, start_dt, end_dt).free_resource_id(start_dt, end_dt)
 
 
 def _validate_resource_for_service(org: Organization, service: Service, resource_id: Optional[int]) -> Optional[FacilityResource]:
@@ -1445,7 +1437,7 @@ def _require_org_and_role(request, roles=("owner", "admin", "manager", "staff"))
     return org, None
 
 
-def _has_overlap(org, start_dt, end_dt, service=None, resource_id: Optional[int] = None, requested_participants: int = 1):
+def _has_overlap(org, start_dt, end_dt, service=None, resource_id: Optional[int] = None, requested_participants: int = 1, ledger: Optional[GroupCapacityLedger] = None):
     """
     Prevent overlapping bookings inside the same organization.
     If `service` is provided, take its `buffer_before` and `buffer_after` into account
@@ -1536,19 +1528,22 @@ def _has_overlap(org, start_dt, end_dt, service=None, resource_id: Optional[int]
             requested_qty = 1
 
         if max_participants > 1:
-            same_slot_qs = Booking.objects.filter(
-                organization=org,
-                is_blocking=False,
-                service=service,
-                start=start_dt,
-                end=end_dt,
-            )
-            if resource_id is not None:
-                same_slot_qs = same_slot_qs.filter(resource_id=int(resource_id))
-            try:
-                booked_participants = int(same_slot_qs.aggregate(total=Sum('participant_count')).get('total') or 0)
-            except Exception:
-                booked_participants = 0
+            if ledger is not None and ledger.covers(start_dt, end_dt):
+                booked_participants = ledger.booked(start_dt, end_dt, resource_id)
+            else:
+                same_slot_qs = Booking.objects.filter(
+                    organization=org,
+                    is_blocking=False,
+                    service=service,
+                    start=start_dt,
+                    end=end_dt,
+                )
+                if resource_id is not None:
+                    same_slot_qs = same_slot_qs.filter(resource_id=int(resource_id))
+                try:
+                    booked_participants = int(same_slot_qs.aggregate(total=Sum('participant_count')).get('total') or 0)
+                except Exception:
+                    booked_participants = 0
             same_slot_share_allowed = (booked_participants + requested_qty) <= max_participants
 
     for b in candidate_qs:
@@ -1583,19 +1578,19 @@ def _has_overlap(org, start_dt, end_dt, service=None, resource_id: Optional[int]
     return False
 
 
-def _slot_remaining_capacity(org: Organization, service: Optional[Service], start_dt, end_dt, resource_id: Optional[int] = None) -> int:
+def _slot_remaining_capacity(org: Organization, service: Optional[Service], start_dt, end_dt, resource_id: Optional[int] = None, ledger: Optional[GroupCapacityLedger] = None) -> int:
     """Return remaining participant capacity for an exact service slot.
 
-    For non-group services (max_participants <= 1), returns 1.
+    For non-group services (max_participants <= 1), returns 1. Served from
+    `ledger` when one covering the slot is passed.
     """
     if not service:
         return 1
-    try:
-        max_participants = int(getattr(service, 'max_participants', 1) or 1)
-    except Exception:
-        max_participants = 1
+    max_participants = service_max_participants(service)
     if max_participants <= 1:
         return 1
+    if ledger is not None and ledger.covers(start_dt, end_dt):
+        return ledger.remaining(start_dt, end_dt, resource_id)
 
     qs = Booking.objects.filter(
         organization=org,
@@ -2498,7 +2493,10 @@ def create_booking(request, org_slug):
             if not selected_resource_id:
                 return HttpResponseBadRequest('No facility resources are available for that time slot.')
 
-    remaining_for_slot = _slot_remaining_capacity(org, service, start_dt, end_dt, resource_id=selected_resource_id)
+    # One grouped query serves both the remaining-seats check and the
+    # same-slot branch of the overlap check below.
+    capacity_ledger = GroupCapacityLedger(org, service, start_dt, end_dt)
+    remaining_for_slot = _slot_remaining_capacity(org, service, start_dt, end_dt, resource_id=selected_resource_id, ledger=capacity_ledger)
     if participant_count > remaining_for_slot:
         if remaining_for_slot <= 0:
             return HttpResponseBadRequest('That time slot is full. Please choose another slot.')
@@ -2506,7 +2504,7 @@ def create_booking(request, org_slug):
 
     # Overlap check (buffer-aware when `service` provided). If this service uses
     # discrete resources, scope overlap checks to the selected resource.
-    overlap_result = _has_overlap(org, start_dt, end_dt, service=service, resource_id=selected_resource_id, requested_participants=participant_count)
+    overlap_result = _has_overlap(org, start_dt, end_dt, service=service, resource_id=selected_resource_id, requested_participants=participant_count, ledger=capacity_ledger)
     squish_warning = None
     if overlap_result:
         # If the service allows 'squished' bookings, permit creation but add a non-blocking warning
@@ -3161,6 +3159,26 @@ def batch_delete(request, org_slug):
 
 
 
+def _public_org_services(org):
+    """Services listed on the public org page (and searched by `org_next_available`)."""
+    services = list(org.services.filter(show_on_public_calendar=True))
+
+    # Safety: if a service requires facility resources but has none linked,
+    # do not show it on the public page (it cannot be booked correctly).
+    try:
+        req_ids = [s.id for s in services if bool(getattr(s, 'requires_facility_resources', False))]
+        if req_ids:
+            linked = set(
+                ServiceResource.objects.filter(service_id__in=req_ids, resource__is_active=True)
+                .values_list('service_id', flat=True)
+            )
+            services = [s for s in services if (not bool(getattr(s, 'requires_facility_resources', False))) or (s.id in linked)]
+    except Exception:
+        pass
+    return services
+
+
+@read_replica
 def public_org_page(request, org_slug):
     org = get_object_or_404(Organization, slug=org_slug)
     is_embed = _is_embed_request(request)
@@ -3191,21 +3209,7 @@ def public_org_page(request, org_slug):
                 pass
             return resp
 
-    services_qs = org.services.filter(show_on_public_calendar=True)
-    services = list(services_qs)
-
-    # Safety: if a service requires facility resources but has none linked,
-    # do not show it on the public page (it cannot be booked correctly).
-    try:
-        req_ids = [s.id for s in services if bool(getattr(s, 'requires_facility_resources', False))]
-        if req_ids:
-            linked = set(
-                ServiceResource.objects.filter(service_id__in=req_ids, resource__is_active=True)
-                .values_list('service_id', flat=True)
-            )
-            services = [s for s in services if (not bool(getattr(s, 'requires_facility_resources', False))) or (s.id in linked)]
-    except Exception:
-        pass
+    services = _public_org_services(org)
     # Attach assigned member display names to each service so the public
     # org list (including embeds) can show "With: ..." consistently.
     try:
@@ -3501,6 +3505,7 @@ def _build_public_service_page_context(
 
 @csrf_exempt
 @require_http_methods(['GET', 'POST'])
+@read_replica
 def public_service_page(request, org_slug, service_slug):
     """
     Public booking page for a single service.
@@ -3718,7 +3723,8 @@ def public_service_page(request, org_slug, service_slug):
         if participant_count > max_participants:
             return HttpResponseBadRequest('Participant count exceeds this service\'s maximum capacity.')
 
-        remaining_for_slot = _slot_remaining_capacity(org, service, start, end)
+        capacity_ledger = GroupCapacityLedger(org, service, start, end)
+        remaining_for_slot = _slot_remaining_capacity(org, service, start, end, ledger=capacity_ledger)
         if participant_count > remaining_for_slot:
             ctx = _build_public_service_page_context(
                 request,
@@ -3744,7 +3750,7 @@ def public_service_page(request, org_slug, service_slug):
             return resp
 
         # Double-check there's still no conflict (exclude per-date overrides)
-        conflict = _has_overlap(org, start, end, service=service, requested_participants=participant_count)
+        conflict = _has_overlap(org, start, end, service=service, requested_participants=participant_count, ledger=capacity_ledger)
         if conflict:
             ctx = _build_public_service_page_context(
                 request,
@@ -3994,11 +4000,10 @@ def public_service_page(request, org_slug, service_slug):
 
         # Owner notification for offline/free is immediate.
         try:
-            from django.db import transaction
-            from .emails import send_owner_booking_notification
+            from .emails import send_owner_booking_notification, queue_booking_email
             if getattr(org, "owner", None) and org.owner.email:
                 try:
-                    transaction.on_commit(lambda: send_owner_booking_notification(booking))
+                    queue_booking_email(booking, send_owner_booking_notification, booking)
                 except Exception:
                     try:
                         send_owner_booking_notification(booking)
@@ -4027,10 +4032,9 @@ def public_service_page(request, org_slug, service_slug):
                     pass
 
                 try:
-                    from django.db import transaction
-                    from .emails import send_booking_rescheduled
+                    from .emails import send_booking_rescheduled, queue_booking_email
                     try:
-                        transaction.on_commit(lambda: send_booking_rescheduled(booking, old_booking_id=reschedule_old_id))
+                        queue_booking_email(booking, send_booking_rescheduled, booking, old_booking_id=reschedule_old_id)
                     except Exception:
                         try:
                             send_booking_rescheduled(booking, old_booking_id=reschedule_old_id)
@@ -4042,8 +4046,7 @@ def public_service_page(request, org_slug, service_slug):
             pass
 
         try:
-            from django.db import transaction
-            from .emails import send_booking_confirmation
+            from .emails import send_booking_confirmation, queue_booking_email
             if not reschedule_old_id:
                 try:
                     def _maybe_send():
@@ -4052,7 +4055,7 @@ def public_service_page(request, org_slug, service_slug):
                                 send_booking_confirmation(booking)
                         except Exception:
                             pass
-                    transaction.on_commit(_maybe_send)
+                    queue_booking_email(booking, _maybe_send)
                 except Exception:
                     try:
                         if not getattr(booking, '_suppress_confirmation', False):
@@ -4156,10 +4159,9 @@ def booking_success(request, org_slug, service_slug, booking_id):
                     pass
 
                 try:
-                    from django.db import transaction
-                    from .emails import send_booking_rescheduled
+                    from .emails import send_booking_rescheduled, queue_booking_email
                     try:
-                        transaction.on_commit(lambda: send_booking_rescheduled(booking, old_booking_id=old_id))
+                        queue_booking_email(booking, send_booking_rescheduled, booking, old_booking_id=old_id)
                     except Exception:
                         try:
                             send_booking_rescheduled(booking, old_booking_id=old_id)
@@ -4172,10 +4174,9 @@ def booking_success(request, org_slug, service_slug, booking_id):
 
         try:
             if not old_id:
-                from django.db import transaction
-                from .emails import send_booking_confirmation
+                from .emails import send_booking_confirmation, queue_booking_email
                 try:
-                    transaction.on_commit(lambda: send_booking_confirmation(booking))
+                    queue_booking_email(booking, send_booking_confirmation, booking)
                 except Exception:
                     try:
                         send_booking_confirmation(booking)
@@ -4185,11 +4186,10 @@ def booking_success(request, org_slug, service_slug, booking_id):
             pass
 
         try:
-            from django.db import transaction
-            from .emails import send_owner_booking_notification
+            from .emails import send_owner_booking_notification, queue_booking_email
             if getattr(org, "owner", None) and org.owner.email:
                 try:
-                    transaction.on_commit(lambda: send_owner_booking_notification(booking))
+                    queue_booking_email(booking, send_owner_booking_notification, booking)
                 except Exception:
                     try:
                         send_owner_booking_notification(booking)
@@ -4354,11 +4354,10 @@ def public_stripe_return(request, org_slug, service_slug, intent_id: int):
 
     # Owner notification
     try:
-        from django.db import transaction
-        from .emails import send_owner_booking_notification
+        from .emails import send_owner_booking_notification, queue_booking_email
         if getattr(org, 'owner', None) and org.owner.email:
             try:
-                transaction.on_commit(lambda: send_owner_booking_notification(booking))
+                queue_booking_email(booking, send_owner_booking_notification, booking)
             except Exception:
                 try:
                     send_owner_booking_notification(booking)
@@ -4387,10 +4386,9 @@ def public_stripe_return(request, org_slug, service_slug, intent_id: int):
                 pass
 
             try:
-                from django.db import transaction
-                from .emails import send_booking_rescheduled
+                from .emails import send_booking_rescheduled, queue_booking_email
                 try:
-                    transaction.on_commit(lambda: send_booking_rescheduled(booking, old_booking_id=old_id))
+                    queue_booking_email(booking, send_booking_rescheduled, booking, old_booking_id=old_id)
                 except Exception:
                     try:
                         send_booking_rescheduled(booking, old_booking_id=old_id)
@@ -4400,8 +4398,7 @@ def public_stripe_return(request, org_slug, service_slug, intent_id: int):
                 pass
         else:
             try:
-                from django.db import transaction
-                from .emails import send_booking_confirmation
+                from .emails import send_booking_confirmation, queue_booking_email
 
                 def _maybe_send():
                     try:
@@ -4410,7 +4407,7 @@ def public_stripe_return(request, org_slug, service_slug, intent_id: int):
                         pass
 
                 try:
-                    transaction.on_commit(_maybe_send)
+                    queue_booking_email(booking, _maybe_send)
                 except Exception:
                     try:
                         send_booking_confirmation(booking)
@@ -4523,6 +4520,7 @@ def create_service(request, org_slug):
 
 @require_http_methods(["GET"])
 @never_cache
+@read_replica
 def service_availability(request, org_slug, service_slug):
     """
     Returns a list of *AVAILABLE* time slots for a specific service.
@@ -4563,6 +4561,23 @@ def service_availability(request, org_slug, service_slug):
     if not range_start or not range_end:
         return HttpResponseBadRequest("Invalid datetime format")
 
+    result = _service_available_slots(request, org, service, range_start, range_end, org_tz)
+    if isinstance(result, HttpResponse):
+        return result
+    return JsonResponse(result, safe=False)
+
+
+def _service_available_slots(request, org, service, range_start, range_end, org_tz, params=None):
+    """Compute the available slot dicts for `service` between two org-local datetimes.
+
+    Shared by `service_availability` and the next-available search. `params`
+    defaults to `request.GET` and carries the optional `inc`, `edge_buffers`
+    and `debug_avail` knobs; debug requests get a `JsonResponse` back instead
+    of a list.
+    """
+    if params is None:
+        params = request.GET
+
     # ---------------------------------------------
     # STEP 1: Filter out time too soon or too far
     # ---------------------------------------------
@@ -4659,12 +4674,12 @@ def service_availability(request, org_slug, service_slug):
                     member_full_day_blocked.add(uid)
 
     if blocking_full_day:
-        return JsonResponse([], safe=False)
+        return []
     if is_shared_service and assignee_users:
         try:
             all_uids = set([getattr(u, 'id', None) for u in assignee_users if getattr(u, 'id', None)])
             if all_uids and member_full_day_blocked.issuperset(all_uids):
-                return JsonResponse([], safe=False)
+                return []
         except Exception:
             pass
 
@@ -4717,13 +4732,13 @@ def service_availability(request, org_slug, service_slug):
     # controlled by the public page via the `edge_buffers` query param. When
     # false (default) the availability will show denser UI increments and
     # only hide slots after bookings using the booked appointment buffers.
-    apply_edge_buffers = request.GET.get('edge_buffers') in ('1', 'true', 'True')
+    apply_edge_buffers = params.get('edge_buffers') in ('1', 'true', 'True')
 
     available_slots = []
 
     debug_avail = False
     try:
-        debug_avail = (request.GET.get('debug_avail') == '1')
+        debug_avail = (params.get('debug_avail') == '1')
     except Exception:
         debug_avail = False
 
@@ -4962,13 +4977,13 @@ def service_availability(request, org_slug, service_slug):
                 })
             except Exception:
                 pass
-        return JsonResponse([], safe=False)
+        return []
 
     # Determine slot increment: front-end may pass `?inc=` (minutes) to control
     # the UI tick spacing. If provided and valid, use it for slot iteration;
     # otherwise fall back to the service's configured increment or, when
     # `use_fixed_increment` is True, to duration+buffer.
-    inc_param = request.GET.get('inc')
+    inc_param = params.get('inc')
     try:
         if inc_param:
             val = int(inc_param)
@@ -4993,6 +5008,17 @@ def service_availability(request, org_slug, service_slug):
     # If this service is configured with discrete facility resources (cages/rooms),
     # availability should be computed as "any resource free" rather than org-wide capacity=1.
     svc_resource_ids = _service_resource_ids(service)
+    resource_allocator = None
+    if svc_resource_ids and base_windows:
+        # One query for every linked resource across the requested range; the
+        # extra day covers slots that run past the last window's end.
+        resource_allocator = ResourceAllocator(
+            org,
+            service,
+            svc_resource_ids,
+            min(w[0] for w in base_windows),
+            max(w[1] for w in base_windows) + timedelta(days=1),
+        )
 
     for win_start, win_end in base_windows:
         # Keep windows even if their early portion violates min notice; we'll just skip early slots.
@@ -5157,7 +5183,7 @@ def service_availability(request, org_slug, service_slug):
                     pass
 
                 # Facility resource enforcement: require at least one free resource.
-                if _find_available_resource_id(org, service, slot_start, slot_end) is None:
+                if _find_available_resource_id(org, service, slot_start, slot_end, allocator=resource_allocator) is None:
                     slot_start += slot_increment
                     continue
 
@@ -5297,46 +5323,13 @@ def service_availability(request, org_slug, service_slug):
                 slot_start += slot_increment
 
     # Group-capacity top-up: if a slot already has bookings for this service but
-    # has not reached max participants, keep that exact slot available.
-    try:
-        max_participants = int(getattr(service, 'max_participants', 1) or 1)
-    except Exception:
-        max_participants = 1
+    # has not reached max participants, keep that exact slot available. Seats
+    # left come from one grouped query over the whole range (the ledger).
+    max_participants = service_max_participants(service)
 
     if max_participants > 1:
         try:
-            remaining_by_key = {}
-            grouped = (
-                Booking.objects
-                .filter(
-                    organization=org,
-                    service=service,
-                    is_blocking=False,
-                    start__lt=range_end,
-                    end__gt=range_start,
-                )
-                .values('start', 'end')
-                .annotate(total_participants=Sum('participant_count'))
-            )
-
-            for row in grouped:
-                slot_start = row.get('start')
-                slot_end = row.get('end')
-                if not slot_start or not slot_end:
-                    continue
-                try:
-                    slot_start_org = slot_start.astimezone(org_tz)
-                except Exception:
-                    slot_start_org = slot_start
-                try:
-                    slot_end_org = slot_end.astimezone(org_tz)
-                except Exception:
-                    slot_end_org = slot_end
-                try:
-                    booked_total = int(row.get('total_participants') or 0)
-                except Exception:
-                    booked_total = 0
-                remaining_by_key[(slot_start_org.isoformat(), slot_end_org.isoformat())] = max(0, int(max_participants - booked_total))
+            capacity_ledger = GroupCapacityLedger(org, service, range_start, range_end)
 
             existing_keys = set()
             normalized_slots = []
@@ -5344,25 +5337,21 @@ def service_availability(request, org_slug, service_slug):
                 try:
                     key = (si.get('start'), si.get('end'))
                     existing_keys.add(key)
-                    remaining = int(remaining_by_key.get(key, max_participants))
+                    remaining = capacity_ledger.remaining(
+                        datetime.fromisoformat(key[0]), datetime.fromisoformat(key[1])
+                    )
                     if remaining <= 0:
                         continue
                     si['remaining_capacity'] = remaining
+                    si['capacity'] = max_participants
                     normalized_slots.append(si)
                 except Exception:
                     continue
             available_slots = normalized_slots
 
-            for row in grouped:
-                try:
-                    booked_total = int(row.get('total_participants') or 0)
-                except Exception:
-                    booked_total = 0
+            for slot_start, slot_end, booked_total in capacity_ledger.slots():
                 if booked_total >= max_participants:
                     continue
-
-                slot_start = row.get('start')
-                slot_end = row.get('end')
                 if not slot_start or not slot_end:
                     continue
                 try:
@@ -5391,6 +5380,7 @@ def service_availability(request, org_slug, service_slug):
                     'used_freeze': False,
                     'freeze_date': None,
                     'remaining_capacity': max(0, int(max_participants - booked_total)),
+                    'capacity': max_participants,
                 })
                 existing_keys.add(k)
         except Exception:
@@ -5458,7 +5448,7 @@ def service_availability(request, org_slug, service_slug):
     except Exception:
         pass
 
-    return JsonResponse(available_slots, safe=False)
+    return available_slots
 
 
 @require_http_methods(["GET"])
@@ -5529,6 +5519,7 @@ def service_effective_settings(request, org_slug, service_slug):
 
 @require_http_methods(["GET"])
 @never_cache
+@read_replica
 def batch_availability_summary(request, org_slug, service_slug):
     """Returns a daily availability summary for a date range.
     Query params: start, end (ISO 8601 date strings).
@@ -5564,10 +5555,24 @@ def batch_availability_summary(request, org_slug, service_slug):
     if not range_start or not range_end:
         return HttpResponseBadRequest("Invalid datetime format")
 
-    # Iterate each day and check if it has slots
     summary = {}
+    for day_start, has_slots in _iter_day_availability(org, service, range_start, range_end, org_tz):
+        summary[day_start.strftime('%Y-%m-%d')] = has_slots
+    return JsonResponse(summary, safe=False)
+
+
+def _iter_day_availability(org, service, range_start, range_end, org_tz):
+    """Yield `(day_start, has_slots)` for each org-local day in the range.
+
+    This is the cheap day-level check behind `batch_availability_summary` and
+    the next-available search: it only looks at the booking horizon, weekly
+    rules, per-date overrides and freezes, never at individual slots. Those
+    inputs are loaded once for the bookable part of the range, so each day is
+    decided in memory (freeze lookups only hit the DB on dates that have one),
+    and callers that stop consuming early skip the remaining days entirely.
+    """
     current = range_start.replace(hour=0, minute=0, second=0, microsecond=0)
-    
+
     # Calculate the exclusive upper bound for bookable dates.
     # If max_booking_days is 1, clients should still be able to book tomorrow,
     # so the day-level summary must allow dates through tomorrow's end.
@@ -5575,7 +5580,7 @@ def batch_availability_summary(request, org_slug, service_slug):
     today_midnight = now_org.replace(hour=0, minute=0, second=0, microsecond=0)
     max_booking_date = today_midnight + timedelta(days=(service.max_booking_days + 1))
     earliest_allowed = now_org + timedelta(hours=service.min_notice_hours)
-    
+
     # Trial limit: cap max_booking_date to trial_end if org is on active trial
     subscription = get_subscription(org)
     if subscription and subscription.status == 'trialing' and subscription.trial_end:
@@ -5589,74 +5594,118 @@ def batch_availability_summary(request, org_slug, service_slug):
         if trial_end_midnight < max_booking_date:
             max_booking_date = trial_end_midnight
 
-    # If this service is explicitly scoped (has any active service-weekly rows OR
-    # is unassigned/shared/partitioned), days without service rows are unavailable.
+    # Days outside [earliest_allowed, max_booking_date) are unavailable without
+    # any lookups; only load rules and overrides for the bookable stretch.
+    scan_start = max(current, earliest_allowed.replace(hour=0, minute=0, second=0, microsecond=0))
+    scan_end = min(range_end, max_booking_date)
+    if scan_start >= scan_end:
+        while current < range_end:
+            yield current, False
+            current += timedelta(days=1)
+        return
+
     try:
-        if _trial_single_active_service(org):
-            svc_has_any_weekly = False
-        else:
-            svc_has_any_weekly = service.weekly_availability.filter(is_active=True).exists()
+        trial_single = _trial_single_active_service(org)
     except Exception:
-        svc_has_any_weekly = False
+        trial_single = False
 
+    # Service weekly rows, grouped by weekday.
+    svc_rows_by_weekday = {}
+    if not trial_single:
+        try:
+            for w in service.weekly_availability.filter(is_active=True).order_by('start_time'):
+                svc_rows_by_weekday.setdefault(w.weekday, []).append(w)
+        except Exception:
+            svc_rows_by_weekday = {}
+
+    # If this service is explicitly scoped (has any active service-weekly rows OR
+    # is unassigned/shared/partitioned), days without service rows are unavailable.
+    svc_has_any_weekly = bool(svc_rows_by_weekday)
     try:
         svc_requires_explicit = _service_requires_explicit_weekly(org, service)
     except Exception:
         svc_requires_explicit = False
 
     svc_is_scoped = bool(svc_has_any_weekly or svc_requires_explicit)
-    
+
+    org_rows_by_weekday = {}
+    try:
+        for w in WeeklyAvailability.objects.filter(organization=org, is_active=True):
+            org_rows_by_weekday.setdefault(w.weekday, []).append(w)
+    except Exception:
+        org_rows_by_weekday = {}
+    any_org_rows = bool(org_rows_by_weekday)
+
+    # Per-date overrides (service NULL bookings).
+    # For shared services, member-scoped full-day blocks should only block
+    # the service day when *all* assignees are blocked.
+    assignee_users = _service_assignee_users(service)
+    is_shared_service = bool(len(assignee_users) >= 2)
+
+    service_overrides = list(_per_date_overrides_qs(
+        org,
+        scan_start,
+        scan_end + timedelta(days=1),
+        service=service,
+        users=None,
+    ))
+    member_overrides = list(_per_date_overrides_qs(
+        org,
+        scan_start,
+        scan_end + timedelta(days=1),
+        service=None,
+        users=assignee_users,
+    ).select_related('assigned_user')) if assignee_users else []
+
+    try:
+        from bookings.models import ServiceSettingFreeze
+        freeze_dates = set(
+            ServiceSettingFreeze.objects.filter(
+                service=service,
+                date__gte=scan_start.date(),
+                date__lte=scan_end.date(),
+            ).values_list('date', flat=True)
+        )
+    except Exception:
+        freeze_dates = set()
+
+    # Per-service lookups that do not depend on the date, resolved on first use.
+    _unset = object()
+    inherited_membership = _unset
+    solo_membership = _unset
+
+    def _to_org(dt):
+        try:
+            return dt.astimezone(org_tz)
+        except Exception:
+            return dt
+
     while current < range_end:
         day_start = current
         day_end = current.replace(hour=23, minute=59, second=59)
-        
+
         # If entire day is in the past or before min notice, no slots
         if day_end < earliest_allowed:
-            summary[current.strftime('%Y-%m-%d')] = False
+            yield current, False
             current += timedelta(days=1)
             continue
-        
+
         # If day is beyond max_booking_days, no slots
         if day_start >= max_booking_date:
-            summary[current.strftime('%Y-%m-%d')] = False
+            yield current, False
             current += timedelta(days=1)
             continue
 
-        # Per-date overrides (service NULL bookings).
-        # For shared services, member-scoped full-day blocks should only block
-        # the service day when *all* assignees are blocked.
-        assignee_users = _service_assignee_users(service)
-        is_shared_service = bool(len(assignee_users) >= 2)
-
-        service_override_qs = _per_date_overrides_qs(
-            org,
-            day_start,
-            day_end,
-            service=service,
-            users=None,
-        )
-        member_override_qs = _per_date_overrides_qs(
-            org,
-            day_start,
-            day_end,
-            service=None,
-            users=assignee_users,
-        ) if assignee_users else Booking.objects.none()
-
         org_availability_override_windows = []
         service_availability_override_windows = []
         full_block = False
 
         # 1) Service/org scoped blocks + availability windows
-        for bk in service_override_qs:
-            try:
-                bk_start_org = bk.start.astimezone(org_tz)
-            except Exception:
-                bk_start_org = bk.start
-            try:
-                bk_end_org = bk.end.astimezone(org_tz)
-            except Exception:
-                bk_end_org = bk.end
+        for bk in service_overrides:
+            if not (bk.start < day_end and bk.end > day_start):
+                continue
+            bk_start_org = _to_org(bk.start)
+            bk_end_org = _to_org(bk.end)
 
             if bk.is_blocking:
                 # Treat a blocking override as full-day block if it covers the entire day.
@@ -5674,30 +5723,25 @@ def batch_availability_summary(request, org_slug, service_slug):
 
         # 2) Member scoped full-day blocks
         member_full_day_blocked = set()
-        if assignee_users:
-            for bk in member_override_qs:
-                if not getattr(bk, 'is_blocking', False):
-                    continue
-                try:
-                    bk_start_org = bk.start.astimezone(org_tz)
-                except Exception:
-                    bk_start_org = bk.start
-                try:
-                    bk_end_org = bk.end.astimezone(org_tz)
-                except Exception:
-                    bk_end_org = bk.end
+        for bk in member_overrides:
+            if not getattr(bk, 'is_blocking', False):
+                continue
+            if not (bk.start < day_end and bk.end > day_start):
+                continue
+            bk_start_org = _to_org(bk.start)
+            bk_end_org = _to_org(bk.end)
 
-                covers_start = bk_start_org <= day_start + timedelta(minutes=1)
-                covers_end = bk_end_org >= day_end - timedelta(minutes=1)
-                if covers_start and covers_end:
-                    u = getattr(bk, 'assigned_user', None)
-                    uid = getattr(u, 'id', None) if u else None
-                    if uid:
-                        member_full_day_blocked.add(uid)
+            covers_start = bk_start_org <= day_start + timedelta(minutes=1)
+            covers_end = bk_end_org >= day_end - timedelta(minutes=1)
+            if covers_start and covers_end:
+                u = getattr(bk, 'assigned_user', None)
+                uid = getattr(u, 'id', None) if u else None
+                if uid:
+                    member_full_day_blocked.add(uid)
 
         # Day-level blocking rules
         if full_block:
-            summary[current.strftime('%Y-%m-%d')] = False
+            yield current, False
             current += timedelta(days=1)
             continue
 
@@ -5706,7 +5750,7 @@ def batch_availability_summary(request, org_slug, service_slug):
                 try:
                     all_uids = set([getattr(u, 'id', None) for u in assignee_users if getattr(u, 'id', None)])
                     if all_uids and member_full_day_blocked.issuperset(all_uids):
-                        summary[current.strftime('%Y-%m-%d')] = False
+                        yield current, False
                         current += timedelta(days=1)
                         continue
                 except Exception:
@@ -5715,7 +5759,7 @@ def batch_availability_summary(request, org_slug, service_slug):
                 try:
                     uid = getattr(assignee_users[0], 'id', None)
                     if uid and uid in member_full_day_blocked:
-                        summary[current.strftime('%Y-%m-%d')] = False
+                        yield current, False
                         current += timedelta(days=1)
                         continue
                 except Exception:
@@ -5734,10 +5778,11 @@ def batch_availability_summary(request, org_slug, service_slug):
             base_windows = [(s, e) for (s, e) in service_availability_override_windows if e > s]
         else:
             freeze = None
-            try:
-                freeze = _active_service_freeze_for_date(org, service, day_start.date(), org_tz)
-            except Exception:
-                freeze = None
+            if day_start.date() in freeze_dates:
+                try:
+                    freeze = _active_service_freeze_for_date(org, service, day_start.date(), org_tz)
+                except Exception:
+                    freeze = None
 
             if freeze and isinstance(getattr(freeze, 'frozen_settings', None), dict) and freeze.frozen_settings.get('weekly_windows'):
                 for w in freeze.frozen_settings.get('weekly_windows', []):
@@ -5751,15 +5796,8 @@ def batch_availability_summary(request, org_slug, service_slug):
                     except Exception:
                         continue
             else:
-                try:
-                    if _trial_single_active_service(org):
-                        svc_rows = None
-                    else:
-                        svc_rows = service.weekly_availability.filter(is_active=True, weekday=day_start.weekday()).order_by('start_time')
-                except Exception:
-                    svc_rows = None
-
-                if svc_rows and svc_rows.exists():
+                svc_rows = svc_rows_by_weekday.get(day_start.weekday())
+                if svc_rows:
                     for w in svc_rows:
                         ws = day_start.replace(hour=w.start_time.hour, minute=w.start_time.minute, second=0, microsecond=0)
                         we = day_start.replace(hour=w.end_time.hour, minute=w.end_time.minute, second=0, microsecond=0)
@@ -5769,43 +5807,33 @@ def batch_availability_summary(request, org_slug, service_slug):
                     if svc_is_scoped:
                         base_windows = []
                     else:
-                        inherited_mid = None
-                        try:
-                            inherited_mid = _service_inherited_member_id(org, service)
-                        except Exception:
-                            inherited_mid = None
-
-                        if inherited_mid:
+                        if inherited_membership is _unset:
+                            inherited_membership = None
                             try:
-                                membership = Membership.objects.filter(id=inherited_mid, organization=org, is_active=True).first()
+                                inherited_mid = _service_inherited_member_id(org, service)
                             except Exception:
-                                membership = None
-                            if membership:
+                                inherited_mid = None
+                            if inherited_mid:
                                 try:
-                                    base_windows = _member_weekly_windows_for_date(org, membership, day_start.date(), org_tz)
+                                    inherited_membership = Membership.objects.filter(id=inherited_mid, organization=org, is_active=True).first() or False
                                 except Exception:
-                                    base_windows = []
-                            else:
-                                base_windows = []
-                        else:
+                                    inherited_membership = False
+
+                        if inherited_membership:
                             try:
-                                any_org_rows = WeeklyAvailability.objects.filter(organization=org, is_active=True).exists()
+                                base_windows = _member_weekly_windows_for_date(org, inherited_membership, day_start.date(), org_tz)
                             except Exception:
-                                any_org_rows = False
-
-                            if not any_org_rows:
-                                base_windows = [(day_start.replace(hour=0, minute=0, second=0, microsecond=0), day_start.replace(hour=23, minute=59, second=0, microsecond=0))]
-                            else:
-                                windows = WeeklyAvailability.objects.filter(
-                                    organization=org,
-                                    is_active=True,
-                                    weekday=day_start.weekday()
-                                )
-                                for w in windows:
-                                    ws = day_start.replace(hour=w.start_time.hour, minute=w.start_time.minute, second=0, microsecond=0)
-                                    we = day_start.replace(hour=w.end_time.hour, minute=w.end_time.minute, second=0, microsecond=0)
-                                    if we > ws:
-                                        base_windows.append((ws, we))
+                                base_windows = []
+                        elif inherited_membership is False:
+                            base_windows = []
+                        elif not any_org_rows:
+                            base_windows = [(day_start.replace(hour=0, minute=0, second=0, microsecond=0), day_start.replace(hour=23, minute=59, second=0, microsecond=0))]
+                        else:
+                            for w in org_rows_by_weekday.get(day_start.weekday(), []):
+                                ws = day_start.replace(hour=w.start_time.hour, minute=w.start_time.minute, second=0, microsecond=0)
+                                we = day_start.replace(hour=w.end_time.hour, minute=w.end_time.minute, second=0, microsecond=0)
+                                if we > ws:
+                                    base_windows.append((ws, we))
 
             if org_availability_override_windows:
                 base_windows = _intersect_dt_windows(
@@ -5814,12 +5842,13 @@ def batch_availability_summary(request, org_slug, service_slug):
                 )
 
             if (not service_availability_override_windows) and len(assignee_users) == 1:
+                if solo_membership is _unset:
+                    try:
+                        solo_membership = Membership.objects.filter(organization=org, user=assignee_users[0], is_active=True).first()
+                    except Exception:
+                        solo_membership = None
                 try:
-                    solo_mem = Membership.objects.filter(organization=org, user=assignee_users[0], is_active=True).first()
-                except Exception:
-                    solo_mem = None
-                try:
-                    member_allowed = _member_effective_windows_for_date(org, solo_mem, day_start.date(), org_tz) if solo_mem else []
+                    member_allowed = _member_effective_windows_for_date(org, solo_membership, day_start.date(), org_tz) if solo_membership else []
                 except Exception:
                     member_allowed = []
                 base_windows = _intersect_dt_windows(base_windows, member_allowed)
@@ -5833,7 +5862,7 @@ def batch_availability_summary(request, org_slug, service_slug):
                 pass
 
         if not base_windows:
-            summary[current.strftime('%Y-%m-%d')] = False
+            yield current, False
             current += timedelta(days=1)
             continue
 
@@ -5844,14 +5873,146 @@ def batch_availability_summary(request, org_slug, service_slug):
                 has_future_window = True
                 break
 
-        summary[current.strftime('%Y-%m-%d')] = bool(has_future_window)
+        yield current, bool(has_future_window)
 
         current += timedelta(days=1)
 
-    return JsonResponse(summary, safe=False)
+
+def _next_available_slot(request, org, service, org_tz, after=None):
+    """Return the earliest bookable slot dict for `service`, or None.
+
+    Scans the booking horizon with `_iter_day_availability` and only builds
+    real slots for days that pass the day-level check, stopping at the first
+    day that yields one. `after` (org-local datetime) skips earlier slots.
+    """
+    now_org = timezone.now().astimezone(org_tz)
+    scan_from = max(after, now_org) if after else now_org
+    # Bounded by NEXT_AVAILABLE_MAX_DAYS however long the booking horizon is.
+    max_days = max(1, int(getattr(settings, 'NEXT_AVAILABLE_MAX_DAYS', 90) or 90))
+    horizon_end = scan_from.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+        days=min(int(getattr(service, 'max_booking_days', 0) or 0) + 2, max_days)
+    )
+    for day_start, has_slots in _iter_day_availability(org, service, scan_from, horizon_end, org_tz):
+        if not has_slots:
+            continue
+        slots = _service_available_slots(
+            request, org, service, day_start, day_start + timedelta(days=1), org_tz, params={},
+        )
+        if not isinstance(slots, list):
+            continue
+        for slot in slots:
+            try:
+                if after and datetime.fromisoformat(slot['start']) < after:
+                    continue
+            except Exception:
+                continue
+            return slot
+    return None
+
+
+def _next_available_payload(request, org, service, org_tz, after=None):
+    slot = _next_available_slot(request, org, service, org_tz, after=after)
+    return {
+        'service_slug': service.slug,
+        'service_name': service.name,
+        'next_available': slot,
+    }
+
+
+def _parse_next_available_after(request, org_tz):
+    """Parse the optional `after` query param; returns (datetime|None, error)."""
+    raw = (request.GET.get('after') or '').strip()
+    if not raw:
+        return None, None
+    try:
+        dt = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except Exception:
+        return None, 'Invalid datetime format'
+    if dt.tzinfo is None:
+        dt = make_aware(dt, org_tz)
+    return dt.astimezone(org_tz), None
+
+
+@require_http_methods(["GET"])
+@never_cache
+def service_next_available(request, org_slug, service_slug):
+    """Return the first open slot for a service within its booking horizon.
+
+    Query params: after (optional ISO 8601 datetime).
+    Returns: {"service_slug", "service_name", "next_available": slot|null}
+    where slot has the same shape as `service_availability` entries.
+    """
+    org = get_object_or_404(Organization, slug=org_slug)
+    service = get_object_or_404(Service, slug=service_slug, organization=org)
+    try:
+        org_tz = ZoneInfo(getattr(org, 'timezone', getattr(settings, 'TIME_ZONE', 'UTC')))
+    except Exception:
+        org_tz = ZoneInfo(getattr(settings, 'TIME_ZONE', 'UTC'))
+
+    after, error = _parse_next_available_after(request, org_tz)
+    if error:
+        return HttpResponseBadRequest(error)
+    return JsonResponse(_next_available_payload(request, org, service, org_tz, after=after))
+
+
+def _org_next_available_payload(request, org, org_tz, after=None):
+    """Next open slot per public service (at most NEXT_AVAILABLE_MAX_SERVICES).
+
+    Anonymous results are cached per organization under its schedule version
+    and booking change stamp, for at most NEXT_AVAILABLE_CACHE_SECONDS (other
+    inputs, like freezes and the clock, are not versioned). Slots for org
+    members carry buffer details, so their requests are computed fresh.
+    """
+    from django.core.cache import cache
+    from bookings.ics_feeds import feed_version
+    from calendar_app.schedule_cache import schedule_version
+
+    ttl = max(0, int(getattr(settings, 'NEXT_AVAILABLE_CACHE_SECONDS', 60) or 0))
+    key = None
+    if ttl and not getattr(getattr(request, 'user', None), 'is_authenticated', False):
+        key = (
+            f"next_avail:{org.id}:{schedule_version(org.id)}:{feed_version(org.id)}:"
+            f"{after.isoformat() if after else ''}"
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    limit = max(1, int(getattr(settings, 'NEXT_AVAILABLE_MAX_SERVICES', 20) or 20))
+    out = []
+    for service in sorted(_public_org_services(org), key=lambda s: s.id)[:limit]:
+        try:
+            out.append(_next_available_payload(request, org, service, org_tz, after=after))
+        except Exception:
+            out.append({'service_slug': service.slug, 'service_name': service.name, 'next_available': None})
+    if key:
+        cache.set(key, out, timeout=ttl)
+    return out
+
+
+@require_http_methods(["GET"])
+@never_cache
+def org_next_available(request, org_slug):
+    """Return the first open slot for every service listed on the public org page.
+
+    Query params: after (optional ISO 8601 datetime).
+    Returns: {"services": [{"service_slug", "service_name", "next_available"}, ...]}
+    """
+    org = get_object_or_404(Organization, slug=org_slug)
+    try:
+        org_tz = ZoneInfo(getattr(org, 'timezone', getattr(settings, 'TIME_ZONE', 'UTC')))
+    except Exception:
+        org_tz = ZoneInfo(getattr(settings, 'TIME_ZONE', 'UTC'))
+
+    after, error = _parse_next_available_after(request, org_tz)
+    if error:
+        return HttpResponseBadRequest(error)
+
+    return JsonResponse({'services': _org_next_available_payload(request, org, org_tz, after=after)})
 
 
 @require_http_methods(["GET"])
+@read_replica
 def public_busy(request, org_slug):
     """
     Public endpoint returning busy intervals (booked events) for an org over a date range.
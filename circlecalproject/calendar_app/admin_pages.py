@@ -265,3 +265,61 @@ def admin_analytics(request: HttpRequest) -> HttpResponse:
     }
 
     return TemplateResponse(request, "admin/analytics.html", context)
+
+
+def admin_performance(request: HttpRequest) -> HttpResponse:
+    from calendar_app.request_metrics import summarize_endpoints
+
+    try:
+        hours = int(request.GET.get("hours") or 24)
+    except (TypeError, ValueError):
+        hours = 24
+    hours = min(max(hours, 1), 24 * 14)
+
+    # Read-only: merging pending timings takes row locks, so it is left to
+    # the `merge_endpoint_timings` scheduler job (up to a minute behind).
+    rows = summarize_endpoints(hours=hours)
+
+    def _ms(value):
+        return "-" if value is None else f"{value:,.0f}"
+
+    endpoint_rows: list[list] = []
+    for row in rows:
+        endpoint_rows.append(
+            [
+                row["endpoint"],
+                row["count"],
+                _ms(row["p50_ms"]),
+                _ms(row["p95_ms"]),
+                _ms(row["p99_ms"]),
+                _ms(row["max_ms"]),
+                f"{row['avg_sql_count']:.1f}",
+                _ms(row["avg_sql_ms"]),
+                _ms(row["avg_outbound_ms"]),
+                f"{row['cache_hits']}/{row['cache_hits'] + row['cache_misses']}",
+                row["slow_count"],
+            ]
+        )
+
+    total_requests = sum(r["count"] for r in rows)
+    total_slow = sum(r["slow_count"] for r in rows)
+
+    context = {
+        **admin.site.each_context(request),
+        "title": "Performance",
+        "hours": hours,
+        "kpis": [
+            {"label": f"Requests ({hours}h)", "value": total_requests, "icon": "speed"},
+            {"label": "Endpoints", "value": len(rows), "icon": "route"},
+            {"label": "Slow requests", "value": total_slow, "icon": "warning"},
+        ],
+        "endpoints_table": {
+            "headers": [
+                "Endpoint", "Requests", "p50 ms", "p95 ms", "p99 ms", "Max ms",
+                "SQL/req", "SQL ms", "Outbound ms", "Cache hits", "Slow",
+            ],
+            "rows": endpoint_rows,
+        },
+    }
+
+    return TemplateResponse(request, "admin/performance.html", context)
@@ -1,16 +1,35 @@
+"""Undo support for Django admin deletes.
+
+Admin writes the deletion `LogEntry` rows *before* deleting (and bulk-creates
+them for the "delete selected" action), so capture is buffered per request:
+
+- `pre_delete` serializes only the objects the admin deleted directly (the
+  delete's `origin`); cascaded rows never get a LogEntry and are skipped.
+- Auto-created M2M links are read once per origin and field with one query
+  over all selected objects, before the collector removes the through rows.
+- At the end of the request `flush_request_snapshots` pairs the buffer with
+  this request's deletion LogEntries in one query and writes every snapshot
+  with one `bulk_create`.
+
+Buffering stops at `ADMIN_UNDO_MAX_SNAPSHOTS_PER_REQUEST` objects, and
+`purge_admin_undo_snapshots` (a `run_scheduler` job) enforces retention.
+"""
+
 from __future__ import annotations
 
 import threading
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
 from django.apps import apps
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.models import ADDITION, DELETION, LogEntry
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_save, pre_delete
+from django.db.models import Model, QuerySet
+from django.db.models.signals import pre_delete
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -26,17 +45,19 @@ _local = threading.local()
 def _set_context(*, enabled: bool, user_id: int | None) -> None:
     _local.enabled = enabled
     _local.user_id = user_id
-    if enabled:
-        if not hasattr(_local, "pre_delete"):
-            _local.pre_delete = {}
-    else:
-        _local.pre_delete = {}
+    _local.started_at = timezone.now() if enabled else None
+    _local.pre_delete = {}
+    _local.origins = {}
 
 
 def _is_enabled() -> bool:
     return bool(getattr(_local, "enabled", False))
 
 
+def _max_per_request() -> int:
+    return max(0, int(getattr(settings, "ADMIN_UNDO_MAX_SNAPSHOTS_PER_REQUEST", 5000) or 0))
+
+
 def _to_jsonable(value: Any) -> Any:
     if value is None:
         return None
@@ -58,33 +79,66 @@ def _to_jsonable(value: Any) -> Any:
     return str(value)
 
 
-def _serialize_instance(obj: Any) -> tuple[dict[str, Any], dict[str, list[Any]]]:
-    """Serialize a model instance into plain JSONable structures.
+def _serialize_instance(obj: Any) -> dict[str, Any]:
+    """Serialize concrete fields into plain JSONable values (no queries).
 
-    - Stores FK values via field.attname (e.g. user_id) so restore can set IDs.
-    - Captures auto-created M2M relations as lists of related PKs.
+    Stores FK values via field.attname (e.g. user_id) so restore can set IDs.
     """
     data: dict[str, Any] = {}
-    m2m: dict[str, list[Any]] = {}
-
     for field in obj._meta.fields:
         name = getattr(field, "attname", field.name)
         try:
             data[name] = _to_jsonable(getattr(obj, name))
         except Exception:
             continue
+    return data
+
 
-    for m2m_field in obj._meta.many_to_many:
+def _bulk_m2m(model, pks: list[Any]) -> dict[str, dict[str, list[Any]]]:
+    """Auto-created M2M links for many objects: {str(pk): {field: [related pks]}}."""
+    result: dict[str, dict[str, list[Any]]] = {}
+    for m2m_field in model._meta.many_to_many:
         try:
-            # Only auto-created through tables (typical ManyToManyField).
-            if not getattr(m2m_field.remote_field.through._meta, "auto_created", False):
+            through = m2m_field.remote_field.through
+            if not getattr(through._meta, "auto_created", False):
                 continue
-            rel = getattr(obj, m2m_field.name)
-            m2m[m2m_field.name] = list(rel.values_list("pk", flat=True))
+            source = m2m_field.m2m_field_name() + "_id"
+            target = m2m_field.m2m_reverse_field_name() + "_id"
+            for source_pk, target_pk in through._default_manager.filter(
+                **{f"{source}__in": pks}
+            ).values_list(source, target):
+                result.setdefault(str(source_pk), {}).setdefault(m2m_field.name, []).append(target_pk)
+            for pk in pks:
+                result.setdefault(str(pk), {}).setdefault(m2m_field.name, [])
         except Exception:
             continue
-
-    return data, m2m
+    return result
+
+
+def _origin_info(origin) -> dict | None:
+    """Selected objects of one admin delete, with their M2M links (computed once)."""
+    key = id(origin)
+    info = _local.origins.get(key)
+    if info is not None:
+        return info
+    if isinstance(origin, QuerySet):
+        model = origin.model
+        cached = getattr(origin, "_result_cache", None)
+        pks = [obj.pk for obj in cached] if cached is not None else list(origin.values_list("pk", flat=True))
+    elif isinstance(origin, Model):
+        model = type(origin)
+        pks = [origin.pk]
+    else:
+        return None
+    info = {
+        "model": model._meta.concrete_model,
+        "pks": {str(pk) for pk in pks},
+        "m2m": _bulk_m2m(model, pks) if model._meta.many_to_many else {},
+        # Keep the origin alive so id() stays unique for this request.
+        "origin": origin,
+    }
+    _local.origins[key] = info
+    return info
 
 
 def set_request_context(request: HttpRequest, *, enabled: bool) -> None:
@@ -97,7 +151,7 @@ def set_request_context(request: HttpRequest, *, enabled: bool) -> None:
     _set_context(enabled=enabled, user_id=user_id)
 
 
-def _pre_delete_capture(sender, instance, **kwargs):
+def _pre_delete_capture(sender, instance, origin=None, **kwargs):
     if not _is_enabled():
         return
 
@@ -106,68 +160,91 @@ def _pre_delete_capture(sender, instance, **kwargs):
         return
 
     try:
-        ct = ContentType.objects.get_for_model(instance, for_concrete_model=False)
+        info = _origin_info(origin)
         object_id = str(instance.pk)
-        snapshot, m2m = _serialize_instance(instance)
+        # Only objects the admin selected have a LogEntry to undo.
+        if info is None or instance._meta.concrete_model is not info["model"] or object_id not in info["pks"]:
+            return
+        if len(_local.pre_delete) >= _max_per_request():
+            return
+        ct = ContentType.objects.get_for_model(instance, for_concrete_model=False)
         _local.pre_delete[(ct.pk, object_id)] = {
             "content_type_id": ct.pk,
             "object_id": object_id,
             "object_repr": str(instance),
-            "snapshot": snapshot,
-            "m2m": m2m,
+            "snapshot": _serialize_instance(instance),
+            "m2m": info["m2m"].get(object_id, {}),
         }
     except Exception:
         # Best-effort only.
         return
 
 
-def _logentry_post_save(sender, instance: LogEntry, created: bool, **kwargs):
-    if not _is_enabled():
-        return
-
-    if not created:
-        return
-
-    if int(instance.action_flag) != int(DELETION):
-        return
+def flush_request_snapshots() -> int:
+    """Write buffered snapshots for this request's deletion LogEntries. Returns rows written."""
+    pending = getattr(_local, "pre_delete", None) or {}
+    if not _is_enabled() or not pending:
+        return 0
+    _local.pre_delete = {}
+    _local.origins = {}
 
+    entries = {}
     try:
-        ct_id = int(instance.content_type_id)
-        object_id = str(instance.object_id)
+        qs = LogEntry.objects.filter(
+            action_flag=DELETION,
+            user_id=getattr(_local, "user_id", None),
+            content_type_id__in={ct_id for ct_id, _ in pending},
+            object_id__in={object_id for _, object_id in pending},
+            undo_snapshot__isnull=True,
+        )
+        if getattr(_local, "started_at", None):
+            qs = qs.filter(action_time__gte=_local.started_at - timedelta(seconds=1))
+        for entry in qs.only("id", "content_type_id", "object_id", "object_repr", "action_flag").order_by("id"):
+            entries[(entry.content_type_id, str(entry.object_id))] = entry
     except Exception:
-        return
+        return 0
 
-    payload = None
+    rows = []
+    for key, payload in pending.items():
+        entry = entries.get(key)
+        if entry is None:
+            continue
+        rows.append(
+            AdminUndoSnapshot(
+                log_entry=entry,
+                content_type_id=payload["content_type_id"],
+                object_id=payload["object_id"],
+                object_repr=payload.get("object_repr") or entry.object_repr,
+                action_flag=entry.action_flag,
+                snapshot=payload.get("snapshot") or {},
+                m2m=payload.get("m2m") or {},
+                created_by_id=getattr(_local, "user_id", None),
+            )
+        )
+    if not rows:
+        return 0
     try:
-        payload = _local.pre_delete.get((ct_id, object_id))
+        AdminUndoSnapshot.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
     except Exception:
-        payload = None
+        return 0
+    return len(rows)
 
-    if not payload:
-        return
 
-    try:
-        AdminUndoSnapshot.objects.create(
-            log_entry=instance,
-            content_type_id=ct_id,
-            object_id=object_id,
-            object_repr=payload.get("object_repr") or instance.object_repr,
-            action_flag=instance.action_flag,
-            snapshot=payload.get("snapshot") or {},
-            m2m=payload.get("m2m") or {},
-            created_by_id=getattr(_local, "user_id", None),
-        )
-    except Exception:
-        return
-    finally:
-        try:
-            del _local.pre_delete[(ct_id, object_id)]
-        except Exception:
-            pass
+def purge_admin_undo_snapshots() -> int:
+    """Drop snapshots past `ADMIN_UNDO_RETENTION_DAYS` and beyond the newest `ADMIN_UNDO_MAX_SNAPSHOTS`."""
+    deleted = 0
+    days = int(getattr(settings, "ADMIN_UNDO_RETENTION_DAYS", 30) or 0)
+    if days > 0:
+        deleted += AdminUndoSnapshot.objects.filter(created_at__lt=timezone.now() - timedelta(days=days)).delete()[0]
+    keep = int(getattr(settings, "ADMIN_UNDO_MAX_SNAPSHOTS", 20000) or 0)
+    if keep > 0:
+        cutoff = list(AdminUndoSnapshot.objects.order_by("-id").values_list("id", flat=True)[keep:keep + 1])
+        if cutoff:
+            deleted += AdminUndoSnapshot.objects.filter(id__lte=cutoff[0]).delete()[0]
+    return deleted
 
 
 pre_delete.connect(_pre_delete_capture, dispatch_uid="cc_admin_undo_pre_delete")
-post_save.connect(_logentry_post_save, sender=LogEntry, dispatch_uid="cc_admin_undo_logentry_post_save")
 
 
 @staff_member_required
@@ -10,3 +10,12 @@ class CalendarAppConfig(AppConfig):
     def ready(self) -> None:
         # Register admin undo signals.
         from . import admin_undo  # noqa: F401
+
+        # Invalidate memoized weekly schedule maps on availability changes.
+        from .schedule_cache import connect_signals
+        connect_signals()
+
+        # Record cache hits/misses and Stripe API time in per-request metrics.
+        from .request_metrics import install_cache_metrics, install_stripe_timing
+        install_cache_metrics()
+        install_stripe_timing()
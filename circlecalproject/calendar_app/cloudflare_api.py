@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Any
 import re
 
-import requests
+from . import http_client
 
 
 CLOUDFLARE_API_BASE_URL = "https://api.cloudflare.com/client/v4"
@@ -86,7 +86,7 @@ def _headers(cfg: CloudflareApiConfig) -> dict[str, str]:
 
 def _request(cfg: CloudflareApiConfig, method: str, path: str, *, json: Any = None, params: Any = None) -> Any:
     url = f"{CLOUDFLARE_API_BASE_URL}{path}"
-    resp = requests.request(method, url, headers=_headers(cfg), json=json, params=params, timeout=20)
+    resp = http_client.request("cloudflare", method, url, headers=_headers(cfg), json=json, params=params)
 
     payload: Any
     try:
@@ -0,0 +1,211 @@
+"""Read-replica routing for read-only traffic.
+
+When a `replica` database alias is configured (`DATABASE_REPLICA_URL` in
+production, `SQLITE_REPLICA_PATH` locally), views wrapped with
+`@read_replica` run their GET/HEAD requests inside a read-only scope and
+`ReplicaRouter` sends the scope's reads to the replica. Everything else,
+including all writes, stays on the primary.
+
+The primary is used instead, even inside the scope, when:
+
+- the client wrote recently: `ReplicaStickinessMiddleware` sets a cookie after
+  every unsafe request that pins that browser to the primary for
+  `REPLICA_STICKY_SECONDS`, so people see their own bookings and edits;
+- the view itself has written something during the request;
+- the view has opened a transaction on the primary;
+- the replica lags by more than `REPLICA_MAX_LAG_SECONDS` or cannot be
+  reached. Lag is measured at most every `REPLICA_LAG_CHECK_SECONDS` per
+  process. On Postgres a replica that has replayed all the WAL it received
+  counts as caught up (0) only while its WAL receiver is streaming and has
+  heard from the primary within `REPLICA_MAX_RECEIVER_SILENCE_SECONDS`; a
+  disconnected replica has also replayed everything it received. Otherwise lag
+  is the time since the last replayed transaction.
+
+On Postgres the request's tenant RLS settings (`PostgresRLSContextMiddleware`)
+are copied to the replica connection the first time a scope reads from it and
+cleared again when the scope ends.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = 'replica'
+STICKY_COOKIE = 'cc_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_scope: contextvars.ContextVar = contextvars.ContextVar('cc_replica_reads', default=None)
+_lag_lock = threading.Lock()
+_lag = {'checked_at': None, 'seconds': None}
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+_LAG_SQL = (
+    "SELECT pg_is_in_recovery(), "
+    "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+    "(SELECT status FROM pg_stat_wal_receiver LIMIT 1), "
+    "(SELECT EXTRACT(EPOCH FROM now() - last_msg_receipt_time) FROM pg_stat_wal_receiver LIMIT 1), "
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+)
+
+
+def _lag_from_status(in_recovery, replayed_all, receiver_status, receiver_silence, replay_age) -> float | None:
+    """Lag in seconds from the `_LAG_SQL` row; None when it cannot be trusted."""
+    if not in_recovery:
+        return 0.0
+    max_silence = float(getattr(settings, 'REPLICA_MAX_RECEIVER_SILENCE_SECONDS', 60) or 0)
+    # Without the pg_read_all_stats role the receiver columns read as NULL,
+    # which falls through to the replay timestamp.
+    if (
+        replayed_all
+        and receiver_status == 'streaming'
+        and receiver_silence is not None
+        and float(receiver_silence) <= max_silence
+    ):
+        return 0.0
+    if replay_age is None:
+        return None
+    return max(0.0, float(replay_age))
+
+
+def _measure_lag() -> float | None:
+    try:
+        conn = connections[REPLICA_ALIAS]
+        if conn.vendor != 'postgresql':
+            return 0.0
+        with conn.cursor() as cursor:
+            cursor.execute(_LAG_SQL)
+            return _lag_from_status(*cursor.fetchone())
+    except Exception:
+        return None
+
+
+def replica_lag_seconds() -> float | None:
+    """Replica lag in seconds (None when unreachable), cached per process."""
+    interval = float(getattr(settings, 'REPLICA_LAG_CHECK_SECONDS', 5) or 0)
+    now = time.monotonic()
+    with _lag_lock:
+        if _lag['checked_at'] is not None and now - _lag['checked_at'] < interval:
+            return _lag['seconds']
+    seconds = _measure_lag()
+    with _lag_lock:
+        _lag.update(checked_at=now, seconds=seconds)
+    return seconds
+
+
+def replica_usable() -> bool:
+    if not replica_configured():
+        return False
+    lag = replica_lag_seconds()
+    return lag is not None and lag <= float(getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5) or 0)
+
+
+def _apply_rls(values: dict) -> None:
+    with connections[REPLICA_ALIAS].cursor() as cursor:
+        for name, value in values.items():
+            cursor.execute("SELECT set_config(%s, %s, false)", [name, value])
+
+
+@contextmanager
+def replica_reads():
+    """Route reads in the enclosed block to the replica (when usable)."""
+    state = {'primary': False, 'atomic_depth': len(connections[DEFAULT_DB_ALIAS].atomic_blocks), 'rls': None}
+    token = _scope.set(state)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+        if state['rls']:
+            try:
+                _apply_rls({name: ('0' if name == 'circlecal.rls_bypass' else '') for name in state['rls']})
+            except Exception:
+                pass
+
+
+def primary_pinned(request) -> bool:
+    try:
+        return float(request.COOKIES.get(STICKY_COOKIE) or 0) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+def _use_replica(request) -> bool:
+    return request.method in SAFE_METHODS and replica_configured() and not primary_pinned(request)
+
+
+def read_replica(view):
+    """Serve a view's safe requests from the replica."""
+    @functools.wraps(view)
+    def _wrapped(request, *args, **kwargs):
+        if not _use_replica(request):
+            return view(request, *args, **kwargs)
+        with replica_reads():
+            return view(request, *args, **kwargs)
+    return _wrapped
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _scope.get()
+        if state is None or state['primary']:
+            return None
+        if len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > state['atomic_depth'] or not replica_usable():
+            return None
+        if state['rls'] is None and connections[REPLICA_ALIAS].vendor == 'postgresql':
+            from .middleware import current_rls_settings
+
+            state['rls'] = current_rls_settings.get() or {}
+            if state['rls']:
+                try:
+                    _apply_rls(state['rls'])
+                except Exception:
+                    state['primary'] = True
+                    return None
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _scope.get()
+        if state is not None:
+            # Read your own writes for the rest of the request.
+            state['primary'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is populated by replication, never migrated directly.
+        return db != REPLICA_ALIAS
+
+
+class ReplicaStickinessMiddleware:
+    """Pin a client to the primary for a while after it sends an unsafe request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_configured():
+            seconds = max(0, int(getattr(settings, 'REPLICA_STICKY_SECONDS', 10) or 0))
+            if seconds:
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    f'{time.time() + seconds:.0f}',
+                    max_age=seconds,
+                    httponly=True,
+                    samesite='Lax',
+                    secure=bool(getattr(settings, 'SESSION_COOKIE_SECURE', False)),
+                )
+        return response
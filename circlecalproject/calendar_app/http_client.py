@@ -0,0 +1,220 @@
+"""Shared outbound HTTP client for third-party APIs.
+
+Every provider we call (Turnstile, Expo push, Render, Cloudflare) goes through
+`request(service, method, url, ...)`, which adds:
+
+- one `requests.Session` per service with a keep-alive connection pool, so
+  calls reuse TLS connections instead of handshaking every time;
+- separate connect/read timeouts per service (`SERVICES`, overridable through
+  `OUTBOUND_HTTP_TIMEOUTS`);
+- a per-process circuit breaker per service. After
+  `OUTBOUND_BREAKER_FAILURES` consecutive failures (connection errors,
+  timeouts, 5xx) calls fail fast with `CircuitOpenError` for
+  `OUTBOUND_BREAKER_RESET_SECONDS`; then a single trial call decides whether
+  the circuit closes again;
+- latency metrics: the call is timed into the current request's metrics
+  (`outbound_timer`) and into process-wide per-service counters
+  (`client_stats`).
+
+`CircuitOpenError` subclasses `requests.ConnectionError`, so callers that
+already handle network failures need no changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .request_metrics import outbound_timer
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    connect_timeout: float
+    read_timeout: float
+
+
+SERVICES: dict[str, ServiceConfig] = {
+    'turnstile': ServiceConfig(connect_timeout=2.0, read_timeout=4.0),
+    'expo': ServiceConfig(connect_timeout=3.0, read_timeout=6.0),
+    'render': ServiceConfig(connect_timeout=3.0, read_timeout=15.0),
+    'cloudflare': ServiceConfig(connect_timeout=3.0, read_timeout=20.0),
+}
+_DEFAULT = ServiceConfig(connect_timeout=3.0, read_timeout=10.0)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+@dataclass
+class _ServiceStats:
+    calls: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open -> closed."""
+
+    failure_threshold: int
+    reset_seconds: float
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count a failure. Returns True if this opened (or re-opened) the circuit."""
+        with self._lock:
+            self.failures += 1
+            reopen = self.trial_in_flight
+            self.trial_in_flight = False
+            if reopen or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+_lock = threading.Lock()
+_sessions: dict[str, requests.Session] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_stats: dict[str, _ServiceStats] = {}
+
+
+def _service_config(service: str) -> ServiceConfig:
+    base = SERVICES.get(service, _DEFAULT)
+    override = (getattr(settings, 'OUTBOUND_HTTP_TIMEOUTS', None) or {}).get(service)
+    if override:
+        try:
+            connect, read = override
+            return ServiceConfig(connect_timeout=float(connect), read_timeout=float(read))
+        except (TypeError, ValueError):
+            pass
+    return base
+
+
+def _session(service: str) -> requests.Session:
+    session = _sessions.get(service)
+    if session is not None:
+        return session
+    with _lock:
+        session = _sessions.get(service)
+        if session is None:
+            pool_size = max(1, int(getattr(settings, 'OUTBOUND_HTTP_POOL_SIZE', 10) or 10))
+            # Retries are left to callers; a hidden retry would double the worst-case latency.
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+            session = requests.Session()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[service] = session
+    return session
+
+
+def breaker(service: str) -> CircuitBreaker:
+    found = _breakers.get(service)
+    if found is not None:
+        return found
+    with _lock:
+        return _breakers.setdefault(service, CircuitBreaker(
+            failure_threshold=max(1, int(getattr(settings, 'OUTBOUND_BREAKER_FAILURES', 5) or 5)),
+            reset_seconds=max(1.0, float(getattr(settings, 'OUTBOUND_BREAKER_RESET_SECONDS', 30) or 30)),
+        ))
+
+
+def _record(service: str, elapsed_ms: float | None, *, failed: bool = False, short_circuit: bool = False) -> None:
+    with _lock:
+        stats = _stats.setdefault(service, _ServiceStats())
+        if short_circuit:
+            stats.short_circuits += 1
+            return
+        stats.calls += 1
+        stats.failures += int(failed)
+        stats.total_ms += elapsed_ms or 0.0
+        stats.max_ms = max(stats.max_ms, elapsed_ms or 0.0)
+
+
+def request(service: str, method: str, url: str, **kwargs) -> requests.Response:
+    """Send one request to `service` through its pooled session and breaker.
+
+    Returns the response for any status; 5xx responses still count as
+    failures for the breaker. Raises `CircuitOpenError` when the circuit is
+    open and `requests` exceptions on network errors and timeouts.
+    """
+    cb = breaker(service)
+    if not cb.allow():
+        _record(service, None, short_circuit=True)
+        raise CircuitOpenError(f'{service} circuit open; failing fast')
+
+    cfg = _service_config(service)
+    kwargs.setdefault('timeout', (cfg.connect_timeout, cfg.read_timeout))
+    started = time.perf_counter()
+    failed = True
+    try:
+        with outbound_timer(service):
+            resp = _session(service).request(method, url, **kwargs)
+        failed = resp.status_code >= 500
+        return resp
+    finally:
+        _record(service, (time.perf_counter() - started) * 1000.0, failed=failed)
+        if failed:
+            if cb.record_failure():
+                logger.warning('outbound circuit for %s opened after %s failures', service, cb.failures)
+        else:
+            cb.record_success()
+
+
+def client_stats() -> dict[str, dict]:
+    """Per-service call counts, latency and breaker state for this process."""
+    with _lock:
+        snapshot = {name: dict(vars(stats)) for name, stats in _stats.items()}
+    for name, stats in snapshot.items():
+        stats['avg_ms'] = stats['total_ms'] / stats['calls'] if stats['calls'] else 0.0
+        stats['state'] = breaker(name).state
+    return snapshot
+
+
+def reset() -> None:
+    """Close pooled sessions and forget breaker state and stats (tests, forks)."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+        _breakers.clear()
+        _stats.clear()
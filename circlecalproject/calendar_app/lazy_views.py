@@ -0,0 +1,69 @@
+"""Lazy view references for URLconfs.
+
+`calendar_app.views`, `bookings.views` and `billing.views` are large modules
+that pull in most of the project (and `stripe`) when imported. Importing them
+from the URLconfs made every worker pay for all of them at boot, before the
+first request and even for requests that only touch one app.
+
+`lazy_views('app.views')` returns a stand-in for the module whose attributes
+are `LazyView`s: `views.home` names the view without importing anything, and
+the module is imported on the first call (or the first attribute read, e.g.
+the CSRF middleware's `csrf_exempt` check). URL resolution and `reverse()`
+never import the view module.
+
+A misspelt view name therefore fails on the first request rather than at
+startup; `tests/test_import_budget.py` resolves every lazy view to catch that.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+
+class LazyView:
+    """Callable stand-in for `module.name`, imported on first use."""
+
+    def __init__(self, module_path: str, name: str):
+        # Read by Django's resolver (`lookup_str`, `ResolverMatch._func_path`).
+        self.__module__ = module_path
+        self.__name__ = self.__qualname__ = name
+        self._view = None
+
+    def resolve(self):
+        view = self._view
+        if view is None:
+            view = self._view = getattr(import_module(self.__module__), self.__name__)
+        return view
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # Dunder probes (copy, pickle, inspect) and `view_class`, which the
+        # resolver checks while building its reverse map, must not import.
+        if attr.startswith('__') or attr == 'view_class':
+            raise AttributeError(attr)
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f'<LazyView {self.__module__}.{self.__name__}>'
+
+
+class LazyViews:
+    """Module stand-in whose attributes are `LazyView`s."""
+
+    def __init__(self, module_path: str):
+        self._module_path = module_path
+        self._views: dict[str, LazyView] = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = LazyView(self._module_path, name)
+        return view
+
+
+def lazy_views(module_path: str) -> LazyViews:
+    return LazyViews(module_path)
@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from calendar_app.periodic import JOBS, get_job, run_due_jobs, runner_id
+
+
+class Command(BaseCommand):
+    help = (
+        "Run periodic housekeeping jobs (trial deletion, scheduled plan changes, "
+        "booking reminders, axes scrubbing, ...). Safe to run in several processes: "
+        "each due job is claimed through a database lease."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run due jobs once and exit instead of looping.',
+        )
+        parser.add_argument(
+            '--job',
+            action='append',
+            default=None,
+            help='Only consider this job (repeatable). Known jobs: ' + ', '.join(job.name for job in JOBS),
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Run the selected jobs now even if they are not due yet.',
+        )
+        parser.add_argument(
+            '--tick-seconds',
+            type=int,
+            default=None,
+            help='Seconds to sleep between checks (default: SCHEDULER_TICK_SECONDS).',
+        )
+
+    def handle(self, *args, **options):
+        names = options.get('job') or None
+        for name in names or []:
+            if get_job(name) is None:
+                raise CommandError(f"Unknown job: {name}")
+        tick = options.get('tick_seconds') or int(getattr(settings, 'SCHEDULER_TICK_SECONDS', 30) or 30)
+        owner = runner_id()
+        force = bool(options.get('force'))
+
+        while True:
+            close_old_connections()
+            results = run_due_jobs(owner, names=names, force=force)
+            for name, ok in results.items():
+                self.stdout.write(f"{name}: {'ok' if ok else 'failed'}")
+            if options.get('once'):
+                failed = sum(1 for ok in results.values() if not ok)
+                self.stdout.write(self.style.SUCCESS(f"Ran={len(results)}, failed={failed}."))
+                return
+            # A forced run only applies to the first pass.
+            force = False
+            time.sleep(max(1, tick))
@@ -1,4 +1,6 @@
 # calendar_app/middleware.py
+import contextvars
+import json
 import logging
 import os
 import sys
@@ -12,7 +14,6 @@ from .utils import user_has_role
 from billing.models import Subscription, Plan
 from django.conf import settings
 from django.contrib import messages
-from django.core.cache import cache
 
 
 logger = logging.getLogger(__name__)
@@ -68,8 +69,9 @@ class AppModeMiddleware:
 class AdminUndoContextMiddleware:
     """Enable admin undo snapshot capture only for admin requests.
 
-    We keep this lightweight: it only toggles a threadlocal flag consumed by
-    calendar_app.admin_undo signal handlers.
+    We keep this lightweight: it toggles a threadlocal flag consumed by
+    calendar_app.admin_undo signal handlers and writes the buffered snapshots
+    once the response is ready.
     """
 
     def __init__(self, get_response):
@@ -78,7 +80,7 @@ class AdminUndoContextMiddleware:
     def __call__(self, request):
         from django.conf import settings
         try:
-            from .admin_undo import set_request_context
+            from .admin_undo import flush_request_snapshots, set_request_context
         except Exception:
             set_request_context = None
 
@@ -95,13 +97,19 @@ class AdminUndoContextMiddleware:
             except Exception:
                 pass
 
-        response = self.get_response(request)
-
-        if set_request_context:
-            try:
-                set_request_context(request, enabled=False)
-            except Exception:
-                pass
+        try:
+            response = self.get_response(request)
+            if set_request_context and enabled:
+                try:
+                    flush_request_snapshots()
+                except Exception:
+                    pass
+        finally:
+            if set_request_context:
+                try:
+                    set_request_context(request, enabled=False)
+                except Exception:
+                    pass
 
         return response
 
@@ -676,19 +684,6 @@ class OrganizationMiddleware:
 
             if (not is_test_run) and needs_connect:
                 if not getattr(settings, 'STRIPE_SECRET_KEY', None):
-                    # Opportunistic background cleanup: deactivate trial accounts whose scheduled
-                    # deactivation time has passed. This avoids relying on manual CLI commands.
-                    # Skipped during tests.
-                    try:
-                        if not is_test_run:
-                            lock_key = 'cc_due_trial_deletion_check_lock'
-                            if not cache.get(lock_key):
-                                cache.set(lock_key, True, timeout=300)  # run at most every 5 min per process
-                                from accounts.deletion import delete_due_trial_accounts
-                                delete_due_trial_accounts(limit=20, dry_run=False)
-                    except Exception:
-                        pass
-
                     return response
                 connected = bool(getattr(org, 'stripe_connect_charges_enabled', False)) and bool(getattr(org, 'stripe_connect_account_id', None))
                 if not connected:
@@ -739,6 +734,11 @@ class OrganizationMiddleware:
         return response
 
 
+# The RLS values of the current request, so other connections (the read
+# replica, calendar_app.db_routing) can apply the same tenant context.
+current_rls_settings: contextvars.ContextVar = contextvars.ContextVar('circlecal_rls_settings', default=None)
+
+
 class PostgresRLSContextMiddleware:
     """Set PostgreSQL session variables used by tenant RLS policies.
 
@@ -783,12 +783,18 @@ class PostgresRLSContextMiddleware:
         except Exception:
             org_id = ''
 
+        token = current_rls_settings.set({
+            'circlecal.current_user_id': user_id,
+            'circlecal.current_org_id': org_id,
+            'circlecal.rls_bypass': bypass,
+        })
         try:
             self._set_config('circlecal.current_user_id', user_id)
             self._set_config('circlecal.current_org_id', org_id)
             self._set_config('circlecal.rls_bypass', bypass)
             return self.get_response(request)
         finally:
+            current_rls_settings.reset(token)
             try:
                 self._set_config('circlecal.current_user_id', '')
                 self._set_config('circlecal.current_org_id', '')
@@ -847,6 +853,14 @@ class AdminPinMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
+        path = request.path or ''
+        admin_prefix = '/' + (getattr(settings, 'ADMIN_PATH', 'admin') or 'admin').strip('/')
+        pin_prefix = admin_prefix + '/pin'
+
+        # Only admin pages are gated; skip the PIN lookup for everything else.
+        if not path.startswith(admin_prefix):
+            return self.get_response(request)
+
         # Only active if ADMIN_PIN is set
         pin = getattr(settings, 'ADMIN_PIN', None)
         # If no env PIN, check for DB-stored PIN
@@ -861,10 +875,6 @@ class AdminPinMiddleware:
         if not pin:
             return self.get_response(request)
 
-        path = request.path or ''
-        admin_prefix = '/' + (getattr(settings, 'ADMIN_PATH', 'admin') or 'admin').strip('/')
-        pin_prefix = admin_prefix + '/pin'
-
         # Allow access to the PIN entry page itself and any static/media paths
         if path.startswith(pin_prefix) or path.startswith('/static/') or path.startswith(settings.MEDIA_URL):
             return self.get_response(request)
@@ -925,4 +935,61 @@ class BusinessSlugRedirectMiddleware:
                 new_path = new_path + '?' + qs
             return HttpResponsePermanentRedirect(new_path)
         except Exception:
-            return self.get_response(request)
\ No newline at end of file
+            return self.get_response(request)
+
+class RequestMetricsMiddleware:
+    """Collect per-request SQL, cache and outbound HTTP timings.
+
+    Logs requests slower than `PERF_SLOW_REQUEST_MS` on the `circlecal.perf`
+    logger and feeds the per-endpoint percentiles shown on the admin
+    performance page. With `PERF_SERVER_TIMING` on, staff users (everyone
+    under DEBUG) also get a `Server-Timing` header; it exposes query counts
+    and timings, so anonymous clients never see it in production.
+    Place it near the top of MIDDLEWARE so the timing covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from calendar_app import request_metrics
+
+        if not request_metrics.metrics_enabled():
+            return self.get_response(request)
+
+        with request_metrics.collect_request_metrics() as metrics:
+            response = self.get_response(request)
+            total_ms = metrics.elapsed_ms()
+
+        try:
+            if getattr(settings, 'PERF_SERVER_TIMING', False) and (
+                settings.DEBUG or getattr(getattr(request, 'user', None), 'is_staff', False)
+            ):
+                response['Server-Timing'] = metrics.server_timing(total_ms)
+
+            endpoint = request_metrics.endpoint_label(request)
+            slow_ms = float(getattr(settings, 'PERF_SLOW_REQUEST_MS', 1000) or 0)
+            slow = bool(slow_ms) and total_ms >= slow_ms
+            if slow:
+                payload = {
+                    'endpoint': endpoint,
+                    'path': request.path,
+                    'status': getattr(response, 'status_code', None),
+                    'duration_ms': round(total_ms, 1),
+                    'sql_count': metrics.sql_count,
+                    'sql_ms': round(metrics.sql_seconds * 1000.0, 1),
+                    'cache_hits': metrics.cache_hits,
+                    'cache_misses': metrics.cache_misses,
+                    'outbound_ms': {k: round(v * 1000.0, 1) for k, v in metrics.outbound_seconds.items()},
+                    'org_id': getattr(getattr(request, 'organization', None), 'id', None),
+                }
+                request_metrics.logger.warning('slow_request %s', json.dumps(payload, sort_keys=True), extra={'perf': payload})
+
+            request_metrics.aggregator.add(endpoint, total_ms, metrics, slow=slow)
+            # A single INSERT; the scheduler merges it into the hourly buckets.
+            if request_metrics.aggregator.flush_due():
+                request_metrics.aggregator.flush()
+        except Exception:
+            logger.debug('Request metrics failed', exc_info=True)
+
+        return response
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0005_rename_calendar_app_content_2a4088_idx_calendar_ap_content_679677_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EndpointTimingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=200)),
+                ('bucket_start', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('slow_count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('sql_count', models.BigIntegerField(default=0)),
+                ('sql_ms', models.FloatField(default=0)),
+                ('outbound_ms', models.FloatField(default=0)),
+                ('cache_hits', models.BigIntegerField(default=0)),
+                ('cache_misses', models.BigIntegerField(default=0)),
+                ('histogram', models.JSONField(default=list)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket_start'], name='calendar_ap_bucket__0907da_idx')],
+                'unique_together': {('endpoint', 'bucket_start')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0006_endpointtimingbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeriodicJobState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('lease_owner', models.CharField(blank=True, default='', max_length=100)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_duration_ms', models.FloatField(default=0)),
+                ('last_status', models.CharField(blank=True, choices=[('ok', 'OK'), ('failed', 'Failed')], default='', max_length=20)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('last_result', models.TextField(blank=True, default='')),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
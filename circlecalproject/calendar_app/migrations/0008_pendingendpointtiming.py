@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar_app', '0007_periodicjobstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingEndpointTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=200)),
+                ('bucket_start', models.DateTimeField()),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
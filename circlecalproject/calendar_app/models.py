@@ -63,3 +63,87 @@ class AdminUndoSnapshot(models.Model):
 
 	def __str__(self) -> str:
 		return f"Undo snapshot for {self.content_type.app_label}.{self.content_type.model} id={self.object_id}"
+
+
+class EndpointTimingBucket(models.Model):
+	"""Hourly latency/SQL aggregates for one endpoint (see calendar_app.request_metrics)."""
+	endpoint = models.CharField(max_length=200)
+	bucket_start = models.DateTimeField()
+	count = models.PositiveIntegerField(default=0)
+	slow_count = models.PositiveIntegerField(default=0)
+	total_ms = models.FloatField(default=0)
+	max_ms = models.FloatField(default=0)
+	sql_count = models.BigIntegerField(default=0)
+	sql_ms = models.FloatField(default=0)
+	outbound_ms = models.FloatField(default=0)
+	cache_hits = models.BigIntegerField(default=0)
+	cache_misses = models.BigIntegerField(default=0)
+	# Request counts per latency bucket (request_metrics.HISTOGRAM_BOUNDS_MS).
+	histogram = models.JSONField(default=list)
+
+	class Meta:
+		unique_together = ("endpoint", "bucket_start")
+		indexes = [
+			models.Index(fields=["bucket_start"]),
+		]
+
+	def merge(self, agg: dict) -> None:
+		self.count += int(agg.get("count") or 0)
+		self.slow_count += int(agg.get("slow_count") or 0)
+		self.total_ms += float(agg.get("total_ms") or 0)
+		self.max_ms = max(float(self.max_ms or 0), float(agg.get("max_ms") or 0))
+		self.sql_count += int(agg.get("sql_count") or 0)
+		self.sql_ms += float(agg.get("sql_ms") or 0)
+		self.outbound_ms += float(agg.get("outbound_ms") or 0)
+		self.cache_hits += int(agg.get("cache_hits") or 0)
+		self.cache_misses += int(agg.get("cache_misses") or 0)
+		incoming = list(agg.get("histogram") or [])
+		merged = list(self.histogram or [])
+		if len(merged) < len(incoming):
+			merged.extend([0] * (len(incoming) - len(merged)))
+		for i, n in enumerate(incoming):
+			merged[i] += int(n or 0)
+		self.histogram = merged
+
+	def __str__(self) -> str:
+		return f"{self.endpoint} @ {self.bucket_start:%Y-%m-%d %H:00}"
+
+
+class PendingEndpointTiming(models.Model):
+	"""Per-worker aggregates waiting for the scheduler to merge them into `EndpointTimingBucket`."""
+	endpoint = models.CharField(max_length=200)
+	bucket_start = models.DateTimeField()
+	# Same keys as EndpointTimingBucket's counters plus "histogram".
+	data = models.JSONField(default=dict)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	def __str__(self) -> str:
+		return f"{self.endpoint} @ {self.bucket_start:%Y-%m-%d %H:00} (pending)"
+
+
+class PeriodicJobState(models.Model):
+	"""Schedule, lease and last-run metrics for one job of `manage.py run_scheduler`."""
+	STATUS_OK = "ok"
+	STATUS_FAILED = "failed"
+	STATUS_CHOICES = [
+		(STATUS_OK, "OK"),
+		(STATUS_FAILED, "Failed"),
+	]
+
+	name = models.CharField(max_length=100, unique=True)
+	next_run_at = models.DateTimeField(null=True, blank=True)
+	# Set while a scheduler process is running the job; other processes skip it
+	# until the lease expires (crashed runner) or is released.
+	lease_owner = models.CharField(max_length=100, blank=True, default="")
+	lease_expires_at = models.DateTimeField(null=True, blank=True)
+	last_started_at = models.DateTimeField(null=True, blank=True)
+	last_finished_at = models.DateTimeField(null=True, blank=True)
+	last_duration_ms = models.FloatField(default=0)
+	last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, default="")
+	last_error = models.TextField(blank=True, default="")
+	last_result = models.TextField(blank=True, default="")
+	run_count = models.PositiveIntegerField(default=0)
+	failure_count = models.PositiveIntegerField(default=0)
+
+	def __str__(self) -> str:
+		return f"{self.name} (next {self.next_run_at or 'now'})"
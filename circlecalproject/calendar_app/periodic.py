@@ -0,0 +1,192 @@
+"""Built-in periodic job runner (`manage.py run_scheduler`).
+
+Housekeeping that used to ride along on user requests or depend on external
+cron runs here instead. Each job has an interval (overridable through
+`SCHEDULER_JOB_INTERVALS`; 0 disables it) and its next run is pushed back by a
+random jitter so several jobs, or several deployments, do not fire together.
+
+Leader election is per job and lives in the database: a process claims a due
+job by setting a lease on its `PeriodicJobState` row with a conditional
+UPDATE, so any number of scheduler processes can run and each job still runs
+once per interval. A runner that dies mid-job leaves a lease that expires after
+`SCHEDULER_LEASE_SECONDS`. The row also keeps the last run's duration, status
+and output plus running run/failure counts.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from calendar_app.models import PeriodicJobState
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    name: str
+    interval_seconds: int
+    func: Callable[[], str]
+
+    def interval(self) -> int:
+        overrides = getattr(settings, 'SCHEDULER_JOB_INTERVALS', None) or {}
+        try:
+            return max(0, int(overrides.get(self.name, self.interval_seconds)))
+        except (TypeError, ValueError):
+            return self.interval_seconds
+
+
+def _command(name: str, *args) -> Callable[[], str]:
+    def _run() -> str:
+        out = io.StringIO()
+        call_command(name, *args, stdout=out, stderr=out)
+        return out.getvalue().strip()
+    return _run
+
+
+def _delete_due_trial_accounts() -> str:
+    from accounts.deletion import delete_due_trial_accounts
+
+    result = delete_due_trial_accounts(limit=200, dry_run=False)
+    return f"Deactivated={result.get('deactivated', 0)}, skipped={result.get('skipped', 0)}."
+
+
+def _purge_admin_undo_snapshots() -> str:
+    from calendar_app.admin_undo import purge_admin_undo_snapshots
+
+    return f"Purged={purge_admin_undo_snapshots()}."
+
+
+def _merge_endpoint_timings() -> str:
+    from calendar_app.request_metrics import merge_pending_timings
+
+    return f"Merged={merge_pending_timings()}."
+
+
+JOBS: list[PeriodicJob] = [
+    PeriodicJob('delete_due_trial_accounts', 300, _delete_due_trial_accounts),
+    PeriodicJob('apply_scheduled_changes', 600, _command('apply_scheduled_changes')),
+    PeriodicJob('process_stripe_events', 300, _command('process_stripe_events')),
+    # Orgs never synced (new deploys, new Stripe customers); a no-op once caught up.
+    PeriodicJob('backfill_billing_mirror', 600, _command('backfill_billing_mirror', '--limit', '25')),
+    PeriodicJob('run_audit_export_jobs', 300, _command('run_audit_export_jobs')),
+    PeriodicJob('run_business_teardowns', 300, _command('run_business_teardowns')),
+    # Each booking is reminded once per start time (Booking.reminder_sent_for),
+    # so hourly runs over a 24h window leave no gap whatever the jitter.
+    PeriodicJob('send_booking_reminders', 3600, _command('send_booking_reminders', '--hours', '24')),
+    PeriodicJob('merge_endpoint_timings', 60, _merge_endpoint_timings),
+    PeriodicJob('scrub_axes_request_data', 86400, _command('scrub_axes_request_data')),
+    PeriodicJob('purge_admin_undo_snapshots', 86400, _purge_admin_undo_snapshots),
+]
+
+
+def get_job(name: str) -> PeriodicJob | None:
+    return next((job for job in JOBS if job.name == name), None)
+
+
+def runner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _jitter(interval: int) -> float:
+    fraction = float(getattr(settings, 'SCHEDULER_JITTER_FRACTION', 0.1) or 0)
+    return random.uniform(0, max(0.0, fraction) * interval)
+
+
+def _lease_seconds() -> int:
+    return max(60, int(getattr(settings, 'SCHEDULER_LEASE_SECONDS', 900) or 900))
+
+
+def _state(job: PeriodicJob) -> PeriodicJobState:
+    state = PeriodicJobState.objects.filter(name=job.name).first()
+    if state is not None:
+        return state
+    try:
+        # Stagger first runs so a fresh deploy does not start every job at once.
+        return PeriodicJobState.objects.create(
+            name=job.name, next_run_at=timezone.now() + timedelta(seconds=_jitter(min(job.interval(), 300))),
+        )
+    except IntegrityError:
+        return PeriodicJobState.objects.get(name=job.name)
+
+
+def _claim(job: PeriodicJob, owner: str, *, force: bool = False) -> bool:
+    now = timezone.now()
+    due = Q()
+    if not force:
+        due = Q(next_run_at__isnull=True) | Q(next_run_at__lte=now)
+    free = Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+    return bool(
+        PeriodicJobState.objects.filter(due, free, name=job.name).update(
+            lease_owner=owner,
+            lease_expires_at=now + timedelta(seconds=_lease_seconds()),
+            last_started_at=now,
+        )
+    )
+
+
+def run_job(job: PeriodicJob, owner: str, *, force: bool = False) -> bool | None:
+    """Run one job if it is due and unclaimed. Returns None when skipped, else success."""
+    interval = job.interval()
+    if not interval and not force:
+        return None
+    _state(job)
+    if not _claim(job, owner, force=force):
+        return None
+
+    started = time.perf_counter()
+    error = ''
+    output = ''
+    try:
+        output = job.func() or ''
+    except Exception as exc:
+        logger.exception('periodic job %s failed', job.name)
+        error = f'{type(exc).__name__}: {exc}'
+    duration_ms = (time.perf_counter() - started) * 1000.0
+
+    finished = timezone.now()
+    PeriodicJobState.objects.filter(name=job.name, lease_owner=owner).update(
+        lease_owner='',
+        lease_expires_at=None,
+        next_run_at=finished + timedelta(seconds=(interval or job.interval_seconds) + _jitter(interval)),
+        last_finished_at=finished,
+        last_duration_ms=duration_ms,
+        last_status=PeriodicJobState.STATUS_FAILED if error else PeriodicJobState.STATUS_OK,
+        last_error=error[:2000],
+        last_result=str(output)[:2000],
+        run_count=F('run_count') + 1,
+        failure_count=F('failure_count') + (1 if error else 0),
+    )
+    logger.info(
+        'periodic job %s %s in %.0fms%s',
+        job.name, 'failed' if error else 'ok', duration_ms, f': {output}' if output and not error else '',
+    )
+    return not error
+
+
+def run_due_jobs(owner: str, *, names: list[str] | None = None, force: bool = False) -> dict[str, bool]:
+    """Run every due job (or only `names`) once. Returns {name: success} for jobs that ran."""
+    results = {}
+    for job in JOBS:
+        if names and job.name not in names:
+            continue
+        ok = run_job(job, owner, force=force)
+        if ok is not None:
+            results[job.name] = ok
+    return results
@@ -5,7 +5,7 @@ from typing import Any
 import re
 import hashlib
 
-import requests
+from . import http_client
 
 
 RENDER_API_BASE_URL = "https://api.render.com/v1"
@@ -90,7 +90,7 @@ def _headers(cfg: RenderApiConfig) -> dict[str, str]:
 
 def _request(cfg: RenderApiConfig, method: str, path: str, *, json: Any = None, params: Any = None) -> Any:
     url = f"{RENDER_API_BASE_URL}{path}"
-    resp = requests.request(method, url, headers=_headers(cfg), json=json, params=params, timeout=15)
+    resp = http_client.request("render", method, url, headers=_headers(cfg), json=json, params=params)
 
     # Render often returns JSON errors, but keep this defensive.
     payload: Any
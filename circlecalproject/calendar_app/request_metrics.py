@@ -0,0 +1,398 @@
+"""Per-request performance metrics.
+
+`RequestMetricsMiddleware` (calendar_app.middleware) opens a `RequestMetrics`
+collector for each request. While it is active:
+
+- every SQL statement is counted and timed through a DB execute wrapper,
+- cache hits and misses are counted by the configured cache backends
+  (`install_cache_metrics`),
+- `outbound_timer` records time spent calling third parties (Stripe, Expo,
+  Turnstile, Render, Cloudflare).
+
+At the end of the request the middleware logs slow requests on the
+`circlecal.perf` logger and folds the request into per-endpoint latency
+histograms. With `PERF_SERVER_TIMING` on, staff users (and everyone under
+DEBUG) also get a `Server-Timing` header. Histograms are buffered in-process
+and handed off as `PendingEndpointTiming` rows (one insert per flush, no
+locks); the `merge_endpoint_timings` scheduler job folds those into
+`EndpointTimingBucket` rows (one per endpoint per hour) so the staff
+performance page can show percentiles across all workers.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+logger = logging.getLogger('circlecal.perf')
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+
+_current: contextvars.ContextVar = contextvars.ContextVar('circlecal_request_metrics', default=None)
+# Set while an instrumented cache call runs, so backends whose get() calls
+# get_many() (or the reverse) count each lookup once.
+_in_cache_call: contextvars.ContextVar = contextvars.ContextVar('circlecal_cache_call', default=False)
+_MISSING = object()
+
+
+def metrics_enabled() -> bool:
+    return bool(getattr(settings, 'PERF_METRICS_ENABLED', True))
+
+
+class RequestMetrics:
+    """Counters for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.outbound_seconds: dict[str, float] = {}
+        self.outbound_calls: dict[str, int] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    @property
+    def outbound_total_ms(self) -> float:
+        return sum(self.outbound_seconds.values()) * 1000.0
+
+    def server_timing(self, total_ms: float) -> str:
+        parts = [
+            f'app;dur={total_ms:.1f}',
+            f'db;dur={self.sql_seconds * 1000.0:.1f};desc="{self.sql_count} queries"',
+            f'cache;desc="hits={self.cache_hits} misses={self.cache_misses}"',
+        ]
+        for name in sorted(self.outbound_seconds):
+            parts.append(f'{name};dur={self.outbound_seconds[name] * 1000.0:.1f}')
+        return ', '.join(parts)
+
+
+def current_metrics() -> RequestMetrics | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_request_metrics():
+    """Activate a fresh collector (and SQL timing) for the enclosed block."""
+    from contextlib import ExitStack
+    from django.db import connections
+
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(_sql_timer))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+def _sql_timer(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.sql_count += 1
+        metrics.sql_seconds += time.perf_counter() - started
+
+
+def record_outbound(name: str, seconds: float) -> None:
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.outbound_seconds[name] = metrics.outbound_seconds.get(name, 0.0) + float(seconds)
+    metrics.outbound_calls[name] = metrics.outbound_calls.get(name, 0) + 1
+
+
+@contextmanager
+def outbound_timer(name: str):
+    """Time an outbound HTTP call to a third-party service."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_outbound(name, time.perf_counter() - started)
+
+
+def record_cache(hits: int = 0, misses: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.cache_hits += hits
+    metrics.cache_misses += misses
+
+
+def _instrument_cache_class(cls) -> None:
+    from django.core.cache.backends.base import BaseCache
+
+    if '_circlecal_metrics' in cls.__dict__:
+        return
+    original_get = cls.get
+
+    def get(self, key, default=None, version=None):
+        if _in_cache_call.get():
+            return original_get(self, key, default, version=version)
+        token = _in_cache_call.set(True)
+        try:
+            value = original_get(self, key, _MISSING, version=version)
+        finally:
+            _in_cache_call.reset(token)
+        if value is _MISSING:
+            record_cache(misses=1)
+            return default
+        record_cache(hits=1)
+        return value
+
+    cls.get = get
+    # BaseCache.get_many loops over get(), which is already counted.
+    if cls.get_many is not BaseCache.get_many:
+        original_get_many = cls.get_many
+
+        def get_many(self, keys, version=None):
+            if _in_cache_call.get():
+                return original_get_many(self, keys, version=version)
+            keys = list(keys)
+            token = _in_cache_call.set(True)
+            try:
+                found = original_get_many(self, keys, version=version)
+            finally:
+                _in_cache_call.reset(token)
+            record_cache(hits=len(found), misses=len(keys) - len(found))
+            return found
+
+        cls.get_many = get_many
+    cls._circlecal_metrics = True
+
+
+def install_cache_metrics() -> None:
+    """Count hits and misses of every configured cache in per-request metrics."""
+    from django.core.cache import caches
+
+    for alias in getattr(settings, 'CACHES', None) or {}:
+        try:
+            _instrument_cache_class(type(caches[alias]))
+        except Exception:
+            logger.debug('Cache metrics not installed for %s', alias, exc_info=True)
+
+
+def install_stripe_timing() -> None:
+    """Route Stripe SDK calls through a client that records outbound time.
+
+    Leaves any client configured elsewhere untouched.
+    """
+    try:
+        import stripe
+    except Exception:
+        return
+    if getattr(stripe, 'default_http_client', None) is not None:
+        return
+
+    class TimedStripeClient(stripe.RequestsClient):
+        def request(self, *args, **kwargs):
+            with outbound_timer('stripe'):
+                return super().request(*args, **kwargs)
+
+        def request_stream(self, *args, **kwargs):
+            with outbound_timer('stripe'):
+                return super().request_stream(*args, **kwargs)
+
+    try:
+        stripe.default_http_client = TimedStripeClient(
+            verify_ssl_certs=getattr(stripe, 'verify_ssl_certs', True),
+            proxy=getattr(stripe, 'proxy', None),
+        )
+    except Exception:
+        logger.debug('Stripe timing client not installed', exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Per-endpoint aggregation
+# ---------------------------------------------------------------------------
+
+def histogram_index(ms: float) -> int:
+    return bisect_left(HISTOGRAM_BOUNDS_MS, ms)
+
+
+def histogram_percentile(histogram, count: int, pct: float, max_ms: float | None = None) -> float | None:
+    """Approximate a percentile as the upper bound of the bucket that holds it."""
+    if not count:
+        return None
+    target = max(1, int(round(count * pct / 100.0)))
+    seen = 0
+    for i, n in enumerate(histogram or []):
+        seen += int(n or 0)
+        if seen >= target:
+            if i < len(HISTOGRAM_BOUNDS_MS):
+                bound = float(HISTOGRAM_BOUNDS_MS[i])
+                return min(bound, max_ms) if max_ms else bound
+            return float(max_ms) if max_ms else float(HISTOGRAM_BOUNDS_MS[-1])
+    return float(max_ms) if max_ms else None
+
+
+def _empty_aggregate() -> dict:
+    return {
+        'count': 0,
+        'slow_count': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'sql_count': 0,
+        'sql_ms': 0.0,
+        'outbound_ms': 0.0,
+        'cache_hits': 0,
+        'cache_misses': 0,
+        'histogram': [0] * (len(HISTOGRAM_BOUNDS_MS) + 1),
+    }
+
+
+class EndpointAggregator:
+    """Buffer per-endpoint aggregates in-process and flush them periodically."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[tuple, dict] = {}
+        self._last_flush = time.monotonic()
+
+    def add(self, endpoint: str, total_ms: float, metrics: RequestMetrics, *, slow: bool) -> None:
+        bucket_start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        with self._lock:
+            agg = self._pending.setdefault((endpoint, bucket_start), _empty_aggregate())
+            agg['count'] += 1
+            agg['slow_count'] += 1 if slow else 0
+            agg['total_ms'] += total_ms
+            agg['max_ms'] = max(agg['max_ms'], total_ms)
+            agg['sql_count'] += metrics.sql_count
+            agg['sql_ms'] += metrics.sql_seconds * 1000.0
+            agg['outbound_ms'] += metrics.outbound_total_ms
+            agg['cache_hits'] += metrics.cache_hits
+            agg['cache_misses'] += metrics.cache_misses
+            agg['histogram'][histogram_index(total_ms)] += 1
+
+    def flush_due(self) -> bool:
+        interval = float(getattr(settings, 'PERF_METRICS_FLUSH_SECONDS', 60) or 0)
+        return (time.monotonic() - self._last_flush) >= interval
+
+    def flush(self) -> int:
+        """Hand buffered aggregates to the scheduler as `PendingEndpointTiming` rows."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        from calendar_app.models import PendingEndpointTiming
+
+        try:
+            PendingEndpointTiming.objects.bulk_create([
+                PendingEndpointTiming(endpoint=endpoint[:200], bucket_start=bucket_start, data=agg)
+                for (endpoint, bucket_start), agg in pending.items()
+            ])
+        except Exception:
+            logger.warning('Failed to flush endpoint timings', exc_info=True)
+            return 0
+        return len(pending)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = {}
+
+
+aggregator = EndpointAggregator()
+
+
+def merge_pending_timings(*, limit: int = 5000) -> int:
+    """Fold handed-off aggregates into hourly `EndpointTimingBucket` rows.
+
+    Runs from the scheduler (`merge_endpoint_timings`) so the row locks stay
+    off the request path. Returns the number of pending rows merged.
+    """
+    from django.db import transaction
+    from calendar_app.models import EndpointTimingBucket, PendingEndpointTiming
+
+    with transaction.atomic():
+        pending = list(PendingEndpointTiming.objects.order_by('id')[:limit])
+        if not pending:
+            return 0
+        merged: dict[tuple, dict] = {}
+        for item in pending:
+            agg = merged.setdefault((item.endpoint, item.bucket_start), _empty_aggregate())
+            incoming = item.data or {}
+            for field in ('count', 'slow_count', 'total_ms', 'sql_count', 'sql_ms', 'outbound_ms', 'cache_hits', 'cache_misses'):
+                agg[field] += incoming.get(field) or 0
+            agg['max_ms'] = max(agg['max_ms'], float(incoming.get('max_ms') or 0))
+            for i, n in enumerate(incoming.get('histogram') or []):
+                if i < len(agg['histogram']):
+                    agg['histogram'][i] += int(n or 0)
+
+        for (endpoint, bucket_start), agg in merged.items():
+            row, _ = EndpointTimingBucket.objects.select_for_update().get_or_create(
+                endpoint=endpoint, bucket_start=bucket_start,
+            )
+            row.merge(agg)
+            row.save()
+        PendingEndpointTiming.objects.filter(id__in=[item.id for item in pending]).delete()
+    return len(pending)
+
+
+def endpoint_label(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    route = getattr(match, 'route', None) or getattr(match, 'view_name', None) or 'unresolved'
+    return f'{request.method} /{route}'
+
+
+def summarize_endpoints(*, hours: int = 24, limit: int = 100) -> list[dict]:
+    """Merge stored buckets from the last `hours` into per-endpoint rows."""
+    from calendar_app.models import EndpointTimingBucket
+
+    since = timezone.now() - timedelta(hours=hours)
+    merged: dict[str, dict] = {}
+    for row in EndpointTimingBucket.objects.filter(bucket_start__gte=since).iterator():
+        agg = merged.setdefault(row.endpoint, _empty_aggregate())
+        agg['count'] += row.count
+        agg['slow_count'] += row.slow_count
+        agg['total_ms'] += row.total_ms
+        agg['max_ms'] = max(agg['max_ms'], row.max_ms)
+        agg['sql_count'] += row.sql_count
+        agg['sql_ms'] += row.sql_ms
+        agg['outbound_ms'] += row.outbound_ms
+        agg['cache_hits'] += row.cache_hits
+        agg['cache_misses'] += row.cache_misses
+        for i, n in enumerate(row.histogram or []):
+            if i < len(agg['histogram']):
+                agg['histogram'][i] += int(n or 0)
+
+    rows = []
+    for endpoint, agg in merged.items():
+        count = agg['count'] or 1
+        rows.append({
+            'endpoint': endpoint,
+            'count': agg['count'],
+            'slow_count': agg['slow_count'],
+            'p50_ms': histogram_percentile(agg['histogram'], agg['count'], 50, agg['max_ms']),
+            'p95_ms': histogram_percentile(agg['histogram'], agg['count'], 95, agg['max_ms']),
+            'p99_ms': histogram_percentile(agg['histogram'], agg['count'], 99, agg['max_ms']),
+            'max_ms': agg['max_ms'],
+            'avg_ms': agg['total_ms'] / count,
+            'avg_sql_count': agg['sql_count'] / count,
+            'avg_sql_ms': agg['sql_ms'] / count,
+            'avg_outbound_ms': agg['outbound_ms'] / count,
+            'cache_hits': agg['cache_hits'],
+            'cache_misses': agg['cache_misses'],
+        })
+    rows.sort(key=lambda r: (r['p95_ms'] or 0, r['count']), reverse=True)
+    return rows[:limit]
@@ -0,0 +1,142 @@
+"""Versioned cache for weekly partitioning constraints.
+
+Checking a service's windows against "member availability minus the member's
+other services" rebuilds several weekly maps from the database on every call,
+and `service_availability_constraints`, `create_service` and `edit_service`
+make those calls repeatedly for the same inputs.
+
+Each organization has a schedule version in the cache. The helpers wrapped
+with `@schedule_memoized` store their results under
+`(org, version, function, arguments)`, so a hit costs one cache read for the
+version plus one for the value and no SQL. Any write to the rows those maps
+are built from (org/service/member weekly rows, service assignments, services,
+memberships, and the subscription whose trial status changes service
+inheritance) bumps the version through the signal receivers below, which
+makes every older entry unreachable; they simply expire after
+`SCHEDULE_CACHE_TTL_SECONDS`. Bulk writes that skip signals
+(`bulk_create`, `QuerySet.update`) call `bump_schedule_version` themselves.
+
+The version is bumped again when the transaction commits, so a concurrent
+reader that computed a map from pre-commit rows cannot leave it behind under
+the current version.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+_VERSION_KEY = 'sched_ver:{org_id}'
+_MISSING = object()
+
+
+def _ttl() -> int:
+    return max(0, int(getattr(settings, 'SCHEDULE_CACHE_TTL_SECONDS', 3600) or 0))
+
+
+def schedule_version(org_id) -> int:
+    key = _VERSION_KEY.format(org_id=org_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so an evicted counter never returns to a value
+        # whose entries may still be cached.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return int(version or 0)
+
+
+def _bump(org_id) -> None:
+    key = _VERSION_KEY.format(org_id=org_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_schedule_version(org_id) -> None:
+    """Invalidate every memoized schedule map of the organization."""
+    if not org_id:
+        return
+    _bump(org_id)
+    transaction.on_commit(lambda: _bump(org_id))
+
+
+def schedule_memoized(func):
+    """Memoize `func(org, *args, **kwargs)` under the org's schedule version.
+
+    Arguments must have stable `repr`s (ids, tuples, None). Results are deep
+    copied on the way out so callers may mutate them freely.
+    """
+
+    @functools.wraps(func)
+    def wrapper(org, *args, **kwargs):
+        org_id = getattr(org, 'id', None)
+        ttl = _ttl()
+        if not org_id or not ttl:
+            return func(org, *args, **kwargs)
+        digest = hashlib.md5(repr((args, sorted(kwargs.items()))).encode(), usedforsecurity=False).hexdigest()
+        key = f'sched:{org_id}:{schedule_version(org_id)}:{func.__name__}:{digest}'
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = func(org, *args, **kwargs)
+            if hasattr(value, '__iter__') and not isinstance(value, (list, tuple, dict, str)):
+                # Querysets are materialized once.
+                value = list(value)
+            cache.set(key, value, timeout=ttl)
+        return copy.deepcopy(value)
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def _org_id_for(instance):
+    org_id = getattr(instance, 'organization_id', None)
+    if org_id:
+        return org_id
+    for rel in ('service', 'membership'):
+        if getattr(instance, f'{rel}_id', None):
+            try:
+                return getattr(getattr(instance, rel), 'organization_id', None)
+            except Exception:
+                return None
+    return None
+
+
+def _on_schedule_row_change(sender, instance, **kwargs):
+    from accounts.teardown import teardown_in_progress
+
+    if teardown_in_progress():
+        return
+    bump_schedule_version(_org_id_for(instance))
+
+
+def _on_business_created(sender, instance, created=False, **kwargs):
+    # Row ids can be reused (e.g. SQLite after a rollback); start a new org clean.
+    if created:
+        bump_schedule_version(instance.id)
+
+
+def connect_signals() -> None:
+    from accounts.models import Business, Membership
+    from billing.models import Subscription
+    from bookings.models import (
+        MemberWeeklyAvailability,
+        Service,
+        ServiceAssignment,
+        ServiceWeeklyAvailability,
+        WeeklyAvailability,
+    )
+
+    for model in (WeeklyAvailability, ServiceWeeklyAvailability, MemberWeeklyAvailability, ServiceAssignment, Service, Membership, Subscription):
+        uid = f'schedule_cache:{model._meta.label_lower}'
+        post_save.connect(_on_schedule_row_change, sender=model, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_on_schedule_row_change, sender=model, dispatch_uid=f'{uid}:delete')
+    post_save.connect(_on_business_created, sender=Business, dispatch_uid='schedule_cache:business:created')
@@ -1,7 +1,10 @@
 from django.urls import path
-from . import views
+from calendar_app.lazy_views import lazy_views
 from django.views.generic import TemplateView
 
+# Imported on first use; see calendar_app.lazy_views.
+views = lazy_views('calendar_app.views')
+
 app_name = 'calendar_app'
 
 urlpatterns = [
@@ -67,6 +70,9 @@ urlpatterns = [
     # Audit endpoints for owner-facing audit snippets
     path('bus/<slug:org_slug>/bookings/audit/', views.bookings_audit_list, name='bookings_audit_list'),
     path('bus/<slug:org_slug>/bookings/audit/export/', views.bookings_audit_export, name='bookings_audit_export'),
+    path('bus/<slug:org_slug>/bookings/audit/export/stream/', views.bookings_audit_export_stream, name='bookings_audit_export_stream'),
+    path('bus/<slug:org_slug>/bookings/audit/export/jobs/<int:job_id>/', views.bookings_audit_export_job, name='bookings_audit_export_job'),
+    path('bus/<slug:org_slug>/bookings/audit/export/jobs/<int:job_id>/download/', views.bookings_audit_export_job_download, name='bookings_audit_export_job_download'),
     path('bus/<slug:org_slug>/bookings/audit/delete/', views.bookings_audit_delete, name='bookings_audit_delete'),
     path('bus/<slug:org_slug>/bookings/audit/undo/', views.bookings_audit_undo, name='bookings_audit_undo'),
     path('bus/<slug:org_slug>/bookings/<int:booking_id>/audit/', views.bookings_audit_for_booking, name='bookings_audit_for_booking'),
@@ -10,11 +10,11 @@ from django.http import JsonResponse
 from django.middleware.csrf import get_token
 from accounts.models import Business as Organization, Membership, Invite
 from bookings.models import Booking, Service, ServiceSettingFreeze, AuditBooking, FacilityResource, ServiceResource
-from bookings.views import _has_overlap
 from bookings.models import WeeklyAvailability, ServiceWeeklyAvailability, MemberWeeklyAvailability
 from django.db import transaction
 from django.http import HttpResponseForbidden
 from calendar_app.permissions import require_roles
+from calendar_app.db_routing import read_replica
 from calendar_app.utils import user_has_role
 from django.shortcuts import get_object_or_404
 from django.utils.crypto import get_random_string
@@ -36,6 +36,9 @@ from calendar_app.forms import ContactForm
 from django.urls import reverse
 from urllib.parse import urlencode
 from django.views.decorators.cache import never_cache
+from bookings.archive import audit_history, booking_history, merged_keyset_page
+from bookings.search import InvalidCursor, apply_booking_search
+from calendar_app.schedule_cache import bump_schedule_version, schedule_memoized
 
 
 def _unique_resource_slug_for_org(org: Organization, base_slug: str, exclude_id: int = None) -> str:
@@ -375,6 +378,7 @@ def update_service_settings(request, org_slug, service_id):
     if conflicting and apply_to_conflicts:
         other_ids = [c['id'] for c in conflicting]
         Service.objects.filter(id__in=other_ids).update(**fields)
+        bump_schedule_version(svc.organization_id)
 
     return JsonResponse({'status': 'ok', 'applied_to_conflicts': bool(conflicting and apply_to_conflicts)})
 
@@ -1376,6 +1380,7 @@ def apply_service_update(request, org_slug, service_id):
 
                 ServiceWeeklyAvailability.objects.filter(service=svc).delete()
                 ServiceWeeklyAvailability.objects.bulk_create(new_objs)
+                bump_schedule_version(svc.organization_id)
             else:
                 # If nothing posted, remove per-service windows.
                 ServiceWeeklyAvailability.objects.filter(service=svc).delete()
@@ -1492,6 +1497,7 @@ def _seed_service_weekly_from_org_defaults(org, service):
             )
             for r in org_rows
         ])
+        bump_schedule_version(service.organization_id)
         return True
     except Exception:
         return False
@@ -1601,6 +1607,7 @@ def _build_service_schedule_signature_from_payload(payload=None, *, defaults=Non
     )
 
 
+@schedule_memoized
 def _effective_member_weekly_map(org, membership_id):
     """Return the member's effective weekly map (member-specific if present, else org defaults)."""
     try:
@@ -1763,6 +1770,7 @@ def _effective_common_weekly_map(org, membership_ids):
     return common
 
 
+@schedule_memoized
 def _effective_common_weekly_map_minus_other_services(org, membership_ids, *, exclude_service_id=None, proposed_signature=None):
     """Return UI weekly map for a shared/group service: common member availability minus members' other services.
 
@@ -1888,6 +1896,7 @@ def _effective_common_weekly_map_minus_other_services(org, membership_ids, *, ex
     return common
 
 
+@schedule_memoized
 def _effective_org_weekly_map_minus_other_services(org, *, exclude_service_id=None, only_active=True, proposed_signature=None):
     """Return UI weekly map for Pro/solo org scope: org weekly availability minus other services.
 
@@ -2059,6 +2068,7 @@ def _enforce_service_windows_within_ui_allowed_map(allowed_ui_map, proposed_clea
             )
 
 
+@schedule_memoized
 def _solo_services_signature_mode(org, membership_id):
     """Return 'all_same' or 'mixed' for the member's solo services.
 
@@ -2781,6 +2791,7 @@ def _enforce_service_windows_within_allowed_rows(allowed_cleaned_rows, service,
             )
 
 
+@schedule_memoized
 def _iter_member_solo_services(org, membership_id):
     """Yield solo services for a membership (services assigned to exactly this one member)."""
     try:
@@ -3561,28 +3572,20 @@ def _ensure_weekly_freezes_for_booked_dates(org, services, org_tz, horizon):
     except Exception:
         return
 
-    # Only real bookings (exclude per-date override rows)
+    # Only real bookings (exclude per-date override rows), one row per
+    # (service, org-local day) straight from the local_date index.
     try:
-        bookings = Booking.objects.filter(
-            organization=org,
-            service__in=list(services),
-            service__isnull=False,
-            start__gte=today_org,
-            start__lte=horizon,
-        ).select_related('service')
+        pairs = set(
+            Booking.objects.filter(
+                organization=org,
+                service__in=list(services),
+                local_date__gte=today_org.date(),
+                start__lte=horizon,
+            ).values_list('service_id', 'local_date').distinct()
+        )
     except Exception:
         return
 
-    # Deduplicate by (service_id, local_date)
-    pairs = set()
-    for b in bookings:
-        try:
-            d = b.start.astimezone(org_tz).date()
-        except Exception:
-            d = b.start.date()
-        if b.service_id:
-            pairs.add((b.service_id, d))
-
     if not pairs:
         return
 
@@ -3847,6 +3850,7 @@ def save_availability(request, slug):
                 MemberWeeklyAvailability.objects.bulk_create([
                     MemberWeeklyAvailability(membership=membership, weekday=wd, start_time=start, end_time=end, is_active=True) for (wd, start, end) in cleaned_rows
                 ])
+                bump_schedule_version(org.id)
                 created_count += len(cleaned_rows)
         return JsonResponse({'success': True, 'member_count': created_count})
 
@@ -3897,6 +3901,7 @@ def save_availability(request, slug):
                 ServiceWeeklyAvailability.objects.bulk_create([
                     ServiceWeeklyAvailability(service=svc, weekday=wd, start_time=start, end_time=end, is_active=True) for (wd, start, end) in cleaned_rows
                 ])
+                bump_schedule_version(org.id)
                 # New rule: a service with no weekly availability must be inactive.
                 # Per-date overrides do not count.
                 if not cleaned_rows:
@@ -4002,6 +4007,7 @@ def save_availability(request, slug):
                     )
                     for (wd, start, end) in cleaned
                 ])
+                bump_schedule_version(org.id)
 
                 # New rule: a service with no weekly availability must be inactive.
                 # Per-date overrides do not count.
@@ -4053,6 +4059,7 @@ def save_availability(request, slug):
                     )
                     for (wd, start, end) in cleaned
                 ])
+                bump_schedule_version(org.id)
             return JsonResponse({'success': True, 'count': len(cleaned), 'target': f'mem:{membership.id}'})
 
     # Default: organization-level weekly availability (existing behavior)
@@ -4119,6 +4126,7 @@ def save_availability(request, slug):
             )
             for (wd, start, end) in cleaned
         ])
+        bump_schedule_version(org.id)
 
     return JsonResponse({'success': True, 'count': len(cleaned)})
 
@@ -4243,6 +4251,7 @@ def save_availability_general(request):
             )
             for (wd, start, end) in cleaned
         ])
+        bump_schedule_version(org.id)
 
     return JsonResponse({'success': True, 'count': len(cleaned)})
 
@@ -4740,8 +4749,17 @@ def delete_business(request, org_slug):
     if request.method in {"GET", "POST"}:
         org_name = org.name
         try:
-            org.delete()
-            messages.success(request, f"Business '{org_name}' has been deleted.")
+            from accounts.models import BusinessTeardownJob
+            from accounts.teardown import request_business_teardown
+            job = request_business_teardown(org, requested_by=request.user, reason='delete_business')
+            if job.status == BusinessTeardownJob.STATUS_DONE:
+                # Keep the post-response middleware from re-provisioning a trial for it.
+                request.organization = None
+                messages.success(request, f"Business '{org_name}' has been deleted.")
+            elif job.status == BusinessTeardownJob.STATUS_FAILED:
+                messages.error(request, "Unable to delete business. Please try again.")
+            else:
+                messages.success(request, f"Business '{org_name}' is being deleted. This can take a few minutes.")
         except Exception:
             messages.error(request, "Unable to delete business. Please try again.")
         return redirect('calendar_app:choose_business')
@@ -6948,6 +6966,7 @@ def create_service(request, org_slug):
                                     is_active=True,
                                 ))
                             ServiceWeeklyAvailability.objects.bulk_create(new_objs)
+                            bump_schedule_version(svc.organization_id)
                         except Exception:
                             # Keep service created even if weekly availability save fails
                             pass
@@ -8084,6 +8103,7 @@ def edit_service(request, org_slug, service_id):
                                 # Replace existing windows
                                 ServiceWeeklyAvailability.objects.filter(service=service).delete()
                                 ServiceWeeklyAvailability.objects.bulk_create(new_objs)
+                                bump_schedule_version(service.organization_id)
                     else:
                         # If no posted windows present, remove any existing per-service windows
                         ServiceWeeklyAvailability.objects.filter(service=service).delete()
@@ -8455,8 +8475,12 @@ def _staff_assigned_service_ids(org, user, membership=None):
     return sorted(ids)
 
 
+BOOKINGS_LIST_PAGE_SIZE = 200
+
+
 @login_required
 @require_roles(['owner', 'admin', 'manager', 'staff'])
+@read_replica
 def bookings_list(request, org_slug):
     """
     Display all bookings for this organization.
@@ -8469,12 +8493,12 @@ def bookings_list(request, org_slug):
     )
     can_manage_bookings_controls = user_org_role in {'owner', 'admin', 'manager'}
 
-    # Base querysets
-    bookings_qs = Booking.objects.filter(
-        organization=org,
-        is_blocking=False,
-        service__isnull=False,
-    ).select_related('service').order_by('-start')
+    # Base querysets. Bookings past the archive horizon live in
+    # ArchivedBooking; every filter below is applied to both tables.
+    bookings_qs, archived_qs = (
+        qs.filter(is_blocking=False, service__isnull=False).select_related('service').order_by('-start')
+        for qs in booking_history(org)
+    )
 
     audit_qs = AuditBooking.objects.filter(organization=org).select_related('service').order_by('-created_at')
 
@@ -8483,9 +8507,9 @@ def bookings_list(request, org_slug):
     staff_allowed_service_ids = []
     if user_org_role == 'staff':
         staff_allowed_service_ids = _staff_assigned_service_ids(org, request.user, membership)
-        bookings_qs = bookings_qs.filter(
-            Q(assigned_user=request.user) | Q(service_id__in=staff_allowed_service_ids)
-        )
+        staff_q = Q(assigned_user=request.user) | Q(service_id__in=staff_allowed_service_ids)
+        bookings_qs = bookings_qs.filter(staff_q)
+        archived_qs = archived_qs.filter(staff_q)
 
         # Service filter options: assigned services plus services from directly-assigned bookings.
         direct_service_ids = []
@@ -8525,17 +8549,19 @@ def bookings_list(request, org_slug):
     scope_service_ids: list[int] | None = None
 
     def _apply_scope(service_id: int | None, service_ids: list[int] | None):
-        nonlocal bookings_qs, audit_qs, scope_service_id, scope_service_ids
+        nonlocal bookings_qs, archived_qs, audit_qs, scope_service_id, scope_service_ids
         if service_id is not None:
             scope_service_id = int(service_id)
             scope_service_ids = None
             bookings_qs = bookings_qs.filter(service_id=service_id)
+            archived_qs = archived_qs.filter(service_id=service_id)
             audit_qs = audit_qs.filter(service_id=service_id)
             return
         if service_ids is not None:
             scope_service_id = None
             scope_service_ids = [int(x) for x in service_ids]
             bookings_qs = bookings_qs.filter(service_id__in=service_ids)
+            archived_qs = archived_qs.filter(service_id__in=service_ids)
             audit_qs = audit_qs.filter(service_id__in=service_ids)
 
     # Scope filter matches calendar.html conventions:
@@ -8584,6 +8610,7 @@ def bookings_list(request, org_slug):
                     uid = getattr(getattr(mem, 'user', None), 'id', None)
                     if uid:
                         bookings_qs = bookings_qs.filter(assigned_user_id=uid)
+                        archived_qs = archived_qs.filter(assigned_user_id=uid)
                         # AuditBooking isn't user-assigned; can't reliably filter it in this fallback.
                 except Exception:
                     pass
@@ -8654,12 +8681,33 @@ def bookings_list(request, org_slug):
     except Exception:
         audit_services_qs = services
 
+    # Server-side search + keyset pagination (newest first). The page renders
+    # one window of rows; "Load older" follows `next_cursor`.
+    search_query = (request.GET.get('q') or '').strip()
+    if search_query:
+        bookings_qs = apply_booking_search(bookings_qs, search_query, organization=org)
+        archived_qs = apply_booking_search(archived_qs, search_query, organization=org)
+    try:
+        bookings_page, next_cursor = merged_keyset_page(
+            (bookings_qs, archived_qs),
+            cursor=request.GET.get('cursor'),
+            limit=BOOKINGS_LIST_PAGE_SIZE,
+            descending=True,
+        )
+    except InvalidCursor:
+        bookings_page, next_cursor = merged_keyset_page(
+            (bookings_qs, archived_qs), limit=BOOKINGS_LIST_PAGE_SIZE, descending=True,
+        )
+
     now = timezone.now()
     today = date.today()
 
     return render(request, "calendar_app/bookings_list.html", {
         "organization": org,
-        "bookings": bookings_qs,
+        "bookings": bookings_page,
+        "next_cursor": next_cursor,
+        "is_paged": bool(request.GET.get('cursor')),
+        "search_query": search_query,
         "services": services,
         "user_org_role": user_org_role,
         "can_manage_bookings_controls": can_manage_bookings_controls,
@@ -9194,6 +9242,7 @@ def bulk_delete_bookings(request, org_slug):
 
 @login_required
 @require_roles(['owner', 'admin', 'manager', 'staff'])
+@read_replica
 def bookings_audit_list(request, org_slug):
     """Return a paginated JSON list of audit entries for the organization.
 
@@ -9209,7 +9258,7 @@ def bookings_audit_list(request, org_slug):
     )
     page = int(request.GET.get('page', 1))
     per_page = int(request.GET.get('per_page', 25))
-    qs = AuditBooking.objects.filter(organization=org).order_by('-created_at')
+    qs = audit_history(org)
     if user_org_role == 'staff':
         staff_allowed_service_ids = _staff_assigned_service_ids(org, request.user, membership)
         if staff_allowed_service_ids:
@@ -9283,6 +9332,7 @@ def bookings_audit_list(request, org_slug):
 
 @login_required
 @require_roles(['owner', 'admin', 'manager', 'staff'])
+@read_replica
 def bookings_audit_for_booking(request, org_slug, booking_id):
     """Return audit entries for a specific original booking id."""
     org = request.organization
@@ -9291,7 +9341,7 @@ def bookings_audit_for_booking(request, org_slug, booking_id):
         getattr(membership, 'role', None)
         or ('owner' if getattr(org, 'owner_id', None) == getattr(request.user, 'id', None) else '')
     )
-    qs = AuditBooking.objects.filter(organization=org, booking_id=booking_id).order_by('-created_at')
+    qs = audit_history(org).filter(booking_id=booking_id)
     if user_org_role == 'staff':
         staff_allowed_service_ids = _staff_assigned_service_ids(org, request.user, membership)
         if staff_allowed_service_ids:
@@ -9387,6 +9437,8 @@ def bookings_audit_undo(request, org_slug):
     # If possible, validate that restoring this booking won't overlap existing bookings.
     try:
         if start_dt:
+            from bookings.views import _has_overlap
+
             # Use the same service when checking overlap so buffers are respected.
             if _has_overlap(org, start_dt, end_dt, service=svc):
                 return HttpResponseBadRequest('Cannot restore booking: time slot overlaps an existing booking.')
@@ -9554,259 +9606,36 @@ def bookings_audit_export(request, org_slug):
     if not ids:
         return HttpResponseBadRequest('No valid ids provided')
 
-    qs = AuditBooking.objects.filter(organization=org, id__in=ids).order_by('-created_at')
-    export = []
-    # Determine organization timezone for display
-    try:
-        org_tz_name = getattr(org, 'timezone', None) or 'UTC'
-        org_tz = ZoneInfo(org_tz_name)
-    except Exception:
-        org_tz = ZoneInfo('UTC')
-
-    def _fmt(dt):
-        if not dt:
-            return None
-        try:
-            if dt.tzinfo is None:
-                # assume UTC for naive datetimes
-                dt = dt.replace(tzinfo=ZoneInfo('UTC'))
-            dt_local = dt.astimezone(org_tz)
-            return dt_local.strftime('%b %d, %Y %I:%M %p')
-        except Exception:
-            try:
-                return dt.isoformat()
-            except Exception:
-                return str(dt)
-
-    for a in qs:
-        # Determine booking reference to show (prefer snapshot.public_ref when available)
-        try:
-            snap = a.booking_snapshot or {}
-            snap_ref = snap.get('public_ref') if isinstance(snap, dict) else None
-        except Exception:
-            snap = {}
-            snap_ref = None
-        booking_ref = snap_ref or getattr(a, 'public_ref', None) or a.booking_id
-
-        # Compute display label: treat past deleted events as 'Successful'
-        display_event = a.event_type or ''
-        try:
-            if a.event_type == AuditBooking.EVENT_DELETED and a.start and (a.start < timezone.now()):
-                display_event = 'successful'
-        except Exception:
-            pass
-
-        # Determine whether a client cancellation was refundable per service policy
-        non_refunded = False
-        try:
-            if a.event_type == AuditBooking.EVENT_CANCELLED and a.service and a.start and a.created_at:
-                # cancellation occurred at a.created_at; compare to start to decide refund eligibility
-                try:
-                    # compute hours between cancellation time and appointment start
-                    hrs = (a.start - a.created_at).total_seconds() / 3600.0
-                    if getattr(a.service, 'refunds_allowed', False):
-                        cutoff = float(getattr(a.service, 'refund_cutoff_hours', 0) or 0)
-                        refundable = (hrs >= cutoff)
-                    else:
-                        refundable = False
-                except Exception:
-                    refundable = False
-                non_refunded = not refundable
-        except Exception:
-            non_refunded = False
-
-        export.append({
-            'id': a.id,
-            'booking_id': a.booking_id,
-            'booking_ref': booking_ref,
-            'event_type': a.event_type,
-            'display_event': display_event,
-            'service': a.service.name if a.service else None,
-            'service_price': float(a.service.price) if (a.service and getattr(a.service, 'price', None) is not None) else None,
-            'business': org.name,
-            'start': a.start.isoformat() if a.start else None,
-            'start_display': _fmt(a.start),
-            'end': a.end.isoformat() if a.end else None,
-            'end_display': _fmt(a.end),
-            'client_name': a.client_name,
-            'client_email': a.client_email,
-            'non_refunded': non_refunded,
-            'created_at': a.created_at.isoformat(),
-            'snapshot': a.booking_snapshot,
-        })
-
-    # Compute earnings summary: counts for successful/cancelled/deleted and
-    # total gross and per-service subtotals only for successful appointments
-    try:
-        total_count = len(export)
-        successful_count = 0
-        cancelled_count = 0
-        deleted_count = 0
-        total_gross = 0.0
-        potential_gross = 0.0
-        per_service = {}
-        now_dt = timezone.now()
-        for it in export:
-            ev = (it.get('display_event') or it.get('event_type') or '').lower()
-            # Treat previously computed 'successful' display_event as successful
-            is_successful = (ev == 'successful')
-            if is_successful:
-                successful_count += 1
-            else:
-                # Cancelled vs deleted based on raw event_type
-                raw = (it.get('event_type') or '').lower()
-                if raw == AuditBooking.EVENT_CANCELLED:
-                    cancelled_count += 1
-                elif raw == AuditBooking.EVENT_DELETED:
-                    deleted_count += 1
-                else:
-                    # Fallback: count non-successful items as deleted for totals
-                    deleted_count += 1
+    from bookings.audit_export import (
+        audit_export_job_payload,
+        audit_export_queryset,
+        audit_sync_pdf_max,
+        create_audit_export_job,
+        iter_audit_export_rows,
+        render_audit_pdf,
+        summarize_audit_rows,
+    )
 
-            # Parse price (safe) and add to potential total always
-            price = it.get('service_price')
-            try:
-                p = float(price) if price is not None else 0.0
-            except Exception:
-                p = 0.0
-            potential_gross += p
-
-            # Determine whether this item contributes to earned totals:
-            # earned if successful OR cancelled but non_refunded
-            contributes = False
-            if is_successful:
-                contributes = True
-            else:
-                try:
-                    if (it.get('event_type') or '').lower() == AuditBooking.EVENT_CANCELLED and it.get('non_refunded'):
-                        contributes = True
-                except Exception:
-                    contributes = False
-
-            if contributes:
-                total_gross += p
-                svc = it.get('service') or 'Unspecified'
-                entry = per_service.get(svc) or {'count': 0, 'subtotal': 0.0}
-                entry['count'] += 1
-                entry['subtotal'] += p
-                per_service[svc] = entry
-
-        export_summary = {
-            'count': total_count,
-            'successful_count': successful_count,
-            'cancelled_count': cancelled_count,
-            'deleted_count': deleted_count,
-            'total_gross': round(total_gross, 2),
-            'potential_gross': round(potential_gross, 2),
-            'per_service': {k: {'count': v['count'], 'subtotal': round(v['subtotal'], 2)} for k, v in per_service.items()}
-        }
-    except Exception:
-        export_summary = {'count': len(export), 'successful_count': 0, 'cancelled_count': 0, 'deleted_count': 0, 'total_gross': 0.0, 'per_service': {}}
-
-    # Try to generate a simple PDF if reportlab is installed
-    try:
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.pagesizes import letter
-        from io import BytesIO
-
-        packet = BytesIO()
-        c = canvas.Canvas(packet, pagesize=letter)
-        width, height = letter
-        y = height - 40
-        line_h = 14
-        # Centered title
-        try:
-            c.setFont('Helvetica-Bold', 14)
-            c.drawCentredString(width / 2.0, y, f'Audit export for {org.name}')
-        except Exception:
-            c.setFont('Helvetica', 11)
-            c.drawString(40, y, f'Audit export for {org.name}')
-        y -= (line_h * 2)
-        # Draw counts and earnings summary: only successful appointments contribute to earnings
-        try:
-            c.setFont('Helvetica-Bold', 12)
-            summary_line = (f"Selected: {export_summary.get('count', 0)}  "
-                            f"Successful: {export_summary.get('successful_count', 0)}  "
-                            f"Cancelled: {export_summary.get('cancelled_count', 0)}  "
-                            f"Deleted: {export_summary.get('deleted_count', 0)}")
-            c.drawString(40, y, summary_line)
-            y -= (line_h * 1.2)
-            total_line = f"Total Earned (successful + non-refunded cancellations): ${export_summary.get('total_gross', 0.0):.2f}"
-            c.setFont('Helvetica', 11)
-            c.drawString(40, y, total_line)
-            y -= (line_h * 1.2)
-            # Potential total: includes all appointments (successful, cancelled, deleted)
-            try:
-                potential_line = f"Potential Total (all appointments): ${export_summary.get('potential_gross', 0.0):.2f}"
-                c.setFont('Helvetica', 11)
-                c.drawString(40, y, potential_line)
-                y -= (line_h * 1.2)
-            except Exception:
-                pass
+    qs = audit_export_queryset(org, ids=ids)
+
+    # Large selections are rendered by a background job; the client polls
+    # the returned status URL and downloads the artifact when done.
+    if len(ids) > audit_sync_pdf_max():
+        job = create_audit_export_job(org, user=request.user, ids=ids)
+        return JsonResponse(
+            audit_export_job_payload(
+                job,
+                status_url=reverse('calendar_app:bookings_audit_export_job', args=[org.slug, job.id]),
+            ),
+            status=202,
+        )
 
-            # Per-service breakdown only for successful appointments
-            if export_summary.get('per_service'):
-                c.setFont('Helvetica', 10)
-                for svc_name, data in export_summary.get('per_service').items():
-                    if y < 60:
-                        c.showPage()
-                        c.setFont('Helvetica', 11)
-                        y = height - 40
-                    c.drawString(40, y, f"{svc_name}: {data.get('count',0)} — ${data.get('subtotal',0.0):.2f}")
-                    y -= line_h
-            y -= (line_h * 0.5)
-        except Exception:
-            try:
-                y -= (line_h * 0.5)
-            except Exception:
-                pass
+    export = list(iter_audit_export_rows(org, qs))
+    export_summary = summarize_audit_rows(export)
 
-        for item in export:
-            if y < 60:
-                c.showPage()
-                c.setFont('Helvetica', 11)
-                y = height - 40
-            ev = item.get('display_event') or item.get('event_type', '')
-            # prefer booking_ref which may be the public_ref from snapshot
-            bid = item.get('booking_ref') or item.get('booking_id') or '-'
-            c.drawString(40, y, f"Event: {str(ev).capitalize()}  ID: {bid}")
-            y -= line_h
-            c.drawString(60, y, f"Service: {item.get('service') or '-'}")
-            y -= line_h
-            # Business (already available)
-            c.drawString(60, y, f"Business: {item.get('business') or org.name}")
-            y -= line_h
-            # Client
-            c.drawString(60, y, f"Client: {item.get('client_name') or '-'} <{item.get('client_email') or '-'}>")
-            y -= line_h
-            # Charge (placed between Client and Start/End)
-            price = item.get('service_price')
-            if price is not None:
-                try:
-                    c.drawString(60, y, f"Charge: ${price:.2f}")
-                except Exception:
-                    c.drawString(60, y, f"Charge: {price}")
-                y -= line_h
-            # Indicate retained charge for non-refunded cancellations
-            try:
-                if (item.get('event_type') or '').lower() == AuditBooking.EVENT_CANCELLED and item.get('non_refunded'):
-                    c.drawString(60, y, "Note: Cancellation charge retained (no refund)")
-                    y -= line_h
-            except Exception:
-                pass
-            # Prefer the human-readable display computed above
-            start_disp = item.get('start_display') or item.get('start') or '-'
-            end_disp = item.get('end_display') or item.get('end') or None
-            if end_disp:
-                c.drawString(60, y, f"Start: {start_disp}  —  End: {end_disp}")
-                y -= line_h
-            else:
-                c.drawString(60, y, f"Start: {start_disp}")
-                y -= line_h
-            y -= (line_h * 1.5)
-        c.save()
-        packet.seek(0)
-        resp = HttpResponse(packet.read(), content_type='application/pdf')
+    try:
+        pdf = render_audit_pdf(org, export, summary=export_summary)
+        resp = HttpResponse(pdf, content_type='application/pdf')
         resp['Content-Disposition'] = 'attachment; filename="audit_export.pdf"'
         return resp
     except Exception as e:
@@ -9830,6 +9659,97 @@ def bookings_audit_export(request, org_slug):
         return HttpResponse('PDF generation failed', status=500)
 
 
+@login_required
+@require_roles(['owner', 'admin', 'manager'])
+@require_http_methods(['GET'])
+def bookings_audit_export_stream(request, org_slug):
+    """Stream audit entries as CSV or NDJSON.
+
+    GET params:
+      - export_format: 'csv' (default) | 'ndjson'
+      - ids: optional comma-separated AuditBooking ids
+      - from / to: optional YYYY-MM-DD bounds on appointment start (org tz, [from, to))
+    """
+    from django.http import StreamingHttpResponse
+    from bookings.audit_export import (
+        audit_export_queryset,
+        iter_audit_export_rows,
+        stream_audit_csv,
+        stream_audit_ndjson,
+    )
+
+    org = request.organization
+    fmt = (request.GET.get('export_format') or 'csv').strip().lower()
+    if fmt not in ('csv', 'ndjson'):
+        return HttpResponseBadRequest('Invalid format')
+
+    ids = None
+    raw_ids = (request.GET.get('ids') or '').strip()
+    if raw_ids:
+        ids = [int(p.strip()) for p in raw_ids.split(',') if p.strip().isdigit()]
+
+    try:
+        org_tz = ZoneInfo(getattr(org, 'timezone', None) or 'UTC')
+    except Exception:
+        org_tz = ZoneInfo('UTC')
+
+    def _day_start(raw):
+        if not raw:
+            return None
+        d = datetime.strptime(raw.strip(), '%Y-%m-%d').date()
+        return datetime(d.year, d.month, d.day, tzinfo=org_tz)
+
+    try:
+        start_from = _day_start(request.GET.get('from'))
+        start_to = _day_start(request.GET.get('to'))
+    except Exception:
+        return HttpResponseBadRequest('Invalid date')
+
+    qs = audit_export_queryset(org, ids=ids, start_from=start_from, start_to=start_to)
+    if fmt == 'ndjson':
+        rows = iter_audit_export_rows(org, qs)
+        resp = StreamingHttpResponse(stream_audit_ndjson(rows), content_type='application/x-ndjson')
+        resp['Content-Disposition'] = 'attachment; filename="audit_export.ndjson"'
+    else:
+        rows = iter_audit_export_rows(org, qs, include_snapshot=False)
+        resp = StreamingHttpResponse(stream_audit_csv(rows), content_type='text/csv')
+        resp['Content-Disposition'] = 'attachment; filename="audit_export.csv"'
+    return resp
+
+
+@login_required
+@require_roles(['owner', 'admin', 'manager'])
+@require_http_methods(['GET'])
+def bookings_audit_export_job(request, org_slug, job_id):
+    """Progress for a background audit PDF export job."""
+    from bookings.audit_export import audit_export_job_payload
+    from bookings.models import AuditExportJob
+
+    org = request.organization
+    job = get_object_or_404(AuditExportJob.objects.defer('artifact'), id=job_id, organization=org)
+    return JsonResponse(audit_export_job_payload(
+        job,
+        status_url=reverse('calendar_app:bookings_audit_export_job', args=[org.slug, job.id]),
+        download_url=reverse('calendar_app:bookings_audit_export_job_download', args=[org.slug, job.id]),
+    ))
+
+
+@login_required
+@require_roles(['owner', 'admin', 'manager'])
+@require_http_methods(['GET'])
+def bookings_audit_export_job_download(request, org_slug, job_id):
+    """Download the finished PDF for a background audit export job."""
+    from bookings.models import AuditExportJob
+
+    org = request.organization
+    job = get_object_or_404(AuditExportJob, id=job_id, organization=org)
+    if job.status != AuditExportJob.STATUS_DONE or not job.artifact:
+        return JsonResponse({'error': 'Export is not ready.', 'status': job.status}, status=409)
+    resp = HttpResponse(bytes(job.artifact), content_type='application/pdf')
+    resp['Content-Disposition'] = 'attachment; filename="audit_export.pdf"'
+    return resp
+
+
 @login_required
 @require_roles(['owner', 'admin', 'manager'])
 @require_http_methods(['POST'])
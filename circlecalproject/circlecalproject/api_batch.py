@@ -0,0 +1,135 @@
+"""One round trip for several API reads.
+
+The mobile app opens with `me/`, `orgs/`, `profile/overview/`,
+`billing/summary/`, `bookings/` and `push/status/`. Sent separately, each
+call authenticates again and resolves the same organization and membership.
+`POST /api/v1/batch/` runs them in-process instead:
+
+    {"requests": [{"id": "me", "path": "me/"},
+                  {"id": "bookings", "path": "/api/v1/bookings/?org=acme"}]}
+
+and answers `{"responses": [{"id", "status", "body"}, ...]}` in the same
+order. Paths are relative to `/api/v1/` or absolute under it. A failed part
+only fails its own entry; the batch itself answers 200.
+
+Sub-requests reuse the batch's authentication and share org/membership
+lookups (`api_org_access.shared_org_lookups`). Only GET is accepted, so a
+batch never mixes writes with reads, and at most `API_BATCH_MAX_REQUESTS`
+parts run per call.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import QueryDict
+from django.urls import Resolver404, resolve, reverse
+
+from .api_org_access import shared_org_lookups
+
+try:
+    from rest_framework.exceptions import ValidationError
+    from rest_framework.permissions import IsAuthenticated
+    from rest_framework.response import Response
+    from rest_framework.views import APIView
+except Exception as exc:  # pragma: no cover
+    raise RuntimeError(
+        "Django REST Framework is required for API views. "
+        "Install 'djangorestframework' and ensure 'rest_framework' is in INSTALLED_APPS."
+    ) from exc
+
+
+logger = logging.getLogger(__name__)
+
+
+def _max_requests() -> int:
+    return max(1, int(getattr(settings, "API_BATCH_MAX_REQUESTS", 10) or 10))
+
+
+def _part(part_id, status: int, body) -> dict:
+    return {"id": part_id, "status": status, "body": body}
+
+
+def _response_body(response):
+    data = getattr(response, "data", None)
+    if data is not None:
+        return data
+    content = getattr(response, "content", b"") or b""
+    if not content:
+        return None
+    if "json" in (response.get("Content-Type") or ""):
+        try:
+            return json.loads(content)
+        except ValueError:
+            pass
+    return {"text": content.decode(response.charset or "utf-8", errors="replace")}
+
+
+class BatchView(APIView):
+    """Execute several GET API calls for the authenticated user."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        parts = (request.data or {}).get("requests") if isinstance(request.data, dict) else None
+        if not isinstance(parts, list) or not parts:
+            raise ValidationError({"requests": "A non-empty list of requests is required."})
+        limit = _max_requests()
+        if len(parts) > limit:
+            raise ValidationError({"requests": f"At most {limit} requests per batch."})
+
+        prefix = reverse("api_batch")[: -len("batch/")]
+        with shared_org_lookups():
+            responses = [self._run(request, prefix, i, part) for i, part in enumerate(parts)]
+        return Response({"responses": responses})
+
+    def _run(self, request, prefix: str, index: int, part) -> dict:
+        if not isinstance(part, dict):
+            return _part(index, 400, {"detail": "Each request must be an object."})
+        part_id = part.get("id", index)
+
+        method = str(part.get("method") or "GET").upper()
+        if method != "GET":
+            return _part(part_id, 405, {"detail": "Only GET requests can be batched."})
+
+        raw = str(part.get("path") or "").strip()
+        url = urlsplit(raw if raw.startswith("/") else prefix + raw)
+        if not raw or url.scheme or url.netloc or not url.path.startswith(prefix):
+            return _part(part_id, 400, {"detail": f"Path must be under {prefix}."})
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return _part(part_id, 404, {"detail": "Not found."})
+        if getattr(match.func, "view_class", None) is type(self):
+            return _part(part_id, 400, {"detail": "Batches cannot be nested."})
+
+        sub = copy.copy(request._request)
+        sub.method = "GET"
+        sub.path = sub.path_info = url.path
+        sub.META = {
+            **request._request.META,
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "HTTP_ACCEPT": "application/json",
+        }
+        sub.GET = QueryDict(url.query)
+        sub.resolver_match = match
+        # Authenticated once for the whole batch.
+        sub._force_auth_user = request.user
+        sub._force_auth_token = request.auth
+
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batched API request failed: %s", url.path)
+            return _part(part_id, 500, {"detail": "Internal server error."})
+
+        if getattr(response, "streaming", False):
+            response.close()
+            return _part(part_id, 400, {"detail": "Streaming endpoints cannot be batched."})
+        return _part(part_id, response.status_code, _response_body(response))
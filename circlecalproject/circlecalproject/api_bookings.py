@@ -5,12 +5,27 @@ from zoneinfo import ZoneInfo
 
 from django.conf import settings
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.decorators import method_decorator
 
 from accounts.models import Business, Membership
-from bookings.models import AuditBooking, Booking
+from bookings.audit_export import (
+    audit_export_job_payload,
+    audit_export_queryset,
+    audit_sync_pdf_max,
+    create_audit_export_job,
+    iter_audit_export_rows,
+    render_audit_pdf,
+    stream_audit_csv,
+    stream_audit_ndjson,
+)
+from bookings.archive import audit_history, booking_history, merged_keyset_page
+from bookings.models import AuditBooking, AuditExportJob, Booking
+from bookings.search import InvalidCursor, apply_booking_search
+from calendar_app.db_routing import read_replica
 from .api_org_access import resolve_org_and_membership
 
 try:
@@ -82,6 +97,7 @@ class BookingsListView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(read_replica)
     def get(self, request):
         org_param = request.query_params.get("org")
         org, membership = _get_org_and_membership(user=request.user, org_param=org_param)
@@ -110,33 +126,30 @@ class BookingsListView(APIView):
         # Treat `to` as exclusive; if the caller gave a date boundary they likely mean whole-day.
         # (No change needed; our date parser already returns start-of-day.)
 
-        qs = (
-            Booking.objects.filter(organization=org)
-            .select_related("service", "assigned_user")
-            .order_by("start")
-        )
+        q = (request.query_params.get("q") or "").strip()
 
-        # Exclude internal per-date override markers (not real client bookings).
-        qs = qs.exclude(service__isnull=True, client_name__startswith="scope:")
+        # The same filters apply to the hot table and the archive (bookings
+        # past the archive horizon).
+        querysets = []
+        for qs in booking_history(org):
+            qs = qs.select_related("service", "assigned_user")
 
-        q = (request.query_params.get("q") or "").strip()
-        if q:
-            # Lightweight keyword search for the mobile app.
-            qs = qs.filter(
-                Q(title__icontains=q)
-                | Q(client_name__icontains=q)
-                | Q(client_email__icontains=q)
-                | Q(service__name__icontains=q)
-            )
+            # Exclude internal per-date override markers (not real client bookings).
+            qs = qs.exclude(service__isnull=True, client_name__startswith="scope:")
 
-        # Staff users default to seeing their own assignments + unassigned bookings.
-        if membership.role == "staff":
-            qs = qs.filter(Q(assigned_user__isnull=True) | Q(assigned_user=request.user))
+            if q:
+                # Keyword search over the normalized search column (+ service names).
+                qs = apply_booking_search(qs, q, organization=org)
+
+            # Staff users default to seeing their own assignments + unassigned bookings.
+            if membership.role == "staff":
+                qs = qs.filter(Q(assigned_user__isnull=True) | Q(assigned_user=request.user))
 
-        if from_dt is not None:
-            qs = qs.filter(end__gt=from_dt)
-        if to_dt is not None:
-            qs = qs.filter(start__lt=to_dt)
+            if from_dt is not None:
+                qs = qs.filter(end__gt=from_dt)
+            if to_dt is not None:
+                qs = qs.filter(start__lt=to_dt)
+            querysets.append(qs)
 
         try:
             limit = int(request.query_params.get("limit") or 200)
@@ -144,13 +157,21 @@ class BookingsListView(APIView):
             limit = 200
         limit = max(1, min(limit, 500))
 
-        items = [_serialize_booking_list_item(b) for b in qs[:limit]]
+        # Keyset pagination over (start, id): pass `next_cursor` back as `cursor`
+        # to fetch the following page.
+        try:
+            rows, next_cursor = merged_keyset_page(querysets, cursor=request.query_params.get("cursor"), limit=limit)
+        except InvalidCursor:
+            raise ValidationError({"cursor": "Invalid cursor."})
+
+        items = [_serialize_booking_list_item(b) for b in rows]
         return Response(
             {
                 "org": {"id": org.id, "slug": org.slug, "name": org.name},
                 "from": from_dt.isoformat() if from_dt else None,
                 "to": to_dt.isoformat() if to_dt else None,
                 "count": len(items),
+                "next_cursor": next_cursor,
                 "bookings": items,
             }
         )
@@ -265,6 +286,7 @@ class BookingsAuditListView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(read_replica)
     def get(self, request):
         org_param = request.query_params.get("org")
         org, _membership = _get_org_and_membership(user=request.user, org_param=org_param)
@@ -284,7 +306,7 @@ class BookingsAuditListView(APIView):
         include_snapshot_raw = str(request.query_params.get("include_snapshot") or "0").strip()
         include_snapshot = include_snapshot_raw in {"1", "true", "True", "yes", "on"}
 
-        qs = AuditBooking.objects.filter(organization=org).select_related("service").order_by("-created_at")
+        qs = audit_history(org)
 
         since_raw = request.query_params.get("since")
         if since_raw:
@@ -371,7 +393,8 @@ class BookingsAuditExportView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def _parse_ids(self, raw: str | None) -> list[int]:
+    @staticmethod
+    def _parse_ids(raw: str | None) -> list[int]:
         if not raw:
             return []
         out: list[int] = []
@@ -401,145 +424,25 @@ class BookingsAuditExportView(APIView):
         if not ids:
             raise ValidationError({"ids": "This query param is required (comma-separated audit ids)."})
 
-        qs = (
-            AuditBooking.objects.filter(organization=org, id__in=ids)
-            .select_related("service")
-            .order_by("-created_at")
-        )
-
-        export: list[dict] = []
-        try:
-            org_tz_name = getattr(org, "timezone", None) or "UTC"
-            org_tz = ZoneInfo(org_tz_name)
-        except Exception:
-            org_tz = ZoneInfo("UTC")
-
-        def _fmt(dt):
-            if not dt:
-                return None
-            try:
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-                return dt.astimezone(org_tz).strftime("%b %d, %Y %I:%M %p")
-            except Exception:
-                try:
-                    return dt.isoformat()
-                except Exception:
-                    return str(dt)
-
-        for a in qs:
-            snap = a.booking_snapshot if isinstance(a.booking_snapshot, dict) else {}
-            booking_ref = None
-            try:
-                booking_ref = snap.get("public_ref")
-            except Exception:
-                booking_ref = None
-            booking_ref = booking_ref or getattr(a, "public_ref", None) or a.booking_id
-
-            display_event = a.event_type or ""
-            try:
-                if a.event_type == AuditBooking.EVENT_DELETED and a.start and (a.start < timezone.now()):
-                    display_event = "successful"
-            except Exception:
-                pass
-
-            non_refunded = False
-            try:
-                if a.event_type == AuditBooking.EVENT_CANCELLED and a.service and a.start and a.created_at:
-                    hrs = (a.start - a.created_at).total_seconds() / 3600.0
-                    if getattr(a.service, "refunds_allowed", False):
-                        cutoff = float(getattr(a.service, "refund_cutoff_hours", 0) or 0)
-                        refundable = hrs >= cutoff
-                    else:
-                        refundable = False
-                    non_refunded = not refundable
-            except Exception:
-                non_refunded = False
-
-            svc = a.service
-            export.append(
-                {
-                    "id": a.id,
-                    "booking_id": a.booking_id,
-                    "booking_ref": booking_ref,
-                    "event_type": a.event_type,
-                    "display_event": display_event,
-                    "service": svc.name if svc else None,
-                    "service_price": float(svc.price) if (svc and getattr(svc, "price", None) is not None) else None,
-                    "business": org.name,
-                    "start": a.start.isoformat() if a.start else None,
-                    "start_display": _fmt(a.start),
-                    "end": a.end.isoformat() if a.end else None,
-                    "end_display": _fmt(a.end),
-                    "client_name": a.client_name,
-                    "client_email": a.client_email,
-                    "non_refunded": non_refunded,
-                    "created_at": a.created_at.isoformat() if a.created_at else None,
-                    "snapshot": a.booking_snapshot,
-                }
+        qs = audit_export_queryset(org, ids=ids)
+
+        # Large selections render in the background; poll the job endpoint.
+        if len(ids) > audit_sync_pdf_max():
+            job = create_audit_export_job(org, user=request.user, ids=ids, include_summary=False)
+            return Response(
+                audit_export_job_payload(
+                    job,
+                    status_url=reverse("api_bookings_audit_export_job", args=[job.id]) + f"?org={org.slug}",
+                ),
+                status=202,
             )
 
+        export = list(iter_audit_export_rows(org, qs))
+
         # Build a basic PDF (best effort) so mobile can download/share.
         try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter
-            from io import BytesIO
-
-            packet = BytesIO()
-            c = canvas.Canvas(packet, pagesize=letter)
-            width, height = letter
-            y = height - 40
-            line_h = 14
-
-            c.setFont("Helvetica-Bold", 14)
-            c.drawCentredString(width / 2.0, y, f"Audit export for {org.name}")
-            y -= line_h * 2
-
-            c.setFont("Helvetica", 11)
-            c.drawString(40, y, f"Selected entries: {len(export)}")
-            y -= line_h * 1.5
-
-            for item in export:
-                if y < 60:
-                    c.showPage()
-                    c.setFont("Helvetica", 11)
-                    y = height - 40
-
-                ev = (item.get("display_event") or item.get("event_type") or "").capitalize()
-                bid = item.get("booking_ref") or item.get("booking_id") or "-"
-                c.drawString(40, y, f"Event: {ev}  ID: {bid}")
-                y -= line_h
-                c.drawString(60, y, f"Service: {item.get('service') or '-'}")
-                y -= line_h
-                c.drawString(60, y, f"Client: {item.get('client_name') or '-'} <{item.get('client_email') or '-'}>")
-                y -= line_h
-                price = item.get("service_price")
-                if price is not None:
-                    try:
-                        c.drawString(60, y, f"Charge: ${float(price):.2f}")
-                    except Exception:
-                        c.drawString(60, y, f"Charge: {price}")
-                    y -= line_h
-
-                try:
-                    if (item.get("event_type") or "").lower() == AuditBooking.EVENT_CANCELLED and item.get("non_refunded"):
-                        c.drawString(60, y, "Note: Cancellation charge retained (no refund)")
-                        y -= line_h
-                except Exception:
-                    pass
-
-                start_disp = item.get("start_display") or item.get("start") or "-"
-                end_disp = item.get("end_display") or item.get("end") or None
-                if end_disp:
-                    c.drawString(60, y, f"Start: {start_disp}  —  End: {end_disp}")
-                else:
-                    c.drawString(60, y, f"Start: {start_disp}")
-                y -= line_h * 2
-
-            c.save()
-            packet.seek(0)
-
-            resp = HttpResponse(packet.read(), content_type="application/pdf")
+            pdf = render_audit_pdf(org, export, summary=None, include_business=False)
+            resp = HttpResponse(pdf, content_type="application/pdf")
             resp["Content-Disposition"] = 'attachment; filename="audit_export.pdf"'
             return resp
         except Exception as e:
@@ -549,3 +452,97 @@ class BookingsAuditExportView(APIView):
             if getattr(settings, "DEBUG", False):
                 raise
             return Response({"detail": "PDF generation failed."}, status=500)
+
+
+class BookingsAuditExportStreamView(APIView):
+    """Stream audit entries as CSV or NDJSON (JWT-auth).
+
+    GET query params:
+    - org: required (slug or id)
+    - export_format: 'csv' (default) | 'ndjson' (`format` is reserved by DRF)
+    - ids: optional comma-separated AuditBooking ids
+    - from / to: optional ISO datetime or YYYY-MM-DD bounds on appointment start
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        org_param = request.query_params.get("org")
+        org, membership = _get_org_and_membership(user=request.user, org_param=org_param)
+        if membership.role not in {"owner", "admin", "manager"}:
+            raise ValidationError({"detail": "Only owners/GMs/managers can export audit history."})
+
+        fmt = (request.query_params.get("export_format") or "csv").strip().lower()
+        if fmt not in {"csv", "ndjson"}:
+            raise ValidationError({"export_format": "Use 'csv' or 'ndjson'."})
+
+        raw_ids = request.query_params.get("ids")
+        ids = BookingsAuditExportView._parse_ids(raw_ids) if raw_ids else None
+
+        try:
+            org_tz = ZoneInfo(getattr(org, "timezone", None) or "UTC")
+        except Exception:
+            org_tz = ZoneInfo("UTC")
+        from_dt, to_dt = _parse_from_to(
+            from_raw=request.query_params.get("from"),
+            to_raw=request.query_params.get("to"),
+            org_tz=org_tz,
+        )
+
+        qs = audit_export_queryset(org, ids=ids, start_from=from_dt, start_to=to_dt)
+        if fmt == "ndjson":
+            resp = StreamingHttpResponse(
+                stream_audit_ndjson(iter_audit_export_rows(org, qs)),
+                content_type="application/x-ndjson",
+            )
+            resp["Content-Disposition"] = 'attachment; filename="audit_export.ndjson"'
+        else:
+            resp = StreamingHttpResponse(
+                stream_audit_csv(iter_audit_export_rows(org, qs, include_snapshot=False)),
+                content_type="text/csv",
+            )
+            resp["Content-Disposition"] = 'attachment; filename="audit_export.csv"'
+        return resp
+
+
+class BookingsAuditExportJobView(APIView):
+    """Progress for a background audit PDF export (JWT-auth)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id: int):
+        org_param = request.query_params.get("org")
+        org, _membership = _get_org_and_membership(user=request.user, org_param=org_param)
+
+        job = AuditExportJob.objects.defer("artifact").filter(organization=org, id=int(job_id)).first()
+        if not job:
+            raise ValidationError({"detail": "Export job not found."})
+
+        suffix = f"?org={org.slug}"
+        return Response(
+            audit_export_job_payload(
+                job,
+                status_url=reverse("api_bookings_audit_export_job", args=[job.id]) + suffix,
+                download_url=reverse("api_bookings_audit_export_job_download", args=[job.id]) + suffix,
+            )
+        )
+
+
+class BookingsAuditExportJobDownloadView(APIView):
+    """Download the finished PDF of a background audit export (JWT-auth)."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id: int):
+        org_param = request.query_params.get("org")
+        org, _membership = _get_org_and_membership(user=request.user, org_param=org_param)
+
+        job = AuditExportJob.objects.filter(organization=org, id=int(job_id)).first()
+        if not job:
+            raise ValidationError({"detail": "Export job not found."})
+        if job.status != AuditExportJob.STATUS_DONE or not job.artifact:
+            return Response({"detail": "Export is not ready.", "status": job.status}, status=409)
+
+        resp = HttpResponse(bytes(job.artifact), content_type="application/pdf")
+        resp["Content-Disposition"] = 'attachment; filename="audit_export.pdf"'
+        return resp
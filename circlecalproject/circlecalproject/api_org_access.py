@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import contextvars
+from contextlib import contextmanager
 from types import SimpleNamespace
 
 from accounts.models import Business, Membership
@@ -13,7 +15,42 @@ except Exception as exc:  # pragma: no cover
     ) from exc
 
 
+# Lookups shared by the sub-requests of one `/api/v1/batch/` call.
+_shared_lookups: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "api_shared_org_lookups", default=None
+)
+
+
+@contextmanager
+def shared_org_lookups():
+    """Memoize org/membership resolution for the duration of the block.
+
+    Every sub-request of a batch then gets the same `Business` instance, so
+    its cached relations (subscription, plan) are loaded once as well.
+    """
+
+    if _shared_lookups.get() is not None:
+        yield
+        return
+    token = _shared_lookups.set({})
+    try:
+        yield
+    finally:
+        _shared_lookups.reset(token)
+
+
 def resolve_org_and_membership(*, user, org_param: str | None):
+    shared = _shared_lookups.get()
+    if shared is None:
+        return _resolve_org_and_membership(user=user, org_param=org_param)
+    key = (getattr(user, "pk", None), str(org_param or ""))
+    if key not in shared:
+        # Failures are not memoized; each sub-request raises its own error.
+        shared[key] = _resolve_org_and_membership(user=user, org_param=org_param)
+    return shared[key]
+
+
+def _resolve_org_and_membership(*, user, org_param: str | None):
     if not org_param:
         raise ValidationError({"org": "This query param is required (org slug or id)."})
 
@@ -3,7 +3,16 @@ from __future__ import annotations
 from django.urls import path
 
 from .api_views import HealthView, HelloView, MeView
-from .api_bookings import BookingDetailView, BookingsAuditExportView, BookingsAuditListView, BookingsListView
+from .api_batch import BatchView
+from .api_bookings import (
+    BookingDetailView,
+    BookingsAuditExportJobDownloadView,
+    BookingsAuditExportJobView,
+    BookingsAuditExportStreamView,
+    BookingsAuditExportView,
+    BookingsAuditListView,
+    BookingsListView,
+)
 from .api_orgs import OrgsListView
 from .api_profile import ProfileAvatarUploadView, ProfileView
 from .api_profile import ProfileOverviewView
@@ -26,10 +35,18 @@ urlpatterns = [
     path("health/", HealthView.as_view(), name="api_health"),
     path("hello/", HelloView.as_view(), name="api_hello"),
     path("me/", MeView.as_view(), name="api_me"),
+    path("batch/", BatchView.as_view(), name="api_batch"),
     path("orgs/", OrgsListView.as_view(), name="api_orgs"),
     path("bookings/", BookingsListView.as_view(), name="api_bookings_list"),
     path("bookings/audit/", BookingsAuditListView.as_view(), name="api_bookings_audit_list"),
     path("bookings/audit/export/", BookingsAuditExportView.as_view(), name="api_bookings_audit_export"),
+    path("bookings/audit/export/stream/", BookingsAuditExportStreamView.as_view(), name="api_bookings_audit_export_stream"),
+    path("bookings/audit/export/jobs/<int:job_id>/", BookingsAuditExportJobView.as_view(), name="api_bookings_audit_export_job"),
+    path(
+        "bookings/audit/export/jobs/<int:job_id>/download/",
+        BookingsAuditExportJobDownloadView.as_view(),
+        name="api_bookings_audit_export_job_download",
+    ),
     path("bookings/<int:booking_id>/", BookingDetailView.as_view(), name="api_booking_detail"),
     path("profile/", ProfileView.as_view(), name="api_profile"),
     path("profile/overview/", ProfileOverviewView.as_view(), name="api_profile_overview"),
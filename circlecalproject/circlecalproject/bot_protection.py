@@ -1,10 +1,8 @@
-import json
-import urllib.parse
-import urllib.request
-
 from django.conf import settings
 from django.core.cache import cache
 
+from calendar_app import http_client
+
 
 TURNSTILE_VERIFY_URL = "https://challenges.cloudflare.com/turnstile/v0/siteverify"
 
@@ -60,16 +58,8 @@ def verify_turnstile(request) -> tuple[bool, str | None]:
         payload['remoteip'] = ip
 
     try:
-        data = urllib.parse.urlencode(payload).encode('utf-8')
-        req = urllib.request.Request(
-            TURNSTILE_VERIFY_URL,
-            data=data,
-            headers={'Content-Type': 'application/x-www-form-urlencoded'},
-            method='POST',
-        )
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            raw = resp.read().decode('utf-8', errors='ignore')
-        parsed = json.loads(raw or '{}')
+        resp = http_client.request('turnstile', 'POST', TURNSTILE_VERIFY_URL, data=payload)
+        parsed = resp.json() if resp.content else {}
         ok = bool(parsed.get('success'))
         if ok:
             return True, None
@@ -179,9 +179,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Server-Timing header, slow-request logs and per-endpoint percentiles.
+    'calendar_app.middleware.RequestMetricsMiddleware',
     # Must be near the top, especially before CommonMiddleware
     *(('corsheaders.middleware.CorsMiddleware',) if _cors_apps else ()),
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # Pins clients to the primary database right after they write.
+    'calendar_app.db_routing.ReplicaStickinessMiddleware',
     'calendar_app.middleware.AppModeMiddleware',
     'calendar_app.middleware.AdminPinMiddleware',
     'calendar_app.middleware.HostedSubdomainMiddleware',
@@ -302,6 +306,11 @@ UNFOLD = {
                         "icon": "insights",
                         "link": lambda request: reverse_lazy("admin_analytics"),
                     },
+                    {
+                        "title": "Performance",
+                        "icon": "speed",
+                        "link": lambda request: reverse_lazy("admin_performance"),
+                    },
                     {
                         "title": "Undo history",
                         "icon": "history",
@@ -353,6 +362,15 @@ DATABASES = {
     }
 }
 
+# Optional read replica for read-only public/reporting views
+# (calendar_app.db_routing). Locally a second SQLite file can stand in for it.
+if (os.getenv('SQLITE_REPLICA_PATH') or '').strip():
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('SQLITE_REPLICA_PATH').strip(),
+    }
+DATABASE_ROUTERS = ['calendar_app.db_routing.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -444,6 +462,124 @@ STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 STRIPE_PUBLISHABLE_KEY = os.getenv("STRIPE_PUBLISHABLE_KEY")
 SITE_URL = os.getenv("SITE_URL") or ("http://127.0.0.1:8000" if DEBUG else "https://circlecal.app")
 
+# Booking audit exports: selections larger than this are rendered as a
+# background PDF job (poll + download) instead of inside the request.
+AUDIT_EXPORT_SYNC_PDF_MAX = max(1, int(os.getenv('AUDIT_EXPORT_SYNC_PDF_MAX', '250') or '250'))
+# Start queued export jobs in a daemon thread after commit. Disable when a
+# separate worker runs `manage.py run_audit_export_jobs`.
+AUDIT_EXPORT_BACKGROUND_THREAD = os.getenv('AUDIT_EXPORT_BACKGROUND_THREAD', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Bookings that ended (and audit entries created) more than this many months
+# ago are moved to the archive tables by `manage.py archive_old_bookings`.
+BOOKING_ARCHIVE_MONTHS = max(1, int(os.getenv('BOOKING_ARCHIVE_MONTHS', '18') or '18'))
+
+# Billing page mirror of Stripe data (billing.mirror). Snapshots older than
+# this are served once more while a refresh runs after the response.
+BILLING_MIRROR_TTL_SECONDS = max(0, int(os.getenv('BILLING_MIRROR_TTL_SECONDS', '300') or '300'))
+BILLING_MIRROR_BACKGROUND_THREAD = os.getenv('BILLING_MIRROR_BACKGROUND_THREAD', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Stripe webhooks are stored and acknowledged, then applied after the response
+# (billing.webhooks). Disable the thread when `manage.py process_stripe_events`
+# runs as a worker; failed events are retried this many times.
+STRIPE_WEBHOOK_BACKGROUND_THREAD = os.getenv('STRIPE_WEBHOOK_BACKGROUND_THREAD', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+STRIPE_WEBHOOK_MAX_ATTEMPTS = max(1, int(os.getenv('STRIPE_WEBHOOK_MAX_ATTEMPTS', '8') or '8'))
+
+# `manage.py apply_scheduled_changes` (billing.scheduled_changes): HTTP timeout
+# per Stripe call and in-run retries for transient errors (network, 429, 5xx).
+SCHEDULED_CHANGE_STRIPE_TIMEOUT_SECONDS = max(1, int(os.getenv('SCHEDULED_CHANGE_STRIPE_TIMEOUT_SECONDS', '20') or '20'))
+SCHEDULED_CHANGE_STRIPE_RETRIES = max(0, int(os.getenv('SCHEDULED_CHANGE_STRIPE_RETRIES', '2') or '2'))
+
+# Business deletion (accounts.teardown): businesses with more booking/audit
+# rows than this are deleted in the background in batches of
+# BUSINESS_TEARDOWN_BATCH_SIZE. Disable the thread when
+# `manage.py run_business_teardowns` runs as a worker.
+BUSINESS_TEARDOWN_SYNC_MAX_ROWS = max(0, int(os.getenv('BUSINESS_TEARDOWN_SYNC_MAX_ROWS', '2000') or '2000'))
+BUSINESS_TEARDOWN_BATCH_SIZE = max(1, int(os.getenv('BUSINESS_TEARDOWN_BATCH_SIZE', '1000') or '1000'))
+BUSINESS_TEARDOWN_BACKGROUND_THREAD = os.getenv('BUSINESS_TEARDOWN_BACKGROUND_THREAD', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Admin undo snapshots (calendar_app.admin_undo): per-request capture cap and
+# retention enforced by the `purge_admin_undo_snapshots` scheduler job.
+ADMIN_UNDO_MAX_SNAPSHOTS_PER_REQUEST = max(0, int(os.getenv('ADMIN_UNDO_MAX_SNAPSHOTS_PER_REQUEST', '5000') or '5000'))
+ADMIN_UNDO_RETENTION_DAYS = max(0, int(os.getenv('ADMIN_UNDO_RETENTION_DAYS', '30') or '30'))
+ADMIN_UNDO_MAX_SNAPSHOTS = max(0, int(os.getenv('ADMIN_UNDO_MAX_SNAPSHOTS', '20000') or '20000'))
+
+# Periodic housekeeping (`manage.py run_scheduler`, calendar_app.periodic).
+# Per-job intervals in seconds can be overridden with
+# SCHEDULER_JOB_INTERVALS="send_booking_reminders=86400,apply_scheduled_changes=0"
+# (0 disables a job). Next runs are delayed by up to this fraction of the interval.
+SCHEDULER_TICK_SECONDS = max(1, int(os.getenv('SCHEDULER_TICK_SECONDS', '30') or '30'))
+SCHEDULER_JITTER_FRACTION = max(0.0, float(os.getenv('SCHEDULER_JITTER_FRACTION', '0.1') or '0.1'))
+# A job claimed by a runner that died is picked up again after this long.
+SCHEDULER_LEASE_SECONDS = max(60, int(os.getenv('SCHEDULER_LEASE_SECONDS', '900') or '900'))
+SCHEDULER_JOB_INTERVALS = {
+    name.strip(): int(value)
+    for name, _, value in (
+        item.partition('=') for item in (os.getenv('SCHEDULER_JOB_INTERVALS', '') or '').split(',')
+    )
+    if name.strip() and value.strip().isdigit()
+}
+
+# Memoized weekly partitioning maps (calendar_app.schedule_cache). Entries are
+# invalidated by a per-org version bump; the TTL only bounds how long orphaned
+# entries linger. 0 disables the cache.
+SCHEDULE_CACHE_TTL_SECONDS = max(0, int(os.getenv('SCHEDULE_CACHE_TTL_SECONDS', '3600') or '0'))
+
+# Public next-available search (bookings.views.org_next_available). Anonymous
+# results are cached per org for NEXT_AVAILABLE_CACHE_SECONDS (0 disables) and
+# each request scans at most NEXT_AVAILABLE_MAX_SERVICES services and
+# NEXT_AVAILABLE_MAX_DAYS days per service.
+NEXT_AVAILABLE_CACHE_SECONDS = max(0, int(os.getenv('NEXT_AVAILABLE_CACHE_SECONDS', '60') or '0'))
+NEXT_AVAILABLE_MAX_SERVICES = max(1, int(os.getenv('NEXT_AVAILABLE_MAX_SERVICES', '20') or '20'))
+NEXT_AVAILABLE_MAX_DAYS = max(1, int(os.getenv('NEXT_AVAILABLE_MAX_DAYS', '90') or '90'))
+
+# Outbound HTTP (calendar_app.http_client). Keep-alive connections per provider,
+# and after this many consecutive failures a provider's calls fail fast for
+# OUTBOUND_BREAKER_RESET_SECONDS. Timeouts can be overridden per provider with
+# OUTBOUND_HTTP_TIMEOUTS="expo=3:6,render=3:15" (connect:read seconds).
+OUTBOUND_HTTP_POOL_SIZE = max(1, int(os.getenv('OUTBOUND_HTTP_POOL_SIZE', '10') or '10'))
+OUTBOUND_BREAKER_FAILURES = max(1, int(os.getenv('OUTBOUND_BREAKER_FAILURES', '5') or '5'))
+OUTBOUND_BREAKER_RESET_SECONDS = max(1, int(os.getenv('OUTBOUND_BREAKER_RESET_SECONDS', '30') or '30'))
+OUTBOUND_HTTP_TIMEOUTS = {
+    name.strip(): tuple(float(part) for part in value.split(':', 1))
+    for name, _, value in (
+        item.partition('=') for item in (os.getenv('OUTBOUND_HTTP_TIMEOUTS', '') or '').split(',')
+    )
+    if name.strip() and value.count(':') == 1 and value.replace(':', '').replace('.', '').strip().isdigit()
+}
+
+# Read replica routing (calendar_app.db_routing). After an unsafe request the
+# client reads from the primary for REPLICA_STICKY_SECONDS; a replica lagging
+# more than REPLICA_MAX_LAG_SECONDS (checked every REPLICA_LAG_CHECK_SECONDS)
+# is skipped.
+REPLICA_STICKY_SECONDS = max(0, int(os.getenv('REPLICA_STICKY_SECONDS', '10') or '0'))
+REPLICA_MAX_LAG_SECONDS = max(0.0, float(os.getenv('REPLICA_MAX_LAG_SECONDS', '5') or '0'))
+REPLICA_LAG_CHECK_SECONDS = max(0.0, float(os.getenv('REPLICA_LAG_CHECK_SECONDS', '5') or '0'))
+# A replica whose WAL receiver has not heard from the primary for this long is
+# not trusted to be caught up, even if it has replayed everything it received.
+REPLICA_MAX_RECEIVER_SILENCE_SECONDS = max(0.0, float(os.getenv('REPLICA_MAX_RECEIVER_SILENCE_SECONDS', '60') or '0'))
+
+# Subscribable iCalendar feeds (bookings.ics_feeds). Rendered bodies are cached
+# for ICS_FEED_CACHE_SECONDS (0 disables) and dropped on any change to the
+# org's bookings, services or team; feeds cover ICS_FEED_PAST_DAYS back and
+# ICS_FEED_FUTURE_DAYS ahead.
+ICS_FEED_CACHE_SECONDS = max(0, int(os.getenv('ICS_FEED_CACHE_SECONDS', '3600') or '0'))
+ICS_FEED_PAST_DAYS = max(0, int(os.getenv('ICS_FEED_PAST_DAYS', '30') or '0'))
+ICS_FEED_FUTURE_DAYS = max(1, int(os.getenv('ICS_FEED_FUTURE_DAYS', '365') or '365'))
+
+# Batched API reads (circlecalproject.api_batch): most sub-requests one
+# POST /api/v1/batch/ may carry.
+API_BATCH_MAX_REQUESTS = max(1, int(os.getenv('API_BATCH_MAX_REQUESTS', '10') or '10'))
+
+# Request performance metrics (calendar_app.request_metrics).
+PERF_METRICS_ENABLED = os.getenv('PERF_METRICS_ENABLED', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+# Server-Timing header with SQL/cache/outbound timings; staff only unless DEBUG.
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', '0').strip().lower() in ('1', 'true', 'yes', 'on')
+# Requests at or above this many milliseconds are logged on `circlecal.perf`.
+PERF_SLOW_REQUEST_MS = max(0, int(os.getenv('PERF_SLOW_REQUEST_MS', '1000') or '1000'))
+# How often each worker hands buffered per-endpoint aggregates to the scheduler
+# (`merge_endpoint_timings` job) as PendingEndpointTiming rows.
+PERF_METRICS_FLUSH_SECONDS = max(0, int(os.getenv('PERF_METRICS_FLUSH_SECONDS', '60') or '60'))
+
 # Optional admin PIN protection. Set via environment variable `ADMIN_PIN`.
 ADMIN_PIN = os.getenv('ADMIN_PIN')
 
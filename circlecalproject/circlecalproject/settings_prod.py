@@ -137,6 +137,27 @@ else:
         if sslmode:
             DATABASES["default"]["OPTIONS"] = {"sslmode": sslmode}
 
+        # Optional streaming replica for read-only traffic (calendar_app.db_routing).
+        _replica_url = (os.getenv("DATABASE_REPLICA_URL") or "").strip()
+        if _replica_url:
+            replica = urlparse(_replica_url)
+            if replica.scheme not in ("postgres", "postgresql"):
+                raise RuntimeError(
+                    "Unsupported DATABASE_REPLICA_URL scheme. Expected 'postgres' or 'postgresql'. "
+                    f"Got scheme={replica.scheme!r}"
+                )
+            DATABASES["replica"] = {
+                **DATABASES["default"],
+                "NAME": (replica.path or "").lstrip("/") or db_name,
+                "USER": replica.username or DATABASES["default"]["USER"],
+                "PASSWORD": replica.password or DATABASES["default"]["PASSWORD"],
+                "HOST": replica.hostname or "",
+                "PORT": str(replica.port or ""),
+            }
+            _replica_sslmode = (parse_qs(replica.query or "").get("sslmode") or [sslmode])[0]
+            if _replica_sslmode:
+                DATABASES["replica"]["OPTIONS"] = {"sslmode": _replica_sslmode}
+
 # Secure cookies (effective when served over HTTPS)
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
@@ -324,6 +345,12 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': True,
         },
+        # Slow-request records from calendar_app.middleware.RequestMetricsMiddleware.
+        'circlecal.perf': {
+            'handlers': ['console'],
+            'level': os.getenv('PERF_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
     },
 }
 
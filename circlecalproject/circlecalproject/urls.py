@@ -99,6 +99,11 @@ urlpatterns = [
         admin.site.admin_view(admin_pages.admin_analytics),
         name="admin_analytics",
     ),
+    path(
+        f"{getattr(settings, 'ADMIN_PATH', 'admin')}/performance/",
+        admin.site.admin_view(admin_pages.admin_performance),
+        name="admin_performance",
+    ),
     path(
         f"{getattr(settings, 'ADMIN_PATH', 'admin')}/undo/<int:logentry_id>/",
         admin.site.admin_view(admin_undo.admin_undo_logentry),
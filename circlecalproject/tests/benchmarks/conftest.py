@@ -0,0 +1,84 @@
+"""Shared fixtures for the scheduling benchmarks.
+
+Tenant size is controlled through environment variables so the default run
+stays small enough for CI while still allowing production-sized comparisons:
+
+    BENCH_SERVICES, BENCH_MEMBERS, BENCH_BOOKINGS, BENCH_OVERRIDES,
+    BENCH_FREEZES, BENCH_DAYS, BENCH_SEED, BENCH_ROUNDS
+
+Each benchmark module declares `QUERY_BUDGETS` ({test name: queries}); the
+warm-up call must issue exactly that many queries for the default tenant.
+With any tenant-size variable set the count is only recorded.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from bookings.synthetic import SyntheticOrgSpec, build_synthetic_org
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+BENCH_ROUNDS = max(1, _env_int('BENCH_ROUNDS', 5))
+# Query budgets only hold for the default tenant.
+TENANT_VARS = (
+    'BENCH_SERVICES', 'BENCH_MEMBERS', 'BENCH_BOOKINGS', 'BENCH_OVERRIDES',
+    'BENCH_FREEZES', 'BENCH_DAYS', 'BENCH_SEED',
+)
+
+
+@pytest.fixture
+def synthetic_org(db):
+    spec = SyntheticOrgSpec(
+        services=max(1, _env_int('BENCH_SERVICES', 5)),
+        members=max(1, _env_int('BENCH_MEMBERS', 3)),
+        bookings=_env_int('BENCH_BOOKINGS', 200),
+        overrides=_env_int('BENCH_OVERRIDES', 20),
+        freezes=_env_int('BENCH_FREEZES', 5),
+        days=max(1, _env_int('BENCH_DAYS', 14)),
+    )
+    return build_synthetic_org(spec, seed=_env_int('BENCH_SEED', 0))
+
+
+@pytest.fixture
+def run_benchmark(benchmark, request):
+    """Benchmark `fn`, checking its query count against the module's budget.
+
+    The query count comes from one warm-up call on a cleared cache, so it
+    does not depend on which tests ran before; wall time from `BENCH_ROUNDS`
+    timed rounds. The count is also stored in the benchmark JSON
+    (`extra_info.queries`).
+    """
+
+    def _run(fn, *args, **kwargs):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            result = fn(*args, **kwargs)
+        executed = len(ctx.captured_queries)
+        benchmark.extra_info['queries'] = executed
+
+        if not any(os.getenv(name) for name in TENANT_VARS):
+            budgets = getattr(request.module, 'QUERY_BUDGETS', {})
+            name = request.node.originalname
+            assert name in budgets, f'{name} has no entry in QUERY_BUDGETS'
+            assert executed == budgets[name], (
+                f'{name}: {executed} queries executed, {budgets[name]} expected. '
+                'Update QUERY_BUDGETS only if the change is intended.\n'
+                + '\n'.join(q['sql'] for q in ctx.captured_queries[:20])
+            )
+
+        benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=BENCH_ROUNDS, iterations=1)
+        return result
+
+    return _run
@@ -0,0 +1,122 @@
+"""Wall-time and query-count benchmarks for the scheduling hot paths.
+
+Run only the benchmarks and save a baseline:
+
+    pytest tests/benchmarks --benchmark-only --benchmark-autosave
+
+Compare a later run against the latest saved baseline (fails on a >20% mean
+regression):
+
+    pytest tests/benchmarks --benchmark-only --benchmark-compare --benchmark-compare-fail=mean:20%
+
+Query counts are checked on every run against QUERY_BUDGETS below (default
+tenant only), so a query regression fails the test even without a saved
+baseline; they are also stored under `extra_info.queries` in the saved JSON.
+Use the BENCH_* variables documented in conftest.py to run against larger
+tenants, e.g. `BENCH_BOOKINGS=50000 BENCH_SERVICES=200`.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from bookings.views import _has_overlap, is_within_availability  # noqa: E402
+
+
+# Exact query counts for the default synthetic tenant. test_events grows with
+# the number of bookings; lower its budget when that is fixed.
+QUERY_BUDGETS = {
+    'test_service_availability': 68,
+    'test_batch_availability_summary': 27,
+    'test_events': 705,
+    'test_has_overlap': 16,
+    'test_is_within_availability': 64,
+    'test_save_availability': 20,
+}
+
+
+def _day_bounds(synth, offset=0):
+    tz = ZoneInfo(synth.org.timezone)
+    day = synth.first_day + timedelta(days=offset)
+    return datetime.combine(day, time(0, 0), tzinfo=tz), datetime.combine(day, time(23, 59, 59), tzinfo=tz)
+
+
+def test_service_availability(run_benchmark, synthetic_org, client):
+    svc = synthetic_org.services[0]
+    start, end = _day_bounds(synthetic_org, 1)
+    url = f'/bus/{synthetic_org.org.slug}/services/{svc.slug}/availability/'
+    params = {'start': start.isoformat(), 'end': end.isoformat()}
+
+    resp = run_benchmark(client.get, url, params)
+    assert resp.status_code == 200
+
+
+def test_batch_availability_summary(run_benchmark, synthetic_org, client):
+    svc = synthetic_org.services[0]
+    start, _ = _day_bounds(synthetic_org)
+    _, end = _day_bounds(synthetic_org, 6)
+    url = f'/bus/{synthetic_org.org.slug}/services/{svc.slug}/availability/batch/'
+    params = {'start': start.isoformat(), 'end': end.isoformat()}
+
+    resp = run_benchmark(client.get, url, params)
+    assert resp.status_code == 200
+
+
+def test_events(run_benchmark, synthetic_org, client):
+    client.force_login(synthetic_org.owner)
+    start, _ = _day_bounds(synthetic_org)
+    _, end = _day_bounds(synthetic_org, 6)
+    url = f'/bus/{synthetic_org.org.slug}/events/'
+    params = {'start': start.isoformat(), 'end': end.isoformat()}
+
+    resp = run_benchmark(client.get, url, params)
+    assert resp.status_code == 200
+
+
+def test_has_overlap(run_benchmark, synthetic_org):
+    svc = synthetic_org.services[0]
+    start, _ = _day_bounds(synthetic_org, 1)
+    slot_start = start.replace(hour=10)
+
+    def _scan_day():
+        # One candidate per 30 minutes across the open day, like a slot scan.
+        return [
+            _has_overlap(synthetic_org.org, s, s + timedelta(minutes=svc.duration), service=svc)
+            for s in (slot_start + timedelta(minutes=30 * i) for i in range(16))
+        ]
+
+    assert len(run_benchmark(_scan_day)) == 16
+
+
+def test_is_within_availability(run_benchmark, synthetic_org):
+    svc = synthetic_org.services[0]
+    start, _ = _day_bounds(synthetic_org, 1)
+    slot_start = start.replace(hour=8)
+
+    def _scan_day():
+        return [
+            is_within_availability(synthetic_org.org, s, s + timedelta(minutes=svc.duration), svc)
+            for s in (slot_start + timedelta(minutes=30 * i) for i in range(16))
+        ]
+
+    assert len(run_benchmark(_scan_day)) == 16
+
+
+def test_save_availability(run_benchmark, synthetic_org, client):
+    client.force_login(synthetic_org.owner)
+    url = f'/bus/{synthetic_org.org.slug}/availability/save/'
+    payload = json.dumps({
+        'availability': [
+            {'day': day, 'ranges': ['08:00-12:00', '13:00-18:00'], 'unavailable': False}
+            for day in range(7)
+        ]
+    })
+
+    resp = run_benchmark(client.post, url, payload, content_type='application/json')
+    assert resp.status_code == 200
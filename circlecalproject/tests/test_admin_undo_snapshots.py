@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from billing.models import DiscountCode
+from calendar_app.admin_undo import purge_admin_undo_snapshots
+from calendar_app.models import AdminUndoSnapshot
+
+
+User = get_user_model()
+
+
+class AdminUndoSnapshotTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='undo_admin', email='undo@example.com', password='pw')
+        self.client.force_login(self.admin)
+        self.members = [User.objects.create_user(username=f'undo_u{i}', password='pw') for i in range(2)]
+
+    def _codes(self, n, prefix='UNDO'):
+        codes = [DiscountCode.objects.create(code=f'{prefix}{i}', percent_off=10) for i in range(n)]
+        for code in codes:
+            code.users.set(self.members)
+        return codes
+
+    def _bulk_delete(self, codes):
+        return self.client.post(reverse('admin:billing_discountcode_changelist'), {
+            'action': 'delete_selected', 'post': 'yes', '_selected_action': [c.pk for c in codes],
+        })
+
+    def test_bulk_delete_writes_snapshots_with_constant_queries(self):
+        def run(n, prefix):
+            codes = self._codes(n, prefix)
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self._bulk_delete(codes)
+            self.assertEqual(resp.status_code, 302)
+            return codes, len(ctx.captured_queries)
+
+        run(1, 'WARM')
+        small, small_queries = run(2, 'UNDO')
+        _, large_queries = run(12, 'MORE')
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(AdminUndoSnapshot.objects.count(), 15)
+
+        snap = AdminUndoSnapshot.objects.get(object_id=str(small[0].pk))
+        self.assertEqual(snap.log_entry.action_flag, DELETION)
+        self.assertEqual(sorted(snap.m2m['users']), sorted(u.pk for u in self.members))
+        self.assertEqual(snap.snapshot['code'], 'UNDO0')
+
+        resp = self.client.post(reverse('admin_undo_logentry', args=[snap.log_entry_id]))
+        self.assertEqual(resp.status_code, 302)
+        restored = DiscountCode.objects.get(pk=small[0].pk)
+        self.assertEqual(restored.users.count(), 2)
+
+    def test_single_delete_is_captured(self):
+        code = self._codes(1)[0]
+        resp = self.client.post(reverse('admin:billing_discountcode_delete', args=[code.pk]), {'post': 'yes'})
+        self.assertEqual(resp.status_code, 302)
+        entry = LogEntry.objects.get(action_flag=DELETION, object_id=str(code.pk))
+        self.assertTrue(AdminUndoSnapshot.objects.filter(log_entry=entry).exists())
+
+    @override_settings(ADMIN_UNDO_RETENTION_DAYS=7, ADMIN_UNDO_MAX_SNAPSHOTS=2)
+    def test_purge_applies_retention_and_cap(self):
+        self._bulk_delete(self._codes(4))
+        oldest = AdminUndoSnapshot.objects.order_by('id').first()
+        AdminUndoSnapshot.objects.filter(id=oldest.id).update(created_at=timezone.now() - timedelta(days=8))
+        self.assertEqual(purge_admin_undo_snapshots(), 2)
+        self.assertEqual(AdminUndoSnapshot.objects.count(), 2)
@@ -0,0 +1,88 @@
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from billing.models import Plan, Subscription
+from bookings.models import Booking, Service
+
+
+User = get_user_model()
+
+
+class ApiBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='batch-api', email='batch@example.com', password='pw')
+        self.org = Business.objects.create(name='Batch API Org', slug=f'batch-api-{uuid.uuid4().hex[:6]}', owner=self.user)
+        Membership.objects.create(user=self.user, organization=self.org, role='owner', is_active=True)
+        plan = Plan.objects.create(name='Team', slug=f'team-{uuid.uuid4().hex[:6]}', billing_period='monthly')
+        Subscription.objects.update_or_create(organization=self.org, defaults={'plan': plan, 'status': 'active', 'active': True})
+
+        other_owner = User.objects.create_user(username='batch-other', email='other@example.com', password='pw')
+        self.other_org = Business.objects.create(name='Other', slug=f'other-{uuid.uuid4().hex[:6]}', owner=other_owner)
+
+        svc = Service.objects.create(organization=self.org, name='Lesson', slug=f'lesson-{uuid.uuid4().hex[:6]}', duration=30)
+        start = timezone.now() + timedelta(days=1)
+        Booking.objects.create(organization=self.org, service=svc, start=start, end=start + timedelta(minutes=30), client_name='Ann')
+        self.client.force_login(self.user)
+
+    def _batch(self, parts):
+        return self.client.post('/api/v1/batch/', {'requests': parts}, content_type='application/json')
+
+    def _org_parts(self):
+        return [
+            {'id': 'bookings', 'path': f'bookings/?org={self.org.slug}'},
+            {'id': 'billing', 'path': f'/api/v1/billing/summary/?org={self.org.slug}'},
+            {'id': 'profile', 'path': f'profile/overview/?org={self.org.slug}'},
+        ]
+
+    def test_returns_per_part_status_and_body(self):
+        resp = self._batch([
+            {'id': 'me', 'path': 'me/'},
+            {'id': 'orgs', 'path': 'orgs/'},
+            {'id': 'bookings', 'path': f'bookings/?org={self.org.slug}'},
+            {'id': 'forbidden', 'path': f'bookings/?org={self.other_org.slug}'},
+            {'id': 'missing', 'path': 'nope/'},
+            {'id': 'write', 'path': 'services/', 'method': 'POST'},
+            {'id': 'outside', 'path': '/admin/'},
+            {'id': 'nested', 'path': 'batch/'},
+        ])
+        self.assertEqual(resp.status_code, 200)
+        parts = {p['id']: p for p in resp.json()['responses']}
+        self.assertEqual(list(parts), ['me', 'orgs', 'bookings', 'forbidden', 'missing', 'write', 'outside', 'nested'])
+
+        self.assertEqual(parts['me']['status'], 200)
+        self.assertEqual(parts['me']['body']['username'], 'batch-api')
+        self.assertEqual([o['slug'] for o in parts['orgs']['body']['orgs']], [self.org.slug])
+        self.assertEqual(parts['bookings']['body']['count'], 1)
+        self.assertEqual(parts['forbidden']['status'], 400)
+        self.assertEqual(parts['missing']['status'], 404)
+        self.assertEqual(parts['write']['status'], 405)
+        self.assertEqual(parts['outside']['status'], 400)
+        self.assertEqual(parts['nested']['status'], 400)
+
+    def test_org_scoped_parts_share_lookups(self):
+        separate = 0
+        for part in self._org_parts():
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(self.client.get('/api/v1/' + part['path'].removeprefix('/api/v1/')).status_code, 200)
+            separate += len(ctx.captured_queries)
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self._batch(self._org_parts())
+        self.assertEqual([p['status'] for p in resp.json()['responses']], [200, 200, 200])
+        # Session, user and middleware lookups run once for the batch, and the
+        # org, membership and subscription once for all three parts (19 vs 35).
+        self.assertLessEqual(len(ctx.captured_queries), separate - 12)
+
+    @override_settings(API_BATCH_MAX_REQUESTS=2)
+    def test_rejects_oversized_and_anonymous_batches(self):
+        self.assertEqual(self._batch(self._org_parts()).status_code, 400)
+        self.assertEqual(self._batch([]).status_code, 400)
+        self.client.logout()
+        self.assertIn(self._batch([{'path': 'me/'}]).status_code, (401, 403))
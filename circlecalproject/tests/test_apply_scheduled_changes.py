@@ -0,0 +1,76 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+import stripe
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Business
+from billing.models import Plan, Subscription, SubscriptionChange
+from billing.scheduled_changes import apply_due_scheduled_changes
+
+
+@override_settings(SCHEDULED_CHANGE_STRIPE_RETRIES=1)
+class ApplyScheduledChangesTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='sc_owner', email='sc@example.com', password='pw')
+        self.pro = Plan.objects.create(name='Pro', slug='sc-pro', price=20, billing_period='monthly', stripe_price_id='price_pro')
+        self.basic = Plan.objects.create(name='Basic', slug='sc-basic', price=5, billing_period='monthly', stripe_price_id='price_basic')
+        self.subs = [self._sub(i) for i in range(3)]
+
+    def _sub(self, i):
+        org = Business.objects.create(name=f'SC {i}', slug=f'sc-{i}', owner=self.user, stripe_customer_id=f'cus_{i}')
+        sub = Subscription.objects.create(
+            organization=org, plan=self.pro, stripe_subscription_id=f'sub_{i}',
+            scheduled_plan=self.basic, scheduled_change_at=timezone.now() - timedelta(minutes=1),
+        )
+        SubscriptionChange.objects.create(organization=org, subscription=sub, change_type='downgrade', new_plan=self.basic)
+        return sub
+
+    def test_applies_batch_and_classifies_failures(self):
+        calls = []
+
+        def update(sub_id, params=None, options=None):
+            calls.append((sub_id, options['idempotency_key']))
+            if sub_id == 'sub_1':
+                raise stripe.InvalidRequestError('No such price', param='items', http_status=400)
+            if sub_id == 'sub_2':
+                raise stripe.APIConnectionError('timed out')
+            return {'id': sub_id, 'status': 'active'}
+
+        client = MagicMock()
+        client.v1.subscriptions.update.side_effect = update
+        with patch('billing.scheduled_changes.time.sleep'):
+            counts = apply_due_scheduled_changes(batch_size=2, workers=4, client=client)
+        self.assertEqual(counts, {'applied': 1, 'retry': 1, 'failed': 1, 'skipped': 0})
+        # The transient failure was retried once with the same idempotency key.
+        self.assertEqual([key for sid, key in calls if sid == 'sub_2'][0], [key for sid, key in calls if sid == 'sub_2'][1])
+
+        done, rejected, pending = (Subscription.objects.get(id=s.id) for s in self.subs)
+        self.assertEqual((done.plan_id, done.scheduled_plan_id), (self.basic.id, None))
+        self.assertEqual(SubscriptionChange.objects.get(subscription=done).status, 'processed')
+        self.assertIn('No such price', rejected.scheduled_change_error)
+        self.assertEqual((pending.scheduled_plan_id, pending.scheduled_change_error), (self.basic.id, ''))
+
+        # Only the transient failure is due on the next run.
+        client.v1.subscriptions.update.side_effect = None
+        client.v1.subscriptions.update.return_value = {'status': 'active'}
+        self.assertEqual(apply_due_scheduled_changes(client=client)['applied'], 1)
+        self.assertEqual(client.v1.subscriptions.update.call_args.args[0], 'sub_2')
+
+    def test_command_reports_counts(self):
+        client = MagicMock()
+        client.v1.subscriptions.update.return_value = {'status': 'active'}
+        out = StringIO()
+        with patch('billing.scheduled_changes.stripe_client', return_value=client), \
+                patch('accounts.push.send_push_to_user') as push, \
+                self.captureOnCommitCallbacks(execute=True):
+            call_command('apply_scheduled_changes', stdout=out)
+        self.assertIn('Applied=3, retry=0, failed=0, skipped=0.', out.getvalue())
+        self.assertFalse(Subscription.objects.filter(scheduled_plan__isnull=False).exists())
+        # The owner hears about each applied downgrade.
+        self.assertEqual(push.call_count, 3)
+        self.assertEqual(push.call_args.kwargs['data']['kind'], 'billing_subscription_updated')
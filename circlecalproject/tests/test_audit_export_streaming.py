@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from bookings.audit_export import run_audit_export_job
+from bookings.models import AuditBooking, AuditExportJob, Service
+
+
+User = get_user_model()
+
+
+@override_settings(AUDIT_EXPORT_BACKGROUND_THREAD=False, AUDIT_EXPORT_SYNC_PDF_MAX=2)
+class AuditExportStreamingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='exp_owner', email='exp@example.com', password='pw')
+        self.org = Business.objects.create(name='Export Org', slug='export-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(
+            organization=self.org, name='Lesson', slug='exp-lesson', duration=60, price=40,
+            refunds_allowed=True, refund_cutoff_hours=24,
+        )
+        now = timezone.now()
+        self.audits = []
+        for i in range(4):
+            start = now + timedelta(days=i + 1)
+            self.audits.append(AuditBooking.objects.create(
+                organization=self.org,
+                booking_id=100 + i,
+                event_type=AuditBooking.EVENT_CANCELLED,
+                booking_snapshot={'public_ref': f'REF{i}'},
+                service=self.svc,
+                start=start,
+                end=start + timedelta(hours=1),
+                client_name=f'Client {i}',
+                client_email=f'c{i}@example.com',
+            ))
+        self.client.force_login(self.user)
+
+    def _body(self, resp):
+        return b''.join(resp.streaming_content).decode('utf-8')
+
+    def test_web_csv_stream_includes_all_rows(self):
+        url = reverse('calendar_app:bookings_audit_export_stream', args=[self.org.slug])
+        resp = self.client.get(url, {'export_format': 'csv'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self._body(resp))))
+        self.assertEqual({r['booking_ref'] for r in rows}, {'REF0', 'REF1', 'REF2', 'REF3'})
+        # Cancelled within 24h of start -> charge retained.
+        by_ref = {r['booking_ref']: r for r in rows}
+        self.assertEqual(by_ref['REF0']['non_refunded'], 'True')
+        self.assertEqual(by_ref['REF3']['non_refunded'], 'False')
+
+    def test_api_ndjson_stream_filters_by_ids(self):
+        ids = f'{self.audits[0].id},{self.audits[1].id}'
+        resp = self.client.get('/api/v1/bookings/audit/export/stream/', {'org': self.org.slug, 'export_format': 'ndjson', 'ids': ids})
+        self.assertEqual(resp.status_code, 200)
+        lines = [json.loads(ln) for ln in self._body(resp).splitlines() if ln.strip()]
+        self.assertEqual(sorted(it['booking_id'] for it in lines), [100, 101])
+
+    def test_large_pdf_export_becomes_background_job(self):
+        url = reverse('calendar_app:bookings_audit_export', args=[self.org.slug])
+        ids = [a.id for a in self.audits]
+        resp = self.client.post(url, data=json.dumps({'ids': ids}), content_type='application/json')
+        self.assertEqual(resp.status_code, 202)
+        payload = resp.json()
+        self.assertEqual(payload['status'], AuditExportJob.STATUS_PENDING)
+
+        job_id = payload['job_id']
+        download_url = reverse('calendar_app:bookings_audit_export_job_download', args=[self.org.slug, job_id])
+        self.assertEqual(self.client.get(download_url).status_code, 409)
+
+        self.assertTrue(run_audit_export_job(job_id))
+        # A second run must not reprocess the claimed job.
+        self.assertFalse(run_audit_export_job(job_id))
+
+        status = self.client.get(payload['status_url']).json()
+        self.assertEqual(status['status'], AuditExportJob.STATUS_DONE)
+        self.assertEqual(status['processed'], 4)
+        self.assertEqual(status['progress'], 1.0)
+
+        dl = self.client.get(status['download_url'])
+        self.assertEqual(dl.status_code, 200)
+        self.assertEqual(dl['Content-Type'], 'application/pdf')
+        self.assertTrue(dl.content.startswith(b'%PDF'))
+
+    def test_small_pdf_export_stays_inline(self):
+        url = reverse('calendar_app:bookings_audit_export', args=[self.org.slug])
+        resp = self.client.get(url, {'ids': str(self.audits[0].id)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'application/pdf')
+
+    def test_command_processes_pending_jobs(self):
+        job = AuditExportJob.objects.create(organization=self.org, params={'ids': [self.audits[0].id]})
+        call_command('run_audit_export_jobs', stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, AuditExportJob.STATUS_DONE)
+        self.assertTrue(bytes(job.artifact).startswith(b'%PDF'))
+
+    def test_job_streams_rows_into_the_pdf(self):
+        from bookings import audit_export
+
+        job = AuditExportJob.objects.create(organization=self.org, params={'ids': [a.id for a in self.audits]})
+        seen = {}
+
+        def render(org, items, **kwargs):
+            seen['items'] = items
+            seen['kwargs'] = kwargs
+            return b'%PDF' + str(sum(1 for _ in items)).encode()
+
+        with patch.object(audit_export, 'render_audit_pdf', side_effect=render):
+            self.assertTrue(run_audit_export_job(job.id))
+        self.assertNotIsInstance(seen['items'], list)
+        self.assertEqual(seen['kwargs']['summary']['count'], 4)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, bytes(job.artifact)), (AuditExportJob.STATUS_DONE, 4, b'%PDF4'))
+
+    def test_command_requeues_jobs_left_running(self):
+        stuck = AuditExportJob.objects.create(
+            organization=self.org, params={'ids': [self.audits[0].id]},
+            status=AuditExportJob.STATUS_RUNNING, started_at=timezone.now() - timedelta(hours=2),
+        )
+        recent = AuditExportJob.objects.create(
+            organization=self.org, params={'ids': [self.audits[1].id]},
+            status=AuditExportJob.STATUS_RUNNING, started_at=timezone.now(),
+        )
+        out = io.StringIO()
+        call_command('run_audit_export_jobs', stdout=out)
+        self.assertIn('requeued=1', out.getvalue())
+        stuck.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual(stuck.status, AuditExportJob.STATUS_DONE)
+        self.assertTrue(bytes(stuck.artifact).startswith(b'%PDF'))
+        self.assertEqual(recent.status, AuditExportJob.STATUS_RUNNING)
@@ -0,0 +1,144 @@
+import io
+import json
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from billing.models import BillingMirrorState, InvoiceMeta, PaymentMethod, Plan, Subscription
+
+
+def _fake_stripe(invoices):
+    fake = MagicMock()
+    fake.Customer.retrieve.return_value = {'id': 'cus_m', 'invoice_settings': {'default_payment_method': 'pm_1'}}
+    fake.PaymentMethod.list.return_value = {'data': [
+        {'id': 'pm_1', 'card': {'brand': 'visa', 'last4': '4242', 'exp_month': 1, 'exp_year': 2030}},
+    ]}
+    fake.Subscription.retrieve.return_value = {
+        'id': 'sub_m', 'status': 'active', 'cancel_at_period_end': True, 'items': {'data': []},
+    }
+    fake.Subscription.list.return_value = {'data': []}
+    fake.Invoice.list.return_value = {'data': invoices}
+    fake.Charge.retrieve.return_value = {'payment_method_details': {'card': {'brand': 'visa', 'last4': '4242'}}}
+    return fake
+
+
+@override_settings(BILLING_MIRROR_BACKGROUND_THREAD=False, STRIPE_WEBHOOK_BACKGROUND_THREAD=False)
+class BillingMirrorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='bm_owner', email='bm@example.com', password='pw')
+        self.org = Business.objects.create(name='Mirror Org', slug='bm-org', owner=self.user, timezone='UTC')
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        plan = Plan.objects.create(name='Pro', slug='pro', price=10, billing_period='monthly')
+        self.sub = Subscription.objects.create(
+            organization=self.org, plan=plan, status='active', active=True, stripe_subscription_id='sub_m',
+        )
+        self.org.stripe_customer_id = 'cus_m'
+        self.org.save(update_fields=['stripe_customer_id'])
+        self.client.force_login(self.user)
+        self.url = reverse('billing:manage_billing', kwargs={'org_slug': self.org.slug})
+        self.invoice = {
+            'id': 'in_1', 'subscription': 'sub_m', 'status': 'paid', 'amount_due': 1000, 'amount_paid': 1000,
+            'currency': 'usd', 'hosted_invoice_url': 'https://invoice.example/in_1',
+            'created': int(time.time()) - 86400, 'charge': 'ch_1',
+        }
+
+    def _get(self, fake):
+        with patch('billing.mirror.stripe', fake), \
+                patch('billing.views.stripe_invoice_upcoming', return_value={'amount_due': 1000, 'subscription': 'sub_m'}):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        return resp
+
+    def test_page_renders_from_mirror_after_first_sync(self):
+        fake = _fake_stripe([self.invoice])
+        resp = self._get(fake)
+        self.assertContains(resp, 'https://invoice.example/in_1')
+        self.assertEqual(PaymentMethod.objects.get(organization=self.org).last4, '4242')
+        row = InvoiceMeta.objects.get(organization=self.org, stripe_invoice_id='in_1')
+        self.assertEqual((row.stripe_status, row.card_last4), ('paid', '4242'))
+        self.sub.refresh_from_db()
+        self.assertTrue(self.sub.cancel_at_period_end)
+
+        # Within the TTL nothing goes to Stripe.
+        fake.reset_mock()
+        self._get(fake)
+        self.assertEqual(fake.mock_calls, [])
+
+        resp = self.client.get(reverse('billing:list_payment_methods', kwargs={'org_slug': self.org.slug}))
+        self.assertEqual(resp.json()['default_payment_method_id'], 'pm_1')
+
+    def test_webhook_stores_invoice_and_marks_state_stale(self):
+        self._get(_fake_stripe([]))
+        event = {'type': 'invoice.finalized', 'data': {'object': dict(self.invoice, id='in_2', status='open', customer='cus_m')}}
+        with patch('billing.views.stripe.Webhook.construct_event', return_value=event):
+            resp = self.client.post(
+                reverse('billing:stripe_webhook'), data=json.dumps({}), content_type='application/json',
+                HTTP_STRIPE_SIGNATURE='t=1,v1=test',
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(InvoiceMeta.objects.get(stripe_invoice_id='in_2').stripe_status, 'open')
+        self.assertTrue(BillingMirrorState.objects.get(organization=self.org).stale)
+
+        fake = _fake_stripe([dict(self.invoice, id='in_2')])
+        self._get(fake)
+        self.assertTrue(fake.Invoice.list.called)
+        self.assertEqual(InvoiceMeta.objects.get(stripe_invoice_id='in_2').stripe_status, 'paid')
+        self.assertFalse(BillingMirrorState.objects.get(organization=self.org).stale)
+
+    @override_settings(BILLING_MIRROR_BACKGROUND_THREAD=True)
+    def test_expired_snapshot_is_served_while_refresh_is_scheduled(self):
+        BillingMirrorState.objects.create(
+            organization=self.org, stale=False, synced_at=timezone.now() - timedelta(hours=1),
+        )
+        fake = _fake_stripe([self.invoice])
+        with patch('billing.mirror._start_refresh_thread') as start, \
+                self.captureOnCommitCallbacks(execute=True):
+            self._get(fake)
+        self.assertEqual(fake.mock_calls, [])
+        start.assert_called_once_with(self.org.id)
+
+    @override_settings(BILLING_MIRROR_BACKGROUND_THREAD=True)
+    def test_first_load_renders_empty_and_backfill_syncs(self):
+        fake = _fake_stripe([self.invoice])
+        with patch('billing.mirror._start_refresh_thread') as start, \
+                self.captureOnCommitCallbacks(execute=True):
+            resp = self._get(fake)
+        self.assertNotContains(resp, 'https://invoice.example/in_1')
+        self.assertEqual(fake.mock_calls, [])
+        start.assert_called_once_with(self.org.id)
+
+        with patch('billing.mirror.stripe', fake), \
+                patch('billing.views.stripe_invoice_upcoming', return_value=None):
+            call_command('backfill_billing_mirror', stdout=io.StringIO())
+            self.assertIsNotNone(BillingMirrorState.objects.get(organization=self.org).synced_at)
+            fake.reset_mock()
+            call_command('backfill_billing_mirror', stdout=io.StringIO())
+        self.assertEqual(fake.mock_calls, [])
+
+    def test_cards_resolved_once_and_only_for_shown_invoices(self):
+        from billing.mirror import INVOICE_CARD_LIMIT, refresh_billing_mirror
+
+        invoices = [dict(self.invoice, id=f'in_{i}', charge=f'ch_{i}') for i in range(INVOICE_CARD_LIMIT + 5)]
+        fake = _fake_stripe(invoices)
+        # Non-card payment: no last4 to find.
+        fake.Charge.retrieve.return_value = {'payment_method_details': {'us_bank_account': {}}}
+        with patch('billing.mirror.stripe', fake), \
+                patch('billing.views.stripe_invoice_upcoming', return_value=None):
+            refresh_billing_mirror(self.org)
+            self.assertEqual(fake.Charge.retrieve.call_count, INVOICE_CARD_LIMIT)
+            fake.Charge.retrieve.reset_mock()
+            refresh_billing_mirror(self.org)
+        fake.Charge.retrieve.assert_not_called()
+        self.assertEqual(InvoiceMeta.objects.filter(card_resolved=True).count(), INVOICE_CARD_LIMIT)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from bookings.archive import archive_cutoff, archive_old_bookings
+from bookings.models import ArchivedAuditBooking, ArchivedBooking, AuditBooking, Booking, Service
+
+
+User = get_user_model()
+
+
+class BookingArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='arc_owner', email='arc@example.com', password='pw')
+        self.org = Business.objects.create(name='Archive Org', slug='archive-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(organization=self.org, name='Lesson', slug='arc-lesson', duration=60)
+
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        self.old = []
+        for i in range(3):
+            start = now - timedelta(days=800 + i)
+            self.old.append(Booking.objects.create(
+                organization=self.org, service=self.svc, start=start, end=start + timedelta(hours=1),
+                client_name=f'Old Client {i}', client_email=f'old{i}@example.com',
+            ))
+        start = now + timedelta(days=1)
+        self.recent = Booking.objects.create(
+            organization=self.org, service=self.svc, start=start, end=start + timedelta(hours=1),
+            client_name='Recent Client', client_email='recent@example.com',
+        )
+
+        self.old_audit = AuditBooking.objects.create(
+            organization=self.org, booking_id=999, event_type=AuditBooking.EVENT_CANCELLED,
+            booking_snapshot={'public_ref': 'OLDREF'}, service=self.svc,
+            start=now - timedelta(days=900), end=now - timedelta(days=900) + timedelta(hours=1),
+            client_name='Old Cancel', client_email='oc@example.com',
+        )
+        AuditBooking.objects.filter(id=self.old_audit.id).update(created_at=now - timedelta(days=900))
+        self.new_audit = AuditBooking.objects.create(
+            organization=self.org, booking_id=1000, event_type=AuditBooking.EVENT_DELETED,
+            booking_snapshot={'public_ref': 'NEWREF'}, service=self.svc,
+            client_name='New Delete', client_email='nd@example.com',
+        )
+        self.client.force_login(self.user)
+
+    def test_cutoff_is_month_aligned(self):
+        now = timezone.now().replace(year=2026, month=3, day=17)
+        cutoff = archive_cutoff(18, now=now)
+        self.assertEqual((cutoff.year, cutoff.month, cutoff.day, cutoff.hour), (2024, 9, 1, 0))
+
+    def test_archive_moves_rows_without_side_effects(self):
+        dry = archive_old_bookings(months=12, dry_run=True)
+        self.assertEqual((dry.bookings, dry.audits), (3, 1))
+        self.assertEqual(Booking.objects.filter(organization=self.org).count(), 4)
+
+        out = io.StringIO()
+        call_command('archive_old_bookings', '--months', '12', '--batch-size', '2', stdout=out)
+        self.assertIn('bookings=3, audits=1', out.getvalue())
+
+        self.assertEqual(list(Booking.objects.filter(organization=self.org)), [self.recent])
+        archived = ArchivedBooking.objects.get(id=self.old[0].id)
+        self.assertEqual(archived.public_ref, self.old[0].public_ref)
+        self.assertEqual(archived.service_id, self.svc.id)
+        # Moving rows must not look like cancellations.
+        self.assertEqual(list(AuditBooking.objects.filter(organization=self.org)), [self.new_audit])
+        self.assertTrue(ArchivedAuditBooking.objects.filter(id=self.old_audit.id).exists())
+
+        # A second run has nothing left to move.
+        self.assertEqual(archive_old_bookings(months=12).bookings, 0)
+
+    def test_history_views_read_archive(self):
+        archive_old_bookings(months=12)
+
+        from calendar_app import views as cal_views
+        url = reverse('calendar_app:bookings_list', args=[self.org.slug])
+        original = cal_views.BOOKINGS_LIST_PAGE_SIZE
+        cal_views.BOOKINGS_LIST_PAGE_SIZE = 3
+        try:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            ids = [b.id for b in resp.context['bookings']]
+            self.assertEqual(ids, [self.recent.id, self.old[0].id, self.old[1].id])
+            resp2 = self.client.get(url, {'cursor': resp.context['next_cursor']})
+            self.assertEqual([b.id for b in resp2.context['bookings']], [self.old[2].id])
+            self.assertIsNone(resp2.context['next_cursor'])
+        finally:
+            cal_views.BOOKINGS_LIST_PAGE_SIZE = original
+        self.assertContains(self.client.get(url, {'q': 'old client 1'}), 'Archived')
+
+        frm = (self.old[2].start - timedelta(days=1)).date().isoformat()
+        resp = self.client.get('/api/v1/bookings/', {'org': self.org.slug, 'from': frm})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            [b['id'] for b in resp.json()['bookings']],
+            [self.old[2].id, self.old[1].id, self.old[0].id],
+        )
+
+        audit = self.client.get('/api/v1/bookings/audit/', {'org': self.org.slug}).json()
+        self.assertEqual(audit['total'], 2)
+        self.assertEqual([it['id'] for it in audit['items']], [self.new_audit.id, self.old_audit.id])
+
+        page2 = self.client.get(
+            reverse('calendar_app:bookings_audit_list', args=[self.org.slug]), {'page': 2, 'per_page': 1}
+        ).json()
+        self.assertEqual([it['id'] for it in page2['items']], [self.old_audit.id])
+
+        resp = self.client.get(
+            reverse('calendar_app:bookings_audit_export_stream', args=[self.org.slug]), {'export_format': 'csv'}
+        )
+        rows = list(csv.DictReader(io.StringIO(b''.join(resp.streaming_content).decode('utf-8'))))
+        self.assertEqual({r['booking_ref'] for r in rows}, {'OLDREF', 'NEWREF'})
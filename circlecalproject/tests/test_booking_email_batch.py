@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from billing.models import Plan, Subscription
+from bookings.emails import send_booking_reminder, send_internal_booking_reminder_notification
+from bookings.models import Booking, Service, ServiceAssignment
+
+
+class CountingBackend(EmailBackend):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+        super().__init__(*args, **kwargs)
+
+
+@override_settings(
+    EMAIL_BACKEND='tests.test_booking_email_batch.CountingBackend',
+    DEFAULT_FROM_EMAIL='no-reply@circlecal.app',
+)
+class BookingEmailBatchTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        owner = User.objects.create_user(username='batch_owner', email='owner@example.com', password='pw')
+        self.org = Business.objects.create(name='Batch Org', slug='batch-org', owner=owner)
+        Membership.objects.update_or_create(user=owner, organization=self.org, defaults={'role': 'owner', 'is_active': True})
+        # Team plan, so the client emails also load staff cards.
+        plan = Plan.objects.create(name='Team', slug='team', billing_period='monthly')
+        Subscription.objects.create(organization=self.org, plan=plan, status='active', active=True)
+        manager = User.objects.create_user(username='batch_mgr', email='mgr@example.com', password='pw')
+        Membership.objects.create(user=manager, organization=self.org, role='manager', is_active=True)
+        staff = User.objects.create_user(username='batch_staff', email='staff@example.com', password='pw')
+        staff_membership = Membership.objects.create(user=staff, organization=self.org, role='staff', is_active=True)
+
+        svc = Service.objects.create(organization=self.org, name='Lesson', slug='batch-lesson', duration=60)
+        ServiceAssignment.objects.create(service=svc, membership=staff_membership)
+        start = timezone.now() + timedelta(days=2)
+        self.booking = Booking.objects.create(
+            organization=self.org, service=svc, start=start, end=start + timedelta(hours=1),
+            client_name='Client', client_email='client@example.com',
+        )
+        CountingBackend.created = 0
+
+    def test_cancellation_fan_out_shares_one_connection(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.delete()
+
+        self.assertEqual(CountingBackend.created, 1)
+        cancellations = [m for m in mail.outbox if m.subject.startswith('Booking Cancelled')]
+        self.assertEqual([m.to for m in cancellations], [['no-reply@circlecal.app'], ['client@example.com']])
+        self.assertEqual(sorted(cancellations[0].bcc), ['mgr@example.com', 'owner@example.com', 'staff@example.com'])
+        # Rendered once for both audiences.
+        self.assertEqual(cancellations[0].body, cancellations[1].body)
+
+    def test_client_and_internal_reminders_share_prefetched_data(self):
+        booking = Booking.objects.select_related(
+            'organization__owner__profile', 'organization__subscription__plan', 'service',
+        ).get(pk=self.booking.pk)
+        # Service assignments (with staff profiles) and managers, shared by both emails.
+        with self.assertNumQueries(2):
+            self.assertTrue(send_booking_reminder(booking))
+            self.assertTrue(send_internal_booking_reminder_notification(booking))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_reminder_runs_send_once_per_start_time(self):
+        def client_reminders():
+            call_command('send_booking_reminders', '--hours', '72', stdout=StringIO())
+            return [m for m in mail.outbox if m.to == ['client@example.com']]
+
+        self.assertEqual(len(client_reminders()), 1)
+        # Overlapping runs (the window is longer than the interval) skip it.
+        self.assertEqual(len(client_reminders()), 1)
+
+        self.booking.start += timedelta(hours=1)
+        self.booking.end += timedelta(hours=1)
+        self.booking.save()
+        self.assertEqual(len(client_reminders()), 2)
+
+    def test_failing_client_reminder_retries_without_repeating_internal(self):
+        def run():
+            call_command('send_booking_reminders', '--hours', '72', stdout=StringIO())
+            return [m for m in mail.outbox if m.to != ['client@example.com']]
+
+        with patch('bookings.management.commands.send_booking_reminders.send_booking_reminder', return_value=False) as client:
+            self.assertEqual(len(run()), 1)
+            self.assertEqual(len(run()), 1)
+        self.assertEqual(client.call_count, 2)
+
+        # The client send goes through on a later run; staff are not reminded again.
+        self.assertEqual(len(run()), 1)
+        self.assertEqual(len([m for m in mail.outbox if m.to == ['client@example.com']]), 1)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.reminder_sent_for, self.booking.start)
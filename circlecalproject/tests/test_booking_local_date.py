@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Business
+from bookings.models import Booking, Service, ServiceSettingFreeze
+
+
+class BookingLocalDateTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username='ld_owner', password='pw')
+        self.org = Business.objects.create(name='Local Day', slug='ld-org', owner=owner, timezone='America/Los_Angeles')
+        self.svc = Service.objects.create(organization=self.org, name='Lesson', slug='ld-lesson', duration=60)
+        # 02:00 UTC on Tuesday 2026-03-10 is still Monday evening in Los Angeles.
+        self.start = datetime(2026, 3, 10, 2, 0, tzinfo=dt_timezone.utc)
+
+    def _book(self, start):
+        return Booking.objects.create(organization=self.org, service=self.svc, start=start, end=start + timedelta(hours=1))
+
+    def test_local_day_follows_start_and_org_timezone(self):
+        booking = self._book(self.start)
+        self.assertEqual((booking.local_date, booking.local_weekday), (date(2026, 3, 9), 0))
+
+        booking.start = self.start + timedelta(hours=12)
+        booking.end = booking.start + timedelta(hours=1)
+        booking.save(update_fields=['start', 'end'])
+        booking.refresh_from_db()
+        self.assertEqual((booking.local_date, booking.local_weekday), (date(2026, 3, 10), 1))
+
+        booking.start = self.start
+        booking.save(update_fields=['start'])
+        self.org.timezone = 'UTC'
+        self.org.save()
+        booking.refresh_from_db()
+        self.assertEqual(booking.local_date, date(2026, 3, 10))
+
+    def test_freeze_removed_only_when_local_day_is_empty(self):
+        first = self._book(self.start)
+        second = self._book(self.start - timedelta(hours=3))
+        ServiceSettingFreeze.objects.create(service=self.svc, date=date(2026, 3, 9), frozen_settings={})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(ServiceSettingFreeze.objects.filter(service=self.svc, date=date(2026, 3, 9)).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(ServiceSettingFreeze.objects.filter(service=self.svc).exists())
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from bookings.models import Booking, Service
+from bookings.search import decode_cursor, encode_cursor, normalize_search_text
+
+
+User = get_user_model()
+
+
+class BookingSearchTextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ks_owner', email='ks@example.com', password='pw')
+        self.org = Business.objects.create(name='Keyset Org', slug='keyset-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(organization=self.org, name='Batting Cage', slug='ks-cage', duration=60)
+
+    def test_search_text_is_normalized_and_updated_on_save(self):
+        start = timezone.now() + timedelta(days=1)
+        b = Booking.objects.create(
+            organization=self.org, service=self.svc, start=start, end=start + timedelta(hours=1),
+            client_name='  José   ÁLVAREZ ', client_email='Jose@Example.com',
+        )
+        b.refresh_from_db()
+        self.assertIn('jose alvarez', b.search_text)
+        self.assertIn('jose@example.com', b.search_text)
+        self.assertIn(b.public_ref.lower(), b.search_text)
+
+        b.client_name = 'Maria'
+        b.save(update_fields=['client_name'])
+        b.refresh_from_db()
+        self.assertIn('maria', b.search_text)
+        self.assertNotIn('alvarez', b.search_text)
+
+    def test_normalize_and_cursor_roundtrip(self):
+        self.assertEqual(normalize_search_text(' A\tb  C '), 'a b c')
+        now = timezone.now()
+        start, pk = decode_cursor(encode_cursor(now, 42))
+        self.assertEqual(start, now)
+        self.assertEqual(pk, 42)
+
+
+class BookingsListKeysetApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ks_api', email='ksapi@example.com', password='pw')
+        self.org = Business.objects.create(name='Keyset API Org', slug='keyset-api-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(organization=self.org, name='Pitching Lesson', slug='ks-pitch', duration=30)
+        self.other_svc = Service.objects.create(organization=self.org, name='Hitting', slug='ks-hit', duration=30)
+
+        base = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.bookings = []
+        # Several bookings share the same start to exercise the id tiebreaker.
+        for i in range(7):
+            start = base + timedelta(hours=i // 2)
+            self.bookings.append(Booking.objects.create(
+                organization=self.org,
+                service=self.svc if i % 2 == 0 else self.other_svc,
+                start=start,
+                end=start + timedelta(minutes=30),
+                client_name=f'Client {i}',
+                client_email=f'client{i}@example.com',
+            ))
+        self.client.force_login(self.user)
+
+    def _get(self, **params):
+        params.setdefault('org', self.org.slug)
+        return self.client.get('/api/v1/bookings/', params)
+
+    def test_cursor_pages_cover_all_rows_without_duplicates(self):
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            resp = self._get(**params)
+            self.assertEqual(resp.status_code, 200)
+            body = resp.json()
+            seen.extend(b['id'] for b in body['bookings'])
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        expected = [b.id for b in sorted(self.bookings, key=lambda b: (b.start, b.id))]
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        resp = self._get(cursor='not-a-cursor')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_search_matches_client_fields_and_service_name(self):
+        resp = self._get(q='CLIENT3@example')
+        self.assertEqual([b['client_name'] for b in resp.json()['bookings']], ['Client 3'])
+
+        resp = self._get(q='pitching')
+        names = {b['client_name'] for b in resp.json()['bookings']}
+        self.assertEqual(names, {'Client 0', 'Client 2', 'Client 4', 'Client 6'})
+
+
+class BookingsListPageKeysetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ks_web', email='ksweb@example.com', password='pw')
+        self.org = Business.objects.create(name='Keyset Web Org', slug='keyset-web-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(organization=self.org, name='Lesson', slug='ks-web-lesson', duration=30)
+        start = timezone.now() + timedelta(days=2)
+        Booking.objects.create(organization=self.org, service=self.svc, start=start, end=start + timedelta(minutes=30),
+                               client_name='Findable Person', client_email='find@example.com')
+        Booking.objects.create(organization=self.org, service=self.svc, start=start, end=start + timedelta(minutes=30),
+                               client_name='Someone Else', client_email='else@example.com')
+        self.client.force_login(self.user)
+
+    def test_server_side_search_and_paging(self):
+        from calendar_app import views as cal_views
+
+        url = reverse('calendar_app:bookings_list', args=[self.org.slug])
+        resp = self.client.get(url, {'q': 'findable'})
+        self.assertEqual(resp.status_code, 200)
+        body = resp.content.decode('utf-8', errors='ignore')
+        self.assertIn('Findable Person', body)
+        self.assertNotIn('Someone Else', body)
+
+        original = cal_views.BOOKINGS_LIST_PAGE_SIZE
+        cal_views.BOOKINGS_LIST_PAGE_SIZE = 1
+        try:
+            resp = self.client.get(url)
+            self.assertEqual(len(resp.context['bookings']), 1)
+            cursor = resp.context['next_cursor']
+            self.assertTrue(cursor)
+            resp2 = self.client.get(url, {'cursor': cursor})
+            self.assertEqual(len(resp2.context['bookings']), 1)
+            self.assertNotEqual(resp.context['bookings'][0].id, resp2.context['bookings'][0].id)
+            self.assertIsNone(resp2.context['next_cursor'])
+        finally:
+            cal_views.BOOKINGS_LIST_PAGE_SIZE = original
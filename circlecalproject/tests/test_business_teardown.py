@@ -0,0 +1,96 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, BusinessTeardownJob, Membership
+from bookings.models import AuditBooking, Booking, Service
+
+
+User = get_user_model()
+
+
+@override_settings(BUSINESS_TEARDOWN_BACKGROUND_THREAD=False)
+class BusinessTeardownTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='td_owner', email='td@example.com', password='pw')
+        self.org = Business.objects.create(name='Teardown Org', slug='td-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        svc = Service.objects.create(organization=self.org, name='Lesson', slug='td-lesson', duration=60)
+        start = timezone.now() + timedelta(days=2)
+        Booking.objects.bulk_create([
+            Booking(
+                organization=self.org, service=svc, start=start + timedelta(hours=i), end=start + timedelta(hours=i, minutes=30),
+                client_name='Client', client_email=f'c{i}@example.com',
+            )
+            for i in range(5)
+        ])
+        self.client.force_login(self.user)
+
+    def test_small_business_is_deleted_inline_without_per_booking_side_effects(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse('calendar_app:delete_business', args=[self.org.slug]))
+        self.assertEqual(resp.status_code, 302)
+        self.assertFalse(Business.objects.filter(id=self.org.id).exists())
+        self.assertFalse(Booking.objects.exists())
+        self.assertFalse(AuditBooking.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+        job = BusinessTeardownJob.objects.get(business_ref=self.org.id)
+        self.assertEqual((job.status, job.reason, job.total, job.processed), ('done', 'delete_business', 5, 5))
+        self.assertEqual(job.progress['bookings.Booking'], 5)
+        self.assertEqual(job.progress['bookings.Service'], 1)
+        self.assertIsNone(job.business_id)
+
+    @override_settings(BUSINESS_TEARDOWN_SYNC_MAX_ROWS=2, BUSINESS_TEARDOWN_BATCH_SIZE=2)
+    def test_large_business_is_hidden_then_torn_down_in_batches(self):
+        resp = self.client.post(reverse('calendar_app:delete_business', args=[self.org.slug]))
+        self.assertEqual(resp.status_code, 302)
+        job = BusinessTeardownJob.objects.get(business_ref=self.org.id)
+        self.assertEqual(job.status, BusinessTeardownJob.STATUS_PENDING)
+        self.org.refresh_from_db()
+        self.assertTrue(self.org.is_archived)
+        self.assertFalse(Membership.objects.filter(organization=self.org, is_active=True).exists())
+
+        out = StringIO()
+        call_command('run_business_teardowns', stdout=out)
+        self.assertIn('Processed=1', out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (BusinessTeardownJob.STATUS_DONE, 5))
+        self.assertFalse(Business.objects.filter(id=self.org.id).exists())
+        self.assertFalse(Booking.objects.exists())
+
+    @override_settings(BUSINESS_TEARDOWN_SYNC_MAX_ROWS=2, BUSINESS_TEARDOWN_BATCH_SIZE=2)
+    def test_abandoned_running_teardown_is_requeued_and_resumes(self):
+        self.client.post(reverse('calendar_app:delete_business', args=[self.org.slug]))
+        job = BusinessTeardownJob.objects.get(business_ref=self.org.id)
+        # The thread deleted one batch, then died.
+        doomed = Booking.objects.filter(id__in=list(Booking.objects.order_by('id').values_list('id', flat=True)[:2]))
+        doomed._raw_delete(doomed.db)
+        BusinessTeardownJob.objects.filter(id=job.id).update(
+            status=BusinessTeardownJob.STATUS_RUNNING, started_at=timezone.now() - timedelta(hours=2),
+            progress={'bookings.Booking': 2}, processed=2,
+        )
+
+        out = StringIO()
+        call_command('run_business_teardowns', stdout=out)
+        self.assertIn('Processed=1, requeued=1', out.getvalue())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), (BusinessTeardownJob.STATUS_DONE, 5))
+        self.assertEqual(job.progress['bookings.Booking'], 5)
+        self.assertFalse(Business.objects.filter(id=self.org.id).exists())
+
+        # A teardown that is still within its lease is left alone.
+        running = BusinessTeardownJob.objects.create(
+            business_ref=999, status=BusinessTeardownJob.STATUS_RUNNING, started_at=timezone.now(),
+        )
+        call_command('run_business_teardowns', stdout=StringIO())
+        running.refresh_from_db()
+        self.assertEqual(running.status, BusinessTeardownJob.STATUS_RUNNING)
@@ -3,7 +3,7 @@ import uuid
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from accounts.models import Membership
 
@@ -11,6 +11,8 @@ from accounts.models import Business
 from billing.models import Plan, Subscription
 
 
+# Apply events inline so assertions see their effects right after the POST.
+@override_settings(STRIPE_WEBHOOK_BACKGROUND_THREAD=False)
 class TestCustomDomainAddonWebhook(TestCase):
     def setUp(self):
         User = get_user_model()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from bookings.capacity import GroupCapacityLedger
+from bookings.models import Booking, Service, ServiceWeeklyAvailability, WeeklyAvailability
+from bookings.views import _has_overlap, _slot_remaining_capacity
+
+
+User = get_user_model()
+
+
+class GroupCapacityLedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='gc_owner', email='gc@example.com', password='pw')
+        self.org = Business.objects.create(name='Group Org', slug='gc-org', owner=self.user, timezone='America/New_York')
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(
+            organization=self.org, name='Clinic', slug='gc-clinic', duration=30, max_participants=4,
+            min_notice_hours=0, max_booking_days=60, time_increment_minutes=30,
+        )
+        tz = ZoneInfo(self.org.timezone)
+        self.day = timezone.now().astimezone(tz).date() + timedelta(days=2)
+        for model, owner in ((WeeklyAvailability, {'organization': self.org}), (ServiceWeeklyAvailability, {'service': self.svc})):
+            model.objects.create(weekday=self.day.weekday(), start_time=time(9, 0), end_time=time(11, 0), is_active=True, **owner)
+        self.nine = datetime.combine(self.day, time(9, 0), tzinfo=tz)
+        for qty in (1, 2):
+            Booking.objects.create(
+                organization=self.org, service=self.svc, start=self.nine, end=self.nine + timedelta(minutes=30),
+                participant_count=qty,
+            )
+
+    def test_ledger_matches_per_slot_aggregates(self):
+        day_start = datetime.combine(self.day, time(0, 0), tzinfo=self.nine.tzinfo)
+        with CaptureQueriesContext(connection) as ctx:
+            ledger = GroupCapacityLedger(self.org, self.svc, day_start, day_start + timedelta(days=1))
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        slots = [(self.nine + timedelta(minutes=30 * i), self.nine + timedelta(minutes=30 * (i + 1))) for i in range(4)]
+        with CaptureQueriesContext(connection) as ctx:
+            from_ledger = [_slot_remaining_capacity(self.org, self.svc, s, e, ledger=ledger) for s, e in slots]
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(from_ledger, [_slot_remaining_capacity(self.org, self.svc, s, e) for s, e in slots])
+        self.assertEqual(from_ledger[:2], [1, 4])
+
+        # The same-slot branch of the overlap check reads the ledger too.
+        utc_nine = self.nine.astimezone(ZoneInfo('UTC'))
+        end = utc_nine + timedelta(minutes=30)
+        for qty in (1, 2):
+            self.assertEqual(
+                _has_overlap(self.org, utc_nine, end, service=self.svc, requested_participants=qty, ledger=ledger),
+                _has_overlap(self.org, utc_nine, end, service=self.svc, requested_participants=qty),
+            )
+
+    def test_availability_payload_exposes_seats_left(self):
+        url = reverse('bookings:service_availability', args=[self.org.slug, self.svc.slug])
+        start = datetime.combine(self.day, time(0, 0), tzinfo=self.nine.tzinfo)
+        resp = self.client.get(url, {'start': start.isoformat(), 'end': (start + timedelta(days=1)).isoformat()})
+        self.assertEqual(resp.status_code, 200)
+        by_start = {datetime.fromisoformat(s['start']): s for s in resp.json()}
+        self.assertEqual(by_start[self.nine]['remaining_capacity'], 1)
+        self.assertEqual(by_start[self.nine]['capacity'], 4)
+        self.assertEqual(by_start[self.nine + timedelta(minutes=30)]['remaining_capacity'], 4)
@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from calendar_app import http_client
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@override_settings(OUTBOUND_BREAKER_FAILURES=2, OUTBOUND_BREAKER_RESET_SECONDS=30)
+class OutboundHttpClientTests(SimpleTestCase):
+    def setUp(self):
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_session_is_pooled_and_timeouts_applied(self):
+        with patch.object(requests.Session, 'request', return_value=_Response(200)) as send:
+            http_client.request('expo', 'POST', 'https://exp.example/push', json=[])
+            http_client.request('expo', 'POST', 'https://exp.example/push', json=[])
+        self.assertIs(http_client._session('expo'), http_client._session('expo'))
+        self.assertEqual(send.call_args.kwargs['timeout'], (3.0, 6.0))
+        self.assertEqual(http_client.client_stats()['expo']['calls'], 2)
+
+    def test_breaker_opens_fails_fast_and_recovers(self):
+        with patch.object(requests.Session, 'request', side_effect=requests.ConnectTimeout('down')) as send:
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectTimeout):
+                    http_client.request('render', 'GET', 'https://render.example/v1')
+            with self.assertRaises(http_client.CircuitOpenError):
+                http_client.request('render', 'GET', 'https://render.example/v1')
+        self.assertEqual(send.call_count, 2)
+        stats = http_client.client_stats()['render']
+        self.assertEqual((stats['failures'], stats['short_circuits'], stats['state']), (2, 1, 'open'))
+
+        # After the reset window a single trial call closes the circuit again.
+        http_client.breaker('render').opened_at -= 31
+        with patch.object(requests.Session, 'request', return_value=_Response(200)):
+            http_client.request('render', 'GET', 'https://render.example/v1')
+        self.assertEqual(http_client.breaker('render').state, 'closed')
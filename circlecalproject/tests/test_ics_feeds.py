@@ -0,0 +1,116 @@
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from bookings.ics import iter_feed_chunks
+from bookings.ics_feeds import feed_key, feed_token
+from bookings.models import Booking, Service, ServiceAssignment
+
+
+class IcsFeedTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(username='feed_owner', email='owner@example.com', password='pw')
+        self.org = Business.objects.create(name='Feed Org', slug='feed-org', owner=self.owner)
+        Membership.objects.update_or_create(user=self.owner, organization=self.org, defaults={'role': 'owner', 'is_active': True})
+        self.staff = User.objects.create_user(username='feed_staff', email='staff@example.com', password='pw')
+        self.staff_membership = Membership.objects.create(user=self.staff, organization=self.org, role='staff', is_active=True)
+
+        self.lesson = Service.objects.create(organization=self.org, name='Lesson', slug='feed-lesson', duration=60)
+        other = Service.objects.create(organization=self.org, name='Clinic', slug='feed-clinic', duration=60)
+        ServiceAssignment.objects.create(service=self.lesson, membership=self.staff_membership)
+        start = timezone.now() + timedelta(days=2)
+        self.lesson_booking = Booking.objects.create(
+            organization=self.org, service=self.lesson, start=start, end=start + timedelta(hours=1), client_name='Ann',
+        )
+        self.clinic_booking = Booking.objects.create(
+            organization=self.org, service=other, start=start + timedelta(hours=2), end=start + timedelta(hours=3), client_name='Bo',
+        )
+
+    def _token(self, scope, obj_id=0, issuer=None):
+        issuer_id = (issuer or self.owner).id
+        return feed_token(scope, self.org.id, obj_id, issuer_id=issuer_id, key=feed_key(self.org))
+
+    def _feed(self, scope, obj_id=0, issuer=None, **headers):
+        return self.client.get(reverse('bookings:ics_feed', args=[self._token(scope, obj_id, issuer)]), **headers)
+
+    def _uids(self, resp):
+        return sorted(line for line in resp.content.decode().split('\r\n') if line.startswith('UID:'))
+
+    def test_feed_is_cached_and_revalidated_until_bookings_change(self):
+        resp = self._feed('org')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertEqual(len(self._uids(resp)), 2)
+
+        etag = resp['ETag']
+        url = reverse('bookings:ics_feed', args=[self._token('org')])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+            self.assertEqual(self.client.get(url).content, resp.content)
+
+        self.clinic_booking.delete()
+        changed = self._feed('org', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(self._uids(changed), [f'UID:circlecal-booking-{self.lesson_booking.id}@circlecal'])
+
+    def test_member_and_service_scopes(self):
+        lesson_uid = [f'UID:circlecal-booking-{self.lesson_booking.id}@circlecal']
+        self.assertEqual(self._uids(self._feed('member', self.staff.id, self.staff)), lesson_uid)
+        self.assertEqual(self._uids(self._feed('service', self.lesson.id, self.staff)), lesson_uid)
+
+        self.staff_membership.is_active = False
+        self.staff_membership.save()
+        self.assertEqual(self._feed('member', self.staff.id, self.staff).status_code, 404)
+        self.assertEqual(self.client.get(reverse('bookings:ics_feed', args=['org.1.0.1.x:forged'])).status_code, 404)
+
+    def test_issuer_is_rechecked_on_every_poll(self):
+        # Staff may not use the org feed, nor a service feed once unassigned.
+        self.assertEqual(self._feed('org', issuer=self.staff).status_code, 404)
+        self.assertEqual(self._feed('service', self.lesson.id, self.staff).status_code, 200)
+        ServiceAssignment.objects.filter(membership=self.staff_membership).delete()
+        self.assertEqual(self._feed('service', self.lesson.id, self.staff).status_code, 404)
+
+        # A demoted manager loses the org feed.
+        self.staff_membership.role = 'manager'
+        self.staff_membership.save()
+        self.assertEqual(self._feed('org', issuer=self.staff).status_code, 200)
+        self.staff_membership.role = 'staff'
+        self.staff_membership.save()
+        self.assertEqual(self._feed('org', issuer=self.staff).status_code, 404)
+
+    def test_reset_revokes_issued_urls(self):
+        old = reverse('bookings:ics_feed', args=[self._token('org')])
+        self.assertEqual(self.client.get(old).status_code, 200)
+
+        self.client.force_login(self.staff)
+        reset_url = reverse('bookings:ics_feed_links_reset', args=[self.org.slug])
+        self.assertEqual(self.client.post(reset_url).status_code, 403)
+        self.client.force_login(self.owner)
+        links = self.client.post(reset_url).json()
+
+        self.assertEqual(self.client.get(old).status_code, 404)
+        self.assertEqual(self.client.get(urlsplit(links['org']).path).status_code, 200)
+
+    def test_feed_links_for_members(self):
+        self.client.force_login(self.staff)
+        links = self.client.get(reverse('bookings:ics_feed_links', args=[self.org.slug])).json()
+        self.assertIsNone(links['org'])
+        self.assertEqual([s['id'] for s in links['services']], [self.lesson.id])
+        self.assertIn(reverse('bookings:ics_feed', args=[self._token('member', self.staff.id, self.staff)]), links['member'])
+
+    def test_writer_chunks_and_folds_long_lines(self):
+        self.lesson.name = 'Lesson, with; specials ' + 'x' * 100
+        self.lesson.save()
+        chunks = list(iter_feed_chunks(Booking.objects.select_related('service', 'organization').order_by('id'), 'Feed', chunk_size=1))
+        # Header, one chunk per booking, footer.
+        self.assertEqual(len(chunks), 4)
+        body = ''.join(chunks)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+        self.assertIn('SUMMARY:Lesson\\, with\\; specials', body)
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from calendar_app.lazy_views import LazyView
+
+
+# Cumulative import time of `circlecalproject.urls` after `django.setup()`.
+# It was ~360 ms with the view modules imported eagerly and is ~160 ms lazily.
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '300'))
+DEFERRED_MODULES = ('calendar_app.views', 'bookings.views', 'billing.views', 'reportlab')
+
+_SCRIPT = (
+    "import os, django; "
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'circlecalproject.settings'); "
+    "django.setup(); "
+    "import circlecalproject.urls"
+)
+
+
+def _measure_urlconf_import():
+    """Return {module: cumulative microseconds} for one fresh `circlecalproject.urls` import."""
+    env = {**os.environ, 'SECRET_KEY': os.environ.get('SECRET_KEY') or 'import-budget'}
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=120, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+class ImportBudgetTests(SimpleTestCase):
+    def test_urlconf_import_stays_lazy_and_within_budget(self):
+        timings = []
+        for _ in range(3):
+            modules = _measure_urlconf_import()
+            loaded = [m for m in DEFERRED_MODULES if m in modules]
+            self.assertEqual(loaded, [], 'imported at URLconf load; reference them lazily')
+            timings.append(modules['circlecalproject.urls'] / 1000.0)
+            if timings[-1] <= IMPORT_TIME_BUDGET_MS:
+                break
+        # The best of a few runs, so a busy machine does not fail the budget.
+        self.assertLessEqual(min(timings), IMPORT_TIME_BUDGET_MS)
+
+    def test_every_lazy_view_resolves(self):
+        def walk(patterns):
+            for p in patterns:
+                if isinstance(p, URLResolver):
+                    yield from walk(p.url_patterns)
+                elif isinstance(p, URLPattern) and isinstance(p.callback, LazyView):
+                    yield p.callback
+
+        views = list(walk(get_resolver().url_patterns))
+        self.assertGreater(len(views), 100)
+        for view in views:
+            self.assertTrue(callable(view.resolve()), view)
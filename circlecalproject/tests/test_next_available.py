@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from unittest.mock import patch
+
+from accounts.models import Business, Membership
+from bookings.models import Booking, Service, ServiceWeeklyAvailability
+
+
+User = get_user_model()
+
+
+class NextAvailableTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='na_owner', email='na@example.com', password='pw')
+        self.org = Business.objects.create(name='Next Org', slug='na-org', owner=self.user, timezone='UTC')
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.svc = Service.objects.create(
+            organization=self.org, name='Lesson', slug='na-lesson', duration=60,
+            min_notice_hours=0, max_booking_days=30, time_increment_minutes=60,
+        )
+        self.day = timezone.now().date() + timedelta(days=3)
+        ServiceWeeklyAvailability.objects.create(
+            service=self.svc, weekday=self.day.weekday(), start_time=time(9, 0), end_time=time(10, 0), is_active=True,
+        )
+        self.nine = datetime.combine(self.day, time(9, 0), tzinfo=ZoneInfo('UTC'))
+
+    def _next(self, **params):
+        url = reverse('bookings:service_next_available', args=[self.org.slug, self.svc.slug])
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        return resp.json()['next_available']
+
+    def test_returns_first_slot_and_skips_full_days(self):
+        slot = self._next()
+        self.assertEqual(datetime.fromisoformat(slot['start']), self.nine)
+
+        Booking.objects.create(organization=self.org, service=self.svc, start=self.nine, end=self.nine + timedelta(hours=1))
+        slot = self._next()
+        self.assertEqual(datetime.fromisoformat(slot['start']), self.nine + timedelta(days=7))
+
+        slot = self._next(after=(self.nine + timedelta(days=8)).isoformat())
+        self.assertEqual(datetime.fromisoformat(slot['start']), self.nine + timedelta(days=14))
+
+        self.assertIsNone(self._next(after=(self.nine + timedelta(days=40)).isoformat()))
+
+    def test_org_endpoint_covers_public_services(self):
+        Service.objects.create(
+            organization=self.org, name='Closed', slug='na-closed', duration=30, max_booking_days=30,
+        )
+        ServiceWeeklyAvailability.objects.create(
+            service=Service.objects.get(slug='na-closed'), weekday=0, start_time=time(9, 0), end_time=time(9, 0), is_active=True,
+        )
+        Service.objects.create(
+            organization=self.org, name='Hidden', slug='na-hidden', duration=30, show_on_public_calendar=False,
+        )
+        resp = self.client.get(reverse('bookings:org_next_available', args=[self.org.slug]))
+        self.assertEqual(resp.status_code, 200)
+        by_slug = {item['service_slug']: item['next_available'] for item in resp.json()['services']}
+        self.assertEqual(set(by_slug), {'na-lesson', 'na-closed'})
+        self.assertEqual(datetime.fromisoformat(by_slug['na-lesson']['start']), self.nine)
+        self.assertIsNone(by_slug['na-closed'])
+
+    def test_org_endpoint_is_cached_until_bookings_change_and_capped(self):
+        url = reverse('bookings:org_next_available', args=[self.org.slug])
+        from bookings import views as booking_views
+
+        with patch.object(booking_views, '_next_available_slot', wraps=booking_views._next_available_slot) as scan:
+            first = self.client.get(url).json()
+            self.assertEqual(self.client.get(url).json(), first)
+            self.assertEqual(scan.call_count, 1)
+
+            Booking.objects.create(organization=self.org, service=self.svc, start=self.nine, end=self.nine + timedelta(hours=1))
+            later = self.client.get(url).json()['services'][0]['next_available']
+            self.assertEqual(datetime.fromisoformat(later['start']), self.nine + timedelta(days=7))
+            self.assertEqual(scan.call_count, 2)
+
+        for i in range(3):
+            Service.objects.create(organization=self.org, name=f'Extra {i}', slug=f'na-extra-{i}', duration=30)
+        with override_settings(NEXT_AVAILABLE_MAX_SERVICES=2, NEXT_AVAILABLE_CACHE_SECONDS=0):
+            self.assertEqual(len(self.client.get(url).json()['services']), 2)
+
+    @override_settings(NEXT_AVAILABLE_MAX_DAYS=5)
+    def test_scan_is_capped_in_days(self):
+        # The only open slot is 3 days out; 7 days out is beyond the cap.
+        self.assertIsNotNone(self._next())
+        self.assertIsNone(self._next(after=(self.nine + timedelta(hours=1)).isoformat()))
+
+    def test_day_summary_query_count_does_not_grow_with_range(self):
+        url = reverse('bookings:batch_availability_summary', args=[self.org.slug, self.svc.slug])
+        start = datetime.combine(timezone.now().date(), time(0, 0), tzinfo=ZoneInfo('UTC'))
+
+        def run(days):
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(url, {'start': start.isoformat(), 'end': (start + timedelta(days=days)).isoformat()})
+            self.assertEqual(resp.status_code, 200)
+            return resp.json(), len(ctx.captured_queries)
+
+        week, week_queries = run(7)
+        month, month_queries = run(28)
+        self.assertTrue(week[self.day.isoformat()])
+        self.assertEqual(sum(month.values()), 4)
+        self.assertEqual(week_queries, month_queries)
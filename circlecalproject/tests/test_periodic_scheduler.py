@@ -0,0 +1,63 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from calendar_app.models import PeriodicJobState
+from calendar_app.periodic import PeriodicJob, run_due_jobs
+
+
+@override_settings(SCHEDULER_JITTER_FRACTION=0, SCHEDULER_JOB_INTERVALS={})
+class PeriodicSchedulerTests(TestCase):
+    def _jobs(self, *jobs):
+        return patch('calendar_app.periodic.JOBS', list(jobs))
+
+    def test_due_job_runs_once_per_interval_and_records_metrics(self):
+        func = MagicMock(return_value='Processed=3.')
+        job = PeriodicJob('tidy', 600, func)
+        PeriodicJobState.objects.create(name='tidy', next_run_at=timezone.now() - timedelta(seconds=1))
+
+        with self._jobs(job):
+            self.assertEqual(run_due_jobs('runner-a'), {'tidy': True})
+            self.assertEqual(run_due_jobs('runner-b'), {})
+        func.assert_called_once()
+
+        state = PeriodicJobState.objects.get(name='tidy')
+        self.assertEqual((state.last_status, state.run_count, state.lease_owner), ('ok', 1, ''))
+        self.assertEqual(state.last_result, 'Processed=3.')
+        self.assertAlmostEqual((state.next_run_at - state.last_finished_at).total_seconds(), 600, delta=1)
+
+    def test_leased_job_is_skipped_and_failures_are_counted(self):
+        boom = MagicMock(side_effect=RuntimeError('storage down'))
+        job = PeriodicJob('tidy', 60, boom)
+        PeriodicJobState.objects.create(
+            name='tidy', next_run_at=timezone.now(), lease_owner='other',
+            lease_expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        with self._jobs(job):
+            self.assertEqual(run_due_jobs('runner-a'), {})
+            PeriodicJobState.objects.filter(name='tidy').update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+            self.assertEqual(run_due_jobs('runner-a'), {'tidy': False})
+
+        state = PeriodicJobState.objects.get(name='tidy')
+        self.assertEqual((state.last_status, state.failure_count), ('failed', 1))
+        self.assertIn('storage down', state.last_error)
+        self.assertIsNone(state.lease_expires_at)
+
+    def test_command_runs_selected_job_now(self):
+        with patch('accounts.deletion.delete_due_trial_accounts', return_value={'deactivated': 2, 'skipped': 0}) as delete:
+            out = StringIO()
+            call_command('run_scheduler', '--once', '--force', '--job', 'delete_due_trial_accounts', stdout=out)
+        delete.assert_called_once_with(limit=200, dry_run=False)
+        self.assertIn('Ran=1, failed=0.', out.getvalue())
+        self.assertEqual(PeriodicJobState.objects.get(name='delete_due_trial_accounts').last_result, 'Deactivated=2, skipped=0.')
+
+    @override_settings(SCHEDULER_JOB_INTERVALS={'tidy': 0})
+    def test_interval_zero_disables_job(self):
+        func = MagicMock()
+        with self._jobs(PeriodicJob('tidy', 60, func)):
+            self.assertEqual(run_due_jobs('runner-a'), {})
+        func.assert_not_called()
@@ -0,0 +1,73 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import Business
+from bookings.models import Booking
+from calendar_app import db_routing
+
+
+@override_settings(REPLICA_LAG_CHECK_SECONDS=0, REPLICA_MAX_LAG_SECONDS=5, REPLICA_STICKY_SECONDS=30)
+class ReadReplicaRoutingTests(TestCase):
+    """A second, separate in-memory SQLite database plays the replica."""
+
+    databases = {'default', db_routing.REPLICA_ALIAS}
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[db_routing.REPLICA_ALIAS] = {**connections.settings['default'], 'NAME': ':memory:'}
+        with connections[db_routing.REPLICA_ALIAS].schema_editor() as editor:
+            for model in (get_user_model(), Business, Booking):
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[db_routing.REPLICA_ALIAS].close()
+        del connections[db_routing.REPLICA_ALIAS]
+        del connections.settings[db_routing.REPLICA_ALIAS]
+
+    @classmethod
+    def setUpTestData(cls):
+        # Only the replica knows this business, so a 200 proves where the read went.
+        User = get_user_model()
+        [owner] = User.objects.using(db_routing.REPLICA_ALIAS).bulk_create([User(username='replica_owner')])
+        Business.objects.using(db_routing.REPLICA_ALIAS).bulk_create([
+            Business(name='Replica Only', slug='replica-only', owner=owner),
+        ])
+
+    def _busy(self):
+        url = reverse('bookings:public_busy', args=['replica-only'])
+        return self.client.get(url, {'start': '2026-01-01T00:00:00', 'end': '2026-01-02T00:00:00'})
+
+    def test_reads_go_to_replica_until_client_writes(self):
+        self.assertEqual(self._busy().status_code, 200)
+
+        self.client.post(reverse('bookings:public_busy', args=['replica-only']))
+        self.assertIn(db_routing.STICKY_COOKIE, self.client.cookies)
+        self.assertEqual(self._busy().status_code, 404)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with patch.object(db_routing, '_measure_lag', return_value=60.0):
+            self.assertEqual(self._busy().status_code, 404)
+        with patch.object(db_routing, '_measure_lag', return_value=None):
+            self.assertEqual(self._busy().status_code, 404)
+        self.assertEqual(self._busy().status_code, 200)
+
+
+    def test_disconnected_receiver_is_not_caught_up(self):
+        # Replayed everything it received, streaming and recently heard from.
+        self.assertEqual(db_routing._lag_from_status(True, True, 'streaming', 2.0, 7200.0), 0.0)
+        # The same LSNs with the receiver gone or silent: fall back to replay age.
+        self.assertEqual(db_routing._lag_from_status(True, True, None, None, 7200.0), 7200.0)
+        self.assertEqual(db_routing._lag_from_status(True, True, 'streaming', 3600.0, 7200.0), 7200.0)
+        self.assertIsNone(db_routing._lag_from_status(True, True, 'stopping', 5.0, None))
+        self.assertEqual(db_routing._lag_from_status(False, None, None, None, None), 0.0)
+
+        disconnected = db_routing._lag_from_status(True, True, None, None, 7200.0)
+        with patch.object(db_routing, '_measure_lag', return_value=disconnected):
+            self.assertEqual(self._busy().status_code, 404)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models import Business, Membership
+from calendar_app import request_metrics
+from calendar_app.models import EndpointTimingBucket, PendingEndpointTiming
+from calendar_app.periodic import get_job
+
+
+User = get_user_model()
+
+
+@override_settings(PERF_METRICS_ENABLED=True, PERF_SERVER_TIMING=True, PERF_METRICS_FLUSH_SECONDS=0)
+class RequestMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        request_metrics.aggregator.clear()
+        self.user = User.objects.create_user(username='perf_owner', email='perf@example.com', password='pw')
+        self.org = Business.objects.create(name='Perf Org', slug='perf-org', owner=self.user)
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        self.client.force_login(self.user)
+
+    def test_server_timing_header_is_staff_only(self):
+        resp = self.client.get(f'/bus/{self.org.slug}/events/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn('Server-Timing', resp)
+        self.client.logout()
+        self.assertNotIn('Server-Timing', self.client.get('/'))
+
+        self.user.is_staff = True
+        self.user.save(update_fields=['is_staff'])
+        self.client.force_login(self.user)
+        header = self.client.get(f'/bus/{self.org.slug}/events/')['Server-Timing']
+        self.assertIn('app;dur=', header)
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertRegex(header, r'cache;desc="hits=\d+ misses=\d+"')
+
+        with override_settings(PERF_SERVER_TIMING=False):
+            self.assertNotIn('Server-Timing', self.client.get(f'/bus/{self.org.slug}/events/'))
+
+    @override_settings(PERF_SLOW_REQUEST_MS=1)
+    def test_slow_requests_are_logged_and_aggregated(self):
+        with self.assertLogs('circlecal.perf', level='WARNING') as logs:
+            self.client.get(f'/bus/{self.org.slug}/events/')
+        self.assertIn('slow_request', logs.output[0])
+        self.assertIn('"sql_count"', logs.output[0])
+
+        # Requests only hand off pending rows; the scheduler job merges them.
+        self.assertFalse(EndpointTimingBucket.objects.exists())
+        self.assertEqual(PendingEndpointTiming.objects.count(), 1)
+        self.assertEqual(get_job('merge_endpoint_timings').func(), 'Merged=1.')
+        self.assertFalse(PendingEndpointTiming.objects.exists())
+
+        row = EndpointTimingBucket.objects.get(endpoint='GET /bus/<slug:org_slug>/events/')
+        self.assertEqual(row.count, 1)
+        self.assertEqual(row.slow_count, 1)
+        self.assertGreater(row.sql_count, 0)
+        self.assertEqual(sum(row.histogram), 1)
+
+        summary = request_metrics.summarize_endpoints(hours=1)
+        self.assertEqual(summary[0]['endpoint'], row.endpoint)
+        self.assertIsNotNone(summary[0]['p95_ms'])
+
+    def test_outbound_and_cache_are_recorded(self):
+        with request_metrics.collect_request_metrics() as metrics:
+            with request_metrics.outbound_timer('stripe'):
+                pass
+            cache.set('perf-present-key', 0)
+            self.assertEqual(cache.get('perf-present-key', 5), 0)
+            self.assertIsNone(cache.get('perf-missing-key'))
+            cache.get_many(['perf-present-key', 'perf-missing-key'])
+        self.assertEqual(metrics.outbound_calls, {'stripe': 1})
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (2, 2))
+        self.assertIn('stripe;dur=', metrics.server_timing(1.0))
+
+    def test_histogram_percentile(self):
+        hist = [0] * (len(request_metrics.HISTOGRAM_BOUNDS_MS) + 1)
+        hist[request_metrics.histogram_index(8)] = 90
+        hist[request_metrics.histogram_index(900)] = 10
+        self.assertEqual(request_metrics.histogram_percentile(hist, 100, 50, 950), 10.0)
+        self.assertEqual(request_metrics.histogram_percentile(hist, 100, 99, 950), 950.0)
+
+    def test_admin_performance_page_is_staff_only(self):
+        url = '/admin/performance/'
+        self.client.get(f'/bus/{self.org.slug}/events/')
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 302)
+
+        staff = User.objects.create_superuser(username='perf_staff', email='staff@example.com', password='pw')
+        self.client.force_login(staff)
+        # The page only reads merged buckets; it never merges pending rows itself.
+        resp = self.client.get(url)
+        self.assertNotContains(resp, '/bus/&lt;slug:org_slug&gt;/events/')
+        self.assertTrue(PendingEndpointTiming.objects.exists())
+
+        get_job('merge_endpoint_timings').func()
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, '/bus/&lt;slug:org_slug&gt;/events/')
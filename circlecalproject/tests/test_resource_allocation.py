@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import Business, Membership
+from billing.models import Plan, Subscription
+from bookings.models import Booking, FacilityResource, Service, ServiceResource, ServiceWeeklyAvailability
+from bookings.resource_allocation import ResourceAllocator
+from bookings.views import _has_overlap
+
+
+User = get_user_model()
+
+
+class ResourceAllocatorTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ra_owner', email='ra@example.com', password='pw')
+        self.org = Business.objects.create(name='Cages', slug='ra-cages', owner=self.user, timezone='UTC')
+        Membership.objects.update_or_create(
+            user=self.user, organization=self.org, defaults={'role': 'owner', 'is_active': True}
+        )
+        plan = Plan.objects.create(name='Team', slug='team', billing_period='monthly')
+        Subscription.objects.update_or_create(
+            organization=self.org, defaults={'plan': plan, 'status': 'active', 'active': True},
+        )
+        self.svc = Service.objects.create(
+            organization=self.org, name='Cage Rental', slug='ra-cage', duration=60, buffer_after=15,
+            min_notice_hours=0, max_booking_days=365, requires_facility_resources=True, max_participants=3,
+        )
+        for wd in range(7):
+            ServiceWeeklyAvailability.objects.create(
+                service=self.svc, weekday=wd, start_time=time(8, 0), end_time=time(20, 0), is_active=True,
+            )
+        self.day = datetime.combine(timezone.now().date() + timedelta(days=3), time(0, 0), tzinfo=ZoneInfo('UTC'))
+
+    def _resources(self, n):
+        out = []
+        first = FacilityResource.objects.filter(organization=self.org).count()
+        for i in range(first, first + n):
+            r = FacilityResource.objects.create(organization=self.org, name=f'Cage {i}', slug=f'cage-{i}', max_services=0)
+            ServiceResource.objects.create(service=self.svc, resource=r)
+            out.append(r.id)
+        return out
+
+    def test_matches_per_resource_overlap_checks(self):
+        rids = self._resources(3)
+        other = Service.objects.create(organization=self.org, name='Other', slug='ra-other', duration=30)
+        rng = random.Random(7)
+        for _ in range(25):
+            start = self.day + timedelta(hours=8, minutes=15 * rng.randrange(0, 44))
+            svc = self.svc if rng.random() < 0.7 else other
+            Booking.objects.create(
+                organization=self.org, service=svc, resource_id=rng.choice(rids), start=start,
+                end=start + timedelta(minutes=60 if svc is self.svc else 30),
+                participant_count=rng.choice([1, 1, 2]),
+            )
+
+        window_end = self.day + timedelta(days=1)
+        allocator = ResourceAllocator(self.org, self.svc, rids, self.day, window_end)
+        slot = self.day + timedelta(hours=7)
+        while slot < self.day + timedelta(hours=21):
+            end = slot + timedelta(minutes=60)
+            for rid in rids:
+                expected = not _has_overlap(self.org, slot, end, service=self.svc, resource_id=rid)
+                self.assertEqual(allocator.is_free(rid, slot, end), expected, (slot, rid))
+            slot += timedelta(minutes=15)
+
+    def test_availability_query_count_does_not_scale_with_resources(self):
+        url = f'/bus/{self.org.slug}/services/{self.svc.slug}/availability/'
+        params = {'start': self.day.isoformat(), 'end': (self.day + timedelta(days=1)).isoformat()}
+
+        rids = self._resources(2)
+        with CaptureQueriesContext(connection) as few:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+
+        rids += self._resources(10)
+        # Fill every cage at 10:00 so that slot disappears.
+        for rid in rids:
+            Booking.objects.create(
+                organization=self.org, service=self.svc, resource_id=rid, participant_count=3,
+                start=self.day + timedelta(hours=10), end=self.day + timedelta(hours=11),
+            )
+        with CaptureQueriesContext(connection) as many:
+            resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        starts = {datetime.fromisoformat(s['start']) for s in resp.json()}
+        self.assertNotIn(self.day + timedelta(hours=10), starts)
+        self.assertIn(self.day + timedelta(hours=12), starts)
+        self.assertLessEqual(len(many.captured_queries), len(few.captured_queries) + 2)
@@ -0,0 +1,47 @@
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Business, Membership
+from bookings.models import MemberWeeklyAvailability, Service, ServiceAssignment, ServiceWeeklyAvailability
+from calendar_app.views import _effective_common_weekly_map_minus_other_services, _solo_services_signature_mode
+
+
+class ScheduleCacheTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username='sc_owner', password='pw')
+        self.org = Business.objects.create(name='Sched Cache', slug='sc-org', owner=owner)
+        self.mem = Membership.objects.create(user=owner, organization=self.org, role='owner')
+        self.row = MemberWeeklyAvailability.objects.create(
+            membership=self.mem, weekday=0, start_time=time(9, 0), end_time=time(17, 0),
+        )
+        self.lesson = Service.objects.create(organization=self.org, name='Lesson', slug='sc-lesson', duration=60)
+        self.group = Service.objects.create(organization=self.org, name='Group', slug='sc-group', duration=30)
+        for svc in (self.lesson, self.group):
+            ServiceAssignment.objects.create(service=svc, membership=self.mem)
+        ServiceWeeklyAvailability.objects.create(
+            service=self.lesson, weekday=0, start_time=time(9, 0), end_time=time(12, 0),
+        )
+
+    def _allowed(self):
+        return _effective_common_weekly_map_minus_other_services(self.org, [self.mem.id], exclude_service_id=self.group.id)
+
+    def test_repeat_calls_are_served_from_cache(self):
+        first = self._allowed()
+        mode = _solo_services_signature_mode(self.org, self.mem.id)
+        self.assertEqual(first[1], ['12:00-17:00'])
+        # Callers may mutate what they get back.
+        first[1].append('00:00-01:00')
+        with self.assertNumQueries(0):
+            self.assertEqual(self._allowed()[1], ['12:00-17:00'])
+            self.assertEqual(_solo_services_signature_mode(self.org, self.mem.id), mode)
+
+    def test_schedule_writes_invalidate(self):
+        self._allowed()
+        self.row.end_time = time(18, 0)
+        self.row.save()
+        self.assertEqual(self._allowed()[1], ['12:00-18:00'])
+
+        ServiceWeeklyAvailability.objects.filter(service=self.lesson).delete()
+        self.assertEqual(self._allowed()[1], ['09:00-18:00'])
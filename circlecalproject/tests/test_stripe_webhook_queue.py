@@ -0,0 +1,96 @@
+import json
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from billing.models import StripeWebhookEvent
+from billing.webhooks import process_pending_stripe_events
+
+
+def _event(event_id, created, event_type='customer.subscription.updated', customer='cus_q'):
+    return {
+        'id': event_id,
+        'type': event_type,
+        'created': created,
+        'data': {'object': {'id': f'sub_{event_id}', 'object': 'subscription', 'customer': customer}},
+    }
+
+
+class StripeWebhookQueueTests(TestCase):
+    def _post(self, event):
+        with patch('billing.views.stripe.Webhook.construct_event', return_value=event):
+            return self.client.post(
+                reverse('billing:stripe_webhook'), data=json.dumps({}), content_type='application/json',
+                HTTP_STRIPE_SIGNATURE='t=1,v1=test',
+            )
+
+    def test_acknowledges_before_processing_and_drops_redeliveries(self):
+        with patch('billing.views.handle_stripe_event') as handler, \
+                self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.assertEqual(self._post(_event('evt_1', 100)).status_code, 200)
+            self.assertEqual(self._post(_event('evt_1', 100)).status_code, 200)
+        handler.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        record = StripeWebhookEvent.objects.get(event_id='evt_1')
+        self.assertEqual((record.status, record.customer_key), (StripeWebhookEvent.STATUS_PENDING, 'cus_q'))
+
+        with patch('billing.views.handle_stripe_event') as handler:
+            self.assertEqual(process_pending_stripe_events(), 1)
+        handler.assert_called_once()
+        record.refresh_from_db()
+        self.assertEqual(record.status, StripeWebhookEvent.STATUS_DONE)
+
+    @override_settings(STRIPE_WEBHOOK_BACKGROUND_THREAD=False, STRIPE_WEBHOOK_MAX_ATTEMPTS=2)
+    def test_failures_retry_in_order_per_customer(self):
+        seen = []
+
+        def flaky(event):
+            if event['id'] == 'evt_a' and not seen:
+                seen.append('boom')
+                raise RuntimeError('stripe down')
+            seen.append(event['id'])
+
+        with patch('billing.views.handle_stripe_event', side_effect=flaky):
+            self._post(_event('evt_a', 100))
+            self._post(_event('evt_b', 200))
+            self._post(_event('evt_other', 150, customer='cus_other'))
+
+            a = StripeWebhookEvent.objects.get(event_id='evt_a')
+            self.assertEqual((a.status, a.attempts), (StripeWebhookEvent.STATUS_PENDING, 1))
+            self.assertGreater(a.next_attempt_at, timezone.now())
+            # evt_b waits behind evt_a; other customers are unaffected.
+            self.assertEqual(StripeWebhookEvent.objects.get(event_id='evt_b').status, StripeWebhookEvent.STATUS_PENDING)
+            self.assertEqual(seen, ['boom', 'evt_other'])
+
+            StripeWebhookEvent.objects.filter(event_id='evt_a').update(next_attempt_at=timezone.now())
+            self.assertEqual(process_pending_stripe_events(), 2)
+        self.assertEqual(seen, ['boom', 'evt_other', 'evt_a', 'evt_b'])
+        self.assertEqual(
+            set(StripeWebhookEvent.objects.values_list('status', flat=True)), {StripeWebhookEvent.STATUS_DONE},
+        )
+
+    @override_settings(STRIPE_WEBHOOK_BACKGROUND_THREAD=False, STRIPE_WEBHOOK_MAX_ATTEMPTS=1)
+    def test_exhausted_event_is_failed_and_unblocks_customer(self):
+        def handler(event):
+            if event['id'] == 'evt_bad':
+                raise ValueError('bad payload')
+
+        with patch('billing.views.handle_stripe_event', side_effect=handler):
+            self._post(_event('evt_bad', 100))
+            self._post(_event('evt_next', 200))
+        bad = StripeWebhookEvent.objects.get(event_id='evt_bad')
+        self.assertEqual(bad.status, StripeWebhookEvent.STATUS_FAILED)
+        self.assertIn('bad payload', bad.last_error)
+        self.assertEqual(StripeWebhookEvent.objects.get(event_id='evt_next').status, StripeWebhookEvent.STATUS_DONE)
+
+    @override_settings(STRIPE_WEBHOOK_BACKGROUND_THREAD=False)
+    def test_database_errors_in_best_effort_steps_are_retried(self):
+        event = _event('evt_pm', 100, event_type='payment_method.detached')
+        with patch('billing.views.PaymentMethod.objects.filter', side_effect=OperationalError('connection lost')):
+            self._post(event)
+        record = StripeWebhookEvent.objects.get(event_id='evt_pm')
+        self.assertEqual((record.status, record.attempts), (StripeWebhookEvent.STATUS_PENDING, 1))
+        self.assertIn('connection lost', record.last_error)
@@ -134,6 +134,46 @@ export async function apiPost<T>(path: string, payload: unknown): Promise<T> {
   }));
 }
 
+export type ApiBatchPart = {
+  id: string | number;
+  status: number;
+  body: unknown;
+};
+
+// Run several GETs in one round trip (POST /api/v1/batch/); parts come back in order.
+// Servers without the batch endpoint answer 404, in which case the GETs are sent one by one.
+export async function apiBatchGet(paths: string[]): Promise<ApiBatchPart[]> {
+  try {
+    const resp = await apiPost<{ responses: ApiBatchPart[] }>('/api/v1/batch/', {
+      requests: paths.map((path, i) => ({ id: i, path })),
+    });
+    return resp.responses ?? [];
+  } catch (e) {
+    if ((e as Partial<ApiError>).status !== 404) throw e;
+  }
+  return Promise.all(
+    paths.map(async (path, i) => {
+      try {
+        return { id: i, status: 200, body: await apiGet<unknown>(path) };
+      } catch (e) {
+        const err = e as Partial<ApiError>;
+        if (typeof err.status !== 'number') throw e;
+        return { id: i, status: err.status, body: err.body };
+      }
+    })
+  );
+}
+
+// Body of a successful batch part; throws an ApiError (like apiGet) otherwise.
+export function batchPartData<T>(part: ApiBatchPart | undefined): T {
+  if (!part || part.status < 200 || part.status >= 300) {
+    const status = part?.status ?? 0;
+    const err: ApiError = { status, message: `Request failed: ${status}`, body: part?.body };
+    throw err;
+  }
+  return part.body as T;
+}
+
 export async function apiPatch<T>(path: string, payload: unknown): Promise<T> {
   return apiRequest<T>(path, async () => ({
     method: 'PATCH',
@@ -505,13 +545,17 @@ export async function apiGetBookings(params: {
   count: number;
   bookings: BookingListItem[];
 }> {
+  return apiGet(bookingsListPath(params));
+}
+
+export function bookingsListPath(params: { org: string; from?: string; to?: string; limit?: number; q?: string }): string {
   const usp = new URLSearchParams();
   usp.set('org', params.org);
   if (params.from) usp.set('from', params.from);
   if (params.to) usp.set('to', params.to);
   if (typeof params.limit === 'number') usp.set('limit', String(params.limit));
   if (params.q) usp.set('q', params.q);
-  return apiGet(`/api/v1/bookings/?${usp.toString()}`);
+  return `/api/v1/bookings/?${usp.toString()}`;
 }
 
 export async function apiGetBookingDetail(params: {
@@ -627,9 +671,13 @@ export async function apiPatchService(params: {
 }
 
 export async function apiGetBillingSummary(params: { org: string }): Promise<BillingSummary> {
+  return apiGet(billingSummaryPath(params));
+}
+
+export function billingSummaryPath(params: { org: string }): string {
   const usp = new URLSearchParams();
   usp.set('org', params.org);
-  return apiGet(`/api/v1/billing/summary/?${usp.toString()}`);
+  return `/api/v1/billing/summary/?${usp.toString()}`;
 }
 
 export async function apiGetProfileOverview(params?: { org?: string | null }): Promise<ApiProfileOverviewResponse> {
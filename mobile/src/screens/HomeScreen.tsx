@@ -4,7 +4,15 @@ import { useFocusEffect } from '@react-navigation/native';
 
 import type { ApiError, BillingSummary } from '../lib/api';
 import type { BookingListItem, OrgListItem } from '../lib/api';
-import { apiGet, apiGetBillingSummary, apiGetBookings, apiGetOrgs, apiGetProfileOverview } from '../lib/api';
+import {
+  apiBatchGet,
+  apiGetBillingSummary,
+  apiGetBookings,
+  apiGetProfileOverview,
+  batchPartData,
+  billingSummaryPath,
+  bookingsListPath,
+} from '../lib/api';
 import {
   clearActiveOrgSlug,
   clearPostStripeMessage,
@@ -152,14 +160,44 @@ export function HomeScreen({
     }
   }
 
+  // Bookings and plan gates in one round trip; the server resolves the org once for both.
+  async function loadOrgData(orgSlug: string) {
+    setLoadingBookings(true);
+    setLoadingPlan(true);
+    try {
+      const [bookingsPart, planPart] = await apiBatchGet([
+        bookingsListPath({ org: orgSlug, from: window.from, to: window.to, limit: 200 }),
+        billingSummaryPath({ org: orgSlug }),
+      ]);
+      try {
+        setBookings(batchPartData<{ bookings: BookingListItem[] }>(bookingsPart).bookings ?? []);
+      } catch (e) {
+        const err = e as Partial<ApiError>;
+        const body = err.body as any;
+        setError((typeof body?.detail === 'string' && body.detail) || 'Failed to load bookings.');
+      }
+      try {
+        setBillingSummary(batchPartData<BillingSummary>(planPart));
+      } catch {
+        // If billing isn't enabled or user isn't authorized, keep portals gated.
+        setBillingSummary(null);
+      }
+    } catch {
+      // Batch request failed as a whole (e.g. offline); fall back to the individual loaders.
+      await Promise.all([loadBookings(orgSlug), loadPlan(orgSlug)]);
+    } finally {
+      setLoadingBookings(false);
+      setLoadingPlan(false);
+    }
+  }
+
   useEffect(() => {
     let cancelled = false;
     (async () => {
       try {
-        const [meResp, orgsResp] = await Promise.all([
-          apiGet<{ username: string; email: string }>('/api/v1/me/'),
-          apiGetOrgs(),
-        ]);
+        const [mePart, orgsPart] = await apiBatchGet(['/api/v1/me/', '/api/v1/orgs/']);
+        const meResp = batchPartData<{ username: string; email: string }>(mePart);
+        const orgsResp = batchPartData<{ orgs: OrgListItem[] }>(orgsPart);
 
         if (cancelled) return;
         setMe(meResp);
@@ -182,7 +220,7 @@ export function HomeScreen({
             // If the profile check fails, do not block access.
           }
           if (!cancelled) {
-            await Promise.all([loadBookings(chosen.slug), loadPlan(chosen.slug)]);
+            await loadOrgData(chosen.slug);
           }
         }
       } catch (e) {
@@ -242,7 +280,7 @@ export function HomeScreen({
 
           // Refresh bookings + plan gates on focus (e.g., after cancelling a booking or upgrading in Stripe).
           if (activeOrg?.slug) {
-            await Promise.all([loadBookings(activeOrg.slug), loadPlan(activeOrg.slug)]);
+            await loadOrgData(activeOrg.slug);
           }
 
           const storedSlug = await getActiveOrgSlug();
@@ -251,7 +289,7 @@ export function HomeScreen({
           const chosen = orgs.find((o) => o.slug === storedSlug) || null;
           if (!chosen) return;
           setActiveOrg(chosen);
-          await Promise.all([loadBookings(chosen.slug), loadPlan(chosen.slug)]);
+          await loadOrgData(chosen.slug);
         } catch {
           // ignore
         }
@@ -271,7 +309,7 @@ export function HomeScreen({
   async function handleSelectOrg(o: OrgListItem) {
     setActiveOrg(o);
     await setActiveOrgSlug(o.slug);
-    await Promise.all([loadBookings(o.slug), loadPlan(o.slug)]);
+    await loadOrgData(o.slug);
   }
 
   const header = (